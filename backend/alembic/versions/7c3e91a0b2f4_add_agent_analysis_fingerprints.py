@@ -0,0 +1,39 @@
+"""add_agent_analysis_fingerprints
+
+Revision ID: 7c3e91a0b2f4
+Revises: d450ca795b5e
+Create Date: 2026-10-19 10:12:41.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '7c3e91a0b2f4'
+down_revision = 'd450ca795b5e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('agent_analysis', sa.Column('model_name', sa.String(100), nullable=True))
+    op.add_column('agent_analysis', sa.Column('input_fingerprint', sa.String(64), nullable=True))
+    op.add_column('agent_analysis', sa.Column('inputs', sa.JSON(), nullable=True))
+    op.add_column('agent_analysis', sa.Column('llm_responses', sa.JSON(), nullable=True))
+    op.add_column('agent_analysis', sa.Column('reused_from', sa.Integer(), nullable=True))
+    
+    op.create_index('ix_agent_analysis_input_fingerprint', 'agent_analysis', ['input_fingerprint'])
+    op.create_foreign_key(
+        'fk_agent_analysis_reused_from', 'agent_analysis', 'agent_analysis', ['reused_from'], ['id']
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('fk_agent_analysis_reused_from', 'agent_analysis', type_='foreignkey')
+    op.drop_index('ix_agent_analysis_input_fingerprint', table_name='agent_analysis')
+    
+    op.drop_column('agent_analysis', 'reused_from')
+    op.drop_column('agent_analysis', 'llm_responses')
+    op.drop_column('agent_analysis', 'inputs')
+    op.drop_column('agent_analysis', 'input_fingerprint')
+    op.drop_column('agent_analysis', 'model_name')
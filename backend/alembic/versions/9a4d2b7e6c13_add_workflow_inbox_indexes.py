@@ -0,0 +1,26 @@
+"""add_workflow_inbox_indexes
+
+Revision ID: 9a4d2b7e6c13
+Revises: 7c3e91a0b2f4
+Create Date: 2026-10-19 14:03:27.552190
+
+"""
+from alembic import op
+
+
+revision = '9a4d2b7e6c13'
+down_revision = '7c3e91a0b2f4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_design_changes_inbox', 'design_changes', ['current_assignee', 'workflow_status', 'project_id']
+    )
+    op.create_index('ix_workflow_history_change_id', 'workflow_history', ['change_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_workflow_history_change_id', table_name='workflow_history')
+    op.drop_index('ix_design_changes_inbox', table_name='design_changes')
@@ -0,0 +1,233 @@
+"""에이전트 분석 입력 지문(fingerprint) 기록과 변경분 재분석
+
+에이전트가 LLM 을 호출할 때마다 (모델, 프롬프트 버전, 프롬프트 전문) 해시를 호출 지문으로 기록합니다.
+프롬프트에는 설계 변경 필드, 검색된 문서 조각, 위험 항목 행, 앞선 에이전트 결과가 모두 들어가므로
+호출 지문이 같으면 같은 입력입니다. 재분석 시 직전 분석의 응답을 호출 지문으로 찾아 재사용하고,
+입력이 바뀐 호출만 실제 LLM 을 부릅니다.
+
+에이전트 지문은 호출 지문들, 모델, 프롬프트 버전, 검색된 조각 ID 를 합친 해시로
+``AgentAnalysis.input_fingerprint`` 에 저장됩니다.
+"""
+import hashlib
+import json
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.db.models import AgentAnalysis
+
+
+logger = logging.getLogger(__name__)
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def call_fingerprint(model_name: str, prompt_version: str, prompt: str) -> str:
+    return _sha256(f"{model_name}\0{prompt_version}\0{prompt}")
+
+
+@dataclass
+class ReplayedResponse:
+    """이전 분석에서 재사용한 LLM 응답 (에이전트는 ``content`` 만 사용)"""
+    content: str
+    usage_metadata: Optional[dict] = None
+
+
+@dataclass
+class AnalysisRecorder:
+    """에이전트 한 개의 분석 입력 기록기 (``replay`` 는 직전 분석의 호출 지문 → 응답)"""
+    agent_type: str
+    model_name: str
+    prompt_version: str
+    replay: Dict[str, str] = field(default_factory=dict)
+    calls: List[str] = field(default_factory=list)
+    responses: Dict[str, str] = field(default_factory=dict)
+    retrieved_ids: List[str] = field(default_factory=list)
+    reused_calls: int = 0
+
+    def call_fingerprint(self, prompt: str) -> str:
+        return call_fingerprint(self.model_name, self.prompt_version, prompt)
+
+    def lookup(self, prompt: str) -> Optional[ReplayedResponse]:
+        fingerprint = self.call_fingerprint(prompt)
+        self.calls.append(fingerprint)
+        content = self.replay.get(fingerprint)
+        if content is None:
+            return None
+        self.reused_calls += 1
+        self.responses[fingerprint] = content
+        return ReplayedResponse(content)
+
+    def record(self, prompt: str, response: Any):
+        content = getattr(response, "content", None)
+        if isinstance(content, str):
+            self.responses[self.call_fingerprint(prompt)] = content
+
+    def record_retrieval(self, results: Dict):
+        for ids in results.get("ids") or []:
+            self.retrieved_ids.extend(ids)
+
+    @property
+    def fully_reused(self) -> bool:
+        return bool(self.calls) and self.reused_calls == len(self.calls)
+
+    @property
+    def inputs(self) -> Dict[str, Any]:
+        return {
+            "model": self.model_name,
+            "prompt_version": self.prompt_version,
+            "llm_calls": self.calls,
+            "retrieved_ids": sorted(set(self.retrieved_ids)),
+        }
+
+    @property
+    def fingerprint(self) -> str:
+        return _sha256(json.dumps({"agent": self.agent_type, **self.inputs}, sort_keys=True))
+
+
+_current_recorder: ContextVar[Optional[AnalysisRecorder]] = ContextVar("analysis_recorder", default=None)
+_current_run: ContextVar[Optional["DeltaAnalysisRun"]] = ContextVar("delta_analysis_run", default=None)
+
+
+def current_recorder() -> Optional[AnalysisRecorder]:
+    return _current_recorder.get()
+
+
+@contextmanager
+def recording(recorder: AnalysisRecorder) -> Iterator[AnalysisRecorder]:
+    """블록 안의 LLM 호출/검색을 recorder 에 기록 (재사용 가능한 호출은 LLM 을 부르지 않음)"""
+    token = _current_recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _current_recorder.reset(token)
+
+
+def latest_analysis(db: Session, change_id: int, agent_type: str, analysis_type: str) -> Optional[AgentAnalysis]:
+    return (
+        db.query(AgentAnalysis)
+        .filter(
+            AgentAnalysis.change_id == change_id,
+            AgentAnalysis.agent_type == agent_type,
+            AgentAnalysis.analysis_type == analysis_type,
+        )
+        .order_by(AgentAnalysis.id.desc())
+        .first()
+    )
+
+
+def latest_analyses(db: Session, change_ids: List[int],
+                    analysis_type: str) -> Dict[int, Dict[str, AgentAnalysis]]:
+    """여러 설계 변경의 에이전트별 최신 분석을 한 번에 조회 (change_id → agent_type → 행)"""
+    latest_ids = (
+        select(func.max(AgentAnalysis.id))
+        .where(AgentAnalysis.change_id.in_(change_ids), AgentAnalysis.analysis_type == analysis_type)
+        .group_by(AgentAnalysis.change_id, AgentAnalysis.agent_type)
+    )
+    result: Dict[int, Dict[str, AgentAnalysis]] = {}
+    for analysis in db.query(AgentAnalysis).filter(AgentAnalysis.id.in_(latest_ids)):
+        result.setdefault(analysis.change_id, {})[analysis.agent_type] = analysis
+    return result
+
+
+def recorder_for(agent, previous: Optional[AgentAnalysis]) -> AnalysisRecorder:
+    return AnalysisRecorder(
+        agent_type=agent.agent_type,
+        model_name=agent.model_name,
+        prompt_version=agent.prompt_version,
+        replay=dict(previous.llm_responses or {}) if previous is not None else {},
+    )
+
+
+def save_analysis(db: Session, change_id: int, analysis_type: str, recorder: AnalysisRecorder,
+                  findings: Dict[str, Any], previous: Optional[AgentAnalysis]) -> AgentAnalysis:
+    """입력이 직전 분석과 같으면 그 행을 재사용, 아니면 지문과 함께 새 이력 행 추가 (commit 은 호출자)"""
+    if previous is not None and recorder.fully_reused and previous.input_fingerprint == recorder.fingerprint:
+        previous.reused = True
+        return previous
+    analysis = AgentAnalysis(
+        change_id=change_id,
+        agent_type=recorder.agent_type,
+        analysis_type=analysis_type,
+        findings=findings,
+        model_name=recorder.model_name,
+        input_fingerprint=recorder.fingerprint,
+        inputs=recorder.inputs,
+        llm_responses=recorder.responses,
+        reused_from=previous.id if previous is not None and recorder.reused_calls else None,
+    )
+    analysis.reused = False
+    db.add(analysis)
+    return analysis
+
+
+class DeltaAnalysisRun:
+    """오케스트레이터 전체 실행에서 에이전트별 직전 분석을 재사용 (``BaseAgent.run`` 이 참조)"""
+
+    analysis_type = "workflow"
+
+    def __init__(self, db: Session, change_id: int,
+                 previous: Optional[Dict[str, AgentAnalysis]] = None):
+        self.db = db
+        self.change_id = change_id
+        # 미리 조회한 직전 분석 (없으면 에이전트마다 조회)
+        self._preloaded = previous
+        self.previous: Dict[str, Optional[AgentAnalysis]] = {}
+        self.recorders: Dict[str, AnalysisRecorder] = {}
+        self.findings: Dict[str, Dict[str, Any]] = {}
+
+    def recorder(self, agent) -> AnalysisRecorder:
+        if self._preloaded is not None:
+            previous = self._preloaded.get(agent.agent_type)
+        else:
+            previous = latest_analysis(self.db, self.change_id, agent.agent_type, self.analysis_type)
+        self.previous[agent.agent_type] = previous
+        recorder = self.recorders[agent.agent_type] = recorder_for(agent, previous)
+        return recorder
+
+    def record_findings(self, agent_type: str, findings: Dict[str, Any]):
+        self.findings[agent_type] = findings
+
+    @contextmanager
+    def activate(self) -> Iterator["DeltaAnalysisRun"]:
+        token = _current_run.set(self)
+        try:
+            yield self
+        finally:
+            _current_run.reset(token)
+
+    def build(self) -> List[AgentAnalysis]:
+        """에이전트별 분석 행 (새 행은 세션에 추가만 하고 커밋하지 않음)"""
+        return [
+            save_analysis(self.db, self.change_id, self.analysis_type, recorder,
+                          self.findings.get(agent_type, {}), self.previous.get(agent_type))
+            for agent_type, recorder in self.recorders.items()
+        ]
+
+    @property
+    def llm_calls(self) -> int:
+        return sum(len(r.calls) - r.reused_calls for r in self.recorders.values())
+
+    @property
+    def llm_calls_reused(self) -> int:
+        return sum(r.reused_calls for r in self.recorders.values())
+
+    def save(self) -> List[AgentAnalysis]:
+        analyses = self.build()
+        self.db.commit()
+        for analysis in analyses:
+            reused = analysis.reused
+            self.db.refresh(analysis)
+            analysis.reused = reused
+        return analyses
+
+
+def current_run() -> Optional[DeltaAnalysisRun]:
+    return _current_run.get()
@@ -1,11 +1,25 @@
-from typing import TypedDict, Annotated, Sequence, Dict, Any, Optional, List
+from typing import TypedDict, Annotated, Sequence, Dict, Any, Optional, List, Tuple
+from functools import cached_property
 import logging
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langgraph.graph import StateGraph, END
 import operator
+import time
 from app.core.config import settings
+from app.agents.analysis_history import (
+    ReplayedResponse,
+    call_fingerprint,
+    current_recorder,
+    current_run,
+    recording
+)
+from app.agents.shared_context import SharedAnalysisContext, current_shared
+from app.core.metrics import AGENT_EXECUTE_DURATION, LLM_REQUEST_DURATION, record_cache, record_llm_usage
+from app.core.tracing import start_span
+from sqlalchemy.orm import joinedload
 from app.db.base import SessionLocal
 from app.db.models import DesignChange, DesignProject, RiskItem
+from app.services.knowledge_base import knowledge_base
+from app.services.shared_cache import shared_cache
+from app.services.traceability_graph import traceability_graph
 
 logger = logging.getLogger(__name__)
 
@@ -20,10 +34,23 @@ class AgentState(TypedDict):
 
 
 class BaseAgent:
+    # 프롬프트 템플릿을 바꾸면 올려서 이전 분석 재사용을 무효화
+    prompt_version = "1"
+    # 입력과 무관하게 항상 같은 (지식 베이스 분류, 질의, 개수) 검색 — 워커 예열 때 미리 실행
+    warm_up_searches: Tuple[Tuple[Tuple[str, ...], str, int], ...] = ()
+    
     def __init__(self, agent_type: str, model_name: str = "gemini-1.5-pro"):
         self.agent_type = agent_type
         self.model_name = model_name
+    
+    @cached_property
+    def llm(self) -> Any:
+        """처음 호출할 때 LLM 클라이언트 생성 (import 시 langchain_google_genai 를 불러오지 않도록)"""
         self._init_llm()
+        try:
+            return self.__dict__["llm"]
+        except KeyError:
+            raise AttributeError("llm") from None
     
     def _get_db_session(self):
         """DB 세션을 반환합니다."""
@@ -31,15 +58,27 @@ class BaseAgent:
     
     def _get_design_change(self, change_id: int) -> Optional[DesignChange]:
         """설계 변경 정보를 DB에서 조회합니다."""
+        shared = current_shared()
+        if shared is not None and change_id in shared.changes:
+            return shared.changes[change_id]
         db = self._get_db_session()
         try:
-            change = db.query(DesignChange).filter(DesignChange.id == change_id).first()
+            # 세션을 닫은 뒤에도 change.project 를 쓸 수 있도록 함께 로드
+            change = (
+                db.query(DesignChange)
+                .options(joinedload(DesignChange.project))
+                .filter(DesignChange.id == change_id)
+                .first()
+            )
             return change
         finally:
             db.close()
     
     def _get_project_for_change(self, change_id: int) -> Optional[DesignProject]:
         """설계 변경에 연결된 프로젝트 정보를 조회합니다."""
+        shared = current_shared()
+        if shared is not None and change_id in shared.changes:
+            return shared.changes[change_id].project
         db = self._get_db_session()
         try:
             change = db.query(DesignChange).filter(DesignChange.id == change_id).first()
@@ -49,8 +88,24 @@ class BaseAgent:
         finally:
             db.close()
     
+    def _get_impact_set(self, state: AgentState) -> List[Dict[str, Any]]:
+        """추적성 링크로 설계 변경에서 도달하는 항목 (한 실행에서 한 번만 계산해 state 에 공유)"""
+        traceability = state['analysis_results'].get('traceability')
+        if traceability is None:
+            db = self._get_db_session()
+            try:
+                items = traceability_graph.impact("design_change", state['change_id'], db=db)
+            finally:
+                db.close()
+            traceability = {'status': 'completed', 'impacted_items': items}
+            state['analysis_results']['traceability'] = traceability
+        return traceability['impacted_items']
+    
     def _get_risks_for_project(self, project_id: int) -> List[RiskItem]:
         """프로젝트의 위험 항목들을 조회합니다."""
+        shared = current_shared()
+        if shared is not None and project_id in shared.risks_by_project:
+            return shared.risks_by_project[project_id]
         db = self._get_db_session()
         try:
             risks = db.query(RiskItem).filter(RiskItem.project_id == project_id).all()
@@ -59,6 +114,7 @@ class BaseAgent:
             db.close()
     
     def _init_llm(self, model_name: Optional[str] = None, credentials: Any = None):
+        from langchain_google_genai import ChatGoogleGenerativeAI
         if model_name:
             self.model_name = model_name
         
@@ -77,5 +133,96 @@ class BaseAgent:
     def create_prompt(self, task: str, context: Dict[str, Any]) -> str:
         raise NotImplementedError("Subclasses must implement create_prompt")
     
+    def _search(self, categories: Sequence[str], query: str, n_results: int = 5,
+                project_id: Optional[int] = None) -> Dict:
+        """지식 베이스 검색 — 지정한 분류의 공통 문서와 ``project_id`` 프로젝트 문서만 대상
+        
+        분석 기록 중이면 검색된 조각 ID 를 입력으로 기록하고, 일괄 분석 중이면 같은 질의를 공유합니다.
+        """
+        shared = current_shared()
+        key = SharedAnalysisContext.search_key(categories, query, n_results, project_id) if shared else None
+        if shared is not None and key in shared.searches:
+            shared.search_hits += 1
+            results = shared.searches[key]
+        else:
+            results = knowledge_base.search(
+                categories,
+                query,
+                n_results=n_results,
+                project_id=project_id
+            )
+            if shared is not None:
+                shared.searches[key] = results
+        recorder = current_recorder()
+        if recorder is not None:
+            recorder.record_retrieval(results)
+        return results
+    
+    async def _invoke_llm(self, prompt: str) -> Any:
+        """LLM 호출 (모델별 지연 시간/토큰 사용량 기록)
+        
+        분석 기록 중이고 직전 분석에 같은 입력의 응답이 있으면 LLM 을 부르지 않고 재사용합니다.
+        공유 캐시가 켜져 있으면 다른 워커가 같은 프롬프트로 받은 응답도 재사용합니다.
+        """
+        recorder = current_recorder()
+        if recorder is not None:
+            replayed = recorder.lookup(prompt)
+            record_cache("analysis_llm", replayed is not None)
+            if replayed is not None:
+                return replayed
+        cache_key = call_fingerprint(self.model_name, self.prompt_version, prompt) if shared_cache.enabled else None
+        content = shared_cache.get("llm", cache_key) if cache_key else None
+        if content is not None:
+            response = ReplayedResponse(content)
+        else:
+            shared = current_shared()
+            if shared is not None and shared.llm_semaphore is not None:
+                async with shared.llm_semaphore:
+                    response = await self._call_llm(prompt)
+            else:
+                response = await self._call_llm(prompt)
+            if cache_key and isinstance(getattr(response, "content", None), str):
+                shared_cache.set("llm", cache_key, response.content, ttl=settings.SHARED_CACHE_LLM_TTL_SECONDS)
+        if recorder is not None:
+            recorder.record(prompt, response)
+        return response
+    
+    async def _call_llm(self, prompt: str) -> Any:
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            with start_span("llm.ainvoke", **{"llm.model": self.model_name, "llm.prompt_chars": len(prompt)}) as span:
+                response = await self.llm.ainvoke(prompt)
+                outcome = "ok"
+                prompt_tokens, completion_tokens = record_llm_usage(self.model_name, response)
+                if prompt_tokens:
+                    span.set_attribute("llm.prompt_tokens", prompt_tokens)
+                if completion_tokens:
+                    span.set_attribute("llm.completion_tokens", completion_tokens)
+            return response
+        finally:
+            LLM_REQUEST_DURATION.labels(self.model_name, outcome).observe(time.perf_counter() - started)
+    
+    async def run(self, state: AgentState) -> AgentState:
+        """execute 실행 + 실행 시간 기록 (오케스트레이터는 이 메서드로 에이전트를 호출)"""
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            with start_span(f"agent.{self.agent_type}", change_id=state.get("change_id")):
+                delta_run = current_run()
+                if delta_run is None:
+                    result = await self.execute(state)
+                else:
+                    before = set(state['analysis_results'])
+                    with recording(delta_run.recorder(self)):
+                        result = await self.execute(state)
+                    delta_run.record_findings(self.agent_type, {
+                        key: value for key, value in result['analysis_results'].items() if key not in before
+                    })
+            outcome = "ok"
+            return result
+        finally:
+            AGENT_EXECUTE_DURATION.labels(self.agent_type, outcome).observe(time.perf_counter() - started)
+    
     async def execute(self, state: AgentState) -> AgentState:
         raise NotImplementedError("Subclasses must implement execute")
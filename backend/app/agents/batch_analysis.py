@@ -0,0 +1,128 @@
+"""여러 설계 변경(예: 릴리스 변경 묶음) 일괄 분석
+
+- 대상 설계 변경/프로젝트/위험 대장과 직전 분석을 한 번에 조회하고, 같은 질의의 지식베이스 검색은 공유합니다.
+- 설계 변경마다 요청된 에이전트를 파이프라인 순서대로 실행하되(QA 가 검증 결과를 쓰는 등 의존성 유지),
+  변경끼리는 동시에 진행하고 LLM 호출은 ``BATCH_ANALYSIS_LLM_CONCURRENCY`` 로 제한합니다.
+- 변경 하나가 끝날 때마다 결과를 내보내고, 분석 이력은 ``BATCH_ANALYSIS_FLUSH_SIZE`` 행씩 모아 한 번에 커밋합니다.
+- 직전 분석과 입력이 같은 LLM 호출은 재사용합니다 (``analysis_history``).
+"""
+import asyncio
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.agents.analysis_history import DeltaAnalysisRun, latest_analyses
+from app.agents.orchestrator import orchestrator
+from app.agents.shared_context import SharedAnalysisContext, sharing
+from app.core.config import settings
+from app.db.models import AgentAnalysis
+
+
+logger = logging.getLogger(__name__)
+
+
+class BatchAnalysisRunner:
+    def __init__(
+        self,
+        db: Session,
+        change_ids: List[int],
+        agent_types: Optional[List[str]] = None,
+        user_role: str = "",
+        llm_concurrency: Optional[int] = None,
+        flush_size: Optional[int] = None,
+    ):
+        requested = set(agent_types or orchestrator.agents)
+        unknown = requested - set(orchestrator.agents)
+        if unknown:
+            raise ValueError(f"Unknown agent type: {', '.join(sorted(unknown))}")
+        self.db = db
+        self.change_ids = list(dict.fromkeys(change_ids))
+        # 파이프라인 순서 유지
+        self.agent_types = [name for name in orchestrator.agents if name in requested]
+        self.user_role = user_role
+        self.llm_concurrency = llm_concurrency or settings.BATCH_ANALYSIS_LLM_CONCURRENCY
+        self.flush_size = flush_size or settings.BATCH_ANALYSIS_FLUSH_SIZE
+        self._pending: List[AgentAnalysis] = []
+
+    async def _analyze_change(
+        self, change_id: int, previous: Dict[str, AgentAnalysis]
+    ) -> Tuple[DeltaAnalysisRun, Optional[Dict[str, Any]], Optional[str]]:
+        delta_run = DeltaAnalysisRun(self.db, change_id, previous=previous)
+        state = {
+            "messages": [],
+            "change_id": change_id,
+            "user_role": self.user_role,
+            "current_step": "start",
+            "analysis_results": {},
+            "next_agent": self.agent_types[0],
+        }
+        try:
+            with delta_run.activate():
+                for name in self.agent_types:
+                    state = await orchestrator.agents[name].run(state)
+        except Exception as e:
+            logger.exception(f"설계 변경 {change_id} 일괄 분석 중 오류: {e}")
+            return delta_run, None, str(e)
+        return delta_run, state, None
+
+    def _flush(self, force: bool = False):
+        """세션에 쌓인 새 분석 행을 한 번에 커밋"""
+        if self._pending and (force or len(self._pending) >= self.flush_size):
+            self.db.commit()
+            self._pending = []
+
+    async def stream(self) -> AsyncIterator[Dict[str, Any]]:
+        """변경별 결과 이벤트를 완료 순서대로 내보내고 마지막에 요약 이벤트"""
+        started = time.perf_counter()
+        shared = SharedAnalysisContext.preload(self.db, self.change_ids, self.llm_concurrency)
+        previous = latest_analyses(self.db, list(shared.changes), DeltaAnalysisRun.analysis_type)
+        for rows in previous.values():
+            for row in rows.values():
+                self.db.expunge(row)
+
+        summary = {"changes": len(self.change_ids), "completed": 0, "failed": 0,
+                   "llm_calls": 0, "llm_calls_reused": 0}
+        for change_id in self.change_ids:
+            if change_id not in shared.changes:
+                summary["failed"] += 1
+                yield {"change_id": change_id, "status": "error", "error": "Design change not found"}
+
+        with sharing(shared):
+            tasks = {
+                asyncio.ensure_future(self._analyze_change(change_id, previous.get(change_id, {}))): change_id
+                for change_id in self.change_ids if change_id in shared.changes
+            }
+        try:
+            for future in asyncio.as_completed(tasks):
+                delta_run, state, error = await future
+                if error is not None:
+                    summary["failed"] += 1
+                    yield {"change_id": delta_run.change_id, "status": "error", "error": error}
+                    continue
+                # build() 는 새 행을 세션에 추가만 하므로 flush_size 만큼 모아서 커밋
+                analyses = delta_run.build()
+                self._pending.extend(a for a in analyses if not a.reused)
+                self._flush()
+                summary["completed"] += 1
+                summary["llm_calls"] += delta_run.llm_calls
+                summary["llm_calls_reused"] += delta_run.llm_calls_reused
+                yield {
+                    "change_id": delta_run.change_id,
+                    "status": "completed",
+                    "recomputed": [a.agent_type for a in analyses if not a.reused],
+                    "reused": [a.agent_type for a in analyses if a.reused],
+                    "llm_calls": delta_run.llm_calls,
+                    "results": state["analysis_results"],
+                }
+        finally:
+            for task in tasks:
+                task.cancel()
+            self._flush(force=True)
+
+        summary.update(
+            search_cache_hits=shared.search_hits,
+            elapsed_seconds=round(time.perf_counter() - started, 3),
+        )
+        yield {"summary": summary}
@@ -2,11 +2,14 @@ from typing import Dict, Any, List, Optional
 import json
 import logging
 from app.agents.base_agent import BaseAgent, AgentState
-from app.services.vector_db_service import vector_db_service
+from app.services.knowledge_base import SOP, TEMPLATES
 from app.services.gdrive_service import gdrive_service
+from app.services.gdrive_pool import drive_client_pool
 
 logger = logging.getLogger(__name__)
 
+MAX_TRACED_ITEMS_IN_PROMPT = 200
+
 
 class DesignEngineerAgent(BaseAgent):
     def __init__(self):
@@ -24,6 +27,9 @@ class DesignEngineerAgent(BaseAgent):
 [관련 문서들]
 {context.get('related_docs', '')}
 
+[추적성 링크로 연결된 항목 (유형:ID, 홉 수)]
+{context.get('traced_items') or '없음'}
+
 다음을 JSON 형식으로 분석하세요:
 1. 영향받는 문서 목록 (문서명, 버전, 영향 이유)
 2. 영향받는 요구사항 (ID, 설명)
@@ -64,24 +70,34 @@ class DesignEngineerAgent(BaseAgent):
     async def analyze_impact(self, change_data: Dict[str, Any]) -> Dict[str, Any]:
         description = change_data.get('description', '')
         
-        search_results = vector_db_service.search(
-            collection_name="qms_knowledge_base",
-            query=description,
-            n_results=10
+        search_results = self._search(
+            (SOP, TEMPLATES),
+            description,
+            n_results=10,
+            project_id=change_data.get('project_id')
         )
         
         related_docs = "\n".join([
             f"- {doc}" for doc in search_results.get('documents', [[]])[0]
         ])
         
+        traced = change_data.get('traced_items') or []
+        traced_items = "\n".join(
+            f"- {item['type']}:{item['id']} (depth {item['depth']})"
+            for item in traced[:MAX_TRACED_ITEMS_IN_PROMPT]
+        )
+        if len(traced) > MAX_TRACED_ITEMS_IN_PROMPT:
+            traced_items += f"\n- ... 외 {len(traced) - MAX_TRACED_ITEMS_IN_PROMPT}건"
+        
         context = {
             'title': change_data.get('title', ''),
             'description': description,
-            'related_docs': related_docs
+            'related_docs': related_docs,
+            'traced_items': traced_items
         }
         
         prompt = self.create_prompt("impact_analysis", context)
-        response = await self.llm.ainvoke(prompt)
+        response = await self._invoke_llm(prompt)
         
         try:
             content = response.content
@@ -96,7 +112,7 @@ class DesignEngineerAgent(BaseAgent):
         return result
     
     async def analyze_risks(self, change_data: Dict[str, Any], risk_file_id: str) -> Dict[str, Any]:
-        risk_df = gdrive_service.read_excel_file(risk_file_id)
+        risk_df = await drive_client_pool.run(gdrive_service.read_excel_file, risk_file_id)
         risk_data = risk_df.to_string() if not risk_df.empty else "No existing risk data"
         
         context = {
@@ -105,7 +121,7 @@ class DesignEngineerAgent(BaseAgent):
         }
         
         prompt = self.create_prompt("risk_analysis", context)
-        response = await self.llm.ainvoke(prompt)
+        response = await self._invoke_llm(prompt)
         
         try:
             content = response.content
@@ -138,7 +154,9 @@ class DesignEngineerAgent(BaseAgent):
                 'title': design_change.title,
                 'description': design_change.description,
                 'change_type': design_change.change_type,
-                'project_code': design_change.project.project_code if design_change.project else None
+                'project_id': design_change.project_id,
+                'project_code': design_change.project.project_code if design_change.project else None,
+                'traced_items': self._get_impact_set(state)
             }
             
             impact_result = await self.analyze_impact(change_data)
@@ -1,5 +1,7 @@
-from langgraph.graph import StateGraph, END
+from functools import cached_property
 from app.agents.base_agent import AgentState
+from app.core.profiling import profile_block
+from app.core.tracing import start_span
 from app.agents.design_engineer_agent import design_engineer_agent
 from app.agents.ra_agent import ra_agent
 from app.agents.qa_agent import qa_agent
@@ -9,18 +11,31 @@ from app.agents.verification_agent import verification_agent
 
 
 class QMSOrchestrator:
-    def __init__(self):
-        self.graph = self._build_graph()
+    agents = {
+        "design_engineer": design_engineer_agent,
+        "project_manager": pm_agent,
+        "risk_manager": risk_manager_agent,
+        "regulatory_affairs": ra_agent,
+        "verification": verification_agent,
+        "quality_assurance": qa_agent
+    }
+    
+    @cached_property
+    def graph(self):
+        """LangGraph 워크플로우 (첫 실행 때 컴파일)"""
+        return self._build_graph()
     
     def _build_graph(self):
+        from langgraph.graph import StateGraph, END
+        
         workflow = StateGraph(AgentState)
         
-        workflow.add_node("design_engineer", design_engineer_agent.execute)
-        workflow.add_node("project_manager", pm_agent.execute)
-        workflow.add_node("risk_manager", risk_manager_agent.execute)
-        workflow.add_node("regulatory_affairs", ra_agent.execute)
-        workflow.add_node("verification", verification_agent.execute)
-        workflow.add_node("quality_assurance", qa_agent.execute)
+        workflow.add_node("design_engineer", design_engineer_agent.run)
+        workflow.add_node("project_manager", pm_agent.run)
+        workflow.add_node("risk_manager", risk_manager_agent.run)
+        workflow.add_node("regulatory_affairs", ra_agent.run)
+        workflow.add_node("verification", verification_agent.run)
+        workflow.add_node("quality_assurance", qa_agent.run)
         
         workflow.set_entry_point("design_engineer")
         
@@ -33,25 +48,22 @@ class QMSOrchestrator:
         
         return workflow.compile()
     
-    async def run(self, initial_state: AgentState) -> AgentState:
-        result = await self.graph.ainvoke(initial_state)
+    async def run(self, initial_state: AgentState, profile: bool = False) -> AgentState:
+        """전체 에이전트 실행 (``profile`` 이면 이 실행만 프로파일링해 records/profiles 에 저장)"""
+        change_id = initial_state.get("change_id")
+        async with profile_block(f"orchestrator-change-{change_id}", enabled=profile):
+            with start_span("orchestrator.run", change_id=change_id, user_role=initial_state.get("user_role")):
+                result = await self.graph.ainvoke(initial_state)
         return result
     
     async def run_single_agent(self, agent_type: str, initial_state: AgentState) -> AgentState:
-        agents = {
-            "design_engineer": design_engineer_agent,
-            "project_manager": pm_agent,
-            "risk_manager": risk_manager_agent,
-            "regulatory_affairs": ra_agent,
-            "verification": verification_agent,
-            "quality_assurance": qa_agent
-        }
-        
-        agent = agents.get(agent_type)
+        agent = self.agents.get(agent_type)
         if not agent:
             raise ValueError(f"Unknown agent type: {agent_type}")
         
-        result = await agent.execute(initial_state)
+        with start_span("orchestrator.run_single_agent", agent=agent_type,
+                        change_id=initial_state.get("change_id")):
+            result = await agent.run(initial_state)
         return result
 
 
@@ -2,12 +2,15 @@ from typing import Dict, Any, Optional
 import json
 import logging
 from app.agents.base_agent import BaseAgent, AgentState
-from app.services.vector_db_service import vector_db_service
+from app.services.knowledge_base import SOP
 
 logger = logging.getLogger(__name__)
 
 
 class ProjectManagerAgent(BaseAgent):
+    SOP_SEARCH = ((SOP,), "프로젝트 관리 일정 리소스", 3)
+    warm_up_searches = (SOP_SEARCH,)
+    
     def __init__(self):
         super().__init__("project_manager")
     
@@ -59,18 +62,14 @@ class ProjectManagerAgent(BaseAgent):
     async def assess_project_impact(self, change_data: Dict[str, Any]) -> Dict[str, Any]:
         project_info = f"프로젝트 코드: {change_data.get('project_code', 'N/A')}"
         
-        sop_results = vector_db_service.search(
-            collection_name="qms_knowledge_base",
-            query="프로젝트 관리 일정 리소스",
-            n_results=3
-        )
+        sop_results = self._search(*self.SOP_SEARCH, project_id=change_data.get('project_id'))
         
         project_context = project_info + "\n\n[SOP 참조]\n"
         if sop_results.get('documents'):
             project_context += "\n".join(sop_results['documents'][0])
         
         prompt = self.create_prompt(change_data, project_context)
-        response = await self.llm.ainvoke(prompt)
+        response = await self._invoke_llm(prompt)
         
         try:
             content = response.content
@@ -105,6 +104,7 @@ class ProjectManagerAgent(BaseAgent):
                 'title': design_change.title,
                 'description': design_change.description,
                 'change_type': design_change.change_type,
+                'project_id': design_change.project_id,
                 'project_code': project.project_code if project else 'N/A'
             }
             
@@ -2,7 +2,7 @@ from typing import Dict, Any, Optional
 import json
 import logging
 from app.agents.base_agent import BaseAgent, AgentState
-from app.services.vector_db_service import vector_db_service
+from app.services.knowledge_base import SOP
 
 logger = logging.getLogger(__name__)
 
@@ -54,16 +54,17 @@ class QualityAssuranceAgent(BaseAgent):
 반드시 JSON 형식으로만 응답하세요."""
     
     async def review_test_results(self, change_data: Dict[str, Any], test_results: Dict[str, Any]) -> Dict[str, Any]:
-        quality_criteria_results = vector_db_service.search(
-            collection_name="qms_knowledge_base",
-            query=f"검증 합격 기준 {change_data.get('change_type', '')}",
-            n_results=5
+        quality_criteria_results = self._search(
+            (SOP,),
+            f"검증 합격 기준 {change_data.get('change_type', '')}",
+            n_results=5,
+            project_id=change_data.get('project_id')
         )
         
         quality_criteria = "\n".join(quality_criteria_results.get('documents', [[]])[0])
         
         prompt = self.create_prompt(change_data, test_results, quality_criteria)
-        response = await self.llm.ainvoke(prompt)
+        response = await self._invoke_llm(prompt)
         
         try:
             content = response.content
@@ -95,7 +96,8 @@ class QualityAssuranceAgent(BaseAgent):
             change_data = {
                 'title': design_change.title,
                 'description': design_change.description,
-                'change_type': design_change.change_type
+                'change_type': design_change.change_type,
+                'project_id': design_change.project_id
             }
             
             previous_results = state.get('analysis_results', {})
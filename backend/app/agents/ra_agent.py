@@ -2,7 +2,7 @@ from typing import Dict, Any, Optional
 import json
 import logging
 from app.agents.base_agent import BaseAgent, AgentState
-from app.services.vector_db_service import vector_db_service
+from app.services.knowledge_base import REGULATORY
 
 logger = logging.getLogger(__name__)
 
@@ -50,23 +50,25 @@ class RegulatoryAffairsAgent(BaseAgent):
     async def review_compliance(self, change_data: Dict[str, Any]) -> Dict[str, Any]:
         description = change_data.get('description', '')
         
-        iso_results = vector_db_service.search(
-            collection_name="qms_knowledge_base",
-            query=f"ISO 13485 {description}",
-            n_results=5
+        iso_results = self._search(
+            (REGULATORY,),
+            f"ISO 13485 {description}",
+            n_results=5,
+            project_id=change_data.get('project_id')
         )
         
-        mfds_results = vector_db_service.search(
-            collection_name="qms_knowledge_base",
-            query=f"MFDS 의료기기 {description}",
-            n_results=5
+        mfds_results = self._search(
+            (REGULATORY,),
+            f"MFDS 의료기기 {description}",
+            n_results=5,
+            project_id=change_data.get('project_id')
         )
         
         regulations = "ISO 13485:\n" + "\n".join(iso_results.get('documents', [[]])[0])
         regulations += "\n\nMFDS:\n" + "\n".join(mfds_results.get('documents', [[]])[0])
         
         prompt = self.create_prompt(change_data, regulations)
-        response = await self.llm.ainvoke(prompt)
+        response = await self._invoke_llm(prompt)
         
         try:
             content = response.content
@@ -101,6 +103,7 @@ class RegulatoryAffairsAgent(BaseAgent):
                 'title': design_change.title,
                 'description': design_change.description,
                 'change_type': design_change.change_type,
+                'project_id': design_change.project_id,
                 'product_type': project.product_type if project else 'N/A'
             }
             
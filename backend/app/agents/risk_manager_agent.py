@@ -2,13 +2,18 @@ from typing import Dict, Any, List, Optional
 import json
 import logging
 from app.agents.base_agent import BaseAgent, AgentState
-from app.services.vector_db_service import vector_db_service
+from app.services.knowledge_base import REGULATORY, RISK
 from app.services.gdrive_service import gdrive_service
+from app.services.gdrive_pool import drive_client_pool
 
 logger = logging.getLogger(__name__)
 
 
 class RiskManagerAgent(BaseAgent):
+    ISO_14971_SEARCH = ((RISK, REGULATORY), "ISO 14971 위험 재평가", 3)
+    IEC_62366_SEARCH = ((RISK, REGULATORY), "IEC 62366 사용 오류 위험", 3)
+    warm_up_searches = (ISO_14971_SEARCH, IEC_62366_SEARCH)
+    
     def __init__(self):
         super().__init__("risk_manager")
     
@@ -90,19 +95,16 @@ class RiskManagerAgent(BaseAgent):
     async def reassess_existing_risks(
         self,
         existing_risks: List[Dict[str, Any]],
-        change_description: str
+        change_description: str,
+        project_id: Optional[int] = None
     ) -> Dict[str, Any]:
-        iso_results = vector_db_service.search(
-            collection_name="qms_knowledge_base",
-            query="ISO 14971 위험 재평가",
-            n_results=3
-        )
+        iso_results = self._search(*self.ISO_14971_SEARCH, project_id=project_id)
         
         iso_guidance = "\n".join(iso_results.get('documents', [[]])[0]) if iso_results.get('documents') else ""
         risk_data = str(existing_risks)
         
         prompt = self.create_prompt_reassess(risk_data, change_description, iso_guidance)
-        response = await self.llm.ainvoke(prompt)
+        response = await self._invoke_llm(prompt)
         
         try:
             content = response.content
@@ -116,17 +118,14 @@ class RiskManagerAgent(BaseAgent):
         
         return result
     
-    async def identify_new_risks(self, change_description: str) -> Dict[str, Any]:
-        usability_results = vector_db_service.search(
-            collection_name="qms_knowledge_base",
-            query="IEC 62366 사용 오류 위험",
-            n_results=3
-        )
+    async def identify_new_risks(self, change_description: str,
+                                 project_id: Optional[int] = None) -> Dict[str, Any]:
+        usability_results = self._search(*self.IEC_62366_SEARCH, project_id=project_id)
         
         usability_guidance = "\n".join(usability_results.get('documents', [[]])[0]) if usability_results.get('documents') else ""
         
         prompt = self.create_prompt_identify(change_description, usability_guidance)
-        response = await self.llm.ainvoke(prompt)
+        response = await self._invoke_llm(prompt)
         
         try:
             content = response.content
@@ -143,7 +142,7 @@ class RiskManagerAgent(BaseAgent):
     async def update_risk_excel(self, risk_file_id: str, updates: List[Dict[str, Any]]) -> bool:
         try:
             import pandas as pd
-            df = gdrive_service.read_excel_file(risk_file_id)
+            df = await drive_client_pool.run(gdrive_service.read_excel_file, risk_file_id)
             
             for update in updates:
                 risk_number = update.get('risk_number')
@@ -193,10 +192,14 @@ class RiskManagerAgent(BaseAgent):
             
             reassess_result = await self.reassess_existing_risks(
                 existing_risks,
-                design_change.description
+                design_change.description,
+                project_id=design_change.project_id
             )
             
-            new_risks_result = await self.identify_new_risks(design_change.description)
+            new_risks_result = await self.identify_new_risks(
+                design_change.description,
+                project_id=design_change.project_id
+            )
             
             state['messages'].append(f"[{self.agent_type}] 위험 관리 완료")
             state['analysis_results']['risk_manager'] = {
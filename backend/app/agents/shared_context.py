@@ -0,0 +1,72 @@
+"""여러 설계 변경을 한 번에 분석할 때 공유하는 조회 결과
+
+일괄 분석은 대상 설계 변경(프로젝트 포함)과 프로젝트별 위험 대장을 한 번에 읽어 두고, 같은 질의의
+지식베이스 검색(정적인 SOP/표준 검색, 같은 변경 유형의 검색)은 한 번만 수행합니다.
+LLM 호출은 ``llm_semaphore`` 로 동시 실행 수를 제한합니다. ``BaseAgent`` 의 조회 메서드가 이 컨텍스트를 먼저 확인합니다.
+"""
+import asyncio
+import json
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+from sqlalchemy.orm import Session, joinedload
+
+from app.db.models import DesignChange, RiskItem
+
+
+@dataclass
+class SharedAnalysisContext:
+    changes: Dict[int, DesignChange] = field(default_factory=dict)
+    risks_by_project: Dict[int, List[RiskItem]] = field(default_factory=dict)
+    searches: Dict[str, Dict] = field(default_factory=dict)
+    llm_semaphore: Optional[asyncio.Semaphore] = None
+    search_hits: int = 0
+
+    @classmethod
+    def preload(cls, db: Session, change_ids: Iterable[int], llm_concurrency: int) -> "SharedAnalysisContext":
+        """설계 변경/프로젝트/위험 대장을 쿼리 두 번으로 읽고 세션에서 분리 (이후 커밋에 만료되지 않도록)"""
+        changes = (
+            db.query(DesignChange)
+            .options(joinedload(DesignChange.project))
+            .filter(DesignChange.id.in_(list(change_ids)))
+            .all()
+        )
+        project_ids = {c.project_id for c in changes if c.project_id}
+        risks_by_project: Dict[int, List[RiskItem]] = {project_id: [] for project_id in project_ids}
+        if project_ids:
+            for risk in db.query(RiskItem).filter(RiskItem.project_id.in_(project_ids)).order_by(RiskItem.id):
+                risks_by_project[risk.project_id].append(risk)
+        for change in changes:
+            db.expunge(change)
+            if change.project is not None and change.project in db:
+                db.expunge(change.project)
+        for risks in risks_by_project.values():
+            for risk in risks:
+                db.expunge(risk)
+        return cls(
+            changes={c.id: c for c in changes},
+            risks_by_project=risks_by_project,
+            llm_semaphore=asyncio.Semaphore(llm_concurrency),
+        )
+
+    @staticmethod
+    def search_key(categories: Sequence[str], query: str, n_results: int, project_id: Optional[int]) -> str:
+        return json.dumps([list(categories), query, n_results, project_id], ensure_ascii=False)
+
+
+_current_shared: ContextVar[Optional[SharedAnalysisContext]] = ContextVar("shared_analysis_context", default=None)
+
+
+def current_shared() -> Optional[SharedAnalysisContext]:
+    return _current_shared.get()
+
+
+@contextmanager
+def sharing(context: SharedAnalysisContext) -> Iterator[SharedAnalysisContext]:
+    token = _current_shared.set(context)
+    try:
+        yield context
+    finally:
+        _current_shared.reset(token)
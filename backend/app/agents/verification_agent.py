@@ -2,7 +2,7 @@ from typing import Dict, Any, List, Optional
 import json
 import logging
 from app.agents.base_agent import BaseAgent, AgentState
-from app.services.vector_db_service import vector_db_service
+from app.services.knowledge_base import SOP, TEMPLATES
 
 logger = logging.getLogger(__name__)
 
@@ -103,16 +103,17 @@ class VerificationValidationAgent(BaseAgent):
 반드시 JSON 형식으로만 응답하세요."""
     
     async def generate_verification_plan(self, change_data: Dict[str, Any]) -> Dict[str, Any]:
-        sop_results = vector_db_service.search(
-            collection_name="qms_knowledge_base",
-            query=f"설계 검증 테스트 계획 {change_data.get('change_type', '')}",
-            n_results=5
+        sop_results = self._search(
+            (SOP, TEMPLATES),
+            f"설계 검증 테스트 계획 {change_data.get('change_type', '')}",
+            n_results=5,
+            project_id=change_data.get('project_id')
         )
         
         sop_guidance = "\n".join(sop_results.get('documents', [[]])[0]) if sop_results.get('documents') else ""
         
         prompt = self.create_verification_plan_prompt(change_data, sop_guidance)
-        response = await self.llm.ainvoke(prompt)
+        response = await self._invoke_llm(prompt)
         
         try:
             content = response.content
@@ -129,18 +130,20 @@ class VerificationValidationAgent(BaseAgent):
     async def generate_checklist(
         self,
         change_type: str,
-        iec_62304_class: str = "B"
+        iec_62304_class: str = "B",
+        project_id: Optional[int] = None
     ) -> Dict[str, Any]:
-        sop_results = vector_db_service.search(
-            collection_name="qms_knowledge_base",
-            query=f"검증 체크리스트 IEC 62304 Class {iec_62304_class}",
-            n_results=5
+        sop_results = self._search(
+            (TEMPLATES, SOP),
+            f"검증 체크리스트 IEC 62304 Class {iec_62304_class}",
+            n_results=5,
+            project_id=project_id
         )
         
         sop_guidance = "\n".join(sop_results.get('documents', [[]])[0]) if sop_results.get('documents') else ""
         
         prompt = self.create_checklist_prompt(change_type, iec_62304_class, sop_guidance)
-        response = await self.llm.ainvoke(prompt)
+        response = await self._invoke_llm(prompt)
         
         try:
             content = response.content
@@ -187,7 +190,7 @@ class VerificationValidationAgent(BaseAgent):
 
 반드시 JSON 형식으로만 응답하세요."""
         
-        response = await self.llm.ainvoke(prompt)
+        response = await self._invoke_llm(prompt)
         
         try:
             content = response.content
@@ -221,7 +224,8 @@ class VerificationValidationAgent(BaseAgent):
             change_data = {
                 'title': design_change.title,
                 'description': design_change.description,
-                'change_type': design_change.change_type
+                'change_type': design_change.change_type,
+                'project_id': design_change.project_id
             }
             
             verification_result = await self.generate_verification_plan(change_data)
@@ -229,7 +233,8 @@ class VerificationValidationAgent(BaseAgent):
             iec_class = project.iec_62304_class if project else "B"
             checklist_result = await self.generate_checklist(
                 design_change.change_type or "일반",
-                iec_class
+                iec_class,
+                project_id=design_change.project_id
             )
             
             state['messages'].append(f"[{self.agent_type}] 검증 계획 수립 완료")
@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1 import auth, design_changes, agents, documents
+from app.api.v1 import auth, design_changes, agents, documents, traceability, vector_store
 
 api_router = APIRouter()
 
@@ -7,3 +7,5 @@ api_router.include_router(auth.router, prefix="/auth", tags=["authentication"])
 api_router.include_router(design_changes.router, prefix="/design-changes", tags=["design-changes"])
 api_router.include_router(agents.router, prefix="/agents", tags=["agents"])
 api_router.include_router(documents.router, prefix="/documents", tags=["documents"])
+api_router.include_router(traceability.router, prefix="/traceability", tags=["traceability"])
+api_router.include_router(vector_store.router, prefix="/vector-store", tags=["vector-store"])
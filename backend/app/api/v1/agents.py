@@ -1,18 +1,57 @@
-from typing import List
+import json
+from typing import Any, Awaitable, Callable, Dict, List
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from app.db.base import get_db
 from app.db.models import DesignChange, User, AgentAnalysis
-from app.models.schemas import AgentAnalysisRequest, AgentAnalysisResponse, GeminiModelResponse
+from app.models.schemas import (
+    AgentAnalysisRequest,
+    AgentAnalysisResponse,
+    BatchAnalysisRequest,
+    GeminiModelResponse,
+    WorkflowAnalysisRequest,
+    WorkflowAnalysisResponse
+)
 from app.utils.auth import get_current_active_user
+from app.agents.analysis_history import (
+    DeltaAnalysisRun,
+    latest_analysis,
+    recorder_for,
+    recording,
+    save_analysis
+)
+from app.agents.base_agent import BaseAgent
+from app.agents.batch_analysis import BatchAnalysisRunner
 from app.agents.design_engineer_agent import design_engineer_agent
+from app.agents.orchestrator import orchestrator
 from app.agents.ra_agent import ra_agent
 from app.agents.qa_agent import qa_agent
+from app.core.config import settings
 from app.services.gemini_service import gemini_service
 
 router = APIRouter()
 
 
+async def _record_analysis(
+    db: Session,
+    change_id: int,
+    agent: BaseAgent,
+    analysis_type: str,
+    analyze: Callable[[], Awaitable[Dict[str, Any]]]
+) -> AgentAnalysis:
+    """직전 같은 종류 분석의 응답을 재사용하며 실행하고, 입력이 바뀐 경우에만 새 이력 추가"""
+    previous = latest_analysis(db, change_id, agent.agent_type, analysis_type)
+    with recording(recorder_for(agent, previous)) as recorder:
+        result = await analyze()
+    analysis = save_analysis(db, change_id, analysis_type, recorder, result, previous)
+    db.commit()
+    reused = analysis.reused
+    db.refresh(analysis)
+    analysis.reused = reused
+    return analysis
+
+
 @router.get("/models", response_model=List[GeminiModelResponse])
 async def list_models(
     current_user: User = Depends(get_current_active_user)
@@ -42,19 +81,10 @@ async def analyze_impact(
     if request.model_name:
         design_engineer_agent._init_llm(model_name=request.model_name)
     
-    result = await design_engineer_agent.analyze_impact(change_data)
-    
-    analysis = AgentAnalysis(
-        change_id=request.change_id,
-        agent_type="design_engineer",
-        analysis_type="impact",
-        findings=result
+    return await _record_analysis(
+        db, change.id, design_engineer_agent, "impact",
+        lambda: design_engineer_agent.analyze_impact(change_data)
     )
-    db.add(analysis)
-    db.commit()
-    db.refresh(analysis)
-    
-    return analysis
 
 
 @router.post("/analyze/risk", response_model=AgentAnalysisResponse)
@@ -79,19 +109,10 @@ async def analyze_risk(
     if request.model_name:
         design_engineer_agent._init_llm(model_name=request.model_name)
         
-    result = await design_engineer_agent.analyze_risks(change_data, risk_file_id)
-    
-    analysis = AgentAnalysis(
-        change_id=request.change_id,
-        agent_type="design_engineer",
-        analysis_type="risk",
-        findings=result
+    return await _record_analysis(
+        db, change.id, design_engineer_agent, "risk",
+        lambda: design_engineer_agent.analyze_risks(change_data, risk_file_id)
     )
-    db.add(analysis)
-    db.commit()
-    db.refresh(analysis)
-    
-    return analysis
 
 
 @router.post("/analyze/regulatory", response_model=AgentAnalysisResponse)
@@ -111,19 +132,10 @@ async def analyze_regulatory(
         "product_type": change.project.product_type if change.project else None
     }
     
-    result = await ra_agent.review_compliance(change_data)
-    
-    analysis = AgentAnalysis(
-        change_id=request.change_id,
-        agent_type="regulatory_affairs",
-        analysis_type="regulation",
-        findings=result
+    return await _record_analysis(
+        db, change.id, ra_agent, "regulation",
+        lambda: ra_agent.review_compliance(change_data)
     )
-    db.add(analysis)
-    db.commit()
-    db.refresh(analysis)
-    
-    return analysis
 
 
 @router.post("/analyze/qa", response_model=AgentAnalysisResponse)
@@ -143,16 +155,78 @@ async def analyze_qa(
         "change_type": change.change_type
     }
     
-    result = await qa_agent.review_test_results(change_data, test_results)
-    
-    analysis = AgentAnalysis(
-        change_id=request.change_id,
-        agent_type="quality_assurance",
-        analysis_type="test",
-        findings=result
+    return await _record_analysis(
+        db, change.id, qa_agent, "test",
+        lambda: qa_agent.review_test_results(change_data, test_results)
     )
-    db.add(analysis)
-    db.commit()
-    db.refresh(analysis)
+
+
+@router.post("/analyze/workflow", response_model=WorkflowAnalysisResponse)
+async def analyze_workflow(
+    request: WorkflowAnalysisRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """6개 에이전트 전체 분석. 직전 분석과 입력이 같은 LLM 호출은 재사용하고 바뀐 부분만 다시 계산"""
+    change = db.query(DesignChange).filter(DesignChange.id == request.change_id).first()
+    if not change:
+        raise HTTPException(status_code=404, detail="Design change not found")
     
-    return analysis
+    if request.model_name:
+        for agent in orchestrator.agents.values():
+            agent._init_llm(model_name=request.model_name)
+    
+    delta_run = DeltaAnalysisRun(db, change.id)
+    with delta_run.activate():
+        await orchestrator.run({
+            "messages": [],
+            "change_id": change.id,
+            "user_role": current_user.role,
+            "current_step": "start",
+            "analysis_results": {},
+            "next_agent": "design_engineer"
+        })
+    analyses = delta_run.save()
+    
+    return {
+        "change_id": change.id,
+        "recomputed": [a.agent_type for a in analyses if not a.reused],
+        "reused": [a.agent_type for a in analyses if a.reused],
+        "llm_calls": delta_run.llm_calls,
+        "llm_calls_reused": delta_run.llm_calls_reused,
+        "analyses": analyses
+    }
+
+
+@router.post("/analyze/batch")
+async def analyze_batch(
+    request: BatchAnalysisRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """여러 설계 변경 일괄 분석. 변경별 결과를 완료되는 대로 NDJSON 한 줄씩 내보내고 마지막 줄은 요약"""
+    if not request.change_ids:
+        raise HTTPException(status_code=400, detail="change_ids must not be empty")
+    if len(request.change_ids) > settings.BATCH_ANALYSIS_MAX_CHANGES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.BATCH_ANALYSIS_MAX_CHANGES} design changes per batch"
+        )
+    try:
+        runner = BatchAnalysisRunner(db, request.change_ids, request.agent_types, user_role=current_user.role)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if request.model_name:
+        for name in runner.agent_types:
+            orchestrator.agents[name]._init_llm(model_name=request.model_name)
+    
+    async def events():
+        # 의존성 종료(세션 close) 뒤에 실행되지만 닫힌 세션도 다시 사용할 수 있으므로 끝나면 직접 닫음
+        try:
+            async for event in runner.stream():
+                yield json.dumps(event, ensure_ascii=False, default=str) + "\n"
+        finally:
+            db.close()
+    
+    return StreamingResponse(events(), media_type="application/x-ndjson")
@@ -3,20 +3,22 @@ from fastapi.security import OAuth2PasswordRequestForm
 from fastapi.responses import RedirectResponse
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 import logging
 
-from google_auth_oauthlib.flow import Flow
 from google.oauth2 import id_token
 from google.oauth2.credentials import Credentials
-from google.auth.transport import requests as google_requests
 
 from app.db.base import get_db
 from app.db.models import User
+from app.services.google_credentials import google_credential_manager
 from app.models.schemas import Token, UserCreate, UserResponse, GoogleLoginResponse
 from app.utils.auth import verify_password, get_password_hash, create_access_token, get_current_active_user
 from app.core.config import settings
 
+if TYPE_CHECKING:
+    from google_auth_oauthlib.flow import Flow
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
@@ -41,8 +43,9 @@ def _get_google_client_config() -> dict:
     }
 
 
-def _create_google_flow() -> Flow:
+def _create_google_flow() -> "Flow":
     """Google OAuth Flow 객체를 생성합니다."""
+    from google_auth_oauthlib.flow import Flow
     client_config = _get_google_client_config()
     
     flow = Flow.from_client_config(
@@ -180,7 +183,7 @@ def login(
     
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.username}, expires_delta=access_token_expires
+        data={"sub": user.username, "role": user.role}, expires_delta=access_token_expires
     )
     return {"access_token": access_token, "token_type": "bearer"}
 
@@ -260,6 +263,7 @@ async def google_callback(
                 detail="Google에서 ID 토큰을 받지 못했습니다."
             )
         
+        from google.auth.transport import requests as google_requests
         request = google_requests.Request()
         
         try:
@@ -311,10 +315,12 @@ async def google_callback(
             access_token=credentials.token,
             token_expiry=token_expiry
         )
+        # 새로 받은 토큰이 캐시된 이전 인증 정보보다 우선
+        google_credential_manager.invalidate(user.id)
         
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = create_access_token(
-            data={"sub": user.username, "google_id": google_id},
+            data={"sub": user.username, "google_id": google_id, "role": user.role},
             expires_delta=access_token_expires
         )
         
@@ -360,6 +366,7 @@ async def refresh_google_token(
             scopes=settings.GOOGLE_OAUTH_SCOPES
         )
         
+        from google.auth.transport import requests as google_requests
         request = google_requests.Request()
         credentials.refresh(request)
         
@@ -372,7 +379,7 @@ async def refresh_google_token(
         
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = create_access_token(
-            data={"sub": current_user.username, "google_id": current_user.google_id},
+            data={"sub": current_user.username, "google_id": current_user.google_id, "role": current_user.role},
             expires_delta=access_token_expires
         )
         
@@ -400,25 +407,7 @@ def get_user_google_credentials(user: User) -> Optional[Credentials]:
     사용자의 Google Credentials 객체를 반환합니다.
     
     Google Drive API 등을 사용할 때 이 함수를 호출하여 credentials를 얻습니다.
+    인증 정보는 사용자별로 캐시되며, 만료가 가까우면 갱신 후 User 행에 저장합니다
+    (네트워크 호출이 있을 수 있으므로 비동기 경로에서는 스레드 풀에서 호출).
     """
-    if not user.google_refresh_token:
-        return None
-    
-    credentials = Credentials(
-        token=user.google_access_token,
-        refresh_token=user.google_refresh_token,
-        token_uri="https://oauth2.googleapis.com/token",
-        client_id=settings.GOOGLE_CLIENT_ID,
-        client_secret=settings.GOOGLE_CLIENT_SECRET,
-        scopes=settings.GOOGLE_OAUTH_SCOPES
-    )
-    
-    if credentials.expired and credentials.refresh_token:
-        try:
-            request = google_requests.Request()
-            credentials.refresh(request)
-        except Exception as e:
-            logger.error(f"Google credentials 갱신 실패: {str(e)}")
-            return None
-    
-    return credentials
+    return google_credential_manager.get(user)
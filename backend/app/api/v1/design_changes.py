@@ -7,9 +7,12 @@ from app.models.schemas import (
     DesignChangeCreate,
     DesignChangeResponse,
     DesignChangeUpdate,
-    WorkflowTransition
+    WorkflowTransition,
+    BulkWorkflowTransition,
+    BulkTransitionResponse
 )
 from app.utils.auth import get_current_active_user
+from app.services.workflow_engine import InvalidTransition, UnknownAction, workflow_engine
 
 router = APIRouter()
 
@@ -35,6 +38,7 @@ def create_design_change(
         figma_link=change.figma_link,
         gdocs_link=change.gdocs_link,
         created_by=current_user.id,
+        current_assignee=current_user.id,
         workflow_status="draft"
     )
     db.add(db_change)
@@ -43,6 +47,50 @@ def create_design_change(
     return db_change
 
 
+@router.get("/inbox", response_model=List[DesignChangeResponse])
+def get_inbox(
+    workflow_status: Optional[str] = None,
+    project_id: Optional[int] = None,
+    assignee_id: Optional[int] = None,
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """담당자 대기함 (기본은 현재 사용자, 상태 미지정 시 승인 완료 외 전체)"""
+    query = workflow_engine.inbox_query(
+        db,
+        assignee_id=assignee_id or current_user.id,
+        status=workflow_status,
+        project_id=project_id
+    )
+    return query.offset(skip).limit(limit).all()
+
+
+@router.post("/transitions/bulk", response_model=BulkTransitionResponse)
+def bulk_transition_workflow(
+    transition: BulkWorkflowTransition,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """여러 설계 변경에 같은 액션을 한 트랜잭션으로 적용 (atomic 이면 하나라도 불가할 때 409)"""
+    try:
+        result = workflow_engine.bulk_transition(
+            db,
+            transition.change_ids,
+            transition.action,
+            current_user,
+            comments=transition.comments,
+            atomic=transition.atomic
+        )
+    except UnknownAction as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if result.failed and transition.atomic:
+        raise HTTPException(status_code=409, detail={"action": transition.action, "failed": result.failed})
+    return {"action": transition.action, "applied": result.applied, "failed": result.failed}
+
+
 @router.get("/{change_id}", response_model=DesignChangeResponse)
 def get_design_change(
     change_id: int,
@@ -60,12 +108,15 @@ def list_design_changes(
     skip: int = 0,
     limit: int = 100,
     project_id: Optional[int] = None,
+    workflow_status: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
     query = db.query(DesignChange)
     if project_id:
         query = query.filter(DesignChange.project_id == project_id)
+    if workflow_status:
+        query = query.filter(DesignChange.workflow_status == workflow_status)
     changes = query.offset(skip).limit(limit).all()
     return changes
 
@@ -82,6 +133,9 @@ def update_design_change(
         raise HTTPException(status_code=404, detail="Design change not found")
     
     update_data = change_update.dict(exclude_unset=True)
+    # 상태 변경은 전이 검증과 이력을 거치도록 transition 으로만 허용
+    if update_data.pop("workflow_status", db_change.workflow_status) != db_change.workflow_status:
+        raise HTTPException(status_code=409, detail="Use the transition endpoint to change workflow status")
     for field, value in update_data.items():
         setattr(db_change, field, value)
     
@@ -101,31 +155,11 @@ def transition_workflow(
     if not db_change:
         raise HTTPException(status_code=404, detail="Design change not found")
     
-    workflow_transitions = {
-        "submit_for_ra": "ra_review",
-        "ra_approve": "implementation",
-        "submit_for_qa": "qa_review",
-        "qa_approve": "quality_head_approval",
-        "approve": "approved",
-        "reject": "rejected"
-    }
-    
-    new_status = workflow_transitions.get(transition.action)
-    if not new_status:
-        raise HTTPException(status_code=400, detail="Invalid transition action")
-    
-    from app.db.models import WorkflowHistory
-    history = WorkflowHistory(
-        change_id=change_id,
-        from_status=db_change.workflow_status,
-        to_status=new_status,
-        action=transition.action,
-        comments=transition.comments,
-        performed_by=current_user.id
-    )
-    db.add(history)
-    
-    db_change.workflow_status = new_status  # type: ignore
-    db.commit()
-    db.refresh(db_change)
-    return db_change
+    try:
+        return workflow_engine.transition(
+            db, db_change, transition.action, current_user, comments=transition.comments
+        )
+    except UnknownAction as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except InvalidTransition as e:
+        raise HTTPException(status_code=409, detail=str(e))
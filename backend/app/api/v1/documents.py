@@ -1,10 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query
+import mimetypes
+from email.utils import formatdate
+from pathlib import Path
+from urllib.parse import quote
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
 from app.db.models import User
 from app.utils.auth import get_current_active_user
-from app.services.document_manager import document_manager, StorageType
+from app.services.document_manager import document_manager, DocumentManager, StorageType
 from app.services.local_storage_service import local_storage_service
-from app.services.gdrive_service import gdrive_service
+from app.services.gdrive_pool import drive_client_pool
+from app.services.folder_sync import SyncDirection, ConflictPolicy
+from app.api.v1.auth import get_user_google_credentials
+from app.utils.file_streaming import RangeNotSatisfiable, parse_range, etag_matches, iter_file
 from pydantic import BaseModel
 from datetime import datetime
 
@@ -12,6 +21,22 @@ from datetime import datetime
 router = APIRouter()
 
 
+async def _manager_for(storage_type: StorageType, user: User) -> DocumentManager:
+    """요청 사용자의 Drive 클라이언트를 쓰는 문서 관리자 (Google 연동이 없으면 서비스 계정)"""
+    if storage_type != StorageType.GDRIVE:
+        return document_manager
+    credentials = await run_in_threadpool(get_user_google_credentials, user)
+    client = drive_client_pool.client_for(credentials, key=f"user:{user.id}")
+    return document_manager.with_gdrive(client)
+
+
+async def _run(storage_type: StorageType, func, *args, **kwargs):
+    """블로킹 저장소 호출을 이벤트 루프 밖에서 실행 (Drive 는 동시 실행 수 제한)"""
+    if storage_type == StorageType.GDRIVE:
+        return await drive_client_pool.run(func, *args, **kwargs)
+    return await run_in_threadpool(func, *args, **kwargs)
+
+
 class FileInfo(BaseModel):
     name: str
     path: Optional[str] = None
@@ -19,6 +44,7 @@ class FileInfo(BaseModel):
     modified_at: Optional[str] = None
     extension: Optional[str] = None
     category: Optional[str] = None
+    sha256: Optional[str] = None
     storage: str
 
 
@@ -39,14 +65,42 @@ class DocumentResponse(BaseModel):
 
 @router.get("/files", response_model=List[FileInfo])
 async def list_files(
+    response: Response,
     storage: str = Query("local", enum=["local", "gdrive"]),
     category: str = Query("", description="로컬 저장소 카테고리 (sop, documents, records 등)"),
     folder_id: Optional[str] = Query(None, description="Google Drive 폴더 ID"),
+    extension: Optional[str] = Query(None, description="로컬 전용: 파일 확장자 필터 (예: json, xlsx)"),
+    limit: Optional[int] = Query(None, ge=1, description="로컬 전용: 페이지 크기 (미지정 시 전체)"),
+    offset: int = Query(0, ge=0, description="로컬 전용: 목록 시작 위치"),
     current_user: User = Depends(get_current_active_user)
 ):
-    """파일 목록 조회 (로컬 또는 Google Drive)"""
+    """파일 목록 조회 (로컬 또는 Google Drive)
+
+    로컬 목록은 최신순이며 전체 개수를 ``X-Total-Count`` 헤더로 반환합니다.
+    ``extension`` / ``limit`` / ``offset`` 은 로컬 저장소에만 적용됩니다.
+    """
     storage_type = StorageType(storage)
-    files = document_manager.list_documents(storage=storage_type, category=category, folder_id=folder_id)
+    if storage_type == StorageType.GDRIVE and (extension or limit is not None or offset):
+        raise HTTPException(
+            status_code=400,
+            detail="extension, limit and offset are only supported for local storage"
+        )
+    manager = await _manager_for(storage_type, current_user)
+    files = await _run(
+        storage_type,
+        manager.list_documents,
+        storage=storage_type,
+        category=category,
+        folder_id=folder_id,
+        extension=extension,
+        limit=limit,
+        offset=offset
+    )
+    
+    if storage_type == StorageType.LOCAL:
+        response.headers["X-Total-Count"] = str(
+            local_storage_service.count_files(category=category, extension=extension)
+        )
     
     return [
         FileInfo(
@@ -56,6 +110,7 @@ async def list_files(
             modified_at=f.get("modified_at") or f.get("modifiedTime"),
             extension=f.get("extension"),
             category=f.get("category"),
+            sha256=f.get("sha256"),
             storage=storage
         )
         for f in files
@@ -70,8 +125,9 @@ async def get_file_content(
 ):
     """파일 내용 읽기"""
     storage_type = StorageType(storage)
+    manager = await _manager_for(storage_type, current_user)
     try:
-        content = document_manager.read_document(path_or_id, storage=storage_type)
+        content = await _run(storage_type, manager.read_document, path_or_id, storage=storage_type)
         return {"content": content, "path_or_id": path_or_id, "storage": storage}
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="File not found")
@@ -79,6 +135,78 @@ async def get_file_content(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/files/download")
+async def download_file(
+    request: Request,
+    path: str = Query(..., description="로컬 저장소 기준 파일 경로"),
+    current_user: User = Depends(get_current_active_user)
+):
+    """로컬 파일 스트리밍 다운로드 (Range / ETag / If-None-Match 지원)"""
+    try:
+        handle, stat, etag = await run_in_threadpool(local_storage_service.open_file, path)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid path")
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="File not found")
+
+    size = stat.st_size
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Last-Modified": formatdate(stat.st_mtime, usegmt=True),
+    }
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        handle.close()
+        return Response(status_code=304, headers=headers)
+
+    media_type = mimetypes.guess_type(handle.name)[0] or "application/octet-stream"
+    headers["Content-Disposition"] = f"attachment; filename*=UTF-8''{quote(Path(handle.name).name)}"
+
+    # If-Range 가 현재 ETag 와 다르면 범위 요청을 무시하고 전체를 보냄
+    if_range = request.headers.get("if-range")
+    byte_range = None
+    if if_range is None or if_range == etag:
+        try:
+            byte_range = parse_range(request.headers.get("range"), size)
+        except RangeNotSatisfiable:
+            handle.close()
+            return Response(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+
+    if byte_range:
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        headers["Content-Length"] = str(end - start + 1)
+        return StreamingResponse(
+            iter_file(handle, start, end), status_code=206, media_type=media_type, headers=headers
+        )
+
+    headers["Content-Length"] = str(size)
+    return StreamingResponse(iter_file(handle, 0, size - 1), media_type=media_type, headers=headers)
+
+
+@router.post("/files/upload", response_model=DocumentResponse)
+async def upload_file(
+    file: UploadFile = File(...),
+    category: str = Form("documents"),
+    filename: Optional[str] = Form(None, description="저장할 파일명 (미지정 시 업로드 파일명)"),
+    current_user: User = Depends(get_current_active_user)
+):
+    """멀티파트 파일 업로드 (청크 단위로 디스크에 스트리밍, 바이너리 지원)"""
+    name = Path(filename or file.filename or "").name
+    if not name:
+        raise HTTPException(status_code=400, detail="Filename is required")
+    try:
+        saved_path = await run_in_threadpool(
+            local_storage_service.write_stream, f"{category}/{name}", file.file
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid path")
+    finally:
+        await file.close()
+
+    return DocumentResponse(path=saved_path, storage="local")
+
+
 @router.post("/files", response_model=DocumentResponse)
 async def save_document(
     doc: DocumentContent,
@@ -86,7 +214,10 @@ async def save_document(
 ):
     """문서 저장 (로컬 또는 Google Drive)"""
     storage_type = StorageType(doc.storage)
-    result = document_manager.save_document(
+    manager = await _manager_for(storage_type, current_user)
+    result = await _run(
+        storage_type,
+        manager.save_document,
         content=doc.content,
         name=doc.name,
         storage=storage_type,
@@ -113,7 +244,8 @@ async def get_sop(
 ):
     """SOP 문서 가져오기"""
     storage_type = StorageType(storage)
-    content = document_manager.get_sop(sop_name, storage=storage_type)
+    manager = await _manager_for(storage_type, current_user)
+    content = await _run(storage_type, manager.get_sop, sop_name, storage=storage_type)
     
     if not content:
         raise HTTPException(status_code=404, detail="SOP not found")
@@ -138,6 +270,37 @@ async def list_categories(
     }
 
 
+@router.get("/records")
+async def list_records(
+    record_type: Optional[str] = Query(None, description="기록 유형 (impact, risk 등)"),
+    change_id: Optional[int] = Query(None, description="설계 변경 ID"),
+    start: Optional[datetime] = Query(None, description="조회 시작 시각"),
+    end: Optional[datetime] = Query(None, description="조회 종료 시각"),
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: User = Depends(get_current_active_user)
+):
+    """분석 기록 조회 (최신순)"""
+    return list(document_manager.iter_analysis_records(
+        record_type=record_type,
+        change_id=change_id,
+        start=start,
+        end=end,
+        limit=limit
+    ))
+
+
+@router.get("/records/{record_id}")
+async def get_record(
+    record_id: str,
+    current_user: User = Depends(get_current_active_user)
+):
+    """분석 기록 단건 조회"""
+    record = document_manager.get_analysis_record(record_id)
+    if not record:
+        raise HTTPException(status_code=404, detail="Record not found")
+    return record
+
+
 @router.post("/sync/to-gdrive")
 async def sync_to_gdrive(
     local_path: str,
@@ -145,7 +308,8 @@ async def sync_to_gdrive(
     current_user: User = Depends(get_current_active_user)
 ):
     """로컬 파일을 Google Drive로 동기화"""
-    result = document_manager.sync_to_gdrive(local_path, gdrive_folder_id)
+    manager = await _manager_for(StorageType.GDRIVE, current_user)
+    result = await _run(StorageType.GDRIVE, manager.sync_to_gdrive, local_path, gdrive_folder_id)
     if not result:
         raise HTTPException(status_code=500, detail="Failed to sync to Google Drive")
     return result
@@ -158,8 +322,31 @@ async def sync_to_local(
     current_user: User = Depends(get_current_active_user)
 ):
     """Google Drive 파일을 로컬로 동기화"""
+    manager = await _manager_for(StorageType.GDRIVE, current_user)
     try:
-        saved_path = document_manager.sync_to_local(gdrive_file_id, local_category)
+        saved_path = await _run(StorageType.GDRIVE, manager.sync_to_local, gdrive_file_id, local_category)
         return {"saved_path": saved_path}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/sync/folder")
+async def sync_folder(
+    local_prefix: str,
+    gdrive_folder_id: str,
+    direction: SyncDirection = SyncDirection.TO_GDRIVE,
+    policy: ConflictPolicy = ConflictPolicy.NEWER_WINS,
+    dry_run: bool = False,
+    current_user: User = Depends(get_current_active_user)
+):
+    """로컬 하위 경로 ↔ Google Drive 폴더 일괄 동기화 (바뀐 파일만 병렬 전송)"""
+    manager = await _manager_for(StorageType.GDRIVE, current_user)
+    if not manager.gdrive.service:
+        raise HTTPException(status_code=503, detail="Google Drive is not configured")
+    try:
+        return await _run(
+            StorageType.GDRIVE, manager.sync_folder, local_prefix, gdrive_folder_id,
+            direction=direction, policy=policy, dry_run=dry_run
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
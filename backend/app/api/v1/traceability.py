@@ -0,0 +1,102 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.db.base import get_db
+from app.db.models import TraceabilityLink, User
+from app.models.schemas import (
+    CoverageGapResponse,
+    TraceabilityLinkCreate,
+    TraceabilityLinkResponse,
+    TraceQueryResponse
+)
+from app.services.auto_linker import traceability_auto_linker
+from app.services.traceability_graph import traceability_graph
+from app.utils.auth import get_current_active_user
+
+router = APIRouter()
+
+
+@router.post("/links", response_model=TraceabilityLinkResponse)
+def create_link(
+    link: TraceabilityLinkCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    db_link = TraceabilityLink(**link.dict(), is_auto_generated=False, created_by=current_user.id)
+    db.add(db_link)
+    db.commit()
+    db.refresh(db_link)
+    return db_link
+
+
+@router.delete("/links/{link_id}")
+def delete_link(
+    link_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    db_link = db.query(TraceabilityLink).filter(TraceabilityLink.id == link_id).first()
+    if not db_link:
+        raise HTTPException(status_code=404, detail="Traceability link not found")
+    db.delete(db_link)
+    db.commit()
+    return {"deleted": link_id}
+
+
+@router.post("/auto-links")
+def generate_auto_links(
+    project_id: int,
+    full: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """프로젝트 엔티티 임베딩 유사도로 추적성 링크 자동 생성 (기본은 바뀐 엔티티만 증분 처리)"""
+    return traceability_auto_linker.run(db, project_id, full=full).to_dict()
+
+
+@router.get("/impact", response_model=TraceQueryResponse)
+def get_impact(
+    node_type: str,
+    node_id: int,
+    max_depth: Optional[int] = Query(None, ge=1),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """노드가 바뀌면 영향받는 하위 항목 (source → target 방향 전이 폐포)"""
+    items = traceability_graph.impact(node_type, node_id, max_depth, db=db)
+    return {"node_type": node_type, "node_id": node_id, "direction": "downstream", "items": items}
+
+
+@router.get("/trace", response_model=TraceQueryResponse)
+def get_trace(
+    node_type: str,
+    node_id: int,
+    max_depth: Optional[int] = Query(None, ge=1),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """노드의 근거가 되는 상위 항목 역추적"""
+    items = traceability_graph.trace(node_type, node_id, max_depth, db=db)
+    return {"node_type": node_type, "node_id": node_id, "direction": "upstream", "items": items}
+
+
+@router.get("/coverage-gaps", response_model=CoverageGapResponse)
+def get_coverage_gaps(
+    source_type: str,
+    target_type: str,
+    candidate_ids: Optional[List[int]] = Query(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """target_type 링크가 없는 source_type 항목 (예: 시험 항목이 없는 요구사항)"""
+    missing = traceability_graph.coverage_gaps(source_type, target_type, candidate_ids, db=db)
+    return {"source_type": source_type, "target_type": target_type, "missing_ids": missing}
+
+
+@router.get("/stats")
+def get_graph_stats(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    traceability_graph.ensure_loaded(db)
+    return traceability_graph.stats()
@@ -0,0 +1,54 @@
+from fastapi import APIRouter, Depends, HTTPException
+from app.core.config import settings
+from app.db.models import User
+from app.services.vector_maintenance import SnapshotError, vector_maintenance
+from app.utils.auth import get_current_active_user
+
+router = APIRouter()
+
+
+def get_vector_admin(current_user: User = Depends(get_current_active_user)) -> User:
+    if current_user.role not in settings.VECTOR_ADMIN_ROLES:
+        raise HTTPException(status_code=403, detail="Vector store maintenance requires an admin role")
+    return current_user
+
+
+def _collection_or_404(name: str):
+    if name not in vector_maintenance.collection_names():
+        raise HTTPException(status_code=404, detail="Collection not found")
+
+
+@router.get("/stats")
+def get_vector_stats(current_user: User = Depends(get_vector_admin)):
+    """컬렉션별 항목 수, 삭제 표시(tombstone) 수, 디스크 사용량"""
+    return [item.to_dict() for item in vector_maintenance.all_stats()]
+
+
+@router.post("/collections/{name}/rebuild")
+def rebuild_collection(name: str, current_user: User = Depends(get_vector_admin)):
+    """살아 있는 항목만 새 컬렉션으로 복사하고 별칭 교체 (검색은 중단 없이 계속)"""
+    _collection_or_404(name)
+    return vector_maintenance.rebuild(name)
+
+
+@router.get("/snapshots")
+def list_snapshots(current_user: User = Depends(get_vector_admin)):
+    return vector_maintenance.list_snapshots()
+
+
+@router.post("/snapshots")
+def create_snapshot(current_user: User = Depends(get_vector_admin)):
+    """``VECTOR_SNAPSHOT_DIRECTORY`` 에 모든 컬렉션 스냅샷 생성"""
+    return vector_maintenance.snapshot()
+
+
+@router.post("/snapshots/{snapshot_name}/restore")
+def restore_snapshot(snapshot_name: str, current_user: User = Depends(get_vector_admin)):
+    """스냅샷의 컬렉션을 새 컬렉션으로 복원하고 별칭 교체"""
+    try:
+        path = vector_maintenance.snapshot_path(snapshot_name)
+        if not path.is_file():
+            raise HTTPException(status_code=404, detail="Snapshot not found")
+        return vector_maintenance.restore(path)
+    except SnapshotError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -28,7 +28,80 @@ class Settings(BaseSettings):
     ]
     
     CHROMA_PERSIST_DIRECTORY: str = "./chroma_db"
+    # Chroma 서버 (호스트를 지정하면 PersistentClient 대신 HttpClient 사용, 다중 워커에서는 필수)
+    CHROMA_SERVER_HOST: str = ""
+    CHROMA_SERVER_PORT: int = 8000
     LOCAL_STORAGE_PATH: str = "./qms_storage"
+    # 로컬 저장소 카탈로그 정합성 검사 주기 (초, 0이면 시작 시 1회만 검사)
+    LOCAL_STORAGE_CATALOG_RECONCILE_SECONDS: float = 60.0
+    # 쓰기 영속화 모드: fsync(쓰기마다 fsync) | group(그룹 커밋으로 fsync 일괄 처리)
+    LOCAL_STORAGE_DURABILITY: str = "fsync"
+    LOCAL_STORAGE_GROUP_COMMIT_MS: int = 50
+    # 분석 기록 로그 세그먼트 최대 크기 (초과 시 회전)
+    RECORD_LOG_SEGMENT_MAX_BYTES: int = 64 * 1024 * 1024
+    # Google Drive 문서 캐시 최대 크기, Changes API 변경 확인 최소 간격 (초)
+    DRIVE_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+    DRIVE_CACHE_REFRESH_SECONDS: float = 30.0
+    # 사용자별 Drive 클라이언트 풀: 최대 개수, 유휴 제거 시간(초), 동시 Drive 호출 수
+    GDRIVE_POOL_MAX_CLIENTS: int = 256
+    GDRIVE_POOL_IDLE_SECONDS: float = 900.0
+    GDRIVE_MAX_CONCURRENCY: int = 16
+    # Drive 다운로드 청크 크기, 청크별 재시도 횟수, 메모리 임시 버퍼 한도 (초과 시 디스크)
+    GDRIVE_DOWNLOAD_CHUNK_BYTES: int = 8 * 1024 * 1024
+    GDRIVE_DOWNLOAD_RETRIES: int = 3
+    GDRIVE_SPOOL_MAX_BYTES: int = 16 * 1024 * 1024
+    # 폴더 일괄 동기화 동시 전송 수
+    FOLDER_SYNC_MAX_WORKERS: int = 4
+    # Google OAuth 토큰: 만료 몇 초 전부터 갱신할지, 사용자 캐시 유휴 제거 시간(초), 사전 갱신 주기(초, 0 이면 끔)
+    GOOGLE_TOKEN_REFRESH_MARGIN_SECONDS: float = 300.0
+    GOOGLE_CREDENTIAL_IDLE_SECONDS: float = 3600.0
+    GOOGLE_TOKEN_REFRESH_INTERVAL_SECONDS: float = 60.0
+    # OpenTelemetry 추적: none | otlp | file
+    TRACING_EXPORTER: str = "none"
+    TRACING_OTLP_ENDPOINT: str = "http://localhost:4317"
+    TRACING_FILE_PATH: str = "./traces.jsonl"
+    TRACING_SERVICE_NAME: str = "qms-backend"
+    # 프로파일링: X-Profile 헤더/profile 쿼리를 허용할 역할, 상시 샘플링 비율(요청 N 개 중 1 개, 0 이면 끔), 샘플 간격(초)
+    PROFILING_ALLOWED_ROLES: List[str] = ["admin"]
+    PROFILING_SAMPLE_RATE: int = 0
+    PROFILING_INTERVAL_SECONDS: float = 0.001
+    # 추적성 그래프: 다른 프로세스/대량 변경을 반영하기 위한 전체 재적재 주기(초, 0 이면 최초 1 회만)
+    TRACEABILITY_GRAPH_MAX_AGE_SECONDS: int = 300
+    # 추적성 링크 자동 생성: 코사인 유사도 임계값, 엔티티당 최대 후보 수, 이 수 이상이면 HNSW 근사 검색 사용
+    AUTO_LINK_THRESHOLD: float = 0.8
+    AUTO_LINK_TOP_K: int = 5
+    AUTO_LINK_ANN_MIN_CANDIDATES: int = 20000
+    # 지식 베이스 분류별 컬렉션의 HNSW 파라미터 (컬렉션을 처음 만들 때만 적용, 바꾸려면 재분할)
+    KNOWLEDGE_HNSW_M: int = 16
+    KNOWLEDGE_HNSW_CONSTRUCTION_EF: int = 200
+    KNOWLEDGE_HNSW_SEARCH_EF: int = 64
+    # 지식 베이스 검색 재순위화: none/mmr/cross_encoder, 후보 배수, 최종 최대 개수(0 이면 요청 개수), MMR 관련도 가중치,
+    # cross-encoder 모델(sentence-transformers 필요, 없으면 mmr)과 배치 크기
+    RERANK_STRATEGY: str = "none"
+    RERANK_CANDIDATE_MULTIPLIER: int = 4
+    RERANK_TOP_K: int = 0
+    RERANK_MMR_LAMBDA: float = 0.7
+    RERANK_CROSS_ENCODER_MODEL: str = "cross-encoder/mmarco-mMiniLMv2-L12-H384-v1"
+    RERANK_BATCH_SIZE: int = 32
+    # 벡터 저장소 유지보수: 별칭 캐시 시간(초, 재구축 후 이전 컬렉션 삭제 전 대기), 복사 단위, 스냅샷 디렉토리, 관리 API 허용 역할
+    VECTOR_ALIAS_CACHE_SECONDS: float = 5.0
+    VECTOR_MAINTENANCE_BATCH_SIZE: int = 500
+    VECTOR_SNAPSHOT_DIRECTORY: str = "./chroma_snapshots"
+    VECTOR_ADMIN_ROLES: List[str] = ["admin"]
+    # 일괄 분석: 동시 LLM 호출 수, 분석 이력 커밋 단위(행), 요청당 최대 설계 변경 수
+    BATCH_ANALYSIS_LLM_CONCURRENCY: int = 8
+    BATCH_ANALYSIS_FLUSH_SIZE: int = 50
+    BATCH_ANALYSIS_MAX_CHANGES: int = 200
+    # 시작 직후 백그라운드에서 Chroma/Gemini 클라이언트와 에이전트 그래프를 미리 생성 (끄면 첫 사용 시 생성)
+    WARM_UP_SERVICES: bool = False
+    # 워커 간 공유 캐시 (SQLite WAL): 임베딩/LLM 응답/사용자 조회, 최대 항목 수, LLM 응답·사용자 유지 시간(초)
+    SHARED_CACHE_ENABLED: bool = False
+    SHARED_CACHE_PATH: str = "./cache/shared_cache.sqlite3"
+    SHARED_CACHE_MAX_ENTRIES: int = 200000
+    SHARED_CACHE_LLM_TTL_SECONDS: int = 86400
+    SHARED_CACHE_USER_TTL_SECONDS: int = 30
+    # Gunicorn 워커 수 (0 이면 CPU 코어 수)
+    WEB_CONCURRENCY: int = 0
     
     BACKEND_CORS_ORIGINS: List[AnyHttpUrl] = []
     FRONTEND_URL: str = "http://localhost:5173"
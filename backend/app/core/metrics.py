@@ -0,0 +1,208 @@
+"""Prometheus 메트릭 정의 및 계측 도우미
+
+``/metrics`` 에서 텍스트 형식으로 노출합니다. 라벨은 카디널리티가 낮은 값만 사용합니다
+(HTTP 는 실제 경로가 아닌 라우트 템플릿, Drive 는 API 메서드 ID).
+"""
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.core import GaugeMetricFamily
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+LLM_BUCKETS = (0.25, 0.5, 1, 2, 4, 8, 15, 30, 60, 120)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "qms_http_request_duration_seconds",
+    "HTTP 요청 처리 시간 (라우트별)",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+AGENT_EXECUTE_DURATION = Histogram(
+    "qms_agent_execute_duration_seconds",
+    "에이전트 execute 실행 시간",
+    ["agent", "outcome"],
+    buckets=LLM_BUCKETS,
+)
+LLM_REQUEST_DURATION = Histogram(
+    "qms_llm_request_duration_seconds",
+    "LLM 호출 시간",
+    ["model", "outcome"],
+    buckets=LLM_BUCKETS,
+)
+LLM_TOKENS = Counter(
+    "qms_llm_tokens_total",
+    "LLM 사용 토큰 수 (SDK 가 사용량을 제공하는 경우)",
+    ["model", "kind"],
+)
+EMBEDDING_DURATION = Histogram(
+    "qms_embedding_duration_seconds",
+    "임베딩 생성 시간",
+    ["operation"],
+    buckets=LATENCY_BUCKETS,
+)
+EMBEDDING_INPUTS = Counter(
+    "qms_embedding_inputs_total",
+    "임베딩한 텍스트 수",
+    ["operation"],
+)
+VECTOR_DB_DURATION = Histogram(
+    "qms_vector_db_duration_seconds",
+    "Chroma 컬렉션 작업 시간",
+    ["operation", "collection"],
+    buckets=LATENCY_BUCKETS,
+)
+RERANK_DURATION = Histogram(
+    "qms_rerank_duration_seconds",
+    "검색 결과 재순위화 시간",
+    ["strategy"],
+    buckets=LATENCY_BUCKETS,
+)
+DRIVE_API_DURATION = Histogram(
+    "qms_drive_api_duration_seconds",
+    "Google Drive API 호출 시간",
+    ["method"],
+    buckets=LATENCY_BUCKETS,
+)
+DRIVE_API_ERRORS = Counter(
+    "qms_drive_api_errors_total",
+    "Google Drive API 오류 (HTTP 상태 코드별)",
+    ["method", "code"],
+)
+CACHE_REQUESTS = Counter(
+    "qms_cache_requests_total",
+    "캐시 조회 (hit/miss)",
+    ["cache", "result"],
+)
+
+
+def _error_code(error: BaseException) -> str:
+    resp = getattr(error, "resp", None)
+    status = getattr(resp, "status", None)
+    return str(status) if status else type(error).__name__
+
+
+@contextmanager
+def observe_drive(method: str) -> Iterator[None]:
+    """Drive API 호출 시간/오류 기록"""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        DRIVE_API_ERRORS.labels(method, _error_code(e)).inc()
+        raise
+    finally:
+        DRIVE_API_DURATION.labels(method).observe(time.perf_counter() - started)
+
+
+@contextmanager
+def observe(histogram: Histogram, **labels: str) -> Iterator[None]:
+    """블록 실행 시간 기록"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.labels(**labels).observe(time.perf_counter() - started)
+
+
+def record_cache(cache: str, hit: bool):
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def record_llm_usage(model: str, response: Any) -> Tuple[Optional[int], Optional[int]]:
+    """LangChain 응답의 토큰 사용량 기록 후 (prompt, completion) 반환 (제공되지 않으면 None)"""
+    usage: Optional[dict] = getattr(response, "usage_metadata", None)
+    if not usage:
+        metadata = getattr(response, "response_metadata", None) or {}
+        usage = metadata.get("usage_metadata") or metadata.get("token_usage")
+    if not usage:
+        return None, None
+    prompt = usage.get("input_tokens", usage.get("prompt_token_count", usage.get("prompt_tokens")))
+    completion = usage.get("output_tokens", usage.get("candidates_token_count", usage.get("completion_tokens")))
+    if prompt:
+        LLM_TOKENS.labels(model, "prompt").inc(prompt)
+    if completion:
+        LLM_TOKENS.labels(model, "completion").inc(completion)
+    return prompt, completion
+
+
+class DatabasePoolCollector:
+    """SQLAlchemy 연결 풀 사용량 (수집 시점 값)"""
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def collect(self):
+        pool = self.engine.pool
+        values = {
+            "size": getattr(pool, "size", None),
+            "checked_out": getattr(pool, "checkedout", None),
+            "overflow": getattr(pool, "overflow", None),
+        }
+        family = GaugeMetricFamily("qms_db_pool_connections", "DB 연결 풀 상태", labels=["state"])
+        for state, getter in values.items():
+            if callable(getter):
+                family.add_metric([state], getter())
+        yield family
+
+
+class MetricsMiddleware:
+    """라우트 템플릿 단위 HTTP 요청 시간 측정 (스트리밍 응답은 본문 전송 완료까지)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "unmatched"
+            HTTP_REQUEST_DURATION.labels(scope["method"], template, str(status["code"])).observe(
+                time.perf_counter() - started
+            )
+
+
+# 다중 워커 모드에서도 응답한 워커 값으로 노출할 프로세스 내부 collector
+_process_local_collectors = []
+
+
+def register_process_collector(collector):
+    REGISTRY.register(collector)
+    _process_local_collectors.append(collector)
+
+
+def render_latest() -> bytes:
+    """``PROMETHEUS_MULTIPROC_DIR`` 가 있으면(다중 워커) 모든 워커의 값을 합쳐서 출력
+    
+    이 경우 DB 풀 게이지처럼 프로세스 안에서만 수집하는 collector 는 응답한 워커의 값만 덧붙입니다.
+    """
+    if not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        return generate_latest(REGISTRY)
+    from prometheus_client import multiprocess
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    for collector in _process_local_collectors:
+        registry.register(collector)
+    return generate_latest(registry)
@@ -0,0 +1,132 @@
+"""요청/오케스트레이터 실행 단위 샘플링 프로파일러 (pyinstrument, async 인식)
+
+- 관리자 역할 토큰으로 ``X-Profile: 1`` 헤더 또는 ``?profile=1`` 을 붙이면 해당 요청을 프로파일링하고
+  응답 헤더 ``X-Profile-Path`` 로 저장 위치를 알려줍니다.
+- ``PROFILING_SAMPLE_RATE`` 가 N(>0)이면 요청 N 개 중 1 개를 무작위로 프로파일링합니다 (상시 저부하 모드).
+- HTML 보고서는 로컬 저장소 ``records/profiles/`` 에 저장됩니다.
+"""
+import logging
+import random
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import AsyncIterator, Dict, Optional
+from urllib.parse import parse_qs
+
+from fastapi.concurrency import run_in_threadpool
+from jose import JWTError, jwt
+from pyinstrument import Profiler
+
+from app.core.config import settings
+from app.services.local_storage_service import local_storage_service
+
+
+logger = logging.getLogger(__name__)
+
+PROFILE_DIR = "records/profiles"
+TRUTHY = {"1", "true", "yes"}
+
+
+def profile_path(name: str) -> str:
+    safe = "".join(c if c.isalnum() or c in "-_" else "-" for c in name).strip("-")[:80]
+    return f"{PROFILE_DIR}/{datetime.now().strftime('%Y%m%d-%H%M%S')}-{safe}-{uuid.uuid4().hex[:8]}.html"
+
+
+def _new_profiler() -> Profiler:
+    return Profiler(interval=settings.PROFILING_INTERVAL_SECONDS, async_mode="enabled")
+
+
+async def _save(profiler: Profiler, path: str):
+    html = profiler.output_html()
+    await run_in_threadpool(local_storage_service.write_file, path, html)
+    logger.info(f"프로파일 저장: {path}")
+
+
+@asynccontextmanager
+async def profile_block(name: str, enabled: bool = True) -> AsyncIterator[Optional[str]]:
+    """블록 실행을 프로파일링하고 보고서 경로를 돌려줌 (``enabled`` 가 False 면 아무것도 하지 않음)"""
+    if not enabled:
+        yield None
+        return
+    path = profile_path(name)
+    profiler = _new_profiler()
+    profiler.start()
+    try:
+        yield path
+    finally:
+        profiler.stop()
+        await _save(profiler, path)
+
+
+def _token_role(headers: Dict[bytes, bytes]) -> Optional[str]:
+    authorization = headers.get(b"authorization", b"").decode("latin-1")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return None
+    return payload.get("role")
+
+
+def _profile_requested(scope, headers: Dict[bytes, bytes]) -> bool:
+    if headers.get(b"x-profile", b"").decode("latin-1").lower() in TRUTHY:
+        return True
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    return any(value.lower() in TRUTHY for value in query.get("profile", []))
+
+
+class ProfilingMiddleware:
+    """명시 요청(관리자) 또는 1/N 샘플링으로 요청 전체(스트리밍 본문 포함)를 프로파일링"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope.get("headers") or [])
+        explicit = _profile_requested(scope, headers)
+        if explicit and _token_role(headers) not in settings.PROFILING_ALLOWED_ROLES:
+            await self._forbidden(send)
+            return
+        sample_rate = settings.PROFILING_SAMPLE_RATE
+        if not explicit and not (sample_rate > 0 and random.random() < 1 / sample_rate):
+            await self.app(scope, receive, send)
+            return
+
+        path = profile_path(f"{scope['method']}-{scope['path']}")
+
+        async def send_wrapper(message):
+            if explicit and message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []),
+                                                  (b"x-profile-path", path.encode("utf-8"))]}
+            await send(message)
+
+        profiler = _new_profiler()
+        try:
+            profiler.start()
+        except RuntimeError:
+            # 같은 컨텍스트에서 이미 프로파일러가 실행 중 (중첩 실행)
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.stop()
+            try:
+                await _save(profiler, path)
+            except Exception as e:
+                logger.warning(f"프로파일 저장 실패: {e}")
+
+    @staticmethod
+    async def _forbidden(send):
+        body = b'{"detail":"Profiling is restricted to administrators"}'
+        await send({
+            "type": "http.response.start",
+            "status": 403,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
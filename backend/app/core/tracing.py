@@ -0,0 +1,129 @@
+"""OpenTelemetry 분산 추적 설정 및 span 도우미
+
+``TRACING_EXPORTER`` 로 내보내기 대상을 고릅니다.
+
+- ``none``: 추적하지 않음 (기본값, span 생성 비용만 남는 no-op)
+- ``otlp``: OTLP/gRPC (Jaeger, OpenTelemetry Collector 등, ``TRACING_OTLP_ENDPOINT``)
+- ``file``: JSON 한 줄씩 ``TRACING_FILE_PATH`` 에 기록 (로컬 분석용)
+
+오케스트레이터 실행(change_id) → 에이전트 노드 → LLM/임베딩/Chroma/SQL/Drive 호출 순으로
+span 이 중첩되어, 느린 실행의 임계 경로를 하나의 trace 에서 확인할 수 있습니다.
+"""
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional, Sequence
+
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
+from opentelemetry.trace import Span, Status, StatusCode
+from sqlalchemy import event
+
+from app.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+tracer = trace.get_tracer("qms")
+
+MAX_STATEMENT_CHARS = 2000
+
+_configured = False
+_configure_lock = threading.Lock()
+
+
+class JsonLinesSpanExporter(SpanExporter):
+    """완료된 span 을 JSON Lines 파일에 추가 기록"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        lines = "".join(span.to_json(indent=None) + "\n" for span in spans)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self):
+        pass
+
+
+def _exporter(name: str) -> Optional[SpanExporter]:
+    if name == "otlp":
+        from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+        return OTLPSpanExporter(endpoint=settings.TRACING_OTLP_ENDPOINT, insecure=True)
+    if name == "file":
+        return JsonLinesSpanExporter(settings.TRACING_FILE_PATH)
+    if name != "none":
+        logger.warning(f"알 수 없는 TRACING_EXPORTER: {name} (추적 비활성화)")
+    return None
+
+
+def configure_tracing(engine=None, exporter: Optional[SpanExporter] = None) -> bool:
+    """TracerProvider 설정 (프로세스당 한 번). 내보내기 대상이 없으면 False"""
+    global _configured
+    with _configure_lock:
+        if _configured:
+            return True
+        exporter = exporter or _exporter(settings.TRACING_EXPORTER.lower())
+        if exporter is None:
+            return False
+        provider = TracerProvider(resource=Resource.create({"service.name": settings.TRACING_SERVICE_NAME}))
+        provider.add_span_processor(BatchSpanProcessor(exporter))
+        trace.set_tracer_provider(provider)
+        if engine is not None:
+            instrument_engine(engine)
+        _configured = True
+        return True
+
+
+def shutdown_tracing():
+    """남은 span 내보내기 후 종료"""
+    if _configured:
+        trace.get_tracer_provider().shutdown()
+
+
+@contextmanager
+def start_span(name: str, **attributes: Any) -> Iterator[Span]:
+    """현재 span 의 하위 span (예외는 기록 후 다시 전달)"""
+    with tracer.start_as_current_span(name, record_exception=True, set_status_on_exception=True) as span:
+        for key, value in attributes.items():
+            if value is not None:
+                span.set_attribute(key, value)
+        yield span
+
+
+def instrument_engine(engine):
+    """SQLAlchemy 엔진의 SQL 실행마다 span 생성"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        span = tracer.start_span(
+            "db.query",
+            attributes={
+                "db.system": engine.dialect.name,
+                "db.statement": statement[:MAX_STATEMENT_CHARS],
+            },
+        )
+        conn.info.setdefault("qms_spans", []).append(span)
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        spans = conn.info.get("qms_spans")
+        if spans:
+            span = spans.pop()
+            if cursor.rowcount is not None and cursor.rowcount >= 0:
+                span.set_attribute("db.rowcount", cursor.rowcount)
+            span.end()
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):
+        spans = context.connection.info.get("qms_spans") if context.connection is not None else None
+        if spans:
+            span = spans.pop()
+            span.set_status(Status(StatusCode.ERROR, str(context.original_exception)))
+            span.end()
+
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Float, JSON
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Float, JSON, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base import Base
@@ -61,13 +61,18 @@ class DesignChange(Base):
     
     project = relationship("DesignProject", back_populates="design_changes")
     workflow_history = relationship("WorkflowHistory", back_populates="design_change")
+    
+    __table_args__ = (
+        # 담당자 대기함: 담당자 + 상태 (+ 프로젝트) 필터
+        Index("ix_design_changes_inbox", "current_assignee", "workflow_status", "project_id"),
+    )
 
 
 class WorkflowHistory(Base):
     __tablename__ = "workflow_history"
     
     id = Column(Integer, primary_key=True, index=True)
-    change_id = Column(Integer, ForeignKey("design_changes.id"))
+    change_id = Column(Integer, ForeignKey("design_changes.id"), index=True)
     from_status = Column(String(50))
     to_status = Column(String(50))
     action = Column(String(50))
@@ -173,6 +178,11 @@ class AgentAnalysis(Base):
     findings = Column(JSON)
     recommendations = Column(JSON)
     affected_items = Column(JSON)
+    model_name = Column(String(100))
+    input_fingerprint = Column(String(64), index=True)
+    inputs = Column(JSON)
+    llm_responses = Column(JSON)
+    reused_from = Column(Integer, ForeignKey("agent_analysis.id"))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
 
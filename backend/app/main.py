@@ -1,12 +1,79 @@
-from fastapi import FastAPI
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.core.metrics import (
+    CONTENT_TYPE_LATEST,
+    DatabasePoolCollector,
+    MetricsMiddleware,
+    register_process_collector,
+    render_latest
+)
+from app.core.profiling import ProfilingMiddleware
+from app.core.tracing import configure_tracing, shutdown_tracing
+from app.db.base import engine
 from app.api.v1 import api_router
+from app.services.local_storage_service import local_storage_service
+from app.services.google_credentials import google_credential_manager
+
+
+logger = logging.getLogger(__name__)
+
+
+def warm_up_services():
+    """지연 생성되는 외부 클라이언트와 에이전트 그래프를 미리 만들어 첫 요청 지연을 없앰"""
+    from app.agents.orchestrator import orchestrator
+    from app.services.knowledge_base import knowledge_base
+    from app.services.reranker import reranker
+    from app.services.vector_db_service import vector_db_service
+    
+    started = time.perf_counter()
+    try:
+        vector_db_service.client
+        vector_db_service.embeddings
+        for agent in orchestrator.agents.values():
+            agent.llm
+        orchestrator.graph
+        # cross-encoder 재순위화를 쓰면 모델도 미리 로드
+        reranker.model
+    except Exception as e:
+        logger.warning(f"서비스 예열 실패 (첫 사용 시 다시 생성): {e}")
+        return
+    # 고정 질의 검색을 미리 실행 (공유 캐시가 켜져 있으면 임베딩은 다른 워커와 공유)
+    for agent in orchestrator.agents.values():
+        for categories, query, n_results in agent.warm_up_searches:
+            try:
+                knowledge_base.search(categories, query, n_results=n_results)
+            except Exception as e:
+                logger.warning(f"예열 검색 실패 ({agent.agent_type}: {query}): {e}")
+    logger.info(f"서비스 예열 완료 ({time.perf_counter() - started:.2f}s)")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    configure_tracing(engine)
+    # 시작 시 1회 카탈로그 정합성 검사 (주기가 0이면 이후 반복하지 않음)
+    local_storage_service.watcher.start()
+    google_credential_manager.start()
+    # 요청은 바로 받고 예열은 백그라운드에서 (롤링 재시작 시 준비 시간 단축)
+    warm_up = asyncio.create_task(run_in_threadpool(warm_up_services)) if settings.WARM_UP_SERVICES else None
+    yield
+    if warm_up is not None:
+        warm_up.cancel()
+    google_credential_manager.stop()
+    local_storage_service.watcher.stop()
+    shutdown_tracing()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -17,6 +84,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(MetricsMiddleware)
+register_process_collector(DatabasePoolCollector(engine))
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 @app.get("/")
@@ -30,3 +101,7 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(render_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -107,6 +107,61 @@ class WorkflowTransition(BaseModel):
     comments: Optional[str] = None
 
 
+class BulkWorkflowTransition(WorkflowTransition):
+    change_ids: List[int]
+    atomic: bool = True
+
+
+class BulkTransitionFailure(BaseModel):
+    change_id: int
+    status: Optional[str] = None
+    error: str
+
+
+class BulkTransitionResponse(BaseModel):
+    action: str
+    applied: List[int]
+    failed: List[BulkTransitionFailure]
+
+
+class TraceabilityLinkCreate(BaseModel):
+    source_type: str
+    source_id: int
+    target_type: str
+    target_id: int
+    relationship_type: Optional[str] = None
+
+
+class TraceabilityLinkResponse(TraceabilityLinkCreate):
+    id: int
+    is_auto_generated: bool
+    confidence_score: Optional[float] = None
+    created_by: Optional[int] = None
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+class TraceNode(BaseModel):
+    type: str
+    id: int
+    depth: int
+
+
+class TraceQueryResponse(BaseModel):
+    node_type: str
+    node_id: int
+    direction: str
+    items: List[TraceNode]
+
+
+class CoverageGapResponse(BaseModel):
+    source_type: str
+    target_type: str
+    missing_ids: List[int]
+
+
 class AgentAnalysisRequest(BaseModel):
     change_id: int
     agent_type: str
@@ -128,12 +183,37 @@ class AgentAnalysisResponse(BaseModel):
     findings: Dict[str, Any]
     recommendations: Optional[List[str]] = None
     affected_items: Optional[Dict[str, Any]] = None
+    model_name: Optional[str] = None
+    input_fingerprint: Optional[str] = None
+    inputs: Optional[Dict[str, Any]] = None
+    reused_from: Optional[int] = None
+    reused: bool = False
     created_at: datetime
     
     class Config:
         from_attributes = True
 
 
+class WorkflowAnalysisRequest(BaseModel):
+    change_id: int
+    model_name: Optional[str] = None
+
+
+class WorkflowAnalysisResponse(BaseModel):
+    change_id: int
+    recomputed: List[str]
+    reused: List[str]
+    llm_calls: int
+    llm_calls_reused: int
+    analyses: List[AgentAnalysisResponse]
+
+
+class BatchAnalysisRequest(BaseModel):
+    change_ids: List[int]
+    agent_types: Optional[List[str]] = None
+    model_name: Optional[str] = None
+
+
 class RiskItemBase(BaseModel):
     risk_number: str
     project_id: int
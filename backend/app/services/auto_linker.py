@@ -0,0 +1,325 @@
+"""임베딩 유사도 기반 추적성 링크 일괄 자동 생성
+
+프로젝트의 설계 변경, 위험 항목(위해요인/위해상황/위해), 문서를 임베딩해 Chroma 컬렉션
+``traceability_entities`` 에 내용 해시와 함께 보관합니다. 실행할 때마다 해시가 바뀌었거나 새로 생긴
+엔티티만 다시 임베딩하고, 그 엔티티가 한쪽 끝인 쌍만 블록 단위 행렬곱(코사인 유사도)으로 점수화합니다.
+후보 대상이 많으면 Chroma HNSW 인덱스로 근사 검색합니다.
+
+임계값 이상인 쌍은 ``is_auto_generated=True`` 와 점수(``confidence_score``)를 붙여 일괄 삽입합니다.
+바뀐 엔티티의 기존 자동 링크 중 더 이상 후보가 아닌 것은 삭제하고, 수동 링크는 건드리지 않습니다.
+"""
+import argparse
+import hashlib
+import logging
+import time
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models import DesignChange, DesignProject, Document, RiskItem, TraceabilityLink
+from app.services.vector_db_service import VectorDBService, vector_db_service
+
+
+logger = logging.getLogger(__name__)
+
+ENTITY_COLLECTION = "traceability_entities"
+AUTO_RELATIONSHIP = "semantic_similarity"
+EMBED_BATCH_SIZE = 100
+SCORE_BLOCK_ROWS = 1024
+DB_BATCH_SIZE = 500
+
+# (source_type, target_type): 설계 변경 → 영향받는 문서/위험, 문서 → 관련 위험
+LINK_RULES: List[Tuple[str, str]] = [
+    ("design_change", "document"),
+    ("design_change", "risk"),
+    ("document", "risk"),
+]
+
+Key = Tuple[str, int]
+
+
+@dataclass
+class Entity:
+    type: str
+    id: int
+    text: str
+
+    @property
+    def key(self) -> str:
+        return f"{self.type}:{self.id}"
+
+    @property
+    def content_hash(self) -> str:
+        return hashlib.sha1(self.text.encode("utf-8"), usedforsecurity=False).hexdigest()
+
+
+@dataclass
+class AutoLinkReport:
+    project_id: int
+    entities: int = 0
+    embedded: int = 0
+    removed_entities: int = 0
+    candidates: int = 0
+    links_created: int = 0
+    links_updated: int = 0
+    links_deleted: int = 0
+    elapsed_seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = asdict(self)
+        result["elapsed_seconds"] = round(self.elapsed_seconds, 3)
+        return result
+
+
+def _join(*parts: Optional[str]) -> str:
+    return "\n".join(p.strip() for p in parts if p and p.strip())
+
+
+def load_entities(db: Session, project_id: int) -> List[Entity]:
+    """프로젝트의 링크 대상 엔티티와 임베딩할 텍스트"""
+    entities = [
+        Entity("design_change", row.id, _join(row.title, row.description, row.justification))
+        for row in db.query(DesignChange.id, DesignChange.title, DesignChange.description,
+                            DesignChange.justification).filter(DesignChange.project_id == project_id)
+    ]
+    entities += [
+        Entity("risk", row.id, _join(row.hazard, row.hazardous_situation, row.harm, row.control_measures))
+        for row in db.query(RiskItem.id, RiskItem.hazard, RiskItem.hazardous_situation, RiskItem.harm,
+                            RiskItem.control_measures).filter(RiskItem.project_id == project_id)
+    ]
+    entities += [
+        Entity("document", row.id, _join(row.document_code, row.document_name, row.document_type))
+        for row in db.query(Document.id, Document.document_code, Document.document_name,
+                            Document.document_type).filter(Document.project_id == project_id)
+    ]
+    return [e for e in entities if e.text]
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+def _parse_key(key: str) -> Key:
+    entity_type, _, entity_id = key.partition(":")
+    return entity_type, int(entity_id)
+
+
+class TraceabilityAutoLinker:
+    def __init__(
+        self,
+        vector_db: VectorDBService = vector_db_service,
+        threshold: Optional[float] = None,
+        top_k: Optional[int] = None,
+        ann_min_candidates: Optional[int] = None,
+    ):
+        self.vector_db = vector_db
+        self.threshold = settings.AUTO_LINK_THRESHOLD if threshold is None else threshold
+        self.top_k = top_k or settings.AUTO_LINK_TOP_K
+        self.ann_min_candidates = ann_min_candidates or settings.AUTO_LINK_ANN_MIN_CANDIDATES
+
+    def _collection(self):
+        return self.vector_db.get_or_create_collection(ENTITY_COLLECTION, {"hnsw:space": "cosine"})
+
+    # ------------------------------------------------------------------ 임베딩
+
+    def _sync_embeddings(self, collection, project_id: int, entities: List[Entity], full: bool,
+                         report: AutoLinkReport) -> Tuple[Dict[str, np.ndarray], set]:
+        """바뀐 엔티티만 재임베딩하고 (key → 정규화 벡터, 바뀐/삭제된 key) 반환"""
+        stored = collection.get(where={"project_id": project_id}, include=["metadatas", "embeddings"])
+        stored_hash = {key: meta.get("content_hash") for key, meta in zip(stored["ids"], stored["metadatas"])}
+        vectors = {key: np.asarray(vec, dtype=np.float32) for key, vec in zip(stored["ids"], stored["embeddings"])}
+
+        current = {e.key for e in entities}
+        removed = [key for key in stored_hash if key not in current]
+        if removed:
+            collection.delete(ids=removed)
+            for key in removed:
+                vectors.pop(key, None)
+        changed = [e for e in entities if full or stored_hash.get(e.key) != e.content_hash]
+
+        for start in range(0, len(changed), EMBED_BATCH_SIZE):
+            batch = changed[start:start + EMBED_BATCH_SIZE]
+            embedded = _normalize(np.asarray(self.vector_db.embed_documents([e.text for e in batch]),
+                                             dtype=np.float32))
+            collection.upsert(
+                ids=[e.key for e in batch],
+                embeddings=embedded.tolist(),
+                documents=[e.text for e in batch],
+                metadatas=[
+                    {"entity_type": e.type, "entity_id": e.id, "project_id": project_id,
+                     "content_hash": e.content_hash}
+                    for e in batch
+                ],
+            )
+            vectors.update(zip((e.key for e in batch), embedded))
+
+        report.embedded = len(changed)
+        report.removed_entities = len(removed)
+        return vectors, {e.key for e in changed} | set(removed)
+
+    # ------------------------------------------------------------------ 점수화
+
+    def _top_pairs(self, queries: np.ndarray, targets: np.ndarray) -> Iterator[Tuple[int, int, float]]:
+        """질의 행마다 상위 top_k 중 임계값 이상인 (질의 인덱스, 대상 인덱스, 점수)"""
+        if not len(queries) or not len(targets):
+            return
+        k = min(self.top_k, len(targets))
+        for start in range(0, len(queries), SCORE_BLOCK_ROWS):
+            scores = queries[start:start + SCORE_BLOCK_ROWS] @ targets.T
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            top_scores = np.take_along_axis(scores, top, axis=1)
+            rows, cols = np.nonzero(top_scores >= self.threshold)
+            for row, col in zip(rows.tolist(), cols.tolist()):
+                yield start + row, int(top[row, col]), float(top_scores[row, col])
+
+    def _ann_pairs(self, collection, project_id: int, target_type: str,
+                   queries: np.ndarray) -> Iterator[Tuple[int, str, float]]:
+        """HNSW 근사 검색 (cosine 거리 = 1 - 유사도)"""
+        for start in range(0, len(queries), SCORE_BLOCK_ROWS):
+            results = collection.query(
+                query_embeddings=queries[start:start + SCORE_BLOCK_ROWS].tolist(),
+                n_results=self.top_k,
+                where={"$and": [{"project_id": project_id}, {"entity_type": target_type}]},
+                include=["distances"],
+            )
+            for row, (ids, distances) in enumerate(zip(results["ids"], results["distances"])):
+                for key, distance in zip(ids, distances):
+                    if 1 - distance >= self.threshold:
+                        yield start + row, key, 1 - distance
+
+    def _score(self, collection, project_id: int, entities: List[Entity], vectors: Dict[str, np.ndarray],
+               changed: set) -> Dict[Tuple[str, str], float]:
+        """적어도 한쪽이 바뀐 엔티티인 후보 쌍 (source key, target key) → 유사도"""
+        by_type: Dict[str, List[str]] = {}
+        for e in entities:
+            by_type.setdefault(e.type, []).append(e.key)
+
+        candidates: Dict[Tuple[str, str], float] = {}
+        for source_type, target_type in LINK_RULES:
+            sources, targets = by_type.get(source_type, []), by_type.get(target_type, [])
+            if not sources or not targets:
+                continue
+            source_changed = np.array([key in changed for key in sources])
+            target_changed = np.array([key in changed for key in targets])
+            if not source_changed.any() and not target_changed.any():
+                continue
+            source_matrix = np.stack([vectors[key] for key in sources])
+            target_matrix = np.stack([vectors[key] for key in targets])
+
+            # 바뀐 source × 전체 target
+            queries = np.flatnonzero(source_changed)
+            if len(targets) >= self.ann_min_candidates:
+                for q, target_key, score in self._ann_pairs(collection, project_id, target_type,
+                                                           source_matrix[queries]):
+                    candidates[(sources[queries[q]], target_key)] = score
+            else:
+                for q, t, score in self._top_pairs(source_matrix[queries], target_matrix):
+                    candidates[(sources[queries[q]], targets[t])] = score
+
+            # 그대로인 source × 바뀐 target
+            queries = np.flatnonzero(~source_changed)
+            changed_targets = np.flatnonzero(target_changed)
+            for q, t, score in self._top_pairs(source_matrix[queries], target_matrix[changed_targets]):
+                candidates[(sources[queries[q]], targets[changed_targets[t]])] = score
+        return candidates
+
+    # ------------------------------------------------------------------ 링크 반영
+
+    def _apply_links(self, db: Session, project_id: int, entities: List[Entity], changed: set,
+                     candidates: Dict[Tuple[str, str], float], report: AutoLinkReport):
+        keys = {e.key for e in entities} | changed
+        types = {_parse_key(key)[0] for key in keys}
+        existing: Dict[Tuple[str, str], Tuple[int, bool]] = {}
+        stale: List[int] = []
+        rows = db.query(
+            TraceabilityLink.id, TraceabilityLink.source_type, TraceabilityLink.source_id,
+            TraceabilityLink.target_type, TraceabilityLink.target_id, TraceabilityLink.is_auto_generated,
+        ).filter(TraceabilityLink.source_type.in_(types), TraceabilityLink.target_type.in_(types))
+        for link_id, source_type, source_id, target_type, target_id, is_auto in rows:
+            pair = (f"{source_type}:{source_id}", f"{target_type}:{target_id}")
+            if pair[0] not in keys or pair[1] not in keys:
+                continue
+            existing[pair] = (link_id, bool(is_auto))
+            if is_auto and pair not in candidates and (pair[0] in changed or pair[1] in changed):
+                stale.append(link_id)
+
+        updates = {existing[pair][0]: score for pair, score in candidates.items()
+                   if pair in existing and existing[pair][1]}
+        new_pairs = [(pair, score) for pair, score in candidates.items() if pair not in existing]
+
+        # ORM 으로 처리해 추적성 그래프가 세션 이벤트로 변경을 받도록 함
+        for start in range(0, len(stale), DB_BATCH_SIZE):
+            for link in db.query(TraceabilityLink).filter(
+                    TraceabilityLink.id.in_(stale[start:start + DB_BATCH_SIZE])):
+                db.delete(link)
+        ids = list(updates)
+        for start in range(0, len(ids), DB_BATCH_SIZE):
+            for link in db.query(TraceabilityLink).filter(TraceabilityLink.id.in_(ids[start:start + DB_BATCH_SIZE])):
+                link.confidence_score = round(updates[link.id], 4)
+        for (source_key, target_key), score in new_pairs:
+            source_type, source_id = _parse_key(source_key)
+            target_type, target_id = _parse_key(target_key)
+            db.add(TraceabilityLink(
+                source_type=source_type,
+                source_id=source_id,
+                target_type=target_type,
+                target_id=target_id,
+                relationship_type=AUTO_RELATIONSHIP,
+                is_auto_generated=True,
+                confidence_score=round(score, 4),
+            ))
+        db.commit()
+
+        report.links_created = len(new_pairs)
+        report.links_updated = len(updates)
+        report.links_deleted = len(stale)
+
+    def run(self, db: Session, project_id: int, full: bool = False) -> AutoLinkReport:
+        """프로젝트 한 개 자동 링크 갱신 (``full`` 이면 전체 재임베딩/재점수화)"""
+        started = time.perf_counter()
+        report = AutoLinkReport(project_id=project_id)
+        entities = load_entities(db, project_id)
+        report.entities = len(entities)
+
+        collection = self._collection()
+        vectors, changed = self._sync_embeddings(collection, project_id, entities, full, report)
+        candidates = self._score(collection, project_id, entities, vectors, changed) if changed else {}
+        report.candidates = len(candidates)
+        if changed:
+            self._apply_links(db, project_id, entities, changed, candidates, report)
+
+        report.elapsed_seconds = time.perf_counter() - started
+        logger.info(f"자동 추적성 링크 (프로젝트 {project_id}): {report.to_dict()}")
+        return report
+
+    def run_all(self, db: Session, full: bool = False) -> List[AutoLinkReport]:
+        project_ids = [row.id for row in db.query(DesignProject.id).order_by(DesignProject.id)]
+        return [self.run(db, project_id, full=full) for project_id in project_ids]
+
+
+traceability_auto_linker = TraceabilityAutoLinker()
+
+
+if __name__ == "__main__":
+    from app.db.base import SessionLocal
+
+    parser = argparse.ArgumentParser(description="임베딩 유사도 기반 추적성 링크 자동 생성")
+    parser.add_argument("--project-id", type=int, help="생략하면 모든 프로젝트")
+    parser.add_argument("--full", action="store_true", help="변경 여부와 무관하게 전체 재계산")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    session = SessionLocal()
+    try:
+        if args.project_id is None:
+            reports = traceability_auto_linker.run_all(session, full=args.full)
+        else:
+            reports = [traceability_auto_linker.run(session, args.project_id, full=args.full)]
+        for item in reports:
+            print(item.to_dict())
+    finally:
+        session.close()
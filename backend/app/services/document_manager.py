@@ -1,7 +1,11 @@
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Union, Iterator
+from datetime import datetime
 from enum import Enum
 from app.services.gdrive_service import gdrive_service, GoogleDriveService
 from app.services.local_storage_service import local_storage_service, LocalStorageService
+from app.services.record_log import get_record_log, RecordLog
+from app.services.drive_cache import get_drive_cache, DriveDocumentCache
+from app.services.folder_sync import FolderSyncEngine, SyncDirection, ConflictPolicy
 
 
 class StorageType(str, Enum):
@@ -15,20 +19,73 @@ class DocumentManager:
     def __init__(
         self, 
         local_service: LocalStorageService = local_storage_service,
-        gdrive_service: GoogleDriveService = gdrive_service
+        gdrive_service: GoogleDriveService = gdrive_service,
+        records: Optional[RecordLog] = None,
+        drive_cache: Optional[DriveDocumentCache] = None
     ):
         self.local = local_service
         self.gdrive = gdrive_service
+        self._records = records
+        self._drive_cache = drive_cache
+    
+    @property
+    def records(self) -> RecordLog:
+        """분석 기록 로그 (첫 사용 시 생성)"""
+        if self._records is None:
+            self._records = get_record_log()
+        return self._records
+    
+    @property
+    def drive_cache(self) -> DriveDocumentCache:
+        """Google Drive 문서 캐시 (첫 사용 시 생성)"""
+        if self._drive_cache is None:
+            self._drive_cache = get_drive_cache(getattr(self.gdrive, "identity", "default"))
+        return self._drive_cache
+    
+    def with_gdrive(self, gdrive: GoogleDriveService) -> "DocumentManager":
+        """같은 로컬 저장소/기록 로그를 쓰되 Drive 클라이언트만 바꾼 관리자 (사용자별 요청용)"""
+        if gdrive is self.gdrive:
+            return self
+        return DocumentManager(local_service=self.local, gdrive_service=gdrive, records=self._records)
+    
+    def _read_drive_text(self, file_id: str) -> str:
+        """Drive 문서 텍스트 (캐시 우선, 미스 시 내려받아 캐시)
+        
+        메타데이터를 내용보다 먼저 받아 두므로, 그 사이 파일이 바뀌어도
+        캐시에는 더 오래된 버전 키가 남아 다음 변경 확인 때 무효화됩니다.
+        """
+        if not self.gdrive.service:
+            return self.gdrive.get_file_content(file_id)
+        
+        cache = self.drive_cache
+        cache.refresh(self.gdrive)
+        cached = cache.get(file_id)
+        if cached is not None:
+            return cached.decode("utf-8")
+        
+        metadata = self.gdrive.get_file_metadata(file_id)
+        content = self.gdrive.get_file_content(file_id)
+        if metadata and content:
+            cache.put(file_id, metadata, content.encode("utf-8"))
+        return content
     
     def list_documents(
         self, 
         storage: StorageType = StorageType.LOCAL,
         category: str = "",
-        folder_id: Optional[str] = None
+        folder_id: Optional[str] = None,
+        extension: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0
     ) -> List[Dict[str, Any]]:
         """문서 목록 조회"""
         if storage == StorageType.LOCAL:
-            return self.local.list_files(category=category)
+            return self.local.list_files(
+                category=category,
+                extension=extension,
+                limit=limit,
+                offset=offset
+            )
         else:
             return self.gdrive.list_files(folder_id=folder_id)
     
@@ -41,7 +98,7 @@ class DocumentManager:
         if storage == StorageType.LOCAL:
             return self.local.read_file(path_or_id)
         else:
-            return self.gdrive.get_file_content(path_or_id)
+            return self._read_drive_text(path_or_id)
     
     def save_document(
         self,
@@ -67,11 +124,19 @@ class DocumentManager:
         if storage == StorageType.LOCAL:
             return self.local.read_file(f"sop/{sop_name}")
         else:
-            # Google Drive에서 SOP 폴더 내 검색
-            files = self.gdrive.list_files(query=f"name contains '{sop_name}'")
-            if files:
-                return self.gdrive.get_file_content(files[0]['id'])
-            return ""
+            # Google Drive에서 SOP 검색 (검색 결과 파일 ID 는 캐시에 기억)
+            if not self.gdrive.service:
+                return ""
+            cache = self.drive_cache
+            cache.refresh(self.gdrive)
+            file_id = cache.lookup_name(sop_name)
+            if file_id is None:
+                files = self.gdrive.list_files(query=f"name contains '{sop_name}'")
+                if not files:
+                    return ""
+                file_id = files[0]['id']
+                cache.remember_name(sop_name, file_id)
+            return self._read_drive_text(file_id)
     
     def save_analysis_record(
         self,
@@ -80,13 +145,12 @@ class DocumentManager:
         storage: StorageType = StorageType.LOCAL,
         folder_id: Optional[str] = None
     ) -> Optional[Dict[str, Any]]:
-        """분석 결과 기록 저장"""
+        """분석 결과 기록 저장 (로컬은 추가 전용 기록 로그에 저장)"""
         if storage == StorageType.LOCAL:
-            saved_path = self.local.save_record(record_type, data)
-            return {"path": saved_path, "storage": "local"}
+            record_id = self.records.append(record_type, data)
+            return {"id": record_id, "storage": "local"}
         else:
             import json
-            from datetime import datetime
             filename = f"{record_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
             content = json.dumps(data, ensure_ascii=False, indent=2)
             result = self.gdrive.upload_content(content, filename, folder_id=folder_id, mime_type='application/json')
@@ -94,6 +158,28 @@ class DocumentManager:
                 result["storage"] = "gdrive"
             return result
     
+    def get_analysis_record(self, record_id: str) -> Optional[Dict[str, Any]]:
+        """로컬 기록 로그에서 분석 기록 조회"""
+        return self.records.get(record_id)
+    
+    def iter_analysis_records(
+        self,
+        record_type: Optional[str] = None,
+        change_id: Optional[Any] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """유형/설계 변경/기간 조건으로 분석 기록 조회 (최신순)"""
+        return self.records.iter_records(
+            record_type=record_type,
+            change_id=change_id,
+            start=start,
+            end=end,
+            reverse=True,
+            limit=limit
+        )
+    
     def sync_to_gdrive(self, local_path: str, gdrive_folder_id: str) -> Optional[Dict]:
         """로컬 파일을 Google Drive로 동기화"""
         content = self.local.read_file(local_path)
@@ -101,11 +187,39 @@ class DocumentManager:
         return self.gdrive.upload_content(content, filename, folder_id=gdrive_folder_id)
     
     def sync_to_local(self, gdrive_file_id: str, local_category: str = "documents") -> str:
-        """Google Drive 파일을 로컬로 동기화"""
-        metadata = self.gdrive.get_file_metadata(gdrive_file_id)
-        content = self.gdrive.get_file_content(gdrive_file_id)
-        filename = metadata.get('name', 'downloaded_file.txt')
-        return self.local.write_file(f"{local_category}/{filename}", content)
-
+        """Google Drive 파일을 로컬로 동기화
+        
+        Google Docs 는 텍스트로 내보내고, 그 외 파일은 원본 바이트를 청크 단위로
+        로컬 저장소에 바로 스트리밍합니다 (메모리 사용량은 청크 크기 수준).
+        """
+        entry = self.drive_cache.get_entry(gdrive_file_id) if self.gdrive.service else None
+        if entry:
+            metadata = {"name": entry["name"], "mimeType": entry["mime_type"]}
+        else:
+            metadata = self.gdrive.get_file_metadata(gdrive_file_id)
+        filename = metadata.get('name') or 'downloaded_file.txt'
+        file_path = f"{local_category}/{filename}"
+        
+        mime_type = metadata.get('mimeType')
+        if not mime_type or self.gdrive.is_google_native(mime_type):
+            content = self._read_drive_text(gdrive_file_id)
+            return self.local.write_file(file_path, content)
+        
+        with self.local.open_write(file_path) as f:
+            self.gdrive.download_to(gdrive_file_id, f)
+        return str(self.local.base_path / file_path)
+    
+    def sync_folder(
+        self,
+        local_prefix: str,
+        gdrive_folder_id: str,
+        direction: SyncDirection = SyncDirection.TO_GDRIVE,
+        policy: ConflictPolicy = ConflictPolicy.NEWER_WINS,
+        dry_run: bool = False
+    ) -> Dict[str, Any]:
+        """로컬 하위 경로와 Drive 폴더 일괄 동기화 (바뀐 파일만 병렬 전송)"""
+        engine = FolderSyncEngine(self.local, self.gdrive)
+        report = engine.run(local_prefix, gdrive_folder_id, direction=direction, policy=policy, dry_run=dry_run)
+        return report.to_dict()
 
 document_manager = DocumentManager()
@@ -0,0 +1,294 @@
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Any
+
+from app.core.config import settings
+from app.core.metrics import record_cache
+from app.utils.durable_io import atomic_write_bytes
+
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    file_id TEXT PRIMARY KEY,
+    version TEXT NOT NULL,
+    name TEXT,
+    mime_type TEXT,
+    size INTEGER NOT NULL,
+    blob TEXT NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_entries_last_access ON entries (last_access);
+CREATE TABLE IF NOT EXISTS names (
+    name TEXT PRIMARY KEY,
+    file_id TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_names_file_id ON names (file_id);
+CREATE TABLE IF NOT EXISTS state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def drive_version(metadata: Dict[str, Any]) -> str:
+    """캐시 버전 키: 바이너리 파일은 headRevisionId, Google Docs 는 modifiedTime"""
+    return metadata.get("headRevisionId") or metadata.get("modifiedTime") or ""
+
+
+class DriveDocumentCache:
+    """Google Drive 문서 읽기 캐시 (디스크, 크기 제한 LRU)
+
+    파일 ID + 버전(headRevisionId / modifiedTime) 단위로 내용을 저장합니다.
+    읽을 때마다 메타데이터를 조회하지 않고, Drive Changes API(``changes.list``)의
+    저장된 page token 으로 변경/삭제된 파일만 무효화합니다.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        max_bytes: Optional[int] = None,
+        refresh_seconds: Optional[float] = None,
+    ):
+        self.directory = Path(directory)
+        self.blob_dir = self.directory / "blobs"
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes if max_bytes is not None else settings.DRIVE_CACHE_MAX_BYTES
+        self.refresh_seconds = (
+            refresh_seconds if refresh_seconds is not None else settings.DRIVE_CACHE_REFRESH_SECONDS
+        )
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._last_refresh = 0.0
+        self._conn = sqlite3.connect(str(self.directory / "index.sqlite3"), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ---- 조회 / 저장 ---------------------------------------------------------
+
+    def get(self, file_id: str) -> Optional[bytes]:
+        """캐시된 내용 (없으면 None). 접근 시각을 갱신합니다."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT blob FROM entries WHERE file_id = ?", (file_id,)
+            ).fetchone()
+            if row is None:
+                record_cache("drive_document", hit=False)
+                return None
+            self._conn.execute(
+                "UPDATE entries SET last_access = ? WHERE file_id = ?", (time.time(), file_id)
+            )
+            self._conn.commit()
+        try:
+            content = (self.blob_dir / row["blob"]).read_bytes()
+        except FileNotFoundError:
+            self.invalidate(file_id)
+            record_cache("drive_document", hit=False)
+            return None
+        record_cache("drive_document", hit=True)
+        return content
+
+    def get_entry(self, file_id: str) -> Optional[Dict[str, Any]]:
+        """캐시된 항목의 메타데이터 (내용 제외)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT file_id, version, name, mime_type, size FROM entries WHERE file_id = ?",
+                (file_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def put(self, file_id: str, metadata: Dict[str, Any], content: bytes):
+        """내용 저장 후 용량 초과분을 오래된 순으로 제거"""
+        if len(content) > self.max_bytes:
+            return
+        version = drive_version(metadata)
+        blob = hashlib.sha1(f"{file_id}:{version}".encode("utf-8")).hexdigest()
+        atomic_write_bytes(self.blob_dir / blob, content)
+        with self._lock:
+            previous = self._conn.execute(
+                "SELECT blob FROM entries WHERE file_id = ?", (file_id,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT INTO entries (file_id, version, name, mime_type, size, blob, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(file_id) DO UPDATE SET version=excluded.version, name=excluded.name, "
+                "mime_type=excluded.mime_type, size=excluded.size, blob=excluded.blob, "
+                "last_access=excluded.last_access",
+                (file_id, version, metadata.get("name"), metadata.get("mimeType"),
+                 len(content), blob, time.time()),
+            )
+            self._conn.commit()
+        if previous and previous["blob"] != blob:
+            (self.blob_dir / previous["blob"]).unlink(missing_ok=True)
+        self._evict()
+
+    def invalidate(self, file_id: str):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT blob FROM entries WHERE file_id = ?", (file_id,)
+            ).fetchone()
+            self._conn.execute("DELETE FROM entries WHERE file_id = ?", (file_id,))
+            self._conn.execute("DELETE FROM names WHERE file_id = ?", (file_id,))
+            self._conn.commit()
+        if row:
+            (self.blob_dir / row["blob"]).unlink(missing_ok=True)
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.execute("DELETE FROM names")
+            self._conn.execute("DELETE FROM state")
+            self._conn.commit()
+        for blob in self.blob_dir.iterdir():
+            blob.unlink(missing_ok=True)
+
+    def _evict(self):
+        """전체 크기가 max_bytes 이하가 될 때까지 가장 오래 전에 읽힌 항목 제거"""
+        with self._lock:
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            victims = []
+            for row in self._conn.execute(
+                "SELECT file_id, size, blob FROM entries ORDER BY last_access"
+            ):
+                if total <= self.max_bytes:
+                    break
+                victims.append(row)
+                total -= row["size"]
+            self._conn.executemany(
+                "DELETE FROM entries WHERE file_id = ?", [(row["file_id"],) for row in victims]
+            )
+            self._conn.commit()
+        for row in victims:
+            (self.blob_dir / row["blob"]).unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            row = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return {"entries": row[0], "bytes": row[1], "max_bytes": self.max_bytes}
+
+    # ---- 검색어 → 파일 ID (SOP 조회용) -------------------------------------
+
+    def lookup_name(self, name: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT file_id FROM names WHERE name = ?", (name,)).fetchone()
+        return row["file_id"] if row else None
+
+    def remember_name(self, name: str, file_id: str):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO names (name, file_id) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET file_id=excluded.file_id",
+                (name, file_id),
+            )
+            self._conn.commit()
+
+    # ---- Changes API 기반 무효화 --------------------------------------------
+
+    def _get_state(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM state WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+
+    def _set_state(self, key: str, value: str):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO state (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value=excluded.value",
+                (key, value),
+            )
+            self._conn.commit()
+
+    def refresh(self, gdrive, force: bool = False) -> int:
+        """Drive 변경 목록을 반영해 바뀐 파일을 무효화 (``refresh_seconds`` 간격으로 제한)
+
+        반환값은 무효화한 항목 수입니다.
+        """
+        if not force and time.monotonic() - self._last_refresh < self.refresh_seconds:
+            return 0
+        with self._refresh_lock:
+            if not force and time.monotonic() - self._last_refresh < self.refresh_seconds:
+                return 0
+            invalidated = self._apply_changes(gdrive)
+            self._last_refresh = time.monotonic()
+            return invalidated
+
+    def _apply_changes(self, gdrive) -> int:
+        token = self._get_state("page_token")
+        if token is None:
+            # 처음에는 현재 시점 토큰만 저장 (캐시가 비어 있으므로 이전 변경은 불필요)
+            token = gdrive.get_start_page_token()
+            if token:
+                self._set_state("page_token", token)
+            return 0
+
+        result = gdrive.list_changes(token)
+        if result is None:
+            # 토큰 만료 등: 어떤 항목이 바뀌었는지 알 수 없으므로 전부 비운다
+            logger.warning("Drive 변경 목록 조회 실패, 문서 캐시를 초기화합니다")
+            self.clear()
+            return 0
+
+        changes, new_token = result
+        invalidated = 0
+        for change in changes:
+            file_id = change.get("fileId")
+            if not file_id:
+                continue
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT version, name FROM entries WHERE file_id = ?", (file_id,)
+                ).fetchone()
+                names = {
+                    r["name"] for r in
+                    self._conn.execute("SELECT name FROM names WHERE file_id = ?", (file_id,))
+                }
+            if row is None and not names:
+                continue
+            file = change.get("file") or {}
+            if change.get("removed") or file.get("trashed"):
+                stale = True
+            else:
+                stale = (
+                    (row is not None and drive_version(file) != row["version"])
+                    # 이름 매핑은 ``name contains`` 검색어 기준이므로 포함 여부로 판단
+                    or (bool(names) and not all(n in (file.get("name") or "") for n in names))
+                )
+            if stale:
+                self.invalidate(file_id)
+                invalidated += 1
+        if new_token:
+            self._set_state("page_token", new_token)
+        return invalidated
+
+
+_drive_caches: Dict[str, DriveDocumentCache] = {}
+_drive_cache_guard = threading.Lock()
+
+
+def get_drive_cache(identity: str = "default") -> DriveDocumentCache:
+    """인증 주체별 Drive 문서 캐시 (첫 사용 시 생성, 카탈로그 대상 밖 숨김 디렉토리)
+
+    사용자마다 볼 수 있는 파일과 변경 목록이 다르므로 캐시를 공유하지 않습니다.
+    """
+    with _drive_cache_guard:
+        cache = _drive_caches.get(identity)
+        if cache is None:
+            directory = Path(settings.LOCAL_STORAGE_PATH) / ".drive_cache"
+            if identity != "default":
+                directory = directory / "users" / identity
+            cache = _drive_caches[identity] = DriveDocumentCache(directory)
+        return cache
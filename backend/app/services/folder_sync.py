@@ -0,0 +1,333 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, timezone
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.services.gdrive_service import GoogleDriveService
+from app.services.local_storage_service import LocalStorageService
+from app.utils.durable_io import atomic_write_bytes
+
+
+logger = logging.getLogger(__name__)
+
+SYNC_STATE_DIR = ".sync_state"
+
+
+class SyncDirection(str, Enum):
+    TO_GDRIVE = "to_gdrive"
+    TO_LOCAL = "to_local"
+
+
+class ConflictPolicy(str, Enum):
+    """양쪽이 마지막 동기화 이후 모두 바뀐 경우(또는 기준 상태가 없는 경우)의 처리"""
+    NEWER_WINS = "newer_wins"
+    LOCAL_WINS = "local_wins"
+    REMOTE_WINS = "remote_wins"
+    SKIP = "skip"
+
+
+@dataclass
+class SyncAction:
+    path: str
+    action: str  # upload | update | download | skip | conflict
+    reason: str
+    size: int = 0
+    file_id: Optional[str] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class SyncReport:
+    direction: str
+    dry_run: bool
+    actions: List[SyncAction] = field(default_factory=list)
+    transferred_bytes: int = 0
+    elapsed_seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        counts: Dict[str, int] = {}
+        for action in self.actions:
+            counts[action.action] = counts.get(action.action, 0) + 1
+        errors = [a for a in self.actions if a.error]
+        return {
+            "direction": self.direction,
+            "dry_run": self.dry_run,
+            "counts": counts,
+            "errors": len(errors),
+            "transferred_bytes": self.transferred_bytes,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "throughput_bytes_per_second": (
+                round(self.transferred_bytes / self.elapsed_seconds) if self.elapsed_seconds else 0
+            ),
+            "actions": [asdict(a) for a in self.actions],
+        }
+
+
+def file_md5(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.md5(usedforsecurity=False)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _parse_drive_time(value: Optional[str]) -> float:
+    if not value:
+        return 0.0
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).astimezone(timezone.utc).timestamp()
+
+
+class FolderSyncEngine:
+    """로컬 저장소 하위 경로 ↔ Google Drive 폴더 일괄 동기화
+
+    로컬 카탈로그(size/mtime/sha256)와 Drive ``md5Checksum``/``modifiedTime`` 을 비교해
+    바뀐 파일만 전송합니다. 마지막 동기화 상태를 저장해 두고 양쪽이 모두 바뀐 파일은
+    충돌로 보고 ``ConflictPolicy`` 에 따라 처리합니다. 전송은 ``max_workers`` 개까지 병렬입니다.
+    """
+
+    REMOTE_FIELDS = "id, name, mimeType, modifiedTime, size, md5Checksum"
+
+    def __init__(self, local: LocalStorageService, gdrive: GoogleDriveService, max_workers: Optional[int] = None):
+        self.local = local
+        self.gdrive = gdrive
+        self.max_workers = max_workers or settings.FOLDER_SYNC_MAX_WORKERS
+
+    # ---- 동기화 상태 --------------------------------------------------------
+
+    def _state_path(self, local_prefix: str, folder_id: str) -> Path:
+        key = hashlib.sha1(f"{local_prefix}\0{folder_id}".encode("utf-8")).hexdigest()
+        return self.local.base_path / SYNC_STATE_DIR / f"{key}.json"
+
+    def _load_state(self, path: Path) -> Dict[str, Dict[str, Any]]:
+        if not path.exists():
+            return {}
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def _save_state(self, path: Path, state: Dict[str, Dict[str, Any]]):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_bytes(path, json.dumps(state, ensure_ascii=False).encode("utf-8"))
+
+    # ---- 비교 ---------------------------------------------------------------
+
+    def _local_manifest(self, local_prefix: str) -> Dict[str, Dict[str, Any]]:
+        """카탈로그 기준 로컬 파일 목록 (prefix 기준 상대 경로 → 카탈로그 항목)"""
+        self.local.catalog.reconcile()
+        prefix = local_prefix.strip("/")
+        return {
+            entry["path"][len(prefix) + 1:]: entry
+            for entry in self.local.catalog.query(category=prefix)
+        }
+
+    def _remote_manifest(self, folder_id: str) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, str]]:
+        """Drive 폴더 재귀 목록 (상대 경로 → 파일 메타데이터, 상대 경로 → 폴더 ID)"""
+        files: Dict[str, Dict[str, Any]] = {}
+        folders = {"": folder_id}
+        for item in self.gdrive.walk_folder(folder_id, fields=self.REMOTE_FIELDS, max_workers=self.max_workers):
+            if item.get("mimeType") == GoogleDriveService.FOLDER_MIME_TYPE:
+                folders[item["path"]] = item["id"]
+            else:
+                files[item["path"]] = item
+        return files, folders
+
+    @staticmethod
+    def _remote_version(remote: Dict[str, Any]) -> str:
+        return remote.get("md5Checksum") or remote.get("modifiedTime") or ""
+
+    def _resolve_conflict(
+        self,
+        policy: ConflictPolicy,
+        direction: SyncDirection,
+        local: Dict[str, Any],
+        remote: Dict[str, Any],
+    ) -> str:
+        """충돌 시 정책에 따라 전송(upload/update/download) 또는 conflict(보류) 결정"""
+        if policy == ConflictPolicy.SKIP:
+            return "conflict"
+        if policy == ConflictPolicy.NEWER_WINS:
+            local_mtime = datetime.fromisoformat(local["modified_at"]).timestamp()
+            local_wins = local_mtime >= _parse_drive_time(remote.get("modifiedTime"))
+        else:
+            local_wins = policy == ConflictPolicy.LOCAL_WINS
+        if direction == SyncDirection.TO_GDRIVE:
+            return "update" if local_wins else "conflict"
+        return "conflict" if local_wins else "download"
+
+    def plan(
+        self,
+        local_prefix: str,
+        folder_id: str,
+        direction: SyncDirection = SyncDirection.TO_GDRIVE,
+        policy: ConflictPolicy = ConflictPolicy.NEWER_WINS,
+    ) -> Dict[str, Any]:
+        """전송 계획 수립 (파일 전송 없음)
+
+        양쪽 내용이 같으면(크기가 같을 때만 로컬 MD5 계산) 건너뜁니다. 다르면 마지막 동기화
+        상태와 비교해 대상 쪽만 바뀌지 않았을 때 전송하고, 그 외는 충돌로 정책을 적용합니다.
+        """
+        direction = SyncDirection(direction)
+        policy = ConflictPolicy(policy)
+        local_files = self._local_manifest(local_prefix)
+        remote_files, remote_folders = self._remote_manifest(folder_id)
+        state = self._load_state(self._state_path(local_prefix, folder_id))
+        prefix = local_prefix.strip("/")
+
+        def same_content(local: Dict[str, Any], remote: Dict[str, Any], previous: Optional[Dict[str, Any]]) -> bool:
+            if remote.get("md5Checksum"):
+                return (
+                    int(remote.get("size", -1)) == local["size"]
+                    and remote["md5Checksum"] == file_md5(self.local.base_path / local["path"])
+                )
+            # Google Docs 등 체크섬이 없는 파일은 마지막 동기화 시점 버전으로 비교
+            return bool(
+                previous
+                and previous.get("remote_version") == self._remote_version(remote)
+                and previous.get("local_sha256") == local["sha256"]
+            )
+
+        actions: List[SyncAction] = []
+        sources = local_files if direction == SyncDirection.TO_GDRIVE else remote_files
+        for relative in sorted(sources):
+            local = local_files.get(relative)
+            remote = remote_files.get(relative)
+            previous = state.get(relative)
+
+            if direction == SyncDirection.TO_GDRIVE and remote is None:
+                actions.append(SyncAction(relative, "upload", "missing on Drive", local["size"]))
+                continue
+            if direction == SyncDirection.TO_LOCAL and local is None:
+                actions.append(SyncAction(relative, "download", "missing locally", int(remote.get("size", 0)), remote["id"]))
+                continue
+            if same_content(local, remote, previous):
+                actions.append(SyncAction(relative, "skip", "unchanged", 0, remote["id"]))
+                continue
+
+            if direction == SyncDirection.TO_GDRIVE:
+                target_unchanged = previous and previous.get("remote_version") == self._remote_version(remote)
+                action, reason = "update", "changed locally"
+            else:
+                target_unchanged = previous and previous.get("local_sha256") == local["sha256"]
+                action, reason = "download", "changed on Drive"
+            if not target_unchanged:
+                action = self._resolve_conflict(policy, direction, local, remote)
+                reason = "changed on both sides" if previous else "differs, no sync baseline"
+            size = 0
+            if action == "update":
+                size = local["size"]
+            elif action == "download":
+                size = int(remote.get("size", 0))
+            actions.append(SyncAction(relative, action, reason, size, remote["id"]))
+
+        return {
+            "actions": actions,
+            "local": local_files,
+            "remote": remote_files,
+            "folders": remote_folders,
+            "state": state,
+            "prefix": prefix,
+        }
+
+    # ---- 실행 ---------------------------------------------------------------
+
+    def _ensure_folder(self, folders: Dict[str, str], relative_dir: str, lock: threading.Lock) -> str:
+        """Drive 하위 폴더 ID (없으면 상위부터 생성)"""
+        with lock:
+            if relative_dir in folders:
+                return folders[relative_dir]
+            parent_dir, _, name = relative_dir.rpartition("/")
+        parent_id = self._ensure_folder(folders, parent_dir, lock)
+        with lock:
+            if relative_dir not in folders:
+                created = self.gdrive.create_folder(name, parent_id=parent_id)
+                if not created:
+                    raise RuntimeError(f"Failed to create Drive folder: {relative_dir}")
+                folders[relative_dir] = created["id"]
+            return folders[relative_dir]
+
+    def run(
+        self,
+        local_prefix: str,
+        folder_id: str,
+        direction: SyncDirection = SyncDirection.TO_GDRIVE,
+        policy: ConflictPolicy = ConflictPolicy.NEWER_WINS,
+        dry_run: bool = False,
+        progress: Optional[Callable[[SyncAction, int, int], None]] = None,
+    ) -> SyncReport:
+        """동기화 실행. ``dry_run`` 이면 계획만 보고합니다."""
+        started = time.monotonic()
+        direction = SyncDirection(direction)
+        policy = ConflictPolicy(policy)
+        plan = self.plan(local_prefix, folder_id, direction, policy)
+        report = SyncReport(direction=direction.value, dry_run=dry_run, actions=plan["actions"])
+        if dry_run:
+            report.elapsed_seconds = time.monotonic() - started
+            return report
+
+        state = plan["state"]
+        folders = plan["folders"]
+        prefix = plan["prefix"]
+        lock = threading.Lock()
+        transfers = [a for a in report.actions if a.action in ("upload", "update", "download")]
+        done = 0
+
+        def transfer(action: SyncAction):
+            local_path = f"{prefix}/{action.path}"
+            if action.action in ("upload", "update"):
+                parent_dir, _, name = action.path.rpartition("/")
+                parent_id = self._ensure_folder(folders, parent_dir, lock) if action.action == "upload" else None
+                result = self.gdrive.upload_path(
+                    str(self.local.base_path / local_path), name,
+                    folder_id=parent_id, file_id=action.file_id
+                )
+                action.file_id = result.get("id", action.file_id)
+                local_sha = plan["local"][action.path]["sha256"]
+                remote_version = self._remote_version(result)
+            else:
+                remote = plan["remote"][action.path]
+                if self.gdrive.is_google_native(remote.get("mimeType")):
+                    content = self.gdrive.get_file_content(action.file_id)
+                    self.local.write_file(local_path, content)
+                    action.size = len(content.encode("utf-8"))
+                else:
+                    with self.local.open_write(local_path) as f:
+                        self.gdrive.download_to(action.file_id, f)
+                local_sha = self.local.catalog.get(local_path)["sha256"]
+                remote_version = self._remote_version(remote)
+            return local_sha, remote_version
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="folder-sync") as pool:
+            futures = {pool.submit(transfer, action): action for action in transfers}
+            for future, action in futures.items():
+                try:
+                    local_sha, remote_version = future.result()
+                    state[action.path] = {
+                        "local_sha256": local_sha,
+                        "remote_version": remote_version,
+                        "file_id": action.file_id,
+                    }
+                    report.transferred_bytes += action.size
+                except Exception as e:
+                    logger.warning(f"폴더 동기화 실패 ({action.path}): {e}")
+                    action.error = str(e)
+                done += 1
+                if progress:
+                    progress(action, done, len(transfers))
+
+        # 변경 없는 파일도 기준 상태로 기록해 다음 실행의 충돌 판단에 사용
+        for action in report.actions:
+            if action.action == "skip" and action.path in plan["local"] and action.path in plan["remote"]:
+                state[action.path] = {
+                    "local_sha256": plan["local"][action.path]["sha256"],
+                    "remote_version": self._remote_version(plan["remote"][action.path]),
+                    "file_id": action.file_id,
+                }
+        self._save_state(self._state_path(local_prefix, folder_id), state)
+        report.elapsed_seconds = time.monotonic() - started
+        return report
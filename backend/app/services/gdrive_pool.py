@@ -0,0 +1,103 @@
+import asyncio
+import hashlib
+import threading
+import time
+import weakref
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+from fastapi.concurrency import run_in_threadpool
+from google.oauth2.credentials import Credentials
+
+from app.core.config import settings
+from app.services.gdrive_service import GoogleDriveService, gdrive_service
+
+
+T = TypeVar("T")
+
+
+def credential_fingerprint(credentials: Credentials) -> str:
+    """인증 정보 식별용 해시 (토큰 원문은 보관하지 않음)"""
+    raw = f"{getattr(credentials, 'client_id', '')}:{getattr(credentials, 'refresh_token', '')}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class DriveClientPool:
+    """사용자(인증 주체)별 Google Drive 클라이언트 풀
+
+    - 클라이언트는 인증 주체 키마다 하나씩 만들어 재사용하며, 다른 사용자와 공유하지 않습니다.
+    - ``idle_seconds`` 동안 쓰이지 않았거나 ``max_clients`` 를 넘으면 오래된 것부터 제거합니다.
+    - ``run`` 은 블로킹 Drive 호출을 스레드 풀에서 실행하고 동시 실행 수를 ``max_concurrency`` 로 제한합니다.
+    """
+
+    def __init__(
+        self,
+        max_clients: Optional[int] = None,
+        idle_seconds: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
+        factory: Callable[..., GoogleDriveService] = GoogleDriveService,
+        default_client: Optional[GoogleDriveService] = None,
+    ):
+        self.max_clients = max_clients or settings.GDRIVE_POOL_MAX_CLIENTS
+        self.idle_seconds = idle_seconds if idle_seconds is not None else settings.GDRIVE_POOL_IDLE_SECONDS
+        self.max_concurrency = max_concurrency or settings.GDRIVE_MAX_CONCURRENCY
+        self.factory = factory
+        self.default_client = default_client
+        self._clients: Dict[str, Tuple[GoogleDriveService, str, float]] = {}
+        self._lock = threading.Lock()
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def client_for(self, credentials: Optional[Credentials], key: Optional[str] = None) -> GoogleDriveService:
+        """인증 주체별 클라이언트 (인증 정보가 없으면 서비스 계정 기본 클라이언트)
+
+        ``key`` 는 사용자 ID 등 안정적인 식별자입니다. 같은 키라도 다른 refresh token 으로
+        다시 로그인한 경우에는 클라이언트를 새로 만듭니다.
+        """
+        if credentials is None:
+            return self.default_client if self.default_client is not None else gdrive_service
+        fingerprint = credential_fingerprint(credentials)
+        key = key or fingerprint
+        now = time.monotonic()
+        with self._lock:
+            self._evict_idle(now)
+            entry = self._clients.get(key)
+            if entry is not None and entry[1] == fingerprint:
+                client = entry[0]
+            else:
+                identity = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+                client = self.factory(credentials, identity=identity)
+            self._clients[key] = (client, fingerprint, now)
+            if len(self._clients) > self.max_clients:
+                oldest = min(self._clients, key=lambda k: self._clients[k][2])
+                del self._clients[oldest]
+            return client
+
+    def _evict_idle(self, now: float):
+        expired = [k for k, (_, _, used) in self._clients.items() if now - used > self.idle_seconds]
+        for key in expired:
+            del self._clients[key]
+
+    def evict(self, key: str):
+        with self._lock:
+            self._clients.pop(key, None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._clients)
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+            return semaphore
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """블로킹 Drive 호출을 이벤트 루프 밖(스레드 풀)에서 실행 (동시 실행 수 제한)"""
+        async with self._semaphore():
+            return await run_in_threadpool(func, *args, **kwargs)
+
+
+drive_client_pool = DriveClientPool()
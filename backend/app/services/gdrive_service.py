@@ -1,11 +1,35 @@
-from google.oauth2 import service_account
 from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseDownload, MediaFileUpload, MediaIoBaseUpload
-from typing import List, Dict, Optional, Any, Union
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Dict, Optional, Any, Union, Tuple, Iterator, Iterable, BinaryIO
 import io
-import pandas as pd
+import tempfile
+import threading
 from app.core.config import settings
+from app.core.metrics import observe_drive
+from app.core.tracing import start_span
+
+# googleapiclient/pandas 는 import 비용이 커서 실제로 Drive 를 쓸 때 불러옴
+if TYPE_CHECKING:
+    import pandas as pd
+    from google_auth_httplib2 import AuthorizedHttp
+
+
+_UNINITIALIZED = object()
+
+
+@lru_cache(maxsize=None)
+def instrumented_request_class():
+    """Drive API 메서드 ID(drive.files.list 등)별 호출 시간/오류를 기록하는 요청 클래스"""
+    from googleapiclient.http import HttpRequest
+    
+    class InstrumentedHttpRequest(HttpRequest):
+        def execute(self, http=None, num_retries=0):
+            method = self.methodId or 'unknown'
+            with observe_drive(method), start_span(method, **{'http.method': self.method}):
+                return super().execute(http=http, num_retries=num_retries)
+    
+    return InstrumentedHttpRequest
 
 
 class GoogleDriveService:
@@ -16,65 +40,285 @@ class GoogleDriveService:
         'https://www.googleapis.com/auth/drive.readonly',  # 모든 파일 읽기
     ]
     
-    def __init__(self, credentials: Optional[Credentials] = None):
-        self.service = None
-        self._init_service(credentials)
+    FOLDER_MIME_TYPE = 'application/vnd.google-apps.folder'
+    GOOGLE_APPS_PREFIX = 'application/vnd.google-apps.'
+    # 목록/메타데이터 조회 기본 필드 마스크
+    DEFAULT_FIELDS = 'id, name, mimeType, modifiedTime, size'
+    PAGE_SIZE = 1000
+    BATCH_SIZE = 100  # Drive 배치 요청 최대 개수
+    
+    def __init__(self, credentials: Optional[Credentials] = None, identity: str = "default"):
+        # 서비스 계정 기본 클라이언트는 처음 사용할 때 생성 (import 시 discovery 클라이언트를 만들지 않음)
+        self._service = _UNINITIALIZED
+        self._service_lock = threading.Lock()
+        # 캐시/풀 구분용 인증 주체 식별자 (서비스 계정은 "default")
+        self.identity = identity
+        self._credentials = None
+        self._local = threading.local()
+        if credentials:
+            self._init_service(credentials)
+    
+    @property
+    def service(self) -> Any:
+        if self._service is _UNINITIALIZED:
+            with self._service_lock:
+                if self._service is _UNINITIALIZED:
+                    self._init_service()
+        return self._service
+    
+    @service.setter
+    def service(self, value: Any):
+        self._service = value
+    
+    def _build(self, credentials) -> Any:
+        """스레드마다 별도 HTTP 연결을 쓰는 Drive 클라이언트 생성
+        
+        httplib2.Http 는 스레드 간 공유할 수 없으므로 요청 객체를 만들 때
+        현재 스레드의 AuthorizedHttp 를 붙입니다.
+        """
+        import httplib2
+        from google_auth_httplib2 import AuthorizedHttp
+        from googleapiclient.discovery import build
+        
+        self._credentials = credentials
+        self._local = threading.local()
+        request_class = instrumented_request_class()
+        
+        def request_builder(http, *args, **kwargs):
+            return request_class(self._thread_http(), *args, **kwargs)
+        
+        return build(
+            'drive', 'v3',
+            http=AuthorizedHttp(credentials, http=httplib2.Http()),
+            requestBuilder=request_builder,
+            cache_discovery=False
+        )
     
     def _init_service(self, credentials: Optional[Credentials] = None):
         """서비스 초기화 - OAuth 또는 서비스 계정 사용"""
+        self.service = None
         try:
             if credentials:
                 # OAuth 사용자 인증
-                self.service = build('drive', 'v3', credentials=credentials)
+                self.service = self._build(credentials)
             elif settings.GOOGLE_DRIVE_CREDENTIALS_PATH:
                 # 서비스 계정 인증
+                from google.oauth2 import service_account
                 sa_credentials = service_account.Credentials.from_service_account_file(
                     settings.GOOGLE_DRIVE_CREDENTIALS_PATH,
                     scopes=self.SCOPES
                 )
-                self.service = build('drive', 'v3', credentials=sa_credentials)
+                self.service = self._build(sa_credentials)
         except Exception as e:
             print(f"Warning: Failed to initialize Google Drive service: {e}")
             self.service = None
     
     def reinitialize(self, credentials: Credentials):
-        """사용자 OAuth 인증으로 서비스 재초기화"""
+        """사용자 OAuth 인증으로 서비스 재초기화
+        
+        공유 싱글톤에서 호출하면 다른 사용자의 요청까지 이 인증을 쓰게 됩니다.
+        사용자별 클라이언트는 ``drive_client_pool.client_for`` 를 사용하세요.
+        """
         self._init_service(credentials)
     
-    def list_files(self, folder_id: Optional[str] = None, query: Optional[str] = None) -> List[Dict]:
-        """파일 목록 조회"""
+    def _thread_http(self) -> Optional["AuthorizedHttp"]:
+        """스레드별 HTTP 연결 (httplib2.Http 는 스레드 간 공유 불가)"""
+        if self._credentials is None:
+            return None
+        import httplib2
+        from google_auth_httplib2 import AuthorizedHttp
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            http = self._local.http = AuthorizedHttp(self._credentials, http=httplib2.Http())
+        return http
+    
+    def iter_files(
+        self,
+        folder_id: Optional[str] = None,
+        query: Optional[str] = None,
+        fields: str = DEFAULT_FIELDS,
+        page_size: int = PAGE_SIZE
+    ) -> Iterator[Dict]:
+        """파일 목록 순회 (nextPageToken 을 따라 모든 페이지 조회)
+        
+        ``fields`` 는 파일 단위 필드 마스크입니다. 오류는 호출자에게 그대로 전달됩니다.
+        """
+        clauses = []
+        if folder_id:
+            clauses.append(f"'{folder_id}' in parents")
+        if query:
+            clauses.append(f"({query})" if folder_id else query)
+        q = " and ".join(clauses) or None
+        
+        page_token = None
+        while True:
+            response = self.service.files().list(
+                q=q,
+                fields=f"nextPageToken, files({fields})",
+                pageSize=page_size,
+                pageToken=page_token
+            ).execute()
+            yield from response.get('files', [])
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                return
+    
+    def list_files(
+        self,
+        folder_id: Optional[str] = None,
+        query: Optional[str] = None,
+        fields: str = DEFAULT_FIELDS
+    ) -> List[Dict]:
+        """파일 목록 조회 (전체 페이지)"""
         if not self.service:
             return []
         try:
-            if folder_id:
-                query = f"'{folder_id}' in parents"
-            
-            results = self.service.files().list(
-                q=query,
-                fields="files(id, name, mimeType, modifiedTime, size)",
-                pageSize=100
-            ).execute()
-            
-            return results.get('files', [])
+            return list(self.iter_files(folder_id=folder_id, query=query, fields=fields))
         except Exception as e:
             print(f"Error listing files: {e}")
             return []
     
+    def get_files_metadata(
+        self,
+        file_ids: Iterable[str],
+        fields: str = DEFAULT_FIELDS
+    ) -> Dict[str, Dict]:
+        """여러 파일 메타데이터를 배치 HTTP 요청으로 조회 (요청 100개 단위)
+        
+        실패한 ID 는 결과에서 빠집니다.
+        """
+        if not self.service:
+            return {}
+        ids = list(dict.fromkeys(file_ids))
+        results: Dict[str, Dict] = {}
+        
+        def callback(request_id, response, exception):
+            if exception is not None:
+                print(f"Error getting file metadata ({request_id}): {exception}")
+            else:
+                results[request_id] = response
+        
+        for start in range(0, len(ids), self.BATCH_SIZE):
+            chunk = ids[start:start + self.BATCH_SIZE]
+            batch = self.service.new_batch_http_request(callback=callback)
+            for file_id in chunk:
+                batch.add(self.service.files().get(fileId=file_id, fields=fields), request_id=file_id)
+            try:
+                with observe_drive('drive.batch'), start_span('drive.batch', requests=len(chunk)):
+                    batch.execute()
+            except Exception as e:
+                print(f"Error executing metadata batch: {e}")
+        return results
+    
+    def walk_folder(
+        self,
+        folder_id: str,
+        fields: str = DEFAULT_FIELDS,
+        max_workers: int = 4,
+        max_depth: Optional[int] = None
+    ) -> List[Dict]:
+        """하위 폴더까지 재귀 조회 (폴더 단위 병렬, 동시 요청 수 ``max_workers`` 로 제한)
+        
+        각 항목에 상위 폴더 기준 상대 경로 ``path`` 를 추가합니다. 폴더 항목도 포함됩니다.
+        """
+        if not self.service:
+            return []
+        if 'mimeType' not in fields:
+            fields = f"{fields}, mimeType"
+        
+        def list_children(item):
+            parent_id, prefix = item
+            children = list(self.iter_files(folder_id=parent_id, fields=fields))
+            for child in children:
+                child['path'] = f"{prefix}{child.get('name', '')}"
+            return children
+        
+        results: List[Dict] = []
+        frontier = [(folder_id, "")]
+        depth = 0
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gdrive-walk") as pool:
+                while frontier:
+                    next_frontier = []
+                    for children in pool.map(list_children, frontier):
+                        results.extend(children)
+                        if max_depth is None or depth < max_depth:
+                            next_frontier.extend(
+                                (child['id'], f"{child['path']}/")
+                                for child in children
+                                if child.get('mimeType') == self.FOLDER_MIME_TYPE
+                            )
+                    frontier = next_frontier
+                    depth += 1
+        except Exception as e:
+            print(f"Error walking folder: {e}")
+        return results
+    
+    @classmethod
+    def is_google_native(cls, mime_type: Optional[str]) -> bool:
+        """Google Docs/Sheets 등 내보내기(export)가 필요한 형식 여부"""
+        return bool(mime_type) and mime_type.startswith(cls.GOOGLE_APPS_PREFIX)
+    
+    def download_to(
+        self,
+        file_id: str,
+        sink: BinaryIO,
+        chunk_size: Optional[int] = None,
+        num_retries: Optional[int] = None,
+        export_mime_type: Optional[str] = None
+    ) -> int:
+        """파일을 청크 단위로 ``sink`` 에 기록하고 기록한 바이트 수 반환
+        
+        각 청크는 Range 요청으로 받으며, 일시 오류(5xx/429)는 해당 청크부터
+        ``num_retries`` 회까지 재시도합니다. Google Docs 는 ``export_mime_type`` 으로 내보냅니다.
+        오류는 호출자에게 그대로 전달됩니다.
+        """
+        if not self.service:
+            raise RuntimeError("Google Drive service is not initialized")
+        if export_mime_type:
+            request = self.service.files().export_media(fileId=file_id, mimeType=export_mime_type)
+        else:
+            request = self.service.files().get_media(fileId=file_id)
+        
+        from googleapiclient.http import MediaIoBaseDownload
+        start = sink.tell()
+        downloader = MediaIoBaseDownload(
+            sink, request, chunksize=chunk_size or settings.GDRIVE_DOWNLOAD_CHUNK_BYTES
+        )
+        retries = settings.GDRIVE_DOWNLOAD_RETRIES if num_retries is None else num_retries
+        done = False
+        while not done:
+            with observe_drive('drive.files.media'), start_span('drive.files.media', file_id=file_id):
+                status, done = downloader.next_chunk(num_retries=retries)
+        return sink.tell() - start
+    
+    def download_to_tempfile(
+        self,
+        file_id: str,
+        chunk_size: Optional[int] = None,
+        export_mime_type: Optional[str] = None
+    ) -> BinaryIO:
+        """임시 파일로 내려받아 처음 위치로 되감은 핸들 반환 (일정 크기 이상은 디스크로)
+        
+        호출자가 닫아야 합니다 (``with`` 사용 권장).
+        """
+        spool = tempfile.SpooledTemporaryFile(max_size=settings.GDRIVE_SPOOL_MAX_BYTES)
+        try:
+            self.download_to(file_id, spool, chunk_size=chunk_size, export_mime_type=export_mime_type)
+        except BaseException:
+            spool.close()
+            raise
+        spool.seek(0)
+        return spool
+    
     def download_file(self, file_id: str) -> bytes:
-        """파일 다운로드"""
+        """파일 다운로드 (전체를 메모리로, 큰 파일은 ``download_to`` 사용)"""
         if not self.service:
             return b""
         try:
-            request = self.service.files().get_media(fileId=file_id)
-            file_buffer = io.BytesIO()
-            downloader = MediaIoBaseDownload(file_buffer, request)
-            
-            done = False
-            while not done:
-                status, done = downloader.next_chunk()
-            
-            file_buffer.seek(0)
-            return file_buffer.read()
+            buffer = io.BytesIO()
+            self.download_to(file_id, buffer)
+            return buffer.getvalue()
         except Exception as e:
             print(f"Error downloading file: {e}")
             return b""
@@ -84,29 +328,21 @@ class GoogleDriveService:
         if not self.service:
             return ""
         try:
-            request = self.service.files().export_media(
-                fileId=file_id,
-                mimeType='text/plain'
-            )
-            file_buffer = io.BytesIO()
-            downloader = MediaIoBaseDownload(file_buffer, request)
-            
-            done = False
-            while not done:
-                status, done = downloader.next_chunk()
-            
-            file_buffer.seek(0)
-            return file_buffer.read().decode('utf-8')
+            buffer = io.BytesIO()
+            self.download_to(file_id, buffer, export_mime_type='text/plain')
+            return buffer.getvalue().decode('utf-8')
         except Exception as e:
             print(f"Error getting file content: {e}")
             return ""
     
-    def read_excel_file(self, file_id: str) -> pd.DataFrame:
-        """엑셀 파일 읽기"""
+    def read_excel_file(self, file_id: str) -> "pd.DataFrame":
+        """엑셀 파일 읽기 (임시 파일로 스트리밍 후 파일 핸들에서 파싱)"""
+        import pandas as pd
+        if not self.service:
+            return pd.DataFrame()
         try:
-            content = self.download_file(file_id)
-            df = pd.read_excel(io.BytesIO(content))
-            return df
+            with self.download_to_tempfile(file_id) as f:
+                return pd.read_excel(f)
         except Exception as e:
             print(f"Error reading Excel file: {e}")
             return pd.DataFrame()
@@ -118,13 +354,46 @@ class GoogleDriveService:
         try:
             file = self.service.files().get(
                 fileId=file_id,
-                fields='id, name, mimeType, modifiedTime, size, parents'
+                fields='id, name, mimeType, modifiedTime, size, parents, headRevisionId'
             ).execute()
             return file
         except Exception as e:
             print(f"Error getting file metadata: {e}")
             return {}
     
+    def get_start_page_token(self) -> Optional[str]:
+        """Changes API 시작 page token 조회"""
+        if not self.service:
+            return None
+        try:
+            return self.service.changes().getStartPageToken().execute().get('startPageToken')
+        except Exception as e:
+            print(f"Error getting start page token: {e}")
+            return None
+    
+    def list_changes(self, page_token: str) -> Optional[Tuple[List[Dict], Optional[str]]]:
+        """page token 이후 변경 목록 조회 (모든 페이지), (변경 목록, 다음 시작 토큰) 반환"""
+        if not self.service:
+            return None
+        try:
+            changes: List[Dict] = []
+            while page_token:
+                response = self.service.changes().list(
+                    pageToken=page_token,
+                    pageSize=1000,
+                    includeRemoved=True,
+                    fields='nextPageToken, newStartPageToken, '
+                           'changes(fileId, removed, file(id, name, mimeType, modifiedTime, headRevisionId, trashed))'
+                ).execute()
+                changes.extend(response.get('changes', []))
+                if 'newStartPageToken' in response:
+                    return changes, response['newStartPageToken']
+                page_token = response.get('nextPageToken')
+            return changes, None
+        except Exception as e:
+            print(f"Error listing changes: {e}")
+            return None
+    
     def upload_file(
         self, 
         file_path: str, 
@@ -140,6 +409,7 @@ class GoogleDriveService:
             if folder_id:
                 file_metadata['parents'] = [folder_id]
             
+            from googleapiclient.http import MediaFileUpload
             media = MediaFileUpload(file_path, mimetype=mime_type, resumable=True)
             file = self.service.files().create(
                 body=file_metadata,
@@ -151,6 +421,38 @@ class GoogleDriveService:
             print(f"Error uploading file: {e}")
             return None
     
+    def upload_path(
+        self,
+        file_path: str,
+        name: str,
+        folder_id: Optional[str] = None,
+        file_id: Optional[str] = None,
+        mime_type: Optional[str] = None,
+        fields: str = 'id, name, mimeType, modifiedTime, size, md5Checksum'
+    ) -> Dict:
+        """로컬 파일을 재개 가능한(resumable) 청크 업로드로 생성 또는 갱신
+        
+        ``file_id`` 가 있으면 해당 파일 내용을 교체합니다. 청크 단위 일시 오류는
+        ``GDRIVE_DOWNLOAD_RETRIES`` 회까지 중단 지점부터 재시도하며, 그 외 오류는 호출자에게 전달됩니다.
+        """
+        if not self.service:
+            raise RuntimeError("Google Drive service is not initialized")
+        from googleapiclient.http import MediaFileUpload
+        media = MediaFileUpload(
+            file_path,
+            mimetype=mime_type,
+            chunksize=settings.GDRIVE_DOWNLOAD_CHUNK_BYTES,
+            resumable=True
+        )
+        if file_id:
+            request = self.service.files().update(fileId=file_id, media_body=media, fields=fields)
+        else:
+            body: Dict[str, Any] = {'name': name}
+            if folder_id:
+                body['parents'] = [folder_id]
+            request = self.service.files().create(body=body, media_body=media, fields=fields)
+        return request.execute(num_retries=settings.GDRIVE_DOWNLOAD_RETRIES)
+    
     def upload_content(
         self,
         content: Union[str, bytes],
@@ -169,6 +471,7 @@ class GoogleDriveService:
             if isinstance(content, str):
                 content = content.encode('utf-8')
             
+            from googleapiclient.http import MediaIoBaseUpload
             media = MediaIoBaseUpload(io.BytesIO(content), mimetype=mime_type, resumable=True)
             file = self.service.files().create(
                 body=file_metadata,
@@ -209,6 +512,7 @@ class GoogleDriveService:
             if isinstance(content, str):
                 content = content.encode('utf-8')
             
+            from googleapiclient.http import MediaIoBaseUpload
             media = MediaIoBaseUpload(io.BytesIO(content), mimetype=mime_type, resumable=True)
             file = self.service.files().update(
                 fileId=file_id,
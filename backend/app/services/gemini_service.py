@@ -1,19 +1,29 @@
-import google.generativeai as genai
-from typing import List, Dict, Any, Optional
+from typing import TYPE_CHECKING, List, Dict, Any, Optional
 from app.core.config import settings
-import google.auth
 from google.oauth2.credentials import Credentials
-from langchain_google_genai import ChatGoogleGenerativeAI
+
+if TYPE_CHECKING:
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
 
 class GeminiService:
     def __init__(self):
         self.api_key = settings.GOOGLE_API_KEY
-        genai.configure(api_key=self.api_key)
+        self._genai = None
+
+    @property
+    def genai(self):
+        """google.generativeai 모듈 (처음 사용할 때 import/configure)"""
+        if self._genai is None:
+            import google.generativeai as genai
+            genai.configure(api_key=self.api_key)
+            self._genai = genai
+        return self._genai
 
     def list_available_models(self) -> List[Dict[str, Any]]:
         """사용 가능한 Gemini 모델 목록을 반환합니다."""
         models = []
-        for m in genai.list_models():
+        for m in self.genai.list_models():
             if 'generateContent' in m.supported_generation_methods:
                 models.append({
                     "name": m.name,
@@ -22,8 +32,9 @@ class GeminiService:
                 })
         return models
 
-    def get_chat_model(self, model_name: str, credentials: Optional[Credentials] = None) -> ChatGoogleGenerativeAI:
+    def get_chat_model(self, model_name: str, credentials: Optional[Credentials] = None) -> "ChatGoogleGenerativeAI":
         """선택된 모델과 인증 정보로 Chat 모델을 생성합니다."""
+        from langchain_google_genai import ChatGoogleGenerativeAI
         if credentials:
             return ChatGoogleGenerativeAI(
                 model=model_name,
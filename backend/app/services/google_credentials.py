@@ -0,0 +1,183 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Optional
+
+from google.oauth2.credentials import Credentials
+
+from app.core.config import settings
+from app.db.base import SessionLocal
+from app.db.models import User
+
+
+logger = logging.getLogger(__name__)
+
+TOKEN_URI = "https://oauth2.googleapis.com/token"
+
+
+def _utc_naive(value: Optional[datetime]) -> Optional[datetime]:
+    """google-auth 는 naive UTC 만료 시각을 사용"""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def persist_user_tokens(user_id: int, credentials: Credentials):
+    """갱신된 토큰을 User 행에 저장 (요청 세션과 독립된 별도 세션 사용)"""
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.id == user_id).first()
+        if user is None:
+            return
+        user.google_access_token = credentials.token
+        user.google_token_expiry = credentials.expiry
+        if credentials.refresh_token:
+            user.google_refresh_token = credentials.refresh_token
+        db.commit()
+    finally:
+        db.close()
+
+
+@dataclass
+class _CachedCredentials:
+    credentials: Credentials
+    refresh_token: str
+    last_used: float
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+def _google_request() -> object:
+    # requests 기반 전송 계층은 import 비용이 커서 첫 갱신 때 불러옴
+    from google.auth.transport import requests as google_requests
+    return google_requests.Request()
+
+
+class GoogleCredentialManager:
+    """사용자별 Google OAuth 인증 정보 캐시 + 토큰 갱신 관리
+
+    - 사용자마다 ``Credentials`` 객체 하나를 메모리에 두고 재사용합니다 (Drive 클라이언트도 같은 객체를 공유).
+    - 만료 ``refresh_margin_seconds`` 전부터 갱신하며, 같은 사용자의 동시 갱신은 사용자별 잠금으로 한 번만 수행합니다.
+    - 갱신된 access token / 만료 시각은 User 행에 저장해 재시작 후에도 다시 갱신하지 않습니다.
+    - 백그라운드 스레드가 최근 사용된 사용자의 토큰을 만료 전에 미리 갱신합니다.
+    """
+
+    def __init__(
+        self,
+        refresh_margin_seconds: Optional[float] = None,
+        idle_seconds: Optional[float] = None,
+        interval_seconds: Optional[float] = None,
+        request_factory: Optional[Callable[[], object]] = None,
+        persist: Callable[[int, Credentials], None] = persist_user_tokens,
+    ):
+        self.refresh_margin_seconds = (
+            refresh_margin_seconds if refresh_margin_seconds is not None
+            else settings.GOOGLE_TOKEN_REFRESH_MARGIN_SECONDS
+        )
+        self.idle_seconds = idle_seconds if idle_seconds is not None else settings.GOOGLE_CREDENTIAL_IDLE_SECONDS
+        self.interval_seconds = (
+            interval_seconds if interval_seconds is not None else settings.GOOGLE_TOKEN_REFRESH_INTERVAL_SECONDS
+        )
+        self.request_factory = request_factory or _google_request
+        self.persist = persist
+        self._entries: Dict[int, _CachedCredentials] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _build(self, user: User) -> Credentials:
+        return Credentials(
+            token=user.google_access_token,
+            refresh_token=user.google_refresh_token,
+            token_uri=TOKEN_URI,
+            client_id=settings.GOOGLE_CLIENT_ID,
+            client_secret=settings.GOOGLE_CLIENT_SECRET,
+            scopes=settings.GOOGLE_OAUTH_SCOPES,
+            expiry=_utc_naive(user.google_token_expiry),
+        )
+
+    def _needs_refresh(self, credentials: Credentials) -> bool:
+        if not credentials.token:
+            return True
+        if credentials.expiry is None:
+            # 만료 시각을 모르면 요청 중 401 응답 시 google-auth 가 갱신
+            return False
+        margin = timedelta(seconds=self.refresh_margin_seconds)
+        return datetime.now(timezone.utc).replace(tzinfo=None) >= credentials.expiry - margin
+
+    def get(self, user: User) -> Optional[Credentials]:
+        """사용자 인증 정보 (필요 시 갱신). 연동이 없거나 갱신에 실패하면 None"""
+        if not user.google_refresh_token:
+            self.invalidate(user.id)
+            return None
+        with self._lock:
+            entry = self._entries.get(user.id)
+            if entry is None or entry.refresh_token != user.google_refresh_token:
+                # 처음 사용하거나 다시 로그인해 refresh token 이 바뀐 경우
+                entry = _CachedCredentials(self._build(user), user.google_refresh_token, time.monotonic())
+                self._entries[user.id] = entry
+            entry.last_used = time.monotonic()
+        if self._needs_refresh(entry.credentials) and not self._refresh(user.id, entry):
+            return None
+        return entry.credentials
+
+    def _refresh(self, user_id: int, entry: _CachedCredentials) -> bool:
+        """사용자별 single-flight 갱신 (대기하던 호출은 앞선 갱신 결과를 그대로 사용)"""
+        with entry.lock:
+            if not self._needs_refresh(entry.credentials):
+                return True
+            try:
+                entry.credentials.refresh(self.request_factory())
+            except Exception as e:
+                logger.error(f"Google credentials 갱신 실패 (user {user_id}): {e}")
+                return False
+            if entry.credentials.refresh_token:
+                entry.refresh_token = entry.credentials.refresh_token
+        try:
+            self.persist(user_id, entry.credentials)
+        except Exception as e:
+            logger.warning(f"갱신된 Google 토큰 저장 실패 (user {user_id}): {e}")
+        return True
+
+    def invalidate(self, user_id: int):
+        """캐시 제거 (로그아웃, 연동 해제, 재로그인 시)"""
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def refresh_due(self):
+        """최근 사용된 사용자 중 곧 만료될 토큰을 미리 갱신하고, 오래 쓰지 않은 항목은 제거"""
+        now = time.monotonic()
+        with self._lock:
+            idle = [uid for uid, e in self._entries.items() if now - e.last_used > self.idle_seconds]
+            for uid in idle:
+                del self._entries[uid]
+            due = [(uid, e) for uid, e in self._entries.items() if self._needs_refresh(e.credentials)]
+        for user_id, entry in due:
+            self._refresh(user_id, entry)
+
+    def start(self):
+        if self.interval_seconds <= 0 or (self._thread and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="google-token-refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def _run(self):
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                self.refresh_due()
+            except Exception as e:
+                logger.warning(f"Google 토큰 사전 갱신 실패: {e}")
+
+
+google_credential_manager = GoogleCredentialManager()
@@ -0,0 +1,169 @@
+"""문서 분류별로 나눈 QMS 지식 베이스 (Chroma)
+
+SOP, 규격/규제, 위험 관리 자료, 양식을 분류마다 별도 컬렉션(``qms_kb_<분류>``)에 저장하고,
+모든 조각에 ``category`` 와 ``project_id`` metadata 를 붙입니다 (전사 공통 문서는 ``project_id=0``).
+검색은 지정한 분류의 컬렉션만, 공통 문서와 해당 프로젝트 문서로 좁혀서 수행하므로 전체 자료를 한
+인덱스에서 순위 매기지 않습니다. 질의는 한 번만 임베딩하고 분류별 결과를 거리순으로 합칩니다.
+``RERANK_STRATEGY`` 가 켜져 있으면 후보를 더 가져와 ``app.services.reranker`` 로 다시 고릅니다.
+
+컬렉션은 ``hnsw:space=cosine`` 과 ``KNOWLEDGE_HNSW_*`` 파라미터로 만듭니다. 예전 단일 컬렉션
+``qms_knowledge_base`` 의 자료는 ``python -m app.services.knowledge_base --repartition`` 으로
+저장된 임베딩을 그대로 옮깁니다 (다시 임베딩하지 않음).
+"""
+import argparse
+import logging
+from typing import Dict, List, Optional, Sequence, TextIO
+
+from app.core.config import settings
+from app.core.metrics import RERANK_DURATION, observe
+from app.core.tracing import start_span
+from app.services.reranker import Reranker, reranker as default_reranker
+from app.services.vector_db_service import VectorDBService, vector_db_service, write_lock
+
+
+logger = logging.getLogger(__name__)
+
+SOP = "sop"
+REGULATORY = "regulatory"
+RISK = "risk"
+TEMPLATES = "templates"
+CATEGORIES = (SOP, REGULATORY, RISK, TEMPLATES)
+
+# 프로젝트와 무관한 공통 문서의 project_id (Chroma metadata 는 None 을 허용하지 않음)
+GLOBAL_PROJECT_ID = 0
+LEGACY_COLLECTION = "qms_knowledge_base"
+REPARTITION_BATCH_SIZE = 500
+
+
+class UnknownCategory(ValueError):
+    """정의되지 않은 지식 베이스 분류"""
+
+
+def collection_name(category: str) -> str:
+    if category not in CATEGORIES:
+        raise UnknownCategory(f"Unknown knowledge category '{category}' (expected one of {', '.join(CATEGORIES)})")
+    return f"qms_kb_{category}"
+
+
+def project_filter(project_id: Optional[int]) -> Dict:
+    """공통 문서 + (있으면) 해당 프로젝트 문서만 검색"""
+    if not project_id:
+        return {"project_id": GLOBAL_PROJECT_ID}
+    return {"project_id": {"$in": [GLOBAL_PROJECT_ID, project_id]}}
+
+
+class KnowledgeBase:
+    def __init__(self, vector_db: VectorDBService = vector_db_service, hnsw: Optional[Dict] = None,
+                 reranker: Optional[Reranker] = None):
+        self.vector_db = vector_db
+        self.reranker = reranker or default_reranker
+        self.hnsw = hnsw or {
+            "hnsw:space": "cosine",
+            "hnsw:M": settings.KNOWLEDGE_HNSW_M,
+            "hnsw:construction_ef": settings.KNOWLEDGE_HNSW_CONSTRUCTION_EF,
+            "hnsw:search_ef": settings.KNOWLEDGE_HNSW_SEARCH_EF,
+        }
+        # 검색/적재 어느 쪽이 먼저 컬렉션을 만들어도 같은 HNSW 설정이 적용되도록 등록
+        for category in CATEGORIES:
+            vector_db.configure_collection(collection_name(category), self.hnsw)
+
+    @staticmethod
+    def _metadata(category: str, metadata: Dict, project_id: Optional[int]) -> Dict:
+        return {**metadata, "category": category, "project_id": project_id or GLOBAL_PROJECT_ID}
+
+    def ingest_text(self, category: str, text: str, metadata: Dict, project_id: Optional[int] = None,
+                    doc_id_prefix: str = "chunk") -> int:
+        return self.vector_db.process_and_add_document(
+            collection_name(category), text, self._metadata(category, metadata, project_id), doc_id_prefix
+        )
+
+    def ingest_stream(self, category: str, handle: TextIO, metadata: Dict, project_id: Optional[int] = None,
+                      doc_id_prefix: str = "chunk") -> int:
+        return self.vector_db.process_and_add_stream(
+            collection_name(category), handle, self._metadata(category, metadata, project_id), doc_id_prefix
+        )
+
+    def search(self, categories: Sequence[str], query: str, n_results: int = 5,
+               project_id: Optional[int] = None) -> Dict:
+        """분류별 컬렉션을 검색해 거리가 가까운 ``n_results`` 개를 Chroma 결과 형식으로 반환
+        
+        재순위화가 켜져 있으면 후보를 더 가져와 다시 고르고, 선택 순서대로 ``scores`` 를 붙입니다.
+        """
+        names = [collection_name(category) for category in categories]
+        embedding = self.vector_db.embed_query(query)
+        where = project_filter(project_id)
+        count = self.reranker.candidate_count(n_results)
+        include = ["metadatas", "documents", "distances"]
+        if self.reranker.enabled and self.reranker.needs_embeddings:
+            include.append("embeddings")
+        keys = ("ids", "distances", "documents", "metadatas", "embeddings")
+        hits = []
+        for name in names:
+            results = self.vector_db.query_by_embedding(name, embedding, count, where, include=include)
+            # include 에 없는 항목(embeddings)은 None 으로 채움
+            rows = len(results["ids"][0])
+            hits.extend(zip(*((results.get(key) or [[None] * rows])[0] for key in keys)))
+        hits.sort(key=lambda hit: hit[1])
+        hits = hits[:count]
+        candidates = {key: [hit[i] for hit in hits] for i, key in enumerate(keys)}
+        if not self.reranker.enabled:
+            return {key: [candidates[key]] for key in keys[:4]}
+        with observe(RERANK_DURATION, strategy=self.reranker.strategy), \
+                start_span("knowledge.rerank", strategy=self.reranker.strategy, candidates=len(hits)):
+            reranked = self.reranker.rerank(query, embedding, candidates, n_results)
+        return {key: [values] for key, values in reranked.items()}
+
+    def repartition_legacy(self, default_category: str = SOP,
+                           batch_size: int = REPARTITION_BATCH_SIZE) -> Dict[str, int]:
+        """``qms_knowledge_base`` 조각을 metadata 의 ``category``(없으면 ``default_category``)로 옮김
+
+        저장된 임베딩을 그대로 upsert 하므로 다시 실행해도 중복되지 않습니다.
+        """
+        collection_name(default_category)
+        legacy = self.vector_db.get_or_create_collection(LEGACY_COLLECTION)
+        moved = {category: 0 for category in CATEGORIES}
+        offset = 0
+        while True:
+            batch = legacy.get(
+                include=["documents", "metadatas", "embeddings"], limit=batch_size, offset=offset
+            )
+            if not batch["ids"]:
+                break
+            routed: Dict[str, Dict[str, List]] = {}
+            for doc_id, document, metadata, embedding in zip(
+                batch["ids"], batch["documents"], batch["metadatas"], batch["embeddings"]
+            ):
+                metadata = metadata or {}
+                category = metadata.get("category")
+                if category not in CATEGORIES:
+                    category = default_category
+                part = routed.setdefault(category, {"ids": [], "documents": [], "metadatas": [], "embeddings": []})
+                part["ids"].append(doc_id)
+                part["documents"].append(document)
+                part["metadatas"].append(self._metadata(category, metadata, metadata.get("project_id")))
+                part["embeddings"].append(embedding)
+            with write_lock:
+                for category, part in routed.items():
+                    self.vector_db.get_or_create_collection(collection_name(category)).upsert(**part)
+                    moved[category] += len(part["ids"])
+            offset += len(batch["ids"])
+        logger.info(f"지식 베이스 재분할 완료: {moved}")
+        return moved
+
+
+knowledge_base = KnowledgeBase()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="QMS 지식 베이스 분류별 컬렉션 관리")
+    parser.add_argument("--repartition", action="store_true",
+                        help=f"{LEGACY_COLLECTION} 의 조각을 분류별 컬렉션으로 이동")
+    parser.add_argument("--default-category", default=SOP, choices=CATEGORIES,
+                        help="metadata 에 category 가 없는 조각의 분류")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.repartition:
+        print(knowledge_base.repartition_legacy(default_category=args.default_category))
+    else:
+        parser.print_help()
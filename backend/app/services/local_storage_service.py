@@ -1,19 +1,60 @@
 import os
 import json
+import hashlib
 import shutil
+import uuid
+from contextlib import contextmanager
+import threading
 from pathlib import Path
-from typing import List, Dict, Optional, Any
+from typing import TYPE_CHECKING, List, Dict, Optional, Any, BinaryIO, Tuple, Iterator
 from datetime import datetime
-import pandas as pd
 from app.core.config import settings
+from app.services.storage_catalog import StorageCatalog, CatalogWatcher
+from app.utils.durable_io import DurableWriter
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def new_record_id(record_type: str) -> str:
+    """충돌 없는 기록 ID (마이크로초 타임스탬프 + 랜덤 접미사)"""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    return f"{record_type}_{timestamp}_{uuid.uuid4().hex[:8]}"
 
 
 class LocalStorageService:
     """로컬 파일 시스템에서 QMS 문서를 관리하는 서비스"""
     
-    def __init__(self, base_path: Optional[str] = None):
+    def __init__(self, base_path: Optional[str] = None, durability: Optional[str] = None):
         self.base_path = Path(base_path or settings.LOCAL_STORAGE_PATH)
         self._ensure_directories()
+        self.writer = DurableWriter(
+            self.base_path / ".locks",
+            mode=durability or settings.LOCAL_STORAGE_DURABILITY,
+            group_commit_ms=settings.LOCAL_STORAGE_GROUP_COMMIT_MS
+        )
+        self._catalog: Optional[StorageCatalog] = None
+        self._watcher: Optional[CatalogWatcher] = None
+        self._catalog_guard = threading.Lock()
+    
+    @property
+    def catalog(self) -> StorageCatalog:
+        """파일 메타데이터 카탈로그 (첫 사용 시 연결, import 시점에는 열지 않음)"""
+        if self._catalog is None:
+            with self._catalog_guard:
+                if self._catalog is None:
+                    self._catalog = StorageCatalog(self.base_path)
+        return self._catalog
+    
+    @property
+    def watcher(self) -> CatalogWatcher:
+        """카탈로그 정합성 검사 스레드 (시작 시 1회 검사 후 주기적으로 반복)"""
+        if self._watcher is None:
+            self._watcher = CatalogWatcher(
+                self.catalog,
+                interval_seconds=settings.LOCAL_STORAGE_CATALOG_RECONCILE_SECONDS
+            )
+        return self._watcher
     
     def _ensure_directories(self):
         """필수 디렉토리 구조 생성"""
@@ -31,32 +72,53 @@ class LocalStorageService:
     def list_files(
         self, 
         category: str = "", 
-        extension: Optional[str] = None
+        extension: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0
     ) -> List[Dict[str, Any]]:
-        """특정 카테고리의 파일 목록 조회"""
-        target_path = self.base_path / category if category else self.base_path
-        
-        if not target_path.exists():
-            return []
-        
-        files = []
-        for item in target_path.rglob("*"):
-            if item.is_file():
-                if extension and not item.suffix.lower() == f".{extension.lower()}":
-                    continue
-                    
-                stat = item.stat()
-                files.append({
-                    "name": item.name,
-                    "path": str(item.relative_to(self.base_path)),
-                    "absolute_path": str(item),
-                    "size": stat.st_size,
-                    "modified_at": datetime.fromtimestamp(stat.st_mtime).isoformat(),
-                    "extension": item.suffix.lower(),
-                    "category": category or "root"
-                })
-        
-        return sorted(files, key=lambda x: x["modified_at"], reverse=True)
+        """특정 카테고리의 파일 목록 조회 (카탈로그 인덱스 기반, 최신순 페이지)"""
+        return self.catalog.query(
+            category=category,
+            extension=extension,
+            limit=limit,
+            offset=offset
+        )
+    
+    def count_files(self, category: str = "", extension: Optional[str] = None) -> int:
+        """특정 카테고리의 파일 개수"""
+        return self.catalog.count(category=category, extension=extension)
+    
+    def _relative(self, full_path: Path) -> str:
+        return full_path.relative_to(self.base_path).as_posix()
+    
+    def _catalog_upsert(self, full_path: Path, sha256: Optional[str] = None):
+        self.catalog.upsert(self._relative(full_path), sha256=sha256)
+    
+    def resolve_path(self, file_path: str) -> Path:
+        """저장소 내부 경로로 변환 (저장소 밖/숨김 경로는 ValueError)"""
+        base = self.base_path.resolve()
+        resolved = (base / file_path).resolve()
+        if resolved == base or base not in resolved.parents:
+            raise ValueError(f"Invalid path: {file_path}")
+        relative = resolved.relative_to(base)
+        if any(part.startswith(".") for part in relative.parts):
+            raise ValueError(f"Invalid path: {file_path}")
+        return self.base_path / relative
+    
+    def open_file(self, file_path: str) -> Tuple[BinaryIO, os.stat_result, str]:
+        """다운로드용 파일 핸들, stat, ETag 반환 (ETag 는 카탈로그 SHA-256 우선)"""
+        full_path = self.resolve_path(file_path)
+        if not full_path.is_file():
+            raise FileNotFoundError(f"File not found: {file_path}")
+        handle = open(full_path, "rb")
+        stat = os.fstat(handle.fileno())
+        entry = self.catalog.get(self._relative(full_path))
+        if entry and entry["sha256"] and entry["size"] == stat.st_size \
+                and entry["modified_at"] == datetime.fromtimestamp(stat.st_mtime).isoformat():
+            etag = f'"{entry["sha256"]}"'
+        else:
+            etag = f'W/"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+        return handle, stat, etag
     
     def read_file(self, file_path: str) -> str:
         """텍스트 파일 읽기"""
@@ -71,8 +133,9 @@ class LocalStorageService:
         content = self.read_file(file_path)
         return json.loads(content)
     
-    def read_excel(self, file_path: str, sheet_name: Optional[str] = None) -> pd.DataFrame:
+    def read_excel(self, file_path: str, sheet_name: Optional[str] = None) -> "pd.DataFrame":
         """엑셀 파일 읽기"""
+        import pandas as pd
         full_path = self.base_path / file_path
         if not full_path.exists():
             raise FileNotFoundError(f"File not found: {file_path}")
@@ -80,22 +143,52 @@ class LocalStorageService:
         return pd.read_excel(full_path, sheet_name=sheet_name)
     
     def write_file(self, file_path: str, content: str) -> str:
-        """텍스트 파일 저장"""
+        """텍스트 파일 저장 (임시 파일 + fsync + rename 으로 원자적 교체)"""
         full_path = self.base_path / file_path
-        full_path.parent.mkdir(parents=True, exist_ok=True)
-        full_path.write_text(content, encoding="utf-8")
+        data = content.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        self.writer.write_bytes(
+            full_path,
+            data,
+            on_commit=lambda path: self._catalog_upsert(path, sha256=digest)
+        )
         return str(full_path)
     
+    def write_stream(
+        self,
+        file_path: str,
+        source: BinaryIO,
+        chunk_size: int = 1024 * 1024
+    ) -> str:
+        """파일 객체 내용을 청크 단위로 원자적 저장 (업로드 등, 메모리 사용량 일정)"""
+        full_path = self.resolve_path(file_path)
+        digest = hashlib.sha256()
+        with self.writer.open(
+            full_path,
+            on_commit=lambda path: self._catalog_upsert(path, sha256=digest.hexdigest())
+        ) as f:
+            for chunk in iter(lambda: source.read(chunk_size), b""):
+                digest.update(chunk)
+                f.write(chunk)
+        return str(full_path)
+    
+    @contextmanager
+    def open_write(self, file_path: str) -> Iterator[BinaryIO]:
+        """원자적 쓰기 핸들 (블록이 정상 종료될 때만 교체 + 카탈로그 갱신)"""
+        full_path = self.resolve_path(file_path)
+        with self.writer.open(full_path, on_commit=self._catalog_upsert) as f:
+            yield f
+    
     def write_json(self, file_path: str, data: Dict[str, Any]) -> str:
         """JSON 파일 저장"""
         content = json.dumps(data, ensure_ascii=False, indent=2)
         return self.write_file(file_path, content)
     
-    def write_excel(self, file_path: str, df: pd.DataFrame, sheet_name: str = "Sheet1") -> str:
+    def write_excel(self, file_path: str, df: "pd.DataFrame", sheet_name: str = "Sheet1") -> str:
         """엑셀 파일 저장"""
         full_path = self.base_path / file_path
-        full_path.parent.mkdir(parents=True, exist_ok=True)
-        df.to_excel(full_path, sheet_name=sheet_name, index=False)
+        with self.writer.open(full_path, on_commit=self._catalog_upsert) as f:
+            df.to_excel(f, sheet_name=sheet_name, index=False, engine="openpyxl")
         return str(full_path)
     
     def save_record(
@@ -105,31 +198,40 @@ class LocalStorageService:
         filename: Optional[str] = None
     ) -> str:
         """분석 결과 등 기록 저장"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        record_id = new_record_id(record_type)
         if not filename:
-            filename = f"{record_type}_{timestamp}.json"
+            filename = f"{record_id}.json"
         
         file_path = f"records/{record_type}/{filename}"
         return self.write_json(file_path, {
+            "record_id": record_id,
             "created_at": datetime.now().isoformat(),
             "record_type": record_type,
             "data": data
         })
     
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """그룹 커밋 모드에서 대기 중인 쓰기를 디스크에 영속화"""
+        return self.writer.flush(timeout=timeout)
+    
     def delete_file(self, file_path: str) -> bool:
         """파일 삭제"""
         full_path = self.base_path / file_path
-        if full_path.exists():
-            full_path.unlink()
-            return True
+        with self.writer.lock(full_path):
+            if full_path.exists():
+                full_path.unlink()
+                self.catalog.remove(self._relative(full_path))
+                return True
         return False
     
     def copy_file(self, source_path: str, dest_path: str) -> str:
-        """파일 복사"""
+        """파일 복사 (수정시각/권한 등 메타데이터 보존)"""
         src = self.base_path / source_path
         dst = self.base_path / dest_path
-        dst.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(src, dst)
+        with self.writer.open(dst, on_commit=self._catalog_upsert) as f, open(src, "rb") as source:
+            shutil.copyfileobj(source, f)
+            f.flush()
+            shutil.copystat(src, f.name)
         return str(dst)
 
 
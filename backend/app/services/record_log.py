@@ -0,0 +1,575 @@
+import os
+import json
+import bisect
+import logging
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Dict, Optional, Any, Iterator, Tuple, NamedTuple
+from datetime import datetime
+from app.core.config import settings
+from app.services.local_storage_service import new_record_id
+from app.utils.durable_io import GroupCommitter, atomic_write_bytes
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 내 잠금만 사용
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = ".manifest.json"
+LOCK_NAME = ".lock"
+LEGACY_MARKER_NAME = ".legacy_imported"
+SEGMENT_GLOB = "segment-*.jsonl"
+
+
+def _segment_seq(name: str) -> int:
+    return int(name[len("segment-"):-len(".jsonl")])
+
+
+class IndexEntry(NamedTuple):
+    record_id: str
+    record_type: str
+    change_id: Optional[str]
+    ts: float
+    offset: int
+    length: int
+    deleted: bool = False
+
+
+class SegmentIndex:
+    """세그먼트 단위 인덱스 (record_type / change_id / 시간)"""
+
+    def __init__(self, name: str, entries: Optional[List[IndexEntry]] = None, size: int = 0):
+        self.name = name
+        self.entries: List[IndexEntry] = []
+        self.timestamps: List[float] = []
+        self.by_type: Dict[str, List[int]] = {}
+        self.by_change: Dict[str, List[int]] = {}
+        self.size = size
+        for entry in entries or []:
+            self.add(entry)
+
+    def add(self, entry: IndexEntry):
+        position = len(self.entries)
+        self.entries.append(entry)
+        self.timestamps.append(entry.ts)
+        if entry.deleted:
+            return
+        self.by_type.setdefault(entry.record_type, []).append(position)
+        if entry.change_id is not None:
+            self.by_change.setdefault(entry.change_id, []).append(position)
+
+    @property
+    def min_ts(self) -> float:
+        return self.timestamps[0] if self.timestamps else 0.0
+
+    @property
+    def max_ts(self) -> float:
+        return self.timestamps[-1] if self.timestamps else 0.0
+
+    def positions(
+        self,
+        record_type: Optional[str],
+        change_id: Optional[str],
+        start: Optional[float],
+        end: Optional[float],
+    ) -> List[int]:
+        if change_id is not None:
+            candidates = self.by_change.get(change_id, [])
+            if record_type is not None:
+                candidates = [p for p in candidates if self.entries[p].record_type == record_type]
+        elif record_type is not None:
+            candidates = self.by_type.get(record_type, [])
+        else:
+            # 시간 범위만 지정된 경우: 타임스탬프 정렬을 이용한 이진 탐색
+            lo = bisect.bisect_left(self.timestamps, start) if start is not None else 0
+            hi = bisect.bisect_right(self.timestamps, end) if end is not None else len(self.timestamps)
+            return [p for p in range(lo, hi) if not self.entries[p].deleted]
+
+        return [
+            p for p in candidates
+            if (start is None or self.entries[p].ts >= start)
+            and (end is None or self.entries[p].ts <= end)
+        ]
+
+    def to_json(self) -> Dict[str, Any]:
+        return {"name": self.name, "size": self.size, "entries": [list(e) for e in self.entries]}
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "SegmentIndex":
+        return cls(data["name"], [IndexEntry(*e) for e in data["entries"]], size=data["size"])
+
+
+class RecordLog:
+    """추가 전용(append-only) 세그먼트 기록 저장소 (JSON Lines)
+
+    분석 결과마다 파일을 만드는 대신 활성 세그먼트에 한 줄씩 추가하고,
+    세그먼트가 ``max_segment_bytes`` 에 도달하면 봉인(seal)하며 인덱스를 사이드카로 기록합니다.
+    세그먼트 목록은 ``.manifest.json`` 으로 원자적으로 교체되어 회전/압축 중 장애에도 일관됩니다.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        max_segment_bytes: Optional[int] = None,
+        durability: Optional[str] = None,
+        group_commit_ms: Optional[int] = None,
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_segment_bytes = max_segment_bytes or settings.RECORD_LOG_SEGMENT_MAX_BYTES
+        self.durability = durability or settings.LOCAL_STORAGE_DURABILITY
+        self.committer = (
+            GroupCommitter(group_commit_ms or settings.LOCAL_STORAGE_GROUP_COMMIT_MS)
+            if self.durability == "group" else None
+        )
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._segments: List[SegmentIndex] = []
+        self._by_id: Dict[str, Tuple[str, int, int]] = {}
+        self._next_seq = 1
+        self._manifest_version = -1
+        with self._exclusive():
+            self._load()
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        """로그 전체에 대한 배타 잠금 (프로세스 내 RLock + 프로세스 간 flock)
+
+        재진입 가능합니다. flock 은 바깥쪽 진입에서 한 번만 잡습니다 — 같은 프로세스라도
+        ``.lock`` 을 다시 열어 flock 하면 자기 자신이 쥔 잠금에 막히기 때문입니다.
+        매니페스트/사이드카 쓰기는 이 잠금 안에서 ``atomic_write_bytes`` 로 수행합니다.
+        """
+        with self._lock:
+            if self._depth or fcntl is None:
+                self._depth += 1
+                try:
+                    yield
+                finally:
+                    self._depth -= 1
+                return
+            with open(self.directory / LOCK_NAME, "a+b") as lock_file:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                self._depth += 1
+                try:
+                    yield
+                finally:
+                    self._depth -= 1
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    # ---- 매니페스트 / 로딩 -------------------------------------------------
+
+    def _manifest_path(self) -> Path:
+        return self.directory / MANIFEST_NAME
+
+    def _sidecar_path(self, name: str) -> Path:
+        return self.directory / f".{name}.idx.json"
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        path = self._manifest_path()
+        if not path.exists():
+            return {"version": 0, "next_seq": 1, "segments": []}
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def _write_manifest(self):
+        self._manifest_version += 1
+        manifest = {
+            "version": self._manifest_version,
+            "next_seq": self._next_seq,
+            "segments": [s.name for s in self._segments],
+        }
+        atomic_write_bytes(
+            self._manifest_path(),
+            json.dumps(manifest, ensure_ascii=False).encode("utf-8")
+        )
+
+    def _load(self):
+        """매니페스트 기준으로 인덱스 재구성 (``_exclusive`` 안에서만 호출)"""
+        manifest = self._read_manifest()
+        self._manifest_version = manifest["version"]
+        self._next_seq = manifest["next_seq"]
+        self._segments = []
+        self._by_id = {}
+
+        names = manifest["segments"]
+        for i, name in enumerate(names):
+            sidecar = self._sidecar_path(name)
+            is_active = i == len(names) - 1
+            if not is_active and sidecar.exists():
+                index = SegmentIndex.from_json(json.loads(sidecar.read_text(encoding="utf-8")))
+            else:
+                index = self._scan_segment(name, truncate_partial=is_active)
+            self._segments.append(index)
+            self._register(index)
+
+        self._remove_orphans()
+        if not self._segments:
+            self._segments.append(self._new_segment())
+            self._write_manifest()
+
+    def _register(self, index: SegmentIndex, start: int = 0):
+        for entry in index.entries[start:]:
+            if entry.deleted:
+                self._by_id.pop(entry.record_id, None)
+            else:
+                self._by_id[entry.record_id] = (index.name, entry.offset, entry.length)
+
+    def _scan_segment(self, name: str, truncate_partial: bool = False, start: int = 0,
+                      index: Optional[SegmentIndex] = None) -> SegmentIndex:
+        """세그먼트 파일을 읽어 인덱스 재구성 (활성 세그먼트의 잘린 마지막 줄은 제거)"""
+        path = self.directory / name
+        index = index or SegmentIndex(name)
+        if not path.exists():
+            path.touch()
+        with open(path, "rb") as f:
+            f.seek(start)
+            offset = start
+            for line in f:
+                if not line.endswith(b"\n"):
+                    if truncate_partial:
+                        logger.warning(f"기록 로그 {name}: 불완전한 마지막 레코드 제거 (offset {offset})")
+                        os.truncate(path, offset)
+                    break
+                index.add(self._entry_from_line(line, offset))
+                offset += len(line)
+        index.size = offset
+        return index
+
+    def _entry_from_line(self, line: bytes, offset: int) -> IndexEntry:
+        record = json.loads(line)
+        return IndexEntry(
+            record["record_id"],
+            record.get("record_type", ""),
+            record.get("change_id"),
+            record["ts"],
+            offset,
+            len(line),
+            bool(record.get("deleted", False)),
+        )
+
+    def _new_segment(self) -> SegmentIndex:
+        """새 세그먼트 생성. 번호를 먼저 매니페스트에 기록해 장애 후에도 재사용되지 않게 합니다."""
+        name = f"segment-{self._next_seq:06d}.jsonl"
+        self._next_seq += 1
+        self._write_manifest()
+        # 매니페스트에 없는 같은 이름의 파일은 중단된 작업의 잔여물이므로 비운다
+        fd = os.open(str(self.directory / name), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        os.close(fd)
+        return SegmentIndex(name)
+
+    def _sync(self):
+        """다른 프로세스가 회전/압축/추가한 내용을 반영 (``_exclusive`` 안에서만 호출)
+
+        잘린 꼬리 복구(truncate)가 다른 프로세스의 진행 중인 추가를 자르지 않도록
+        읽기 경로도 배타 잠금을 잡은 상태에서만 동기화합니다.
+        """
+        manifest_version = self._read_manifest()["version"]
+        if manifest_version != self._manifest_version:
+            self._load()
+            return
+        active = self._segments[-1]
+        path = self.directory / active.name
+        if path.stat().st_size > active.size:
+            known = len(active.entries)
+            self._scan_segment(active.name, start=active.size, index=active)
+            self._register(active, start=known)
+
+    # ---- 쓰기 ---------------------------------------------------------------
+
+    def append(self, record_type: str, data: Dict[str, Any], change_id: Optional[Any] = None,
+               record_id: Optional[str] = None) -> str:
+        """기록 추가. 생성된 record_id 를 반환합니다."""
+        record_id = record_id or new_record_id(record_type)
+        if change_id is None and isinstance(data, dict):
+            change_id = data.get("change_id")
+        self._append_line({
+            "record_id": record_id,
+            "record_type": record_type,
+            "change_id": str(change_id) if change_id is not None else None,
+            "data": data,
+        })
+        return record_id
+
+    def delete(self, record_id: str) -> bool:
+        """삭제 표시(tombstone) 추가. 실제 공간은 ``compact`` 에서 회수됩니다."""
+        with self._exclusive():
+            self._sync()
+            if record_id not in self._by_id:
+                return False
+            self._append_line_locked({"record_id": record_id, "deleted": True})
+            return True
+
+    def _append_line(self, record: Dict[str, Any]):
+        with self._exclusive():
+            self._sync()
+            self._append_line_locked(record)
+
+    def _append_line_locked(self, record: Dict[str, Any]):
+        # 세그먼트 내 시간 순서를 보장하도록 타임스탬프는 잠금 안에서 부여
+        now = datetime.now()
+        record["created_at"] = now.isoformat()
+        record["ts"] = now.timestamp()
+        line = (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+        active = self._segments[-1]
+        if active.size and active.size + len(line) > self.max_segment_bytes:
+            active = self._rotate()
+
+        path = self.directory / active.name
+        fd = os.open(str(path), os.O_WRONLY | os.O_APPEND)
+        try:
+            os.write(fd, line)
+            if self.committer is None:
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+        if self.committer is not None:
+            self.committer.submit(path)
+
+        entry = self._entry_from_line(line, active.size)
+        active.add(entry)
+        active.size += len(line)
+        self._register(active, start=len(active.entries) - 1)
+
+    def _rotate(self) -> SegmentIndex:
+        """활성 세그먼트 봉인 + 인덱스 사이드카 기록 후 새 세그먼트 시작"""
+        sealed = self._segments[-1]
+        self.flush()
+        atomic_write_bytes(
+            self._sidecar_path(sealed.name),
+            json.dumps(sealed.to_json(), ensure_ascii=False).encode("utf-8")
+        )
+        active = self._new_segment()
+        self._segments.append(active)
+        self._write_manifest()
+        return active
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        if self.committer is None:
+            return True
+        return self.committer.flush(timeout=timeout)
+
+    # ---- 읽기 ---------------------------------------------------------------
+
+    def _read_at(self, name: str, offset: int, length: int) -> Dict[str, Any]:
+        with open(self.directory / name, "rb") as f:
+            f.seek(offset)
+            return json.loads(f.read(length))
+
+    def get(self, record_id: str) -> Optional[Dict[str, Any]]:
+        """record_id 로 기록 조회"""
+        with self._exclusive():
+            self._sync()
+            location = self._by_id.get(record_id)
+            if location is None:
+                return None
+            return self._read_at(*location)
+
+    def iter_records(
+        self,
+        record_type: Optional[str] = None,
+        change_id: Optional[Any] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        reverse: bool = False,
+        limit: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """record_type / change_id / 시간 범위로 기록 순회 (세그먼트 시간 범위로 가지치기)"""
+        start_ts = start.timestamp() if start else None
+        end_ts = end.timestamp() if end else None
+        key = str(change_id) if change_id is not None else None
+
+        # 계획 수립과 파일 열기를 잠금 안에서 수행: 이후 compact() 가 세그먼트를
+        # 삭제하더라도 열린 핸들로 끝까지 읽을 수 있습니다.
+        handles: Dict[str, Any] = {}
+        try:
+            with self._exclusive():
+                self._sync()
+                plan: List[Tuple[str, List[IndexEntry]]] = []
+                for segment in self._segments:
+                    if not segment.entries:
+                        continue
+                    if start_ts is not None and segment.max_ts < start_ts:
+                        continue
+                    if end_ts is not None and segment.min_ts > end_ts:
+                        continue
+                    positions = segment.positions(record_type, key, start_ts, end_ts)
+                    entries = [
+                        segment.entries[p] for p in positions
+                        if self._by_id.get(segment.entries[p].record_id, (None,))[0] == segment.name
+                    ]
+                    if entries:
+                        plan.append((segment.name, entries))
+                        handles[segment.name] = open(self.directory / segment.name, "rb")
+
+            if reverse:
+                plan = [(name, entries[::-1]) for name, entries in reversed(plan)]
+
+            produced = 0
+            for name, entries in plan:
+                f = handles[name]
+                for entry in entries:
+                    if limit is not None and produced >= limit:
+                        return
+                    f.seek(entry.offset)
+                    yield json.loads(f.read(entry.length))
+                    produced += 1
+        finally:
+            for f in handles.values():
+                f.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._exclusive():
+            self._sync()
+            return {
+                "segments": len(self._segments),
+                "records": len(self._by_id),
+                "bytes": sum(s.size for s in self._segments),
+                "entries": sum(len(s.entries) for s in self._segments),
+            }
+
+    # ---- 압축 ---------------------------------------------------------------
+
+    def _remove_orphans(self):
+        """매니페스트에 없는 세그먼트 (중단된 회전/압축의 잔여물) 제거
+
+        ``next_seq`` 이상의 번호는 매니페스트가 모르는 파일이므로 지우지 않고 번호만 건너뜁니다.
+        """
+        live = {s.name for s in self._segments}
+        for path in self.directory.glob(SEGMENT_GLOB):
+            if path.name in live:
+                continue
+            seq = _segment_seq(path.name)
+            if seq < self._next_seq:
+                path.unlink(missing_ok=True)
+                self._sidecar_path(path.name).unlink(missing_ok=True)
+            else:
+                logger.warning(f"기록 로그: 매니페스트에 없는 세그먼트 {path.name} 보존")
+                self._next_seq = seq + 1
+
+    def compact(self) -> Dict[str, int]:
+        """봉인된 세그먼트를 병합하며 삭제된 기록과 tombstone 을 제거"""
+        with self._exclusive():
+            self._sync()
+            sealed = self._segments[:-1]
+            if not sealed:
+                return {"segments_before": 0, "segments_after": 0, "bytes_reclaimed": 0}
+
+            before_bytes = sum(s.size for s in sealed)
+            outputs: List[SegmentIndex] = []
+            current: Optional[SegmentIndex] = None
+            handle = None
+            try:
+                for segment in sealed:
+                    with open(self.directory / segment.name, "rb") as source:
+                        for entry in segment.entries:
+                            if entry.deleted:
+                                continue
+                            if self._by_id.get(entry.record_id, (None,))[0] != segment.name:
+                                continue
+                            source.seek(entry.offset)
+                            line = source.read(entry.length)
+                            if current is None or current.size + len(line) > self.max_segment_bytes:
+                                if handle:
+                                    handle.flush()
+                                    os.fsync(handle.fileno())
+                                    handle.close()
+                                current = self._new_segment()
+                                outputs.append(current)
+                                handle = open(self.directory / current.name, "ab")
+                            handle.write(line)
+                            current.add(entry._replace(offset=current.size))
+                            current.size += len(line)
+            finally:
+                if handle:
+                    handle.flush()
+                    os.fsync(handle.fileno())
+                    handle.close()
+
+            for index in outputs:
+                atomic_write_bytes(
+                    self._sidecar_path(index.name),
+                    json.dumps(index.to_json(), ensure_ascii=False).encode("utf-8")
+                )
+
+            old_names = [s.name for s in sealed]
+            self._segments = outputs + [self._segments[-1]]
+            self._write_manifest()
+
+            for name in old_names:
+                (self.directory / name).unlink(missing_ok=True)
+                self._sidecar_path(name).unlink(missing_ok=True)
+
+            self._by_id = {}
+            for index in self._segments:
+                self._register(index)
+
+            return {
+                "segments_before": len(sealed),
+                "segments_after": len(outputs),
+                "bytes_reclaimed": before_bytes - sum(s.size for s in outputs),
+            }
+
+
+    # ---- 기존 파일 기록 가져오기 -------------------------------------------
+
+    def import_legacy_records(self, records_dir: Path) -> int:
+        """``records/{record_type}/*.json`` 개별 파일 기록을 로그로 1회 가져오기
+
+        원본 파일은 그대로 둡니다. 완료 표시 파일이 있으면 다시 실행하지 않으며,
+        이미 로그에 있는 record_id 는 건너뜁니다.
+        """
+        records_dir = Path(records_dir)
+        marker = self.directory / LEGACY_MARKER_NAME
+        with self._exclusive():
+            if marker.exists():
+                return 0
+            self._sync()
+            paths = sorted(records_dir.glob("*/*.json"), key=lambda p: (p.stat().st_mtime, p.name))
+            imported = 0
+            for path in paths:
+                try:
+                    content = json.loads(path.read_text(encoding="utf-8"))
+                except (OSError, ValueError) as e:
+                    logger.warning(f"기존 기록 가져오기 실패 ({path}): {e}")
+                    continue
+                if not isinstance(content, dict):
+                    content = {"data": content}
+                record_id = content.get("record_id") or path.stem
+                if record_id in self._by_id:
+                    continue
+                data = content.get("data", content)
+                change_id = data.get("change_id") if isinstance(data, dict) else None
+                self._append_line_locked({
+                    "record_id": record_id,
+                    "record_type": content.get("record_type") or path.parent.name,
+                    "change_id": str(change_id) if change_id is not None else None,
+                    "data": data,
+                    "legacy_path": path.relative_to(records_dir.parent).as_posix(),
+                    "legacy_created_at": content.get("created_at"),
+                })
+                imported += 1
+            self.flush()
+            atomic_write_bytes(marker, json.dumps({"imported": imported}).encode("utf-8"))
+            if imported:
+                logger.info(f"기존 파일 기록 {imported}건을 기록 로그로 가져왔습니다")
+            return imported
+
+
+_record_log: Optional[RecordLog] = None
+_record_log_guard = threading.Lock()
+
+
+def get_record_log() -> RecordLog:
+    """기록 로그 싱글톤 (첫 사용 시 생성)
+
+    카탈로그 대상에서 제외되도록 저장소 안의 숨김 디렉토리에 둡니다.
+    """
+    global _record_log
+    with _record_log_guard:
+        if _record_log is None:
+            base_path = Path(settings.LOCAL_STORAGE_PATH)
+            _record_log = RecordLog(base_path / ".record_log")
+            _record_log.import_legacy_records(base_path / "records")
+        return _record_log
@@ -0,0 +1,126 @@
+"""지식 베이스 검색 결과 재순위화 (over-fetch 후 상위 k 개 선택)
+
+벡터 검색으로 요청 개수의 ``RERANK_CANDIDATE_MULTIPLIER`` 배를 가져온 뒤 다음 중 하나로 다시 고릅니다.
+
+- ``mmr``: 질의 유사도와 이미 고른 조각과의 중복을 함께 고려 (Maximal Marginal Relevance).
+  후보 임베딩 행렬로 한 번에 계산하므로 추가 모델 없이 CPU 에서 바로 동작합니다.
+- ``cross_encoder``: 로컬 CPU cross-encoder 로 (질의, 조각) 쌍을 배치 단위로 점수화.
+  ``sentence-transformers`` 가 없으면 경고를 남기고 ``mmr`` 로 대신합니다.
+
+결과에는 선택 순서대로 ``scores`` 가 붙습니다 (mmr 은 질의와의 코사인 유사도, cross_encoder 는 모델 점수).
+"""
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+STRATEGIES = ("none", "mmr", "cross_encoder")
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+def mmr_select(query_embedding: Sequence[float], embeddings: Sequence[Sequence[float]], k: int,
+               lambda_mult: float) -> List[int]:
+    """MMR 로 ``k`` 개 후보 인덱스를 선택 순서대로 반환
+
+    중복도(이미 고른 조각과의 최대 유사도)는 고를 때마다 한 행렬-벡터 곱으로 갱신합니다.
+    """
+    candidates = _normalize(np.asarray(embeddings, dtype=np.float32))
+    if len(candidates) == 0 or k <= 0:
+        return []
+    relevance = candidates @ _normalize(np.asarray(query_embedding, dtype=np.float32))
+    redundancy = np.full(len(candidates), -np.inf, dtype=np.float32)
+    available = np.ones(len(candidates), dtype=bool)
+    selected: List[int] = []
+    for _ in range(min(k, len(candidates))):
+        # 처음에는 중복도가 없으므로 관련도만으로 고름
+        penalty = np.where(np.isfinite(redundancy), redundancy, 0.0)
+        scores = lambda_mult * relevance - (1 - lambda_mult) * penalty
+        scores[~available] = -np.inf
+        pick = int(np.argmax(scores))
+        selected.append(pick)
+        available[pick] = False
+        redundancy = np.maximum(redundancy, candidates @ candidates[pick])
+    return selected
+
+
+class Reranker:
+    def __init__(self, strategy: Optional[str] = None, candidate_multiplier: Optional[int] = None,
+                 top_k: Optional[int] = None, mmr_lambda: Optional[float] = None,
+                 model_name: Optional[str] = None, batch_size: Optional[int] = None):
+        self.strategy = strategy or settings.RERANK_STRATEGY
+        if self.strategy not in STRATEGIES:
+            raise ValueError(f"Unknown rerank strategy '{self.strategy}' (expected one of {', '.join(STRATEGIES)})")
+        self.candidate_multiplier = candidate_multiplier or settings.RERANK_CANDIDATE_MULTIPLIER
+        self.top_k = settings.RERANK_TOP_K if top_k is None else top_k
+        self.mmr_lambda = settings.RERANK_MMR_LAMBDA if mmr_lambda is None else mmr_lambda
+        self.model_name = model_name or settings.RERANK_CROSS_ENCODER_MODEL
+        self.batch_size = batch_size or settings.RERANK_BATCH_SIZE
+        self._model: Any = None
+        self._model_loaded = False
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.strategy != "none"
+
+    @property
+    def needs_embeddings(self) -> bool:
+        """MMR(또는 cross-encoder 를 쓸 수 없어 MMR 로 대신할 때)에 후보 임베딩이 필요"""
+        return self.strategy == "mmr" or (self.strategy == "cross_encoder" and self.model is None)
+
+    def candidate_count(self, n_results: int) -> int:
+        return n_results * self.candidate_multiplier if self.enabled else n_results
+
+    def result_count(self, n_results: int) -> int:
+        """프롬프트에 넣을 최종 개수 (``RERANK_TOP_K`` 가 있으면 그 이하로)"""
+        return min(n_results, self.top_k) if self.enabled and self.top_k else n_results
+
+    @property
+    def model(self) -> Any:
+        """cross-encoder 모델 (처음 사용할 때 로드, sentence-transformers 가 없으면 None)"""
+        if self.strategy != "cross_encoder":
+            return None
+        with self._lock:
+            if not self._model_loaded:
+                try:
+                    from sentence_transformers import CrossEncoder
+                    self._model = CrossEncoder(self.model_name, device="cpu")
+                except ImportError:
+                    logger.warning("sentence-transformers 가 없어 cross-encoder 대신 MMR 로 재순위화합니다")
+                self._model_loaded = True
+        return self._model
+
+    def rerank(self, query: str, query_embedding: Sequence[float], candidates: Dict[str, List],
+               n_results: int) -> Dict[str, List]:
+        """후보(ids/documents/metadatas/distances[/embeddings] 목록)에서 ``n_results`` 개를 골라 점수와 함께 반환"""
+        k = self.result_count(n_results)
+        if not candidates["ids"]:
+            order, scores = [], []
+        elif self.model is not None:
+            raw = self.model.predict([(query, document) for document in candidates["documents"]],
+                                     batch_size=self.batch_size)
+            raw = np.asarray(raw, dtype=np.float32)
+            order = [int(i) for i in np.argsort(-raw, kind="stable")[:k]]
+            scores = [float(raw[i]) for i in order]
+        else:
+            order = mmr_select(query_embedding, candidates["embeddings"], k, self.mmr_lambda)
+            relevance = _normalize(np.asarray(candidates["embeddings"], dtype=np.float32)) @ \
+                _normalize(np.asarray(query_embedding, dtype=np.float32))
+            scores = [float(relevance[i]) for i in order]
+        reranked = {key: [candidates[key][i] for i in order]
+                    for key in ("ids", "documents", "metadatas", "distances")}
+        reranked["scores"] = scores
+        return reranked
+
+
+reranker = Reranker()
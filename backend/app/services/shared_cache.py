@@ -0,0 +1,141 @@
+"""여러 워커 프로세스가 함께 쓰는 로컬 캐시 (SQLite WAL)
+
+Gunicorn/Uvicorn 워커마다 메모리 캐시를 따로 두면 메모리가 워커 수만큼 늘고 새 워커는 빈 캐시로 시작합니다.
+임베딩, LLM 응답, 사용자 조회처럼 프로세스 간에 나눠 쓸 값은 같은 호스트의 SQLite 파일 하나에
+(namespace, key) → JSON 으로 저장합니다. WAL 모드라 읽기는 쓰기와 동시에 진행됩니다.
+
+``SHARED_CACHE_ENABLED`` 가 꺼져 있으면 모든 조회는 miss, 저장은 무시됩니다.
+연결은 처음 사용할 때 프로세스마다 엽니다 (fork 이전에 연 연결은 자식에서 쓰지 않음).
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from app.core.config import settings
+from app.core.metrics import record_cache
+
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    expires_at REAL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE INDEX IF NOT EXISTS ix_entries_created_at ON entries (created_at);
+"""
+
+# SQLite 변수 개수 제한 안에서 한 번에 조회할 키 수
+_MANY_CHUNK = 500
+
+
+class SharedCache:
+    def __init__(
+        self,
+        path: str,
+        enabled: bool = True,
+        max_entries: Optional[int] = None,
+        prune_every: int = 1000,
+    ):
+        self.path = Path(path)
+        self.enabled = enabled
+        self.max_entries = max_entries if max_entries is not None else settings.SHARED_CACHE_MAX_ENTRIES
+        self.prune_every = prune_every
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._writes = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        """현재 프로세스의 연결 (``_lock`` 을 잡은 상태에서 호출)"""
+        if self._conn is None or self._pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            conn.commit()
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        return self.get_many(namespace, [key]).get(key)
+
+    def get_many(self, namespace: str, keys: Iterable[str]) -> Dict[str, Any]:
+        """있는 키만 담은 dict (만료된 항목은 없는 것으로 취급)"""
+        keys = list(dict.fromkeys(keys))
+        if not self.enabled or not keys:
+            return {}
+        now = time.time()
+        found: Dict[str, Any] = {}
+        with self._lock:
+            conn = self._connection()
+            for start in range(0, len(keys), _MANY_CHUNK):
+                chunk = keys[start:start + _MANY_CHUNK]
+                rows = conn.execute(
+                    f"SELECT key, value FROM entries WHERE namespace = ? AND key IN ({','.join('?' * len(chunk))})"
+                    " AND (expires_at IS NULL OR expires_at > ?)",
+                    [namespace, *chunk, now],
+                ).fetchall()
+                found.update((key, json.loads(value)) for key, value in rows)
+        for key in keys:
+            record_cache(f"shared_{namespace}", key in found)
+        return found
+
+    def set(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None):
+        self.set_many(namespace, {key: value}, ttl=ttl)
+
+    def set_many(self, namespace: str, items: Dict[str, Any], ttl: Optional[float] = None):
+        """``ttl`` 초 뒤 만료 (None 이면 용량 정리 때까지 유지)"""
+        if not self.enabled or not items:
+            return
+        now = time.time()
+        expires_at = now + ttl if ttl else None
+        rows = [(namespace, key, json.dumps(value, ensure_ascii=False), expires_at, now)
+                for key, value in items.items()]
+        with self._lock:
+            conn = self._connection()
+            conn.executemany("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)", rows)
+            conn.commit()
+            self._writes += len(rows)
+            if self._writes >= self.prune_every:
+                self._writes = 0
+                self._prune(conn, now)
+
+    def delete(self, namespace: str, keys: Iterable[str]):
+        keys = list(keys)
+        if not self.enabled or not keys:
+            return
+        with self._lock:
+            conn = self._connection()
+            conn.executemany("DELETE FROM entries WHERE namespace = ? AND key = ?", [(namespace, k) for k in keys])
+            conn.commit()
+
+    def _prune(self, conn: sqlite3.Connection, now: float):
+        """만료 항목 삭제 후 ``max_entries`` 를 넘으면 오래된 것부터 삭제"""
+        conn.execute("DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+        count = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        if count > self.max_entries:
+            conn.execute(
+                "DELETE FROM entries WHERE rowid IN (SELECT rowid FROM entries ORDER BY created_at LIMIT ?)",
+                (count - self.max_entries,),
+            )
+        conn.commit()
+
+
+shared_cache = SharedCache(settings.SHARED_CACHE_PATH, enabled=settings.SHARED_CACHE_ENABLED)
@@ -0,0 +1,251 @@
+import os
+import hashlib
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import List, Dict, Optional, Any, Iterable, Tuple
+from datetime import datetime
+
+
+logger = logging.getLogger(__name__)
+
+CATALOG_FILENAME = ".catalog.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    category TEXT NOT NULL,
+    extension TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    sha256 TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_files_category_mtime ON files (category, mtime DESC);
+CREATE INDEX IF NOT EXISTS ix_files_extension_mtime ON files (extension, mtime DESC);
+CREATE INDEX IF NOT EXISTS ix_files_mtime ON files (mtime DESC);
+"""
+
+
+def file_sha256(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """파일 내용의 SHA-256 해시 계산 (청크 단위)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def is_hidden(relative_path: str) -> bool:
+    """카탈로그/잠금 파일 등 내부 관리용 경로 여부"""
+    return any(part.startswith(".") for part in Path(relative_path).parts)
+
+
+class StorageCatalog:
+    """로컬 저장소 파일 메타데이터 카탈로그 (SQLite)
+
+    목록 조회 시 디렉토리 전체를 순회하지 않고 인덱스 쿼리로 처리합니다.
+    쓰기/삭제 시 갱신되며, ``reconcile`` 로 파일 시스템과 주기적으로 맞춥니다.
+    """
+
+    def __init__(self, base_path: Path, db_path: Optional[Path] = None):
+        self.base_path = Path(base_path)
+        self.db_path = Path(db_path) if db_path else self.base_path / CATALOG_FILENAME
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM files LIMIT 1").fetchone()
+        return row is None
+
+    def _entry(self, relative_path: str, full_path: Path, sha256: Optional[str]) -> Tuple:
+        stat = full_path.stat()
+        parts = Path(relative_path).parts
+        category = parts[0] if len(parts) > 1 else "root"
+        return (
+            relative_path,
+            full_path.name,
+            category,
+            full_path.suffix.lower(),
+            stat.st_size,
+            stat.st_mtime,
+            sha256,
+        )
+
+    def upsert(self, relative_path: str, sha256: Optional[str] = None):
+        """파일 메타데이터 추가/갱신 (해시 미지정 시 계산)"""
+        full_path = self.base_path / relative_path
+        if sha256 is None:
+            sha256 = file_sha256(full_path)
+        self._upsert_many([self._entry(relative_path, full_path, sha256)])
+
+    def _upsert_many(self, entries: Iterable[Tuple]):
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO files (path, name, category, extension, size, mtime, sha256) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(path) DO UPDATE SET name=excluded.name, category=excluded.category, "
+                "extension=excluded.extension, size=excluded.size, mtime=excluded.mtime, "
+                "sha256=excluded.sha256",
+                list(entries),
+            )
+            self._conn.commit()
+
+    def remove(self, relative_path: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM files WHERE path = ?", (relative_path,))
+            self._conn.commit()
+
+    def get(self, relative_path: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM files WHERE path = ?", (relative_path,)
+            ).fetchone()
+        return self._to_dict(row) if row else None
+
+    def query(
+        self,
+        category: str = "",
+        extension: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """카테고리/확장자 필터 + 수정시각 역순 페이지 조회"""
+        clauses, params = self._filters(category, extension)
+        sql = "SELECT * FROM files"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY mtime DESC, path LIMIT ? OFFSET ?"
+        params.extend([limit if limit is not None else -1, offset])
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def count(self, category: str = "", extension: Optional[str] = None) -> int:
+        clauses, params = self._filters(category, extension)
+        sql = "SELECT COUNT(*) FROM files"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()[0]
+
+    def _filters(self, category: str, extension: Optional[str]) -> Tuple[List[str], List[Any]]:
+        clauses: List[str] = []
+        params: List[Any] = []
+        category = category.strip("/")
+        if category:
+            if "/" in category:
+                # 하위 경로: path 기본키 인덱스를 이용한 범위 조회
+                clauses.append("path >= ? AND path < ?")
+                params.extend([f"{category}/", f"{category}0"])
+            else:
+                clauses.append("category = ?")
+                params.append(category)
+        if extension:
+            clauses.append("extension = ?")
+            params.append(f".{extension.lower().lstrip('.')}")
+        return clauses, params
+
+    def _iter_files(self) -> Iterable[Path]:
+        """숨김 디렉토리(.locks, .record_log 등)는 내려가지 않고 일반 파일만 순회"""
+        for root, dirs, files in os.walk(self.base_path):
+            dirs[:] = [d for d in dirs if not d.startswith(".")]
+            for name in files:
+                if not name.startswith("."):
+                    yield Path(root) / name
+
+    def reconcile(self) -> Dict[str, int]:
+        """파일 시스템과 카탈로그 동기화 (크기/수정시각이 바뀐 파일만 해시 재계산)"""
+        with self._lock:
+            known = {
+                row["path"]: (row["size"], row["mtime"])
+                for row in self._conn.execute("SELECT path, size, mtime FROM files")
+            }
+
+        seen = set()
+        changed: List[Tuple] = []
+        for item in self._iter_files():
+            relative_path = item.relative_to(self.base_path).as_posix()
+            seen.add(relative_path)
+            try:
+                stat = item.stat()
+                previous = known.get(relative_path)
+                if previous and previous == (stat.st_size, stat.st_mtime):
+                    continue
+                changed.append(self._entry(relative_path, item, file_sha256(item)))
+            except FileNotFoundError:
+                seen.discard(relative_path)
+
+        removed = [path for path in known if path not in seen]
+        if changed:
+            self._upsert_many(changed)
+        if removed:
+            with self._lock:
+                self._conn.executemany("DELETE FROM files WHERE path = ?", [(p,) for p in removed])
+                self._conn.commit()
+
+        return {"updated": len(changed), "removed": len(removed), "total": len(seen)}
+
+    def _to_dict(self, row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            "name": row["name"],
+            "path": row["path"],
+            "absolute_path": str(self.base_path / row["path"]),
+            "size": row["size"],
+            "modified_at": datetime.fromtimestamp(row["mtime"]).isoformat(),
+            "extension": row["extension"],
+            "category": row["category"],
+            "sha256": row["sha256"],
+        }
+
+
+class CatalogWatcher:
+    """카탈로그 주기적 정합성 검사 (폴링 방식 백그라운드 스레드)
+
+    외부 도구로 저장소를 직접 수정한 경우에도 카탈로그가 따라가도록 합니다.
+    시작 직후 한 번 검사해 앱이 내려가 있던 동안의 변경을 반영하며,
+    ``interval_seconds`` 가 0 이하이면 그 한 번만 수행하고 종료합니다.
+    """
+
+    def __init__(self, catalog: StorageCatalog, interval_seconds: float = 60.0):
+        self.catalog = catalog
+        self.interval_seconds = interval_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="storage-catalog-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def _reconcile(self):
+        try:
+            self.catalog.reconcile()
+        except Exception as e:
+            logger.warning(f"저장소 카탈로그 정합성 검사 실패: {e}")
+
+    def _run(self):
+        self._reconcile()
+        if self.interval_seconds <= 0:
+            return
+        while not self._stop.wait(self.interval_seconds):
+            self._reconcile()
@@ -0,0 +1,373 @@
+"""TraceabilityLink 기반 인메모리 추적성 그래프
+
+링크 (source_type, source_id) → (target_type, target_id) 를 정수 노드로 인턴한 뒤
+정방향/역방향 CSR 배열(indptr, 이웃, 링크 ID)로 보관합니다. 영향 분석(하위 방향 전이 폐포),
+역추적(상위 방향), 커버리지 공백 질의는 홉마다 SQL 조인 없이 numpy 로 프런티어 단위 BFS 를 수행합니다.
+
+- 커밋된 링크 추가/삭제/수정은 세션 이벤트로 받아 델타 인접 리스트에 반영하고,
+  델타가 커지면 CSR 을 다시 압축합니다.
+- ``Query.delete()`` / Core 대량 입력처럼 ORM 이벤트가 없는 변경과 다른 프로세스의 변경은
+  ``TRACEABILITY_GRAPH_MAX_AGE_SECONDS`` 주기 재적재(또는 ``refresh()``)로 따라잡습니다.
+"""
+import logging
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.base import SessionLocal
+from app.db.models import TraceabilityLink
+
+
+logger = logging.getLogger(__name__)
+
+PENDING_KEY = "traceability_pending"
+MIN_COMPACT_EDGES = 1024
+COMPACT_RATIO = 0.1
+IMPACT_CACHE_SIZE = 1024
+
+Node = Tuple[str, int]
+
+
+def _csr(count: int, rows: np.ndarray, *columns: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """rows 기준으로 정렬한 CSR (indptr, 정렬된 columns...)"""
+    order = np.argsort(rows, kind="stable")
+    indptr = np.zeros(count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=count), out=indptr[1:])
+    return (indptr, *(column[order] for column in columns))
+
+
+def _gather(indptr: np.ndarray, nodes: np.ndarray) -> np.ndarray:
+    """nodes 각각의 [indptr[n], indptr[n+1]) 구간 위치를 이어붙인 배열"""
+    starts = indptr[nodes]
+    lengths = indptr[nodes + 1] - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return offsets + np.arange(total, dtype=np.int64)
+
+
+class TraceabilityGraph:
+    """프로세스 단위 추적성 그래프 (스레드 안전)"""
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+        self._lock = threading.RLock()
+        self._refresh_lock = threading.Lock()
+        self._pending_key = f"{PENDING_KEY}:{id(self)}"
+        self._loaded_at: Optional[float] = None
+        # 재적재 중 커밋된 변경 (스냅샷 이후 다시 적용)
+        self._replay: Optional[List[Tuple[int, Optional[Tuple[str, int, str, int]]]]] = None
+        self._reset()
+        self.attach(session_factory)
+
+    # ------------------------------------------------------------------ 상태
+
+    def _reset(self):
+        self._type_codes: Dict[str, int] = {}
+        self._type_names: List[str] = []
+        self._node_index: Dict[Node, int] = {}
+        self._nodes: List[Node] = []
+        self._node_type = np.empty(1024, dtype=np.int32)
+
+        # 압축된 기본 간선 (정방향 CSR 순서), _alive 로 삭제 표시
+        self._base_nodes = 0
+        self._fwd_indptr = np.zeros(1, dtype=np.int64)
+        self._fwd_src = np.empty(0, dtype=np.int64)
+        self._fwd_dst = np.empty(0, dtype=np.int64)
+        self._fwd_link = np.empty(0, dtype=np.int64)
+        self._alive = np.empty(0, dtype=bool)
+        self._rev_indptr = np.zeros(1, dtype=np.int64)
+        self._rev_pos = np.empty(0, dtype=np.int64)
+        self._link_pos: Dict[int, int] = {}
+        self._dead = 0
+
+        # 마지막 압축 이후 추가된 간선
+        self._delta_links: Dict[int, Tuple[int, int]] = {}
+        self._delta_out: Dict[int, Dict[int, int]] = {}
+        self._delta_in: Dict[int, Dict[int, int]] = {}
+
+        self.version = 0
+        self._impact_cache: Dict[Tuple[Any, ...], List[Dict[str, Any]]] = {}
+
+    def _intern(self, node_type: str, node_id: int) -> int:
+        key = (node_type, int(node_id))
+        index = self._node_index.get(key)
+        if index is not None:
+            return index
+        code = self._type_codes.get(node_type)
+        if code is None:
+            code = self._type_codes[node_type] = len(self._type_names)
+            self._type_names.append(node_type)
+        index = len(self._nodes)
+        if index >= len(self._node_type):
+            self._node_type = np.resize(self._node_type, len(self._node_type) * 2)
+        self._node_type[index] = code
+        self._node_index[key] = index
+        self._nodes.append(key)
+        return index
+
+    @property
+    def node_count(self) -> int:
+        return len(self._nodes)
+
+    @property
+    def link_count(self) -> int:
+        return len(self._alive) - self._dead + len(self._delta_links)
+
+    # ------------------------------------------------------------------ 적재/압축
+
+    def load(self, rows: Iterable[Tuple[int, str, int, str, int]]):
+        """(link_id, source_type, source_id, target_type, target_id) 로 그래프 전체 재구성"""
+        with self._lock:
+            self._reset()
+            link_ids, sources, targets = [], [], []
+            for link_id, source_type, source_id, target_type, target_id in rows:
+                link_ids.append(link_id)
+                sources.append(self._intern(source_type, source_id))
+                targets.append(self._intern(target_type, target_id))
+            self._build(
+                np.asarray(sources, dtype=np.int64),
+                np.asarray(targets, dtype=np.int64),
+                np.asarray(link_ids, dtype=np.int64),
+            )
+            self._loaded_at = time.monotonic()
+
+    def refresh(self, db: Optional[Session] = None):
+        """DB 에서 전체 링크를 다시 읽음 (``db`` 가 없으면 session_factory 로 세션 생성)"""
+        with self._lock:
+            self._replay = []
+        own_session = db is None
+        db = db or self.session_factory()
+        try:
+            rows = db.execute(select(
+                TraceabilityLink.id,
+                TraceabilityLink.source_type,
+                TraceabilityLink.source_id,
+                TraceabilityLink.target_type,
+                TraceabilityLink.target_id,
+            )).all()
+        finally:
+            if own_session:
+                db.close()
+        with self._lock:
+            replay, self._replay = self._replay or [], None
+            self.load(rows)
+            for link_id, endpoints in replay:
+                self._apply(link_id, endpoints)
+        logger.info(f"추적성 그래프 적재: 노드 {self.node_count}, 링크 {self.link_count}")
+
+    def ensure_loaded(self, db: Optional[Session] = None):
+        """최초 호출 또는 최대 보관 시간이 지나면 재적재"""
+        with self._refresh_lock:
+            max_age = settings.TRACEABILITY_GRAPH_MAX_AGE_SECONDS
+            loaded_at = self._loaded_at
+            if loaded_at is None or (max_age > 0 and time.monotonic() - loaded_at > max_age):
+                self.refresh(db)
+
+    def _build(self, src: np.ndarray, dst: np.ndarray, links: np.ndarray):
+        count = len(self._nodes)
+        self._fwd_indptr, self._fwd_src, self._fwd_dst, self._fwd_link = _csr(count, src, src, dst, links)
+        self._alive = np.ones(len(links), dtype=bool)
+        self._rev_indptr, self._rev_pos = _csr(count, self._fwd_dst, np.arange(len(links), dtype=np.int64))
+        self._link_pos = dict(zip(self._fwd_link.tolist(), range(len(links))))
+        self._base_nodes = count
+        self._dead = 0
+        self._delta_links.clear()
+        self._delta_out.clear()
+        self._delta_in.clear()
+
+    def _maybe_compact(self):
+        pending = len(self._delta_links) + self._dead
+        if pending < max(MIN_COMPACT_EDGES, COMPACT_RATIO * len(self._alive)):
+            return
+        alive = self._alive
+        delta = list(self._delta_links.items())
+        self._build(
+            np.concatenate([self._fwd_src[alive], np.fromiter((s for _, (s, _) in delta), np.int64, len(delta))]),
+            np.concatenate([self._fwd_dst[alive], np.fromiter((d for _, (_, d) in delta), np.int64, len(delta))]),
+            np.concatenate([self._fwd_link[alive], np.fromiter((k for k, _ in delta), np.int64, len(delta))]),
+        )
+
+    # ------------------------------------------------------------------ 증분 갱신
+
+    def add_link(self, link_id: int, source_type: str, source_id: int, target_type: str, target_id: int):
+        with self._lock:
+            if self._replay is not None:
+                self._replay.append((link_id, (source_type, source_id, target_type, target_id)))
+            if self._loaded_at is None or link_id in self._link_pos or link_id in self._delta_links:
+                return
+            src = self._intern(source_type, source_id)
+            dst = self._intern(target_type, target_id)
+            self._delta_links[link_id] = (src, dst)
+            self._delta_out.setdefault(src, {})[link_id] = dst
+            self._delta_in.setdefault(dst, {})[link_id] = src
+            self._changed()
+
+    def remove_link(self, link_id: int):
+        with self._lock:
+            if self._replay is not None:
+                self._replay.append((link_id, None))
+            if self._loaded_at is None:
+                return
+            pos = self._link_pos.pop(link_id, None)
+            if pos is not None:
+                self._alive[pos] = False
+                self._dead += 1
+            elif link_id in self._delta_links:
+                src, dst = self._delta_links.pop(link_id)
+                self._delta_out[src].pop(link_id)
+                self._delta_in[dst].pop(link_id)
+            else:
+                return
+            self._changed()
+
+    def _changed(self):
+        self.version += 1
+        self._impact_cache.clear()
+        self._maybe_compact()
+
+    def attach(self, session_factory):
+        """세션 팩토리의 커밋된 TraceabilityLink 변경을 그래프에 반영"""
+        event.listen(session_factory, "after_flush", self._after_flush)
+        event.listen(session_factory, "after_commit", self._after_commit)
+        event.listen(session_factory, "after_rollback", self._after_rollback)
+
+    def detach(self, session_factory):
+        event.remove(session_factory, "after_flush", self._after_flush)
+        event.remove(session_factory, "after_commit", self._after_commit)
+        event.remove(session_factory, "after_rollback", self._after_rollback)
+
+    def _after_flush(self, session, flush_context):
+        pending = session.info.setdefault(self._pending_key, [])
+        for obj in session.deleted:
+            if isinstance(obj, TraceabilityLink):
+                pending.append((obj.id, None))
+        for obj in [*session.new, *session.dirty]:
+            if isinstance(obj, TraceabilityLink):
+                if obj in session.dirty:
+                    if not session.is_modified(obj):
+                        continue
+                    pending.append((obj.id, None))
+                pending.append((obj.id, (obj.source_type, obj.source_id, obj.target_type, obj.target_id)))
+
+    def _apply(self, link_id: int, endpoints: Optional[Tuple[str, int, str, int]]):
+        if endpoints is None:
+            self.remove_link(link_id)
+        else:
+            self.add_link(link_id, *endpoints)
+
+    def _after_commit(self, session):
+        for link_id, endpoints in session.info.pop(self._pending_key, []):
+            self._apply(link_id, endpoints)
+
+    def _after_rollback(self, session):
+        session.info.pop(self._pending_key, None)
+
+    # ------------------------------------------------------------------ 질의
+
+    def _neighbors(self, frontier: np.ndarray, reverse: bool) -> np.ndarray:
+        base = frontier[frontier < self._base_nodes]
+        if reverse:
+            pos = self._rev_pos[_gather(self._rev_indptr, base)]
+            found = self._fwd_src[pos[self._alive[pos]]]
+        else:
+            pos = _gather(self._fwd_indptr, base)
+            found = self._fwd_dst[pos[self._alive[pos]]]
+        delta = self._delta_in if reverse else self._delta_out
+        if delta:
+            extra = [n for node in frontier.tolist() for n in delta.get(node, {}).values()]
+            if extra:
+                found = np.concatenate([found, np.asarray(extra, dtype=np.int64)])
+        return found
+
+    def _traverse(self, node_type: str, node_id: int, reverse: bool,
+                  max_depth: Optional[int]) -> List[Dict[str, Any]]:
+        key = (node_type, int(node_id), reverse, max_depth)
+        with self._lock:
+            cached = self._impact_cache.get(key)
+            if cached is not None:
+                return cached
+            root = self._node_index.get((node_type, int(node_id)))
+            result: List[Dict[str, Any]] = []
+            if root is not None:
+                visited = np.zeros(len(self._nodes), dtype=bool)
+                visited[root] = True
+                frontier = np.array([root], dtype=np.int64)
+                depth = 0
+                while frontier.size and (max_depth is None or depth < max_depth):
+                    depth += 1
+                    found = np.unique(self._neighbors(frontier, reverse))
+                    frontier = found[~visited[found]]
+                    visited[frontier] = True
+                    result.extend(
+                        {"type": t, "id": i, "depth": depth}
+                        for t, i in sorted(self._nodes[n] for n in frontier.tolist())
+                    )
+            if len(self._impact_cache) >= IMPACT_CACHE_SIZE:
+                self._impact_cache.clear()
+            self._impact_cache[key] = result
+            return result
+
+    def impact(self, node_type: str, node_id: int, max_depth: Optional[int] = None,
+               db: Optional[Session] = None) -> List[Dict[str, Any]]:
+        """노드에서 링크 방향(source → target)으로 도달 가능한 항목 (깊이 순)"""
+        self.ensure_loaded(db)
+        return self._traverse(node_type, node_id, False, max_depth)
+
+    def trace(self, node_type: str, node_id: int, max_depth: Optional[int] = None,
+              db: Optional[Session] = None) -> List[Dict[str, Any]]:
+        """노드로 이어지는 상위 항목 역추적 (target → source)"""
+        self.ensure_loaded(db)
+        return self._traverse(node_type, node_id, True, max_depth)
+
+    def coverage_gaps(self, source_type: str, target_type: str,
+                      candidate_ids: Optional[Iterable[int]] = None,
+                      db: Optional[Session] = None) -> List[int]:
+        """target_type 으로 직접 연결된 링크가 없는 source_type 항목 ID
+
+        ``candidate_ids`` 를 주면 링크가 전혀 없는 항목까지 포함해 검사합니다.
+        """
+        self.ensure_loaded(db)
+        with self._lock:
+            source_code = self._type_codes.get(source_type)
+            target_code = self._type_codes.get(target_type)
+            node_types = self._node_type[:len(self._nodes)]
+            covered = np.zeros(len(self._nodes), dtype=bool)
+            if source_code is not None and target_code is not None:
+                mask = (
+                    self._alive
+                    & (node_types[self._fwd_src] == source_code)
+                    & (node_types[self._fwd_dst] == target_code)
+                )
+                covered[self._fwd_src[mask]] = True
+                for src, dst in self._delta_links.values():
+                    if node_types[src] == source_code and node_types[dst] == target_code:
+                        covered[src] = True
+            ids = set() if source_code is None else {
+                self._nodes[n][1] for n in np.flatnonzero((node_types == source_code) & ~covered).tolist()
+            }
+            if candidate_ids is not None:
+                ids.update(
+                    int(i) for i in candidate_ids
+                    if (index := self._node_index.get((source_type, int(i)))) is None or not covered[index]
+                )
+            return sorted(ids)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "nodes": self.node_count,
+                "links": self.link_count,
+                "pending_delta": len(self._delta_links) + self._dead,
+                "version": self.version,
+                "node_types": list(self._type_names),
+            }
+
+
+traceability_graph = TraceabilityGraph()
@@ -1,33 +1,142 @@
-import chromadb
-from chromadb.config import Settings
-from typing import List, Dict, Optional
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
+import hashlib
+import threading
+import time
+from functools import cached_property
+from typing import Any, List, Dict, Optional, TextIO
 from app.core.config import settings as app_settings
+from app.core.metrics import observe, EMBEDDING_DURATION, EMBEDDING_INPUTS, VECTOR_DB_DURATION
+from app.core.tracing import start_span
+from app.services.shared_cache import SharedCache, shared_cache
+
+
+EMBEDDING_MODEL = "models/embedding-001"
+# 논리 컬렉션 이름 → 실제 Chroma 컬렉션 이름을 metadata 로 보관하는 컬렉션 (재구축/복원 시 교체)
+ALIAS_COLLECTION = "qms_vector_aliases"
+
+# 이 프로세스의 쓰기와 재구축/스냅샷이 겹치지 않도록 (유지보수 작업이 복사하는 동안 쓰기를 대기)
+write_lock = threading.RLock()
+
+
+class SharedCacheEmbeddings:
+    """임베딩 결과를 워커 간 공유 캐시에 저장 (모델 + 텍스트 해시 키, 없는 텍스트만 임베딩)"""
+    
+    def __init__(self, inner: Any, model: str, cache: SharedCache = shared_cache):
+        self.inner = inner
+        self.model = model
+        self.cache = cache
+    
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model}\0{text}".encode("utf-8")).hexdigest()
+    
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [self._key(text) for text in texts]
+        cached = self.cache.get_many("embedding_document", keys)
+        missing = [i for i, key in enumerate(keys) if key not in cached]
+        if missing:
+            vectors = self.inner.embed_documents([texts[i] for i in missing])
+            fresh = {keys[i]: vector for i, vector in zip(missing, vectors)}
+            self.cache.set_many("embedding_document", fresh)
+            cached.update(fresh)
+        return [cached[key] for key in keys]
+    
+    def embed_query(self, text: str) -> List[float]:
+        # 검색 질의는 문서와 다른 task type 으로 임베딩되므로 namespace 를 나눔
+        key = self._key(text)
+        vector = self.cache.get("embedding_query", key)
+        if vector is None:
+            vector = self.inner.embed_query(text)
+            self.cache.set("embedding_query", key, vector)
+        return vector
 
 
 class VectorDBService:
+    """Chroma 저장소/임베딩 클라이언트는 처음 사용할 때 생성 (import 시 디스크/네트워크 작업 없음)
+    
+    ``CHROMA_SERVER_HOST`` 가 있으면 Chroma 서버에 접속합니다. 여러 프로세스가 같은 디렉토리에
+    PersistentClient 를 열면 인덱스가 손상될 수 있으므로 다중 워커에서는 서버 모드를 씁니다.
+    
+    컬렉션은 논리 이름으로 다루고, 재구축/복원으로 별칭이 바뀌면 새 실제 컬렉션으로 이어집니다.
+    별칭은 ``VECTOR_ALIAS_CACHE_SECONDS`` 동안 프로세스마다 캐시합니다.
+    """
+    
+    _aliases: Optional[Dict[str, str]] = None
+    _aliases_loaded_at = 0.0
+    
     def __init__(self):
-        self.client = chromadb.PersistentClient(
+        # 컬렉션별 생성 metadata (HNSW 파라미터 등, 처음 만들 때만 적용됨)
+        self.collection_metadata: Dict[str, Dict] = {}
+    
+    def configure_collection(self, name: str, metadata: Dict):
+        """이후 어떤 경로로 컬렉션이 처음 만들어지더라도 ``metadata`` 로 생성되도록 등록"""
+        self.collection_metadata[name] = metadata
+    
+    @cached_property
+    def client(self):
+        import chromadb
+        from chromadb.config import Settings
+        if app_settings.CHROMA_SERVER_HOST:
+            return chromadb.HttpClient(
+                host=app_settings.CHROMA_SERVER_HOST,
+                port=app_settings.CHROMA_SERVER_PORT,
+                settings=Settings(anonymized_telemetry=False)
+            )
+        return chromadb.PersistentClient(
             path=app_settings.CHROMA_PERSIST_DIRECTORY,
             settings=Settings(anonymized_telemetry=False)
         )
-        self.embeddings = GoogleGenerativeAIEmbeddings(
-            model="models/embedding-001",
+    
+    @cached_property
+    def embeddings(self):
+        from langchain_google_genai import GoogleGenerativeAIEmbeddings
+        embeddings = GoogleGenerativeAIEmbeddings(
+            model=EMBEDDING_MODEL,
             google_api_key=app_settings.GOOGLE_API_KEY
         )
-        self.text_splitter = RecursiveCharacterTextSplitter(
+        if shared_cache.enabled:
+            return SharedCacheEmbeddings(embeddings, EMBEDDING_MODEL)
+        return embeddings
+    
+    @cached_property
+    def text_splitter(self):
+        from langchain.text_splitter import RecursiveCharacterTextSplitter
+        return RecursiveCharacterTextSplitter(
             chunk_size=1000,
             chunk_overlap=200,
             separators=["\n\n", "\n", ". ", " "]
         )
     
+    def aliases(self, refresh: bool = False) -> Dict[str, str]:
+        now = time.monotonic()
+        if refresh or self._aliases is None or now - self._aliases_loaded_at > app_settings.VECTOR_ALIAS_CACHE_SECONDS:
+            collection = self.client.get_or_create_collection(ALIAS_COLLECTION)
+            self._aliases = dict(collection.metadata or {})
+            self._aliases_loaded_at = now
+        return self._aliases
+    
+    def resolve_collection(self, name: str) -> str:
+        """논리 이름이 가리키는 실제 Chroma 컬렉션 이름 (별칭이 없으면 그대로)"""
+        return self.aliases().get(name, name)
+    
+    def set_alias(self, name: str, physical_name: str):
+        with write_lock:
+            collection = self.client.get_or_create_collection(ALIAS_COLLECTION)
+            collection.modify(metadata={**(collection.metadata or {}), name: physical_name})
+            self._aliases = None
+    
     def get_or_create_collection(self, name: str, metadata: Optional[Dict] = None):
+        # Chroma 는 빈 metadata dict 를 거부하므로 없으면 None 으로 전달
         return self.client.get_or_create_collection(
-            name=name,
-            metadata=metadata or {}
+            name=self.resolve_collection(name),
+            metadata=metadata or self.collection_metadata.get(name) or None
         )
     
+    def embed_documents(self, documents: List[str]) -> List[List[float]]:
+        with observe(EMBEDDING_DURATION, operation="documents"), \
+                start_span("embedding.embed_documents", documents=len(documents)):
+            embeddings = self.embeddings.embed_documents(documents)
+        EMBEDDING_INPUTS.labels("documents").inc(len(documents))
+        return embeddings
+    
     def add_documents(
         self,
         collection_name: str,
@@ -35,19 +144,20 @@ class VectorDBService:
         metadatas: List[Dict],
         ids: Optional[List[str]] = None
     ):
-        collection = self.get_or_create_collection(collection_name)
-        
-        embeddings = self.embeddings.embed_documents(documents)
+        embeddings = self.embed_documents(documents)
         
         if ids is None:
             ids = [f"doc_{i}" for i in range(len(documents))]
         
-        collection.add(
-            documents=documents,
-            metadatas=metadatas,
-            embeddings=embeddings,
-            ids=ids
-        )
+        with write_lock, observe(VECTOR_DB_DURATION, operation="add", collection=collection_name), \
+                start_span("chroma.add", collection=collection_name, documents=len(documents)):
+            collection = self.get_or_create_collection(collection_name)
+            collection.add(
+                documents=documents,
+                metadatas=metadatas,
+                embeddings=embeddings,
+                ids=ids
+            )
     
     def process_and_add_document(
         self,
@@ -73,6 +183,47 @@ class VectorDBService:
         
         return len(chunks)
     
+    def process_and_add_stream(
+        self,
+        collection_name: str,
+        handle: TextIO,
+        metadata: Dict,
+        doc_id_prefix: str = "chunk",
+        block_chars: int = 1024 * 1024
+    ) -> int:
+        """텍스트 파일 핸들을 블록 단위로 읽어 분할/임베딩 (전체 문서를 메모리에 올리지 않음)
+        
+        블록 경계에 걸친 마지막 조각은 다음 블록 앞에 이어 붙여 분할합니다.
+        """
+        total = 0
+        carry = ""
+        while True:
+            block = handle.read(block_chars)
+            text = carry + block
+            if not text:
+                break
+            chunks = self.text_splitter.split_text(text)
+            # 아직 끝나지 않았을 수 있는 마지막 조각은 다음 블록과 함께 처리
+            carry = chunks.pop() if block and chunks else ""
+            if chunks:
+                metadatas = []
+                for i in range(len(chunks)):
+                    chunk_metadata = metadata.copy()
+                    chunk_metadata['chunk_index'] = total + i
+                    metadatas.append(chunk_metadata)
+                ids = [f"{doc_id_prefix}_{total + i}" for i in range(len(chunks))]
+                self.add_documents(collection_name, chunks, metadatas, ids)
+                total += len(chunks)
+            if not block:
+                break
+        return total
+    
+    def embed_query(self, query: str) -> List[float]:
+        with observe(EMBEDDING_DURATION, operation="query"), start_span("embedding.embed_query"):
+            embedding = self.embeddings.embed_query(query)
+        EMBEDDING_INPUTS.labels("query").inc()
+        return embedding
+    
     def search(
         self,
         collection_name: str,
@@ -80,25 +231,40 @@ class VectorDBService:
         n_results: int = 5,
         where: Optional[Dict] = None
     ) -> Dict:
+        return self.query_by_embedding(collection_name, self.embed_query(query), n_results, where)
+    
+    def query_by_embedding(
+        self,
+        collection_name: str,
+        query_embedding: List[float],
+        n_results: int = 5,
+        where: Optional[Dict] = None,
+        include: Optional[List[str]] = None
+    ) -> Dict:
+        """이미 임베딩한 질의로 검색 (여러 컬렉션을 같은 질의로 검색할 때 임베딩 한 번만)"""
         collection = self.get_or_create_collection(collection_name)
         
-        query_embedding = self.embeddings.embed_query(query)
-        
-        results = collection.query(
-            query_embeddings=[query_embedding],
-            n_results=n_results,
-            where=where
-        )
+        with observe(VECTOR_DB_DURATION, operation="query", collection=collection_name), \
+                start_span("chroma.query", collection=collection_name, n_results=n_results) as span:
+            results = collection.query(
+                query_embeddings=[query_embedding],
+                n_results=n_results,
+                where=where,
+                include=include or ["metadatas", "documents", "distances"]
+            )
+            span.set_attribute("retrieved_documents", len((results.get("ids") or [[]])[0]))
         
         return results
     
     def delete_documents(self, collection_name: str, ids: List[str]):
-        collection = self.get_or_create_collection(collection_name)
-        collection.delete(ids=ids)
+        with write_lock:
+            collection = self.get_or_create_collection(collection_name)
+            collection.delete(ids=ids)
     
     def delete_by_metadata(self, collection_name: str, where: Dict):
-        collection = self.get_or_create_collection(collection_name)
-        collection.delete(where=where)
+        with write_lock:
+            collection = self.get_or_create_collection(collection_name)
+            collection.delete(where=where)
 
 
 vector_db_service = VectorDBService()
@@ -0,0 +1,281 @@
+"""벡터 저장소(Chroma) 유지보수: 통계, 재구축(압축), 스냅샷/복원
+
+Chroma 의 HNSW 인덱스는 삭제된 항목을 표시만 하고 공간을 돌려주지 않으므로, 추가/삭제가 반복되면
+디스크 사용량이 계속 늘고 검색 품질이 떨어집니다. 재구축은 살아 있는 항목만 새 컬렉션
+(``<이름>__g<시각>``)에 복사한 뒤 논리 이름의 별칭을 새 컬렉션으로 바꾸고 이전 컬렉션을 삭제합니다.
+검색은 별칭을 따라가므로 재구축 중에도 계속 동작합니다. 등록된 생성 metadata
+(예: ``KNOWLEDGE_HNSW_*``)가 있으면 새 컬렉션에 적용되므로 HNSW 파라미터 변경도 재구축으로 반영합니다.
+
+스냅샷은 파일을 복사하지 않고 Chroma API 로 읽은 항목(임베딩 포함)을 gzip JSON Lines 로 씁니다.
+복사/내보내기 동안에는 이 프로세스의 쓰기(``write_lock``)를 멈추고, 다른 프로세스가 그 사이 추가/삭제한
+ID 는 별칭을 바꾸기 직전에 한 번 더 맞춥니다. 복원은 스냅샷의 컬렉션을 새 컬렉션으로 만든 뒤
+같은 방식으로 별칭을 교체합니다.
+"""
+import argparse
+import gzip
+import json
+import logging
+import os
+import pickle
+import sqlite3
+import time
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from app.core.config import settings
+from app.services.vector_db_service import ALIAS_COLLECTION, VectorDBService, vector_db_service, write_lock
+
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = "qms-vector-snapshot"
+SNAPSHOT_VERSION = 1
+GENERATION_SEPARATOR = "__g"
+_INCLUDE = ["documents", "metadatas", "embeddings"]
+
+
+class SnapshotError(ValueError):
+    """스냅샷 파일이 없거나 형식이 맞지 않음"""
+
+
+@dataclass
+class CollectionStats:
+    name: str
+    physical_name: str
+    count: int
+    metadata: Optional[Dict[str, Any]]
+    # 로컬 저장소(PersistentClient)일 때만 계산
+    disk_bytes: Optional[int] = None
+    total_elements_added: Optional[int] = None
+    tombstones: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _records(collection, batch_size: int) -> Iterator[Dict[str, List]]:
+    offset = 0
+    while True:
+        batch = collection.get(include=_INCLUDE, limit=batch_size, offset=offset)
+        if not batch["ids"]:
+            return
+        yield batch
+        offset += len(batch["ids"])
+
+
+class VectorMaintenance:
+    def __init__(self, vector_db: VectorDBService = vector_db_service,
+                 batch_size: Optional[int] = None, snapshot_directory: Optional[str] = None):
+        self.vector_db = vector_db
+        self.batch_size = batch_size or settings.VECTOR_MAINTENANCE_BATCH_SIZE
+        self.snapshot_directory = Path(snapshot_directory or settings.VECTOR_SNAPSHOT_DIRECTORY)
+
+    def collection_names(self) -> List[str]:
+        """유지보수 대상 논리 컬렉션 이름 (별칭 컬렉션 제외)"""
+        physical_to_name = {physical: name for name, physical in self.vector_db.aliases(refresh=True).items()}
+        names = [physical_to_name.get(c.name, c.name) for c in self.vector_db.client.list_collections()]
+        return sorted(name for name in names if name != ALIAS_COLLECTION)
+
+    # ---- 통계 ----
+
+    def _local_segment_dir(self, collection) -> Optional[Path]:
+        client_settings = self.vector_db.client.get_settings()
+        if not client_settings.is_persistent or not client_settings.persist_directory:
+            return None
+        root = Path(client_settings.persist_directory)
+        conn = sqlite3.connect(f"file:{root / 'chroma.sqlite3'}?mode=ro", uri=True)
+        try:
+            row = conn.execute(
+                "SELECT id FROM segments WHERE collection = ? AND scope = 'VECTOR'", (str(collection.id),)
+            ).fetchone()
+        finally:
+            conn.close()
+        return root / row[0] if row else None
+
+    def stats(self, name: str) -> CollectionStats:
+        physical_name = self.vector_db.resolve_collection(name)
+        collection = self.vector_db.client.get_collection(physical_name)
+        stats = CollectionStats(name, physical_name, collection.count(), collection.metadata)
+        segment_dir = self._local_segment_dir(collection)
+        # 항목이 적어 아직 디스크로 내려가지 않은 인덱스는 디렉토리가 없음
+        if segment_dir is not None and segment_dir.is_dir():
+            stats.disk_bytes = sum(f.stat().st_size for f in segment_dir.iterdir() if f.is_file())
+            metadata_file = segment_dir / "index_metadata.pickle"
+            if metadata_file.exists():
+                with open(metadata_file, "rb") as f:
+                    persisted = pickle.load(f)
+                stats.total_elements_added = persisted.total_elements_added
+                stats.tombstones = max(persisted.total_elements_added - stats.count, 0)
+        return stats
+
+    def all_stats(self) -> List[CollectionStats]:
+        return [self.stats(name) for name in self.collection_names()]
+
+    # ---- 재구축 / 별칭 교체 ----
+
+    @staticmethod
+    def _generation_name(name: str) -> str:
+        return f"{name}{GENERATION_SEPARATOR}{time.time_ns() // 1_000_000}"
+
+    def _swap(self, name: str, new_collection):
+        """별칭을 새 컬렉션으로 바꾸고, 다른 프로세스의 별칭 캐시가 만료된 뒤 이전 컬렉션 삭제"""
+        old_physical = self.vector_db.resolve_collection(name)
+        self.vector_db.set_alias(name, new_collection.name)
+        if old_physical == new_collection.name:
+            return
+        time.sleep(settings.VECTOR_ALIAS_CACHE_SECONDS)
+        try:
+            self.vector_db.client.delete_collection(old_physical)
+        except ValueError:
+            pass
+
+    def _copy_into(self, new_collection, batches: Iterable[Dict[str, List]]) -> int:
+        copied = 0
+        for batch in batches:
+            new_collection.upsert(
+                ids=batch["ids"],
+                embeddings=batch["embeddings"],
+                documents=batch["documents"],
+                metadatas=batch["metadatas"],
+            )
+            copied += len(batch["ids"])
+        return copied
+
+    def _reconcile(self, source, target) -> Dict[str, int]:
+        """복사 중 다른 프로세스가 추가/삭제한 ID 반영"""
+        source_ids = set(source.get(include=[])["ids"])
+        target_ids = set(target.get(include=[])["ids"])
+        added = sorted(source_ids - target_ids)
+        removed = sorted(target_ids - source_ids)
+        for start in range(0, len(added), self.batch_size):
+            batch = source.get(ids=added[start:start + self.batch_size], include=_INCLUDE)
+            self._copy_into(target, [batch])
+        if removed:
+            target.delete(ids=removed)
+        return {"added": len(added), "removed": len(removed)}
+
+    def rebuild(self, name: str) -> Dict[str, Any]:
+        """살아 있는 항목만 새 컬렉션에 복사하고 별칭 교체 (삭제 표시된 HNSW 항목과 빈 공간 제거)"""
+        if name == ALIAS_COLLECTION:
+            raise ValueError("The alias collection cannot be rebuilt")
+        started = time.perf_counter()
+        before = self.stats(name)
+        metadata = {**(before.metadata or {}), **self.vector_db.collection_metadata.get(name, {})}
+        with write_lock:
+            source = self.vector_db.client.get_collection(before.physical_name)
+            target = self.vector_db.client.create_collection(self._generation_name(name), metadata=metadata or None)
+            copied = self._copy_into(target, _records(source, self.batch_size))
+            reconciled = self._reconcile(source, target)
+            self._swap(name, target)
+        after = self.stats(name)
+        logger.info(f"벡터 컬렉션 재구축 완료: {name} {before.physical_name} → {after.physical_name} "
+                    f"({copied}건, {time.perf_counter() - started:.1f}s)")
+        return {
+            "name": name,
+            "copied": copied,
+            "reconciled": reconciled,
+            "before": before.to_dict(),
+            "after": after.to_dict(),
+        }
+
+    # ---- 스냅샷 / 복원 ----
+
+    def snapshot_path(self, snapshot_name: str) -> Path:
+        """스냅샷 디렉토리 안의 파일만 허용 (API 에서 받은 이름으로 임의 경로 접근 방지)"""
+        if not snapshot_name or Path(snapshot_name).name != snapshot_name:
+            raise SnapshotError(f"Invalid snapshot name '{snapshot_name}'")
+        return self.snapshot_directory / snapshot_name
+
+    def list_snapshots(self) -> List[Dict[str, Any]]:
+        if not self.snapshot_directory.is_dir():
+            return []
+        return [
+            {"name": path.name, "bytes": path.stat().st_size, "modified_at": path.stat().st_mtime}
+            for path in sorted(self.snapshot_directory.glob("*.jsonl.gz"))
+        ]
+
+    def snapshot(self, path: Optional[Path] = None, names: Optional[List[str]] = None) -> Dict[str, Any]:
+        """컬렉션 항목을 임베딩 포함 gzip JSON Lines 로 저장 (임시 파일에 쓴 뒤 교체하므로 중간 상태가 남지 않음)"""
+        if path is None:
+            path = self.snapshot_directory / f"vectors-{time.strftime('%Y%m%d-%H%M%S')}.jsonl.gz"
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        names = names or self.collection_names()
+        counts: Dict[str, int] = {}
+        tmp_path = path.with_name(path.name + ".tmp")
+        with write_lock, gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            f.write(json.dumps({"format": SNAPSHOT_FORMAT, "version": SNAPSHOT_VERSION,
+                                "created_at": time.time(), "collections": names}) + "\n")
+            for name in names:
+                collection = self.vector_db.client.get_collection(self.vector_db.resolve_collection(name))
+                f.write(json.dumps({"collection": name, "metadata": collection.metadata}, ensure_ascii=False) + "\n")
+                counts[name] = 0
+                for batch in _records(collection, self.batch_size):
+                    f.write(json.dumps({"collection": name, "batch": batch}, ensure_ascii=False) + "\n")
+                    counts[name] += len(batch["ids"])
+        os.replace(tmp_path, path)
+        logger.info(f"벡터 스냅샷 저장: {path} {counts}")
+        return {"path": str(path), "collections": counts}
+
+    def _read_snapshot(self, path: Path) -> Iterator[Dict[str, Any]]:
+        if not path.is_file():
+            raise SnapshotError(f"Snapshot not found: {path.name}")
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            header = json.loads(f.readline() or "{}")
+            if header.get("format") != SNAPSHOT_FORMAT or header.get("version") != SNAPSHOT_VERSION:
+                raise SnapshotError(f"Unsupported snapshot format: {path.name}")
+            for line in f:
+                yield json.loads(line)
+
+    def restore(self, path: Path, names: Optional[List[str]] = None) -> Dict[str, Any]:
+        """스냅샷의 컬렉션을 새 컬렉션으로 만들고 별칭 교체 (스냅샷에 없는 컬렉션은 그대로)"""
+        counts: Dict[str, int] = {}
+        targets = {}
+        with write_lock:
+            # 컬렉션마다 metadata 줄 다음에 항목 줄이 이어짐
+            for entry in self._read_snapshot(Path(path)):
+                name = entry["collection"]
+                if names and name not in names:
+                    continue
+                if "metadata" in entry:
+                    targets[name] = self.vector_db.client.create_collection(
+                        self._generation_name(name), metadata=entry["metadata"] or None
+                    )
+                    counts[name] = 0
+                else:
+                    counts[name] += self._copy_into(targets[name], [entry["batch"]])
+            for name, target in targets.items():
+                self._swap(name, target)
+        logger.info(f"벡터 스냅샷 복원: {path} {counts}")
+        return {"path": str(path), "collections": counts}
+
+
+vector_maintenance = VectorMaintenance()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Chroma 벡터 저장소 유지보수")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("stats", help="컬렉션별 항목 수, 삭제 표시 수, 디스크 사용량")
+    rebuild_parser = commands.add_parser("rebuild", help="살아 있는 항목만 새 컬렉션으로 복사 후 별칭 교체")
+    rebuild_parser.add_argument("names", nargs="*", help="생략하면 모든 컬렉션")
+    snapshot_parser = commands.add_parser("snapshot", help="스냅샷 파일 생성")
+    snapshot_parser.add_argument("--output", type=Path, help=f"기본: {settings.VECTOR_SNAPSHOT_DIRECTORY}/vectors-<시각>.jsonl.gz")
+    snapshot_parser.add_argument("names", nargs="*", help="생략하면 모든 컬렉션")
+    restore_parser = commands.add_parser("restore", help="스냅샷 파일에서 복원")
+    restore_parser.add_argument("path", type=Path)
+    restore_parser.add_argument("names", nargs="*", help="생략하면 스냅샷의 모든 컬렉션")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.command == "stats":
+        for item in vector_maintenance.all_stats():
+            print(item.to_dict())
+    elif args.command == "rebuild":
+        for name in args.names or vector_maintenance.collection_names():
+            print(vector_maintenance.rebuild(name))
+    elif args.command == "snapshot":
+        print(vector_maintenance.snapshot(args.output, args.names or None))
+    else:
+        print(vector_maintenance.restore(args.path, args.names or None))
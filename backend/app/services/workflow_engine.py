@@ -0,0 +1,203 @@
+"""설계 변경 워크플로우 상태 기계
+
+전이는 ``WORKFLOW`` 표(액션 → 허용되는 현재 상태, 다음 상태)로 선언합니다. 현재 상태에서 허용되지 않는
+액션은 ``InvalidTransition`` 으로 거절하고, 다음 상태의 담당 역할(``STATUS_OWNERS``) 사용자 중
+열린 설계 변경이 가장 적은 사람을 ``current_assignee`` 로 지정합니다 (역할이 없는 상태는 작성자).
+
+일괄 전이는 대상 설계 변경을 한 번에 조회하고, 담당자 부하도 역할별로 한 번만 집계한 뒤
+상태 변경과 ``WorkflowHistory`` 삽입을 한 트랜잭션에서 묶어서 실행합니다.
+"""
+import logging
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+
+from app.db.models import DesignChange, User, WorkflowHistory
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Transition:
+    action: str
+    sources: FrozenSet[str]
+    target: str
+
+
+WORKFLOW: Dict[str, Transition] = {
+    t.action: t for t in (
+        Transition("submit_for_ra", frozenset({"draft"}), "ra_review"),
+        Transition("ra_approve", frozenset({"ra_review"}), "implementation"),
+        Transition("submit_for_qa", frozenset({"implementation"}), "qa_review"),
+        Transition("qa_approve", frozenset({"qa_review"}), "quality_head_approval"),
+        Transition("approve", frozenset({"quality_head_approval"}), "approved"),
+        Transition("reject", frozenset({"ra_review", "qa_review", "quality_head_approval"}), "rejected"),
+        Transition("reopen", frozenset({"rejected"}), "draft"),
+    )
+}
+
+# 상태별 담당 역할 (None 이면 작성자에게 돌아감)
+STATUS_OWNERS: Dict[str, Optional[str]] = {
+    "draft": None,
+    "ra_review": "regulatory_affairs",
+    "implementation": None,
+    "qa_review": "qa",
+    "quality_head_approval": "quality_head",
+    "rejected": None,
+}
+
+# 처리할 일이 남지 않은 상태 (담당자 없음, 반려는 작성자가 다시 열 수 있으므로 제외)
+FINAL_STATUSES = frozenset({"approved"})
+
+
+class InvalidTransition(Exception):
+    """현재 상태에서 허용되지 않는 워크플로우 액션 (HTTP 409)"""
+
+    def __init__(self, change_id: int, status: str, action: str):
+        super().__init__(f"Action '{action}' is not allowed from status '{status}'")
+        self.change_id = change_id
+        self.status = status
+        self.action = action
+
+
+class UnknownAction(ValueError):
+    """정의되지 않은 워크플로우 액션 (HTTP 400)"""
+
+
+@dataclass
+class BulkTransitionResult:
+    applied: List[int]
+    failed: List[Dict[str, object]]
+
+
+class WorkflowEngine:
+    def __init__(self, workflow: Dict[str, Transition] = WORKFLOW,
+                 owners: Dict[str, Optional[str]] = STATUS_OWNERS):
+        self.workflow = workflow
+        self.owners = owners
+
+    def transition_for(self, action: str) -> Transition:
+        transition = self.workflow.get(action)
+        if transition is None:
+            raise UnknownAction("Invalid transition action")
+        return transition
+
+    def allowed_actions(self, status: str) -> List[str]:
+        return [t.action for t in self.workflow.values() if status in t.sources]
+
+    def check(self, change: DesignChange, transition: Transition):
+        if change.workflow_status not in transition.sources:
+            raise InvalidTransition(change.id, change.workflow_status, transition.action)
+
+    def _role_loads(self, db: Session, roles: Iterable[str]) -> Dict[str, List[Tuple[int, int]]]:
+        """역할별 활성 사용자와 열린 담당 건수 (건수, user_id) 를 쿼리 한 번으로 집계"""
+        roles = [r for r in set(roles) if r]
+        if not roles:
+            return {}
+        open_counts = (
+            db.query(DesignChange.current_assignee.label("user_id"), func.count(DesignChange.id).label("n"))
+            .filter(DesignChange.workflow_status.notin_(FINAL_STATUSES))
+            .group_by(DesignChange.current_assignee)
+            .subquery()
+        )
+        rows = (
+            db.query(User.id, User.role, func.coalesce(open_counts.c.n, 0))
+            .outerjoin(open_counts, open_counts.c.user_id == User.id)
+            .filter(User.role.in_(roles), User.is_active.is_(True))
+            .all()
+        )
+        loads: Dict[str, List[Tuple[int, int]]] = {role: [] for role in roles}
+        for user_id, role, count in rows:
+            loads[role].append((count, user_id))
+        return loads
+
+    def _assignee(self, change: DesignChange, status: str,
+                  loads: Dict[str, List[Tuple[int, int]]]) -> Optional[int]:
+        if status in FINAL_STATUSES:
+            return None
+        role = self.owners.get(status)
+        if role is None:
+            return change.created_by
+        candidates = loads.get(role)
+        if not candidates:
+            logger.warning(f"'{role}' 역할의 활성 사용자가 없어 설계 변경 {change.id} 담당자를 비워 둡니다")
+            return None
+        # 가장 한가한 사용자에게 배정하고 같은 일괄 처리 안의 다음 배정에 반영
+        index = min(range(len(candidates)), key=candidates.__getitem__)
+        count, user_id = candidates[index]
+        candidates[index] = (count + 1, user_id)
+        return user_id
+
+    def _apply(self, db: Session, changes: List[DesignChange], transition: Transition,
+               user: User, comments: Optional[str]):
+        loads = self._role_loads(db, [self.owners.get(transition.target)])
+        history = []
+        for change in changes:
+            history.append({
+                "change_id": change.id,
+                "from_status": change.workflow_status,
+                "to_status": transition.target,
+                "action": transition.action,
+                "comments": comments,
+                "performed_by": user.id,
+            })
+            change.workflow_status = transition.target
+            change.current_assignee = self._assignee(change, transition.target, loads)
+        if history:
+            db.execute(insert(WorkflowHistory), history)
+
+    def transition(self, db: Session, change: DesignChange, action: str, user: User,
+                   comments: Optional[str] = None) -> DesignChange:
+        transition = self.transition_for(action)
+        self.check(change, transition)
+        self._apply(db, [change], transition, user, comments)
+        db.commit()
+        db.refresh(change)
+        return change
+
+    def bulk_transition(self, db: Session, change_ids: List[int], action: str, user: User,
+                        comments: Optional[str] = None, atomic: bool = True) -> BulkTransitionResult:
+        """여러 설계 변경에 같은 액션을 한 트랜잭션으로 적용
+
+        ``atomic`` 이면 하나라도 전이할 수 없을 때 아무것도 적용하지 않고, 아니면 가능한 것만 적용합니다.
+        """
+        transition = self.transition_for(action)
+        change_ids = list(dict.fromkeys(change_ids))
+        found = {c.id: c for c in db.query(DesignChange).filter(DesignChange.id.in_(change_ids))}
+        valid: List[DesignChange] = []
+        failed: List[Dict[str, object]] = []
+        for change_id in change_ids:
+            change = found.get(change_id)
+            if change is None:
+                failed.append({"change_id": change_id, "error": "Design change not found"})
+                continue
+            try:
+                self.check(change, transition)
+            except InvalidTransition as e:
+                failed.append({"change_id": change_id, "status": e.status, "error": str(e)})
+                continue
+            valid.append(change)
+        if failed and atomic:
+            return BulkTransitionResult(applied=[], failed=failed)
+        self._apply(db, valid, transition, user, comments)
+        db.commit()
+        return BulkTransitionResult(applied=[c.id for c in valid], failed=failed)
+
+    @staticmethod
+    def inbox_query(db: Session, assignee_id: int, status: Optional[str] = None,
+                    project_id: Optional[int] = None):
+        """담당자 대기함 — ``ix_design_changes_inbox`` (담당자, 상태, 프로젝트) 인덱스를 그대로 사용"""
+        query = db.query(DesignChange).filter(DesignChange.current_assignee == assignee_id)
+        if status:
+            query = query.filter(DesignChange.workflow_status == status)
+        else:
+            query = query.filter(DesignChange.workflow_status.notin_(FINAL_STATUSES))
+        if project_id:
+            query = query.filter(DesignChange.project_id == project_id)
+        return query.order_by(DesignChange.id)
+
+
+workflow_engine = WorkflowEngine()
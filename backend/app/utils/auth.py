@@ -4,11 +4,13 @@ from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached
 from app.core.config import settings
 from app.db.base import get_db
 from app.db.models import User
 from app.models.schemas import TokenData
+from app.services.shared_cache import shared_cache
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
@@ -33,6 +35,33 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 
+# 요청마다 조회하는 사용자 행 중 워커 간 공유 캐시에 두는 컬럼 (비밀번호 해시/토큰 제외, 나머지는 접근 시 로드)
+CACHED_USER_COLUMNS = ("id", "username", "email", "full_name", "role", "is_active", "google_id")
+
+
+def _load_user(db: Session, username: str) -> Optional[User]:
+    """사용자 조회 (공유 캐시 hit 이면 쿼리 없이 세션에 연결)"""
+    row = shared_cache.get("user", username) if shared_cache.enabled else None
+    if row is not None:
+        user = User(**row)
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
+    user = db.query(User).filter(User.username == username).first()
+    if user is not None and shared_cache.enabled:
+        shared_cache.set("user", username, {c: getattr(user, c) for c in CACHED_USER_COLUMNS},
+                         ttl=settings.SHARED_CACHE_USER_TTL_SECONDS)
+    return user
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_cached_users(session: Session, flush_context):
+    """사용자 행이 바뀌면 공유 캐시에서 제거 (다른 워커도 다음 요청에서 다시 조회)"""
+    if not shared_cache.enabled:
+        return
+    usernames = [obj.username for obj in (*session.dirty, *session.deleted) if isinstance(obj, User)]
+    shared_cache.delete("user", usernames)
+
+
 def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
@@ -51,7 +80,7 @@ def get_current_user(
     except JWTError:
         raise credentials_exception
     
-    user = db.query(User).filter(User.username == token_data.username).first()
+    user = _load_user(db, token_data.username)
     if user is None:
         raise credentials_exception
     return user
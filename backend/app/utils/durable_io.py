@@ -0,0 +1,258 @@
+import os
+import uuid
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterator, List, Optional, Set
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 내 잠금만 사용
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+def fsync_directory(directory: Path):
+    """디렉토리 엔트리(rename 결과) 영속화"""
+    if os.name == "nt":
+        return
+    fd = os.open(str(directory), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def fsync_file(path: Path):
+    fd = os.open(str(path), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def atomic_write_bytes(path: Path, data: bytes):
+    """잠금 없이 임시 파일 + fsync + rename 으로 원자적 교체 (호출자가 잠금을 관리)"""
+    path = Path(path)
+    tmp_path = path.parent / f".{path.name}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    fsync_directory(path.parent)
+
+
+class _PendingReplace:
+    """그룹 커밋 대기 중인 임시 파일 → 대상 경로 교체 요청"""
+
+    __slots__ = ("tmp_path", "path", "done", "error")
+
+    def __init__(self, tmp_path: Path, path: Path):
+        self.tmp_path = tmp_path
+        self.path = path
+        self.done = threading.Event()
+        self.error: Optional[BaseException] = None
+
+
+class GroupCommitter:
+    """그룹 커밋: 여러 쓰기의 fsync 를 모아 백그라운드에서 일괄 처리
+
+    - ``commit_replace``: 임시 파일을 대기열에 넣고, 커밋 창마다 모인 임시 파일을
+      모두 fsync 한 **뒤에** 제출 순서대로 rename 하고 디렉토리를 한 번씩 fsync 합니다.
+      호출자는 교체가 영속화될 때까지 대기하므로 장애 시에도 대상 경로에는
+      이전 버전 또는 새 버전만 남습니다.
+    - ``submit``: 이미 제자리에 쓴 파일(추가 전용 로그 등)의 fsync 만 예약하고 즉시 반환하며,
+      ``flush()`` 는 그 시점까지 제출된 모든 쓰기가 영속화될 때까지 대기합니다.
+    """
+
+    def __init__(self, interval_ms: int = 50):
+        self.interval = interval_ms / 1000.0
+        self._cond = threading.Condition()
+        self._pending_files: Set[Path] = set()
+        self._pending_replaces: List[_PendingReplace] = []
+        self._submitted = 0
+        self._committed = 0
+        self._thread: Optional[threading.Thread] = None
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="group-committer", daemon=True)
+            self._thread.start()
+
+    def submit(self, path: Path):
+        with self._cond:
+            self._pending_files.add(Path(path))
+            self._submitted += 1
+            self._ensure_thread()
+            self._cond.notify_all()
+
+    def commit_replace(self, tmp_path: Path, path: Path):
+        """임시 파일을 다음 그룹 커밋에서 fsync → rename 하고 완료까지 대기"""
+        pending = _PendingReplace(Path(tmp_path), Path(path))
+        with self._cond:
+            self._pending_replaces.append(pending)
+            self._submitted += 1
+            self._ensure_thread()
+            self._cond.notify_all()
+        pending.done.wait()
+        if pending.error is not None:
+            raise pending.error
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """현재까지 제출된 쓰기가 모두 fsync 될 때까지 대기"""
+        with self._cond:
+            target = self._submitted
+            self._cond.notify_all()
+            return self._cond.wait_for(lambda: self._committed >= target, timeout=timeout)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending_files or self._pending_replaces)
+                # 커밋 창 동안 추가 쓰기를 모은다
+                self._cond.wait(timeout=self.interval)
+                files, self._pending_files = self._pending_files, set()
+                replaces, self._pending_replaces = self._pending_replaces, []
+                target = self._submitted
+
+            dirs: Set[Path] = set()
+            for path in files:
+                try:
+                    fsync_file(path)
+                    dirs.add(path.parent)
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    logger.warning(f"그룹 커밋 fsync 실패 ({path}): {e}")
+
+            # 1) 임시 파일 데이터 영속화 → 2) 제출 순서대로 교체 → 3) 디렉토리당 fsync 1회
+            for pending in replaces:
+                try:
+                    fsync_file(pending.tmp_path)
+                except OSError as e:
+                    pending.error = e
+            for pending in replaces:
+                if pending.error is not None:
+                    continue
+                try:
+                    os.replace(pending.tmp_path, pending.path)
+                    dirs.add(pending.path.parent)
+                except OSError as e:
+                    pending.error = e
+            for directory in dirs:
+                try:
+                    fsync_directory(directory)
+                except OSError as e:
+                    logger.warning(f"그룹 커밋 디렉토리 fsync 실패 ({directory}): {e}")
+                    for pending in replaces:
+                        if pending.error is None and pending.path.parent == directory:
+                            pending.error = e
+
+            for pending in replaces:
+                pending.done.set()
+            with self._cond:
+                self._committed = max(self._committed, target)
+                self._cond.notify_all()
+
+
+class DurableWriter:
+    """임시 파일 + fsync + rename 기반 원자적 쓰기와 경로별 권고 잠금
+
+    mode:
+      - ``fsync``: 쓰기마다 파일/디렉토리 fsync 후 반환 (기본값)
+      - ``group``: 임시 파일 fsync / rename / 디렉토리 fsync 를 ``GroupCommitter`` 로
+        일괄 처리. 쓰기는 교체가 영속화된 뒤 반환되므로 원자성은 그대로 유지됩니다.
+
+    잠금은 경로 해시를 ``lock_stripes`` 개의 고정 슬롯에 나눠 담습니다 (스트라이프 잠금).
+    경로마다 잠금 파일을 만들지 않으므로 잠금 파일 수는 슬롯 수로 제한됩니다.
+    """
+
+    def __init__(
+        self,
+        lock_dir: Path,
+        mode: str = "fsync",
+        group_commit_ms: int = 50,
+        lock_stripes: int = 64
+    ):
+        if mode not in ("fsync", "group"):
+            raise ValueError(f"Unknown durability mode: {mode}")
+        self.lock_dir = Path(lock_dir)
+        self.lock_dir.mkdir(parents=True, exist_ok=True)
+        self.mode = mode
+        self.committer = GroupCommitter(group_commit_ms) if mode == "group" else None
+        self._stripes = [threading.Lock() for _ in range(lock_stripes)]
+
+    def _stripe(self, path: Path) -> int:
+        digest = hashlib.sha1(str(Path(path).resolve()).encode("utf-8")).digest()
+        return int.from_bytes(digest[:4], "big") % len(self._stripes)
+
+    @contextmanager
+    def lock(self, path: Path) -> Iterator[None]:
+        """경로별 배타 잠금 (프로세스 내 스레드 + 프로세스 간 flock, 스트라이프 단위)"""
+        stripe = self._stripe(path)
+        with self._stripes[stripe]:
+            if fcntl is None:
+                yield
+                return
+            with open(self.lock_dir / f"stripe-{stripe:03d}.lock", "a+b") as lock_file:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    @contextmanager
+    def open(
+        self,
+        path: Path,
+        on_commit: Optional[Callable[[Path], None]] = None
+    ) -> Iterator[BinaryIO]:
+        """원자적 쓰기용 파일 핸들. 블록이 정상 종료될 때만 대상 경로로 교체됩니다.
+
+        ``on_commit`` 은 교체가 영속화된 직후 잠금을 쥔 상태에서 호출됩니다 (카탈로그 갱신 등).
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.parent / f".{path.name}.{uuid.uuid4().hex}.tmp"
+        with self.lock(path):
+            try:
+                with open(tmp_path, "wb") as f:
+                    yield f
+                    f.flush()
+                    if self.mode == "fsync":
+                        os.fsync(f.fileno())
+                if self.mode == "fsync":
+                    os.replace(tmp_path, path)
+                else:
+                    self.committer.commit_replace(tmp_path, path)
+            except BaseException:
+                tmp_path.unlink(missing_ok=True)
+                raise
+
+            if self.mode == "fsync":
+                fsync_directory(path.parent)
+            if on_commit:
+                on_commit(path)
+
+    def write_bytes(
+        self,
+        path: Path,
+        data: bytes,
+        on_commit: Optional[Callable[[Path], None]] = None
+    ):
+        with self.open(path, on_commit=on_commit) as f:
+            f.write(data)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """그룹 커밋 모드에서 대기 중인 fsync 완료까지 대기"""
+        if self.committer is None:
+            return True
+        return self.committer.flush(timeout=timeout)
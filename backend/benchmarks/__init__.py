@@ -0,0 +1,6 @@
+"""성능 벤치마크 (외부 API 없이 결정적 가짜 LLM/임베딩으로 실행)
+
+    python -m benchmarks.orchestrator_bench --runs 64 --concurrency 8
+
+자세한 사용법은 ``benchmarks/README.md`` 참고.
+"""
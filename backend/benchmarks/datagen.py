@@ -0,0 +1,146 @@
+"""부하 테스트용 대량 합성 데이터 적재
+
+SQLAlchemy Core 의 executemany 배치 INSERT 로 프로젝트/설계 변경/위험 항목/워크플로 이력/
+추적성 링크를 적재합니다 (ORM 객체를 만들지 않으므로 10⁶ 행도 수십 초 수준).
+
+    python -m benchmarks.datagen --database-url sqlite:///./load.db \\
+        --changes 100000 --risks 10000 --history 1000000 --links 200000 --users 200
+
+부하 테스트 사용자는 ``loaduser0000`` … 이며 비밀번호는 모두 ``LOAD_PASSWORD`` 입니다.
+"""
+import argparse
+import json
+import os
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+
+from benchmarks.synthetic import HAZARDS, TOPICS, WORDS  # noqa: E402
+
+
+LOAD_PASSWORD = "loadtest-password"
+ROLES = ["design_engineer", "project_manager", "risk_manager", "regulatory_affairs", "qa", "quality_head"]
+STATUSES = ["draft", "ra_review", "implementation", "qa_review", "quality_head_approval", "approved", "rejected"]
+ACTIONS = ["submit_for_ra", "ra_approve", "submit_for_qa", "qa_approve", "approve", "reject"]
+LINK_TYPES = [("requirement", "design_change"), ("design_change", "risk_item"), ("risk_item", "test_case")]
+
+
+def _batches(rows: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    batch: List[Dict[str, Any]] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def _link_row(rng: random.Random, id_ranges: Dict[str, int], users: int) -> Dict[str, Any]:
+    source_type, target_type = rng.choice(LINK_TYPES)
+    return {
+        "source_type": source_type, "source_id": rng.randint(1, id_ranges[source_type]),
+        "target_type": target_type, "target_id": rng.randint(1, id_ranges[target_type]),
+        "relationship_type": "traces_to", "is_auto_generated": rng.random() < 0.3,
+        "confidence_score": round(rng.random(), 3), "created_by": rng.randint(1, users),
+    }
+
+
+def generate(
+    database_url: str,
+    projects: int = 50,
+    users: int = 100,
+    changes: int = 100_000,
+    risks: int = 10_000,
+    history: int = 1_000_000,
+    links: int = 100_000,
+    seed: int = 0,
+    batch_size: int = 10_000,
+    create_tables: bool = True,
+) -> Dict[str, Any]:
+    """테이블별 적재 행 수와 소요 시간 반환 (ID 는 1부터 연속으로 가정하므로 빈 DB 에 적재)"""
+    from app.db.base import Base
+    from app.db.models import DesignChange, DesignProject, RiskItem, TraceabilityLink, User, WorkflowHistory
+    from app.utils.auth import get_password_hash
+
+    rng = random.Random(seed)
+    engine = create_engine(database_url)
+    if create_tables:
+        Base.metadata.create_all(bind=engine)
+    password_hash = get_password_hash(LOAD_PASSWORD)
+    now = datetime.now(timezone.utc)
+
+    def timestamp() -> datetime:
+        return now - timedelta(seconds=rng.randint(0, 3 * 365 * 86400))
+
+    # 추적성 링크 대상 종류별 ID 범위 (요구사항/시험 항목은 별도 테이블이 없어 임의 범위)
+    id_ranges = {"design_change": changes, "risk_item": risks, "requirement": 5_000, "test_case": 20_000}
+    tables = [
+        (User.__table__, users, lambda i: {
+            "username": f"loaduser{i:04d}", "email": f"loaduser{i:04d}@example.com",
+            "password_hash": password_hash, "full_name": f"Load User {i}",
+            "role": ROLES[i % len(ROLES)], "is_active": True,
+        }),
+        (DesignProject.__table__, projects, lambda i: {
+            "project_code": f"LP-{i:04d}", "project_name": f"{rng.choice(TOPICS)} 프로젝트 {i}",
+            "description": _text(rng, 30), "product_type": "SaMD", "iec_62304_class": rng.choice("ABC"),
+            "status": "active", "created_by": rng.randint(1, users),
+        }),
+        (DesignChange.__table__, changes, lambda i: {
+            "change_number": f"LDCR-{i:07d}", "project_id": rng.randint(1, projects),
+            "title": f"{rng.choice(TOPICS)} 변경 {i}", "description": _text(rng, 60),
+            "change_type": rng.choice(["new_feature", "bug_fix", "improvement"]),
+            "justification": _text(rng, 15), "workflow_status": rng.choice(STATUSES),
+            "created_by": rng.randint(1, users), "created_at": timestamp(),
+        }),
+        (RiskItem.__table__, risks, lambda i: {
+            "risk_number": f"LR-{i:06d}", "project_id": rng.randint(1, projects),
+            "hazard": rng.choice(HAZARDS), "hazardous_situation": _text(rng, 12), "harm": _text(rng, 6),
+            "severity": rng.randint(1, 5), "probability": rng.randint(1, 5),
+            "risk_level": rng.choice(["Low", "Medium", "High"]), "status": "open",
+        }),
+        (WorkflowHistory.__table__, history, lambda i: {
+            "change_id": rng.randint(1, changes), "from_status": rng.choice(STATUSES),
+            "to_status": rng.choice(STATUSES), "action": rng.choice(ACTIONS),
+            "comments": _text(rng, 8), "performed_by": rng.randint(1, users), "performed_at": timestamp(),
+        }),
+        (TraceabilityLink.__table__, links, lambda i: _link_row(rng, id_ranges, users)),
+    ]
+
+    report: Dict[str, Any] = {}
+    for table, count, make_row in tables:
+        started = time.perf_counter()
+        with engine.begin() as conn:
+            for batch in _batches((make_row(i) for i in range(count)), batch_size):
+                conn.execute(insert(table), batch)
+        report[table.name] = {"rows": count, "seconds": round(time.perf_counter() - started, 2)}
+    engine.dispose()
+    return report
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="부하 테스트용 대량 합성 데이터 적재")
+    parser.add_argument("--database-url", required=True)
+    for name, default in [("projects", 50), ("users", 100), ("changes", 100_000), ("risks", 10_000),
+                          ("history", 1_000_000), ("links", 100_000), ("seed", 0), ("batch-size", 10_000)]:
+        parser.add_argument(f"--{name}", type=int, default=default)
+    args = parser.parse_args(argv)
+    report = generate(
+        args.database_url, projects=args.projects, users=args.users, changes=args.changes, risks=args.risks,
+        history=args.history, links=args.links, seed=args.seed, batch_size=args.batch_size,
+    )
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
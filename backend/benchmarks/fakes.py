@@ -0,0 +1,125 @@
+"""지연 시간 분포와 토큰 속도를 설정할 수 있는 가짜 LLM / 임베딩"""
+import asyncio
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+
+# 모든 에이전트가 파싱할 수 있는 키를 모은 응답 (test_orchestrator_integration 과 동일한 방식)
+DEFAULT_RESPONSE: Dict[str, Any] = {
+    "status": "ok",
+    "impact_analysis": {"affected_docs": []},
+    "affected_documents": [],
+    "schedule_impact": {},
+    "resource_allocation": {},
+    "reassessed_risks": [],
+    "new_risks": [],
+    "regulatory_impact": "low",
+    "submission_required": False,
+    "test_plan": [],
+    "required_tests": [],
+    "decision": "APPROVE",
+    "comments": "benchmark",
+}
+
+
+@dataclass
+class LatencyModel:
+    """로그정규 분포 지연 시간 (중앙값 ``median_s``, 형태 ``sigma``) + 출력 토큰 생성 시간"""
+
+    median_s: float = 0.05
+    sigma: float = 0.5
+    tokens_per_second: float = 0.0  # 0 이면 토큰 생성 시간 없음
+    max_s: float = 30.0
+
+    def sample(self, rng: random.Random, output_tokens: int = 0) -> float:
+        base = 0.0
+        if self.median_s > 0:
+            base = math.exp(rng.gauss(math.log(self.median_s), self.sigma)) if self.sigma > 0 else self.median_s
+        if self.tokens_per_second > 0:
+            base += output_tokens / self.tokens_per_second
+        return min(base, self.max_s)
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+class FakeLLM:
+    """``ainvoke`` 만 제공하는 ChatGoogleGenerativeAI 대역 (usage_metadata 포함)"""
+
+    def __init__(
+        self,
+        latency: LatencyModel,
+        seed: int = 0,
+        output_tokens: int = 400,
+        response: Optional[Dict[str, Any]] = None,
+    ):
+        self.latency = latency
+        self.output_tokens = output_tokens
+        self.content = json.dumps(response or DEFAULT_RESPONSE, ensure_ascii=False)
+        self.calls = 0
+        self.prompt_tokens = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    async def ainvoke(self, prompt: str) -> Any:
+        prompt_tokens = estimate_tokens(prompt)
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += prompt_tokens
+            delay = self.latency.sample(self._rng, self.output_tokens)
+        await asyncio.sleep(delay)
+        return SimpleNamespace(
+            content=self.content,
+            usage_metadata={"input_tokens": prompt_tokens, "output_tokens": self.output_tokens},
+        )
+
+
+class FakeEmbeddings:
+    """해시 기반 결정적 임베딩 (같은 단어를 공유하는 텍스트끼리 유사도가 높음)
+
+    실제 GoogleGenerativeAIEmbeddings 처럼 동기(블로킹) 호출이며, 호출당 지연과
+    텍스트당 지연을 더해 ``time.sleep`` 합니다.
+    """
+
+    def __init__(self, dim: int = 256, per_call: Optional[LatencyModel] = None,
+                 per_text_s: float = 0.0, seed: int = 0):
+        self.dim = dim
+        self.per_call = per_call or LatencyModel(median_s=0.0, sigma=0.0)
+        self.per_text_s = per_text_s
+        self.calls = 0
+        self.texts = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _vector(self, text: str) -> List[float]:
+        vector = [0.0] * self.dim
+        for token in text.lower().split():
+            digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+            index = int.from_bytes(digest[:4], "little") % self.dim
+            vector[index] += 1.0 if digest[4] & 1 else -1.0
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    def _wait(self, count: int):
+        with self._lock:
+            self.calls += 1
+            self.texts += count
+            delay = self.per_call.sample(self._rng) + self.per_text_s * count
+        if delay > 0:
+            time.sleep(delay)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self._wait(len(texts))
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        self._wait(1)
+        return self._vector(text)
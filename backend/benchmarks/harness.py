@@ -0,0 +1,69 @@
+"""벤치마크 결과 집계, 기준선(baseline) 저장/비교"""
+import json
+import math
+import resource
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+
+# 값이 작을수록 좋은 지표 / 클수록 좋은 지표
+LOWER_IS_BETTER = ("latency_p50_s", "latency_p95_s", "latency_p99_s", "latency_mean_s", "peak_rss_mb")
+HIGHER_IS_BETTER = ("throughput_rps",)
+
+
+def percentile(values: Sequence[float], p: float) -> float:
+    """nearest-rank 백분위수"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(p / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def peak_rss_mb() -> float:
+    """프로세스 최대 RSS (MiB). Linux 는 KiB, macOS 는 byte 단위로 보고됨"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def summarize(latencies: List[float], elapsed_s: float, errors: int = 0) -> Dict[str, Any]:
+    count = len(latencies)
+    return {
+        "runs": count,
+        "errors": errors,
+        "elapsed_s": round(elapsed_s, 4),
+        "throughput_rps": round(count / elapsed_s, 4) if elapsed_s > 0 else 0.0,
+        "latency_mean_s": round(sum(latencies) / count, 4) if count else 0.0,
+        "latency_p50_s": round(percentile(latencies, 50), 4),
+        "latency_p95_s": round(percentile(latencies, 95), 4),
+        "latency_p99_s": round(percentile(latencies, 99), 4),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def compare(metrics: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.10) -> List[str]:
+    """기준선 대비 ``tolerance`` 이상 나빠진 지표 목록 (설명 문자열)"""
+    regressions = []
+    for key in LOWER_IS_BETTER + HIGHER_IS_BETTER:
+        if key not in metrics or not baseline.get(key):
+            continue
+        current, previous = metrics[key], baseline[key]
+        change = (current - previous) / previous
+        worse = change > tolerance if key in LOWER_IS_BETTER else change < -tolerance
+        if worse:
+            regressions.append(f"{key}: {previous} -> {current} ({change:+.1%})")
+    return regressions
+
+
+def load_baseline(path: Path, scenario: str) -> Optional[Dict[str, Any]]:
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8")).get("scenarios", {}).get(scenario)
+
+
+def save_baseline(path: Path, scenario: str, metrics: Dict[str, Any]):
+    data = json.loads(path.read_text(encoding="utf-8")) if path.exists() else {"scenarios": {}}
+    data["scenarios"][scenario] = metrics
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=2, ensure_ascii=False, sort_keys=True) + "\n", encoding="utf-8")
@@ -0,0 +1,235 @@
+"""REST API 부하 테스트 (asyncio + httpx 가상 사용자)
+
+가상 사용자마다 로그인 후 가중치에 따라 시나리오(목록/조회/생성/상태 전이/분석)를 반복하고
+엔드포인트별 지연 시간(p50/p95/p99), 처리량, 상태 코드를 보고합니다.
+먼저 ``benchmarks.datagen`` 으로 데이터를 적재하세요.
+
+    # 별도 서버 (가짜 Gemini 로 기동): python -m benchmarks.stub_server --database-url sqlite:///./load.db
+    python -m benchmarks.load_test --base-url http://localhost:8000 --users 200 --duration 60
+
+    # 프로세스 내 ASGI 호출 (네트워크/서버 없이 앱 코드만 측정)
+    python -m benchmarks.load_test --in-process --database-url sqlite:///./load.db --users 50
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+from collections import Counter, defaultdict
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+
+import httpx  # noqa: E402
+
+from benchmarks.datagen import ACTIONS, LOAD_PASSWORD  # noqa: E402
+from benchmarks.harness import percentile  # noqa: E402
+from benchmarks.synthetic import TOPICS, WORDS  # noqa: E402
+
+
+API = "/api/v1"
+DEFAULT_WEIGHTS = {"list": 6, "get": 4, "create": 2, "transition": 2, "analyze": 1, "login": 1}
+
+
+@dataclass
+class LoadConfig:
+    users: int = 50
+    duration_s: float = 30.0
+    think_time_s: float = 0.0
+    seed: int = 0
+    load_users: int = 100     # datagen 으로 만든 loaduserNNNN 수
+    projects: int = 50
+    max_change_id: int = 100_000
+    weights: Dict[str, int] = field(default_factory=lambda: dict(DEFAULT_WEIGHTS))
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Counter] = defaultdict(Counter)
+
+    def add(self, name: str, status: int, seconds: float):
+        self.latencies[name].append(seconds)
+        self.statuses[name][str(status)] += 1
+
+    def report(self, elapsed_s: float) -> Dict[str, Any]:
+        endpoints = {}
+        for name, values in sorted(self.latencies.items()):
+            statuses = self.statuses[name]
+            endpoints[name] = {
+                "requests": len(values),
+                "errors": sum(n for code, n in statuses.items() if code == "0" or code >= "500"),
+                "statuses": dict(statuses),
+                "rps": round(len(values) / elapsed_s, 2) if elapsed_s else 0.0,
+                "latency_mean_s": round(sum(values) / len(values), 4),
+                "latency_p50_s": round(percentile(values, 50), 4),
+                "latency_p95_s": round(percentile(values, 95), 4),
+                "latency_p99_s": round(percentile(values, 99), 4),
+            }
+        total = sum(len(v) for v in self.latencies.values())
+        return {
+            "elapsed_s": round(elapsed_s, 2),
+            "requests": total,
+            "rps": round(total / elapsed_s, 2) if elapsed_s else 0.0,
+            "endpoints": endpoints,
+        }
+
+
+class VirtualUser:
+    def __init__(self, index: int, client: httpx.AsyncClient, config: LoadConfig, recorder: Recorder):
+        self.client = client
+        self.config = config
+        self.recorder = recorder
+        self.rng = random.Random(config.seed * 1_000_003 + index)
+        self.username = f"loaduser{index % config.load_users:04d}"
+        self.headers: Dict[str, str] = {}
+        self.created: List[int] = []
+
+    async def _call(self, name: str, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, headers=self.headers, **kwargs)
+        except httpx.HTTPError:
+            self.recorder.add(name, 0, time.perf_counter() - started)
+            return None
+        self.recorder.add(name, response.status_code, time.perf_counter() - started)
+        return response
+
+    def _change_id(self) -> int:
+        if self.created and self.rng.random() < 0.5:
+            return self.rng.choice(self.created)
+        return self.rng.randint(1, self.config.max_change_id)
+
+    async def login(self):
+        response = await self._call("login", "POST", f"{API}/auth/login",
+                                    data={"username": self.username, "password": LOAD_PASSWORD})
+        if response is not None and response.status_code == 200:
+            self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    async def list(self):
+        params: Dict[str, Any] = {"skip": self.rng.randint(0, 1000), "limit": 50}
+        if self.rng.random() < 0.5:
+            params["project_id"] = self.rng.randint(1, self.config.projects)
+        await self._call("list", "GET", f"{API}/design-changes/", params=params)
+
+    async def get(self):
+        await self._call("get", "GET", f"{API}/design-changes/{self._change_id()}")
+
+    async def create(self):
+        payload = {
+            "project_id": self.rng.randint(1, self.config.projects),
+            "title": f"{self.rng.choice(TOPICS)} 부하 테스트 변경",
+            "description": " ".join(self.rng.choice(WORDS) for _ in range(40)),
+            "change_type": "improvement",
+        }
+        response = await self._call("create", "POST", f"{API}/design-changes/", json=payload)
+        if response is not None and response.status_code == 200:
+            self.created.append(response.json()["id"])
+
+    async def transition(self):
+        await self._call("transition", "POST", f"{API}/design-changes/{self._change_id()}/transition",
+                         json={"action": self.rng.choice(ACTIONS), "comments": "load test"})
+
+    async def analyze(self):
+        await self._call("analyze", "POST", f"{API}/agents/analyze/impact", json={
+            "change_id": self._change_id(), "agent_type": "design_engineer", "analysis_type": "impact",
+        })
+
+    async def run(self, deadline: float):
+        await self.login()
+        names = list(self.config.weights)
+        weights = [self.config.weights[n] for n in names]
+        while time.perf_counter() < deadline:
+            await getattr(self, self.rng.choices(names, weights)[0])()
+            if self.config.think_time_s:
+                await asyncio.sleep(self.rng.expovariate(1 / self.config.think_time_s))
+
+
+async def run_load(client: httpx.AsyncClient, config: LoadConfig) -> Dict[str, Any]:
+    recorder = Recorder()
+    started = time.perf_counter()
+    deadline = started + config.duration_s
+    await asyncio.gather(*(VirtualUser(i, client, config, recorder).run(deadline) for i in range(config.users)))
+    return recorder.report(time.perf_counter() - started)
+
+
+def run_in_process(database_url: str, config: LoadConfig, workdir: Optional[str] = None) -> Dict[str, Any]:
+    """앱을 같은 프로세스에서 ASGI 로 호출 (DB 는 ``database_url``, Gemini 는 가짜)"""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.db.base import get_db
+    from app.main import app
+    from benchmarks.stubs import install_api_stubs
+
+    engine = create_engine(database_url, connect_args={"check_same_thread": False}
+                           if database_url.startswith("sqlite") else {})
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp, ExitStack() as stack:
+        install_api_stubs(stack, tmp, seed=config.seed)
+        app.dependency_overrides[get_db] = override_get_db
+        stack.callback(app.dependency_overrides.pop, get_db, None)
+
+        async def main():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+                return await run_load(client, config)
+
+        report = asyncio.run(main())
+    engine.dispose()
+    return report
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="REST API 부하 테스트")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--base-url", help="실행 중인 서버 주소")
+    target.add_argument("--in-process", action="store_true", help="ASGI 로 같은 프로세스에서 호출")
+    parser.add_argument("--database-url", help="--in-process 에서 사용할 DB")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--think-time", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--load-users", type=int, default=100)
+    parser.add_argument("--projects", type=int, default=50)
+    parser.add_argument("--max-change-id", type=int, default=100_000)
+    parser.add_argument("--weights", type=json.loads, default=None,
+                        help='시나리오 가중치 JSON (예: \'{"list": 5, "analyze": 1}\')')
+    args = parser.parse_args(argv)
+
+    config = LoadConfig(
+        users=args.users, duration_s=args.duration, think_time_s=args.think_time, seed=args.seed,
+        load_users=args.load_users, projects=args.projects, max_change_id=args.max_change_id,
+    )
+    if args.weights:
+        config.weights = args.weights
+
+    if args.in_process:
+        if not args.database_url:
+            parser.error("--in-process 에는 --database-url 이 필요합니다")
+        report = run_in_process(args.database_url, config)
+    else:
+        async def remote():
+            limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+            async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=120) as client:
+                return await run_load(client, config)
+        report = asyncio.run(remote())
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""QMSOrchestrator 종단 간 처리량/지연 시간 벤치마크
+
+가짜 LLM/임베딩(지연 분포 설정 가능)과 시드 고정 합성 데이터로 오케스트레이션 N 개를
+동시 실행해 p50/p95/p99, 처리량, 최대 RSS 를 보고하고 저장된 기준선과 비교합니다.
+DB(SQLite)와 Chroma 는 임시 디렉토리의 실제 인스턴스를 사용합니다.
+
+    python -m benchmarks.orchestrator_bench --runs 64 --concurrency 8
+    python -m benchmarks.orchestrator_bench --update-baseline
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# 앱 설정 필수값 (실제 API 를 호출하지 않으므로 더미 값으로 충분)
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+
+from benchmarks.fakes import FakeEmbeddings, FakeLLM, LatencyModel  # noqa: E402
+from benchmarks.harness import compare, load_baseline, save_baseline, summarize  # noqa: E402
+from benchmarks.stubs import install_stubs  # noqa: E402
+from benchmarks.synthetic import ingest_corpus, make_change, make_risk_register  # noqa: E402
+
+
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / "orchestrator.json"
+
+
+@dataclass
+class BenchConfig:
+    runs: int = 32
+    concurrency: int = 8
+    docs: int = 200
+    risks: int = 200
+    seed: int = 1
+    llm_median_s: float = 0.05
+    llm_sigma: float = 0.5
+    llm_tokens_per_second: float = 0.0
+    llm_output_tokens: int = 400
+    embed_per_call_s: float = 0.0
+    embed_per_text_s: float = 0.0
+
+    def scenario(self) -> str:
+        """기준선 비교 키 (실행 조건이 같은 결과끼리만 비교)"""
+        return ",".join(f"{f.name}={getattr(self, f.name)}" for f in fields(self))
+
+
+def _seed_database(session_factory, config: BenchConfig) -> List[int]:
+    from app.db.models import DesignChange, DesignProject, RiskItem, User
+
+    db = session_factory()
+    try:
+        user = User(username="bench", email="bench@example.com", full_name="Bench", role="design_engineer")
+        db.add(user)
+        db.flush()
+        project = DesignProject(project_code="BENCH", project_name="Benchmark", created_by=user.id,
+                                iec_62304_class="B")
+        db.add(project)
+        db.flush()
+        register = make_risk_register(config.risks, seed=config.seed)
+        db.add_all(RiskItem(project_id=project.id, **row) for row in register.to_dict("records"))
+        changes = [
+            DesignChange(project_id=project.id, created_by=user.id, **make_change(i, seed=config.seed))
+            for i in range(config.runs)
+        ]
+        db.add_all(changes)
+        db.commit()
+        return [change.id for change in changes]
+    finally:
+        db.close()
+
+
+async def _run_all(orchestrator, change_ids: List[int], concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def one(change_id: int):
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            state = await orchestrator.run({
+                "messages": [],
+                "change_id": change_id,
+                "user_role": "design_engineer",
+                "current_step": "start",
+                "analysis_results": {},
+                "next_agent": "design_engineer",
+            })
+            latencies.append(time.perf_counter() - started)
+            errors += sum(1 for r in state["analysis_results"].values() if r.get("status") != "completed")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(change_id) for change_id in change_ids))
+    return latencies, time.perf_counter() - started, errors
+
+
+def run_benchmark(config: BenchConfig, workdir: Optional[str] = None) -> Dict[str, Any]:
+    """벤치마크 1회 실행 후 지표 반환 (``errors`` 는 completed 가 아닌 에이전트 결과 수)"""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.agents.orchestrator import QMSOrchestrator
+    from app.db.base import Base
+    from app.services.vector_db_service import vector_db_service
+
+    llm = FakeLLM(
+        LatencyModel(config.llm_median_s, config.llm_sigma, config.llm_tokens_per_second),
+        seed=config.seed, output_tokens=config.llm_output_tokens,
+    )
+    embeddings = FakeEmbeddings(
+        per_call=LatencyModel(config.embed_per_call_s, 0.0), per_text_s=config.embed_per_text_s, seed=config.seed
+    )
+
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp, ExitStack() as stack:
+        engine = create_engine(f"sqlite:///{tmp}/bench.db", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        change_ids = _seed_database(session_factory, config)
+        register = make_risk_register(config.risks, seed=config.seed)
+        install_stubs(stack, llm, embeddings, f"{tmp}/chroma", session_factory=session_factory,
+                      read_excel=lambda file_id: register.copy())
+
+        ingest_corpus(vector_db_service, config.docs, seed=config.seed)
+        embeddings.calls = embeddings.texts = 0
+
+        latencies, elapsed, errors = asyncio.run(_run_all(QMSOrchestrator(), change_ids, config.concurrency))
+        engine.dispose()
+
+    metrics = summarize(latencies, elapsed, errors)
+    metrics.update({
+        "llm_calls": llm.calls,
+        "llm_prompt_tokens": llm.prompt_tokens,
+        "embedding_calls": embeddings.calls,
+    })
+    return metrics
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    for f in fields(BenchConfig):
+        parser.add_argument(f"--{f.name.replace('_', '-')}", type=f.type if callable(f.type) else type(f.default),
+                            default=f.default)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.10, help="허용 악화 비율 (기본 10%%)")
+    parser.add_argument("--update-baseline", action="store_true", help="이번 결과를 기준선으로 저장")
+    parser.add_argument("--workdir", default=None, help="임시 DB/Chroma 위치 (기본: 시스템 임시 디렉토리)")
+    args = parser.parse_args(argv)
+
+    config = BenchConfig(**{f.name: getattr(args, f.name) for f in fields(BenchConfig)})
+    metrics = run_benchmark(config, workdir=args.workdir)
+    scenario = config.scenario()
+    result: Dict[str, Any] = {"config": asdict(config), "metrics": metrics}
+
+    baseline = load_baseline(args.baseline, scenario)
+    if args.update_baseline:
+        save_baseline(args.baseline, scenario, metrics)
+        result["baseline"] = "updated"
+    elif baseline is not None:
+        result["baseline"] = baseline
+        result["regressions"] = compare(metrics, baseline, args.tolerance)
+
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+    return 1 if result.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
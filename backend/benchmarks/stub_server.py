@@ -0,0 +1,34 @@
+"""가짜 Gemini/임시 Chroma 로 API 서버 기동 (부하 테스트 대상)
+
+    python -m benchmarks.stub_server --database-url sqlite:///./load.db --port 8000
+"""
+import argparse
+import os
+import tempfile
+from contextlib import ExitStack
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--llm-median-s", type=float, default=0.2)
+    args = parser.parse_args()
+
+    # 앱 import 전에 설정 (DB 엔진은 import 시점에 생성됨)
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+
+    import uvicorn
+    from app.main import app
+    from benchmarks.stubs import install_api_stubs
+
+    with tempfile.TemporaryDirectory() as tmp, ExitStack() as stack:
+        install_api_stubs(stack, tmp, llm_median_s=args.llm_median_s)
+        uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""외부 API 대역 설치 (Gemini LLM/임베딩 → 가짜, Chroma → 임시 디렉토리, Drive 엑셀 → 합성 대장)"""
+from contextlib import ExitStack
+from typing import Callable, Optional
+from unittest.mock import patch
+
+from benchmarks.fakes import FakeEmbeddings, FakeLLM
+
+
+def install_stubs(
+    stack: ExitStack,
+    llm: FakeLLM,
+    embeddings: FakeEmbeddings,
+    chroma_path: str,
+    session_factory: Optional[Callable] = None,
+    read_excel: Optional[Callable] = None,
+):
+    """``stack`` 이 닫힐 때 원래대로 돌아가는 패치 적용"""
+    import chromadb
+    from chromadb.config import Settings
+
+    from app.agents import (design_engineer_agent, pm_agent, qa_agent, ra_agent,
+                            risk_manager_agent, verification_agent)
+    from app.agents.base_agent import BaseAgent
+    from app.services.gdrive_service import gdrive_service
+    from app.services.vector_db_service import vector_db_service
+
+    agents = [
+        design_engineer_agent.design_engineer_agent, pm_agent.pm_agent, risk_manager_agent.risk_manager_agent,
+        ra_agent.ra_agent, verification_agent.verification_agent, qa_agent.qa_agent,
+    ]
+    client = chromadb.PersistentClient(path=chroma_path, settings=Settings(anonymized_telemetry=False))
+    stack.enter_context(patch.object(vector_db_service, "client", client))
+    stack.enter_context(patch.object(vector_db_service, "embeddings", embeddings))
+    for agent in agents:
+        stack.enter_context(patch.object(agent, "llm", llm))
+        # 요청별 모델 변경(_init_llm)이 가짜 LLM 을 실제 클라이언트로 바꾸지 않도록
+        stack.enter_context(patch.object(agent, "_init_llm", lambda model_name=None, credentials=None: None))
+    if session_factory is not None:
+        stack.enter_context(patch.object(BaseAgent, "_get_db_session", lambda self: session_factory()))
+    if read_excel is not None:
+        stack.enter_context(patch.object(gdrive_service, "read_excel_file", read_excel))
+    return client
+
+
+def install_api_stubs(stack: ExitStack, workdir: str, docs: int = 50, seed: int = 0,
+                      llm_median_s: float = 0.2, llm_sigma: float = 0.5):
+    """API 부하 테스트용: 가짜 Gemini + 임시 Chroma 에 합성 코퍼스 적재"""
+    from benchmarks.fakes import LatencyModel
+    from benchmarks.synthetic import ingest_corpus
+    from app.services.vector_db_service import vector_db_service
+
+    llm = FakeLLM(LatencyModel(llm_median_s, llm_sigma), seed=seed)
+    embeddings = FakeEmbeddings(seed=seed)
+    install_stubs(stack, llm, embeddings, f"{workdir}/chroma")
+    ingest_corpus(vector_db_service, docs, seed=seed)
+    return llm, embeddings
@@ -0,0 +1,73 @@
+"""시드 고정 합성 데이터: 규격/SOP 문서 코퍼스, 위험 관리 대장, 설계 변경"""
+import random
+from typing import Any, Dict, List
+
+import pandas as pd
+
+
+TOPICS = [
+    "설계 검증", "소프트웨어 변경 관리", "위험 관리", "사용적합성", "전기 안전",
+    "생물학적 안전성", "라벨링", "시판 후 감시", "공급자 관리", "문서 관리",
+]
+STANDARDS = ["ISO 13485", "ISO 14971", "IEC 62304", "IEC 62366-1", "IEC 60601-1", "MFDS 고시"]
+WORDS = (
+    "요구사항 절차 기록 검토 승인 시험 합격 기준 추적성 위해요인 심각도 발생확률 통제 조치 "
+    "잔여 위험 평가 변경 영향 분석 문서 보관 책임자 교육 감사 시정 예방 조치 검증 밸리데이션 "
+    "소프트웨어 단위 통합 시스템 회귀 사용자 인터페이스 경고 표시 전원 누설 전류 절연 펌웨어"
+).split()
+HAZARDS = ["감전", "과열", "오진단", "데이터 손실", "오투여", "알람 누락", "사용 오류", "감염"]
+
+
+def make_corpus(num_docs: int, words_per_doc: int = 600, seed: int = 0) -> List[Dict[str, Any]]:
+    """문서 ``num_docs`` 개 (id, text, metadata)"""
+    rng = random.Random(seed)
+    documents = []
+    for i in range(num_docs):
+        topic = rng.choice(TOPICS)
+        standard = rng.choice(STANDARDS)
+        body = " ".join(rng.choice(WORDS) for _ in range(words_per_doc))
+        documents.append({
+            "id": f"doc-{i:05d}",
+            "text": f"{standard} {topic}\n\n{body}",
+            "metadata": {"standard": standard, "topic": topic},
+        })
+    return documents
+
+
+def make_risk_register(num_risks: int, seed: int = 0) -> pd.DataFrame:
+    """위험 관리 대장 (RiskItem 컬럼과 같은 이름)"""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(num_risks):
+        severity = rng.randint(1, 5)
+        probability = rng.randint(1, 5)
+        score = severity * probability
+        rows.append({
+            "risk_number": f"R-{i:05d}",
+            "hazard": rng.choice(HAZARDS),
+            "hazardous_situation": " ".join(rng.choice(WORDS) for _ in range(12)),
+            "harm": " ".join(rng.choice(WORDS) for _ in range(6)),
+            "severity": severity,
+            "probability": probability,
+            "risk_level": "High" if score >= 15 else "Medium" if score >= 6 else "Low",
+        })
+    return pd.DataFrame(rows)
+
+
+def make_change(index: int, seed: int = 0) -> Dict[str, Any]:
+    rng = random.Random(seed * 100003 + index)
+    topic = rng.choice(TOPICS)
+    return {
+        "change_number": f"BENCH-{index:05d}",
+        "title": f"{topic} 관련 설계 변경 {index}",
+        "description": " ".join(rng.choice(WORDS) for _ in range(80)),
+        "change_type": rng.choice(["new_feature", "bug_fix", "improvement"]),
+        "justification": "benchmark",
+    }
+
+
+def ingest_corpus(vector_db, num_docs: int, seed: int = 0, collection: str = "qms_knowledge_base"):
+    """합성 코퍼스를 VectorDBService 로 분할/임베딩해 적재 (에이전트가 검색하는 컬렉션)"""
+    for document in make_corpus(num_docs, seed=seed):
+        vector_db.process_and_add_document(collection, document["text"], document["metadata"],
+                                           doc_id_prefix=document["id"])
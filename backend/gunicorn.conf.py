@@ -0,0 +1,40 @@
+"""다중 워커 실행 설정 (gunicorn -c gunicorn.conf.py app.main:app)
+
+워커마다 앱을 따로 import 하고(preload 없음) 시작 시 서비스를 예열합니다.
+임베딩/LLM 응답/사용자 조회는 ``SHARED_CACHE_PATH`` 의 공유 캐시로, Prometheus 메트릭은
+``PROMETHEUS_MULTIPROC_DIR`` 로 워커 간에 합칩니다. 로컬 Chroma(PersistentClient)는 여러 프로세스가
+같은 디렉터리에 쓰면 안 되므로 워커가 둘 이상이면 ``CHROMA_SERVER_HOST`` 가 필요합니다.
+"""
+import multiprocessing
+import os
+import shutil
+
+# settings 를 읽기 전에 다중 워커 기본값 지정 (환경 변수로 덮어쓸 수 있음)
+os.environ.setdefault("SHARED_CACHE_ENABLED", "true")
+os.environ.setdefault("WARM_UP_SERVICES", "true")
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "./cache/prometheus")
+
+from app.core.config import settings  # noqa: E402
+
+bind = os.environ.get("BIND", "0.0.0.0:8000")
+workers = settings.WEB_CONCURRENCY or multiprocessing.cpu_count()
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = False
+# 분석/일괄 분석 스트리밍은 LLM 호출 때문에 오래 걸릴 수 있음
+timeout = 300
+graceful_timeout = 30
+keepalive = 5
+
+
+def on_starting(server):
+    if server.cfg.workers > 1 and not settings.CHROMA_SERVER_HOST:
+        raise RuntimeError("워커가 2개 이상이면 CHROMA_SERVER_HOST 로 Chroma 서버를 지정해야 합니다")
+    # 이전 실행의 워커별 메트릭 파일 제거
+    multiproc_dir = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(multiproc_dir, ignore_errors=True)
+    os.makedirs(multiproc_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
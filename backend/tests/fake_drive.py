@@ -0,0 +1,207 @@
+"""오프라인 테스트용 Google Drive v3 서비스 대역
+
+``googleapiclient`` 의 ``service.files().list(...).execute()`` 호출 형태를 흉내내며,
+페이지 토큰 / 배치 요청 / 필드 마스크와 호출 횟수를 기록합니다.
+"""
+import hashlib
+import re
+import threading
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional
+
+
+FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
+
+
+class FakeRequest:
+    def __init__(self, drive: "FakeDriveService", method: str, handler: Callable[[], Dict], params: Dict):
+        self.drive = drive
+        self.method = method
+        self.handler = handler
+        self.params = params
+
+    def execute(self, http=None, num_retries=0):
+        with self.drive.lock:
+            self.drive.calls[self.method] += 1
+            self.drive.http_clients.add(id(http) if http is not None else None)
+        return self.handler()
+
+
+class FakeBatch:
+    def __init__(self, drive: "FakeDriveService", callback):
+        self.drive = drive
+        self.callback = callback
+        self.requests: List = []
+
+    def add(self, request: FakeRequest, request_id: str):
+        self.requests.append((request_id, request))
+
+    def execute(self, http=None):
+        with self.drive.lock:
+            self.drive.calls["batch"] += 1
+        for request_id, request in self.requests:
+            try:
+                response, error = request.handler(), None
+            except Exception as e:
+                response, error = None, e
+            self.callback(request_id, response, error)
+
+
+class FakeResponse(dict):
+    """httplib2.Response 처럼 status 속성을 가진 헤더 dict"""
+
+    def __init__(self, status: int, headers: Optional[Dict[str, str]] = None):
+        super().__init__(headers or {})
+        self.status = status
+
+
+class FakeMediaHttp:
+    """Range 요청을 처리하는 미디어 다운로드용 http (지정 횟수만큼 503 반환)"""
+
+    def __init__(self, drive: "FakeDriveService", content: bytes):
+        self.drive = drive
+        self.content = content
+
+    def request(self, uri, method="GET", headers=None, **kwargs):
+        with self.drive.lock:
+            if self.drive.fail_next > 0:
+                self.drive.fail_next -= 1
+                return FakeResponse(503), b""
+        first, last = map(int, headers["range"].split("=")[1].split("-"))
+        chunk = self.content[first:last + 1]
+        with self.drive.lock:
+            self.drive.ranges.append((first, len(chunk)))
+        total = len(self.content)
+        return FakeResponse(206, {
+            "content-range": f"bytes {first}-{first + len(chunk) - 1}/{total}",
+            "content-length": str(len(chunk)),
+        }), chunk
+
+
+class FakeMediaRequest:
+    def __init__(self, drive: "FakeDriveService", file_id: str, content: bytes):
+        self.uri = f"https://fake-drive/{file_id}?alt=media"
+        self.headers: Dict[str, str] = {}
+        self.http = FakeMediaHttp(drive, content)
+
+
+class FakeFiles:
+    def __init__(self, drive: "FakeDriveService"):
+        self.drive = drive
+
+    def list(self, q=None, fields=None, pageSize=100, pageToken=None, **kwargs):
+        def handler():
+            matches = [f for f in self.drive.items.values() if self.drive.matches(f, q)]
+            matches.sort(key=lambda f: f["name"])
+            start = int(pageToken or 0)
+            page = matches[start:start + pageSize]
+            response: Dict[str, Any] = {"files": [self.drive.mask(f, fields) for f in page]}
+            if start + pageSize < len(matches):
+                response["nextPageToken"] = str(start + pageSize)
+            return response
+        return FakeRequest(self.drive, "files.list", handler, {"q": q, "fields": fields, "pageSize": pageSize})
+
+    def get_media(self, fileId, **kwargs):
+        return FakeMediaRequest(self.drive, fileId, self.drive.items[fileId]["content"])
+
+    def export_media(self, fileId, mimeType=None, **kwargs):
+        content = self.drive.items[fileId]["content"]
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        return FakeMediaRequest(self.drive, fileId, content)
+
+    def create(self, body=None, media_body=None, fields=None, **kwargs):
+        def handler():
+            body_ = dict(body or {})
+            parents = body_.pop("parents", [None])
+            folder = body_.get("mimeType") == FOLDER_MIME_TYPE
+            extra = {k: v for k, v in body_.items() if k not in ("name", "mimeType")}
+            if media_body is not None:
+                extra.update(self.drive.media_fields(media_body))
+            if not folder and "mimeType" in body_:
+                extra["mimeType"] = body_["mimeType"]
+            with self.drive.lock:
+                file_id = self.drive.add(body_["name"], parent=parents[0], folder=folder, **extra)
+            return self.drive.mask(self.drive.items[file_id], fields)
+        return FakeRequest(self.drive, "files.create", handler, {"body": body, "fields": fields})
+
+    def update(self, fileId, body=None, media_body=None, fields=None, **kwargs):
+        def handler():
+            item = self.drive.items[fileId]
+            item.update(body or {})
+            if media_body is not None:
+                item.update(self.drive.media_fields(media_body))
+            return self.drive.mask(item, fields)
+        return FakeRequest(self.drive, "files.update", handler, {"fileId": fileId, "fields": fields})
+
+    def get(self, fileId, fields=None, **kwargs):
+        def handler():
+            if fileId not in self.drive.items:
+                raise KeyError(fileId)
+            return self.drive.mask(self.drive.items[fileId], fields)
+        return FakeRequest(self.drive, "files.get", handler, {"fileId": fileId, "fields": fields})
+
+
+class FakeDriveService:
+    def __init__(self):
+        self.items: Dict[str, Dict[str, Any]] = {}
+        self.calls: Counter = Counter()
+        self.http_clients: set = set()
+        self.lock = threading.Lock()
+        self.ranges: List = []
+        self.fail_next = 0
+        self._seq = 0
+        self._clock = 0
+
+    def add(self, name: str, parent: Optional[str] = None, folder: bool = False, **extra) -> str:
+        self._seq += 1
+        file_id = f"id{self._seq}"
+        self.items[file_id] = {
+            "id": file_id,
+            "name": name,
+            "mimeType": FOLDER_MIME_TYPE if folder else extra.pop("mimeType", "text/plain"),
+            "modifiedTime": extra.pop("modifiedTime", "2024-01-01T00:00:00Z"),
+            "parents": [parent] if parent else [],
+            **extra,
+        }
+        return file_id
+
+    def media_fields(self, media) -> Dict[str, Any]:
+        """업로드 미디어로 content/size/md5Checksum/modifiedTime 계산"""
+        content = media.getbytes(0, media.size())
+        self._clock += 1
+        return {
+            "content": content,
+            "size": str(len(content)),
+            "md5Checksum": hashlib.md5(content).hexdigest(),
+            "modifiedTime": f"2030-01-01T00:00:{self._clock % 60:02d}Z",
+        }
+
+    def files(self) -> FakeFiles:
+        return FakeFiles(self)
+
+    def new_batch_http_request(self, callback=None) -> FakeBatch:
+        return FakeBatch(self, callback)
+
+    @staticmethod
+    def mask(file: Dict[str, Any], fields: Optional[str]) -> Dict[str, Any]:
+        """``nextPageToken, files(id, name)`` / ``id, name`` 형태의 필드 마스크 적용"""
+        if not fields:
+            return {k: v for k, v in file.items() if k != "content"}
+        inner = re.search(r"files\((.*)\)", fields)
+        names = [n.strip() for n in (inner.group(1) if inner else fields).split(",")]
+        return {k: v for k, v in file.items() if k in names and k != "content"}
+
+    @staticmethod
+    def matches(file: Dict[str, Any], q: Optional[str]) -> bool:
+        if not q:
+            return True
+        for clause in q.strip("()").split(" and "):
+            clause = clause.strip("() ")
+            parent = re.fullmatch(r"'(.+)' in parents", clause)
+            contains = re.fullmatch(r"name contains '(.+)'", clause)
+            if parent and parent.group(1) not in file["parents"]:
+                return False
+            if contains and contains.group(1) not in file["name"]:
+                return False
+        return True
@@ -0,0 +1,96 @@
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.agents.base_agent import BaseAgent
+from app.agents.orchestrator import orchestrator
+from app.db.models import AgentAnalysis, DesignProject, RiskItem
+from app.services.knowledge_base import knowledge_base
+
+
+class CountingLLM:
+    def __init__(self):
+        self.prompts = []
+
+    async def ainvoke(self, prompt):
+        self.prompts.append(prompt)
+        return SimpleNamespace(content=json.dumps({"summary": "ok"}))
+
+
+@pytest.fixture
+def llm(db_session):
+    llm = CountingLLM()
+    session = MagicMock(wraps=db_session)
+    session.close = MagicMock()
+    search_results = {"ids": [["sop-1", "sop-2"]], "documents": [["SOP A", "SOP B"]]}
+    with patch.object(knowledge_base, "search", return_value=search_results), \
+            patch.object(BaseAgent, "_get_db_session", return_value=session), \
+            patch.object(BaseAgent, "_get_impact_set", return_value=[]):
+        patches = [patch.object(agent, "llm", llm) for agent in orchestrator.agents.values()]
+        # 요청의 model_name 으로 실제 클라이언트가 만들어지지 않도록
+        patches += [patch.object(agent, "_init_llm", lambda model_name=None, credentials=None: None)
+                    for agent in orchestrator.agents.values()]
+        for p in patches:
+            p.start()
+        yield llm
+        for p in patches:
+            p.stop()
+
+
+@pytest.fixture
+def change(client, db_session, test_user_data, test_project_data, test_change_data):
+    client.post("/api/v1/auth/register", json=test_user_data)
+    token = client.post(
+        "/api/v1/auth/login",
+        data={"username": test_user_data["username"], "password": test_user_data["password"]},
+    ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    project = DesignProject(**test_project_data)
+    db_session.add(project)
+    db_session.commit()
+    created = client.post("/api/v1/design-changes/", json={**test_change_data, "project_id": project.id},
+                          headers=headers).json()
+    return SimpleNamespace(id=created["id"], project_id=project.id, headers=headers)
+
+
+def test_workflow_reanalysis_reuses_unchanged_agents(client, db_session, llm, change):
+    url = "/api/v1/agents/analyze/workflow"
+
+    first = client.post(url, json={"change_id": change.id}, headers=change.headers).json()
+    assert first["reused"] == [] and len(first["recomputed"]) == 6
+    assert first["llm_calls"] == len(llm.prompts) and first["llm_calls_reused"] == 0
+    assert all(a["input_fingerprint"] and "sop-1" in a["inputs"]["retrieved_ids"] for a in first["analyses"])
+
+    calls = len(llm.prompts)
+    second = client.post(url, json={"change_id": change.id}, headers=change.headers).json()
+    assert second["recomputed"] == [] and second["llm_calls"] == 0
+    assert len(llm.prompts) == calls
+    assert [a["id"] for a in second["analyses"]] == [a["id"] for a in first["analyses"]]
+    assert db_session.query(AgentAnalysis).count() == 6
+
+    # 위험 대장만 바뀌면 위험 재평가 호출 한 번만 다시 실행
+    db_session.add(RiskItem(risk_number="R-9", project_id=change.project_id, hazard="Overheating"))
+    db_session.commit()
+    third = client.post(url, json={"change_id": change.id}, headers=change.headers).json()
+    assert third["recomputed"] == ["risk_manager"]
+    assert third["llm_calls"] == 1 and len(llm.prompts) == calls + 1
+    risk_analysis = next(a for a in third["analyses"] if a["agent_type"] == "risk_manager")
+    previous = next(a for a in first["analyses"] if a["agent_type"] == "risk_manager")
+    assert risk_analysis["reused_from"] == previous["id"]
+    assert risk_analysis["input_fingerprint"] != previous["input_fingerprint"]
+
+
+def test_single_analysis_is_reused_until_change_is_edited(client, llm, change):
+    body = {"change_id": change.id, "agent_type": "design_engineer", "analysis_type": "impact"}
+
+    first = client.post("/api/v1/agents/analyze/impact", json=body, headers=change.headers).json()
+    second = client.post("/api/v1/agents/analyze/impact", json=body, headers=change.headers).json()
+    assert (first["reused"], second["reused"]) == (False, True)
+    assert second["id"] == first["id"] and len(llm.prompts) == 1
+
+    client.put(f"/api/v1/design-changes/{change.id}", json={"title": "Edited title"}, headers=change.headers)
+    third = client.post("/api/v1/agents/analyze/impact", json=body, headers=change.headers).json()
+    assert third["reused"] is False and third["id"] != first["id"]
+    assert len(llm.prompts) == 2
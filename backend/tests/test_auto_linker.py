@@ -0,0 +1,107 @@
+import chromadb
+import pytest
+from chromadb.config import Settings
+
+from app.db.models import DesignChange, DesignProject, Document, RiskItem, TraceabilityLink
+from app.services.auto_linker import TraceabilityAutoLinker
+from app.services.vector_db_service import VectorDBService
+
+
+VOCAB = ["battery", "display", "alarm", "wireless"]
+
+
+class KeywordEmbeddings:
+    """어휘 빈도 벡터 (같은 주제 텍스트끼리만 유사)"""
+
+    def __init__(self):
+        self.calls = []
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        return [[text.lower().count(word) + 0.01 for word in VOCAB] for text in texts]
+
+
+@pytest.fixture
+def linker(tmp_path):
+    service = VectorDBService.__new__(VectorDBService)
+    service.client = chromadb.PersistentClient(path=str(tmp_path / "chroma"),
+                                               settings=Settings(anonymized_telemetry=False))
+    service.embeddings = KeywordEmbeddings()
+    return TraceabilityAutoLinker(vector_db=service, threshold=0.9, top_k=2)
+
+
+@pytest.fixture
+def project(db_session):
+    project = DesignProject(project_code="P-1", project_name="Pump")
+    db_session.add(project)
+    db_session.flush()
+    db_session.add_all([
+        DesignChange(change_number="DCR-1", project_id=project.id, title="Battery change",
+                     description="Replace battery cell"),
+        DesignChange(change_number="DCR-2", project_id=project.id, title="Display update",
+                     description="New display layout"),
+        RiskItem(risk_number="R-1", project_id=project.id, hazard="Battery overheating", harm="Burn"),
+        RiskItem(risk_number="R-2", project_id=project.id, hazard="Display misread", harm="Wrong dose"),
+        Document(document_type="SRS", document_code="SRS-BAT", document_name="Battery requirements",
+                 version="1.0", project_id=project.id),
+    ])
+    db_session.commit()
+    return project
+
+
+def pairs(db_session):
+    return sorted(
+        (link.source_type, link.source_id, link.target_type, link.target_id)
+        for link in db_session.query(TraceabilityLink).filter(TraceabilityLink.is_auto_generated.is_(True))
+    )
+
+
+def test_links_similar_entities_with_scores(linker, db_session, project):
+    report = linker.run(db_session, project.id)
+
+    assert report.entities == 5 and report.embedded == 5
+    assert pairs(db_session) == [
+        ("design_change", 1, "document", 1),
+        ("design_change", 1, "risk", 1),
+        ("design_change", 2, "risk", 2),
+        ("document", 1, "risk", 1),
+    ]
+    scores = [link.confidence_score for link in db_session.query(TraceabilityLink)]
+    assert all(0.9 <= score <= 1.0 for score in scores)
+
+
+def test_incremental_run_reembeds_only_changed_entities(linker, db_session, project):
+    linker.run(db_session, project.id)
+    db_session.add(TraceabilityLink(source_type="design_change", source_id=2, target_type="document", target_id=1))
+    db_session.commit()
+
+    report = linker.run(db_session, project.id)
+    assert report.embedded == 0 and report.links_created == 0
+
+    change = db_session.get(DesignChange, 2)
+    change.title, change.description = "Wireless module", "Add wireless alarm relay"
+    risk = RiskItem(risk_number="R-3", project_id=project.id, hazard="Wireless alarm dropout",
+                    harm="Missed wireless alarm")
+    db_session.add(risk)
+    db_session.commit()
+
+    report = linker.run(db_session, project.id)
+    assert report.embedded == 2
+    assert linker.vector_db.embeddings.calls[-1] == [
+        "Wireless module\nAdd wireless alarm relay",
+        "Wireless alarm dropout\nMissed wireless alarm",
+    ]
+    assert report.links_deleted == 1
+    assert ("design_change", 2, "risk", 2) not in pairs(db_session)
+    assert ("design_change", 2, "risk", risk.id) in pairs(db_session)
+    # 수동 링크는 유지
+    assert db_session.query(TraceabilityLink).filter(TraceabilityLink.is_auto_generated.is_(False)).count() == 1
+
+
+def test_ann_path_matches_exact_scores(linker, db_session, project):
+    exact = linker.run(db_session, project.id, full=True)
+    linker.ann_min_candidates = 1
+    ann = linker.run(db_session, project.id, full=True)
+
+    assert exact.candidates == ann.candidates
+    assert ann.links_created == 0 and ann.links_deleted == 0
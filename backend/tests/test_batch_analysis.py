@@ -0,0 +1,99 @@
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.agents.base_agent import BaseAgent
+from app.agents.orchestrator import orchestrator
+from app.db.models import AgentAnalysis, DesignProject
+from app.services.knowledge_base import knowledge_base
+
+
+class CountingLLM:
+    def __init__(self):
+        self.prompts = []
+
+    async def ainvoke(self, prompt):
+        self.prompts.append(prompt)
+        return SimpleNamespace(content=json.dumps({"summary": "ok"}))
+
+
+@pytest.fixture
+def llm(db_session):
+    llm = CountingLLM()
+    session = MagicMock(wraps=db_session)
+    session.close = MagicMock()
+    search = MagicMock(return_value={"ids": [["sop-1"]], "documents": [["SOP A"]]})
+    with patch.object(knowledge_base, "search", search), \
+            patch.object(BaseAgent, "_get_db_session", return_value=session), \
+            patch.object(BaseAgent, "_get_impact_set", return_value=[]):
+        patches = [patch.object(agent, "llm", llm) for agent in orchestrator.agents.values()]
+        patches += [patch.object(agent, "_init_llm", lambda model_name=None, credentials=None: None)
+                    for agent in orchestrator.agents.values()]
+        for p in patches:
+            p.start()
+        llm.search = search
+        yield llm
+        for p in patches:
+            p.stop()
+
+
+@pytest.fixture
+def changes(client, db_session, test_user_data, test_project_data, test_change_data):
+    client.post("/api/v1/auth/register", json=test_user_data)
+    token = client.post(
+        "/api/v1/auth/login",
+        data={"username": test_user_data["username"], "password": test_user_data["password"]},
+    ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    project = DesignProject(**test_project_data)
+    db_session.add(project)
+    db_session.commit()
+    ids = [
+        client.post("/api/v1/design-changes/",
+                    json={**test_change_data, "change_number": f"DC-B{i}", "title": f"Change {i}",
+                          "project_id": project.id},
+                    headers=headers).json()["id"]
+        for i in range(3)
+    ]
+    return SimpleNamespace(ids=ids, headers=headers)
+
+
+def _events(response):
+    return [json.loads(line) for line in response.text.splitlines() if line]
+
+
+def test_batch_streams_results_and_shares_retrieval(client, db_session, llm, changes):
+    body = {"change_ids": changes.ids + [999999], "agent_types": ["design_engineer", "risk_manager"]}
+    response = client.post("/api/v1/agents/analyze/batch", json=body, headers=changes.headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    events = _events(response)
+    *results, last = events
+    summary = last["summary"]
+    assert {e["change_id"] for e in results if e["status"] == "completed"} == set(changes.ids)
+    assert [e["change_id"] for e in results if e["status"] == "error"] == [999999]
+    assert summary["completed"] == 3 and summary["failed"] == 1
+    assert summary["llm_calls"] == len(llm.prompts) > 0
+    # 같은 질의의 정적 SOP/표준 검색은 변경 수와 무관하게 한 번만 수행
+    assert summary["search_cache_hits"] > 0
+    assert llm.search.call_count < 3 * 3
+    assert db_session.query(AgentAnalysis).count() == 6
+
+    calls = len(llm.prompts)
+    again = _events(client.post("/api/v1/agents/analyze/batch", json=body, headers=changes.headers))
+    assert again[-1]["summary"]["llm_calls"] == 0 and len(llm.prompts) == calls
+    assert all(e["recomputed"] == [] for e in again if e.get("status") == "completed")
+    assert db_session.query(AgentAnalysis).count() == 6
+
+
+def test_batch_rejects_unknown_agent_and_oversized_batch(client, llm, changes):
+    url = "/api/v1/agents/analyze/batch"
+    response = client.post(url, json={"change_ids": changes.ids, "agent_types": ["nope"]}, headers=changes.headers)
+    assert response.status_code == 400
+
+    with patch("app.api.v1.agents.settings.BATCH_ANALYSIS_MAX_CHANGES", 2):
+        response = client.post(url, json={"change_ids": changes.ids}, headers=changes.headers)
+    assert response.status_code == 400
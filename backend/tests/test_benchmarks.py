@@ -0,0 +1,23 @@
+from benchmarks.harness import compare, percentile
+from benchmarks.orchestrator_bench import BenchConfig, run_benchmark
+
+
+def test_percentile_and_regression_detection():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 95) == 0.0
+
+    baseline = {"latency_p95_s": 1.0, "throughput_rps": 10.0, "peak_rss_mb": 200.0}
+    assert compare({"latency_p95_s": 1.05, "throughput_rps": 9.5, "peak_rss_mb": 200.0}, baseline) == []
+    regressions = compare({"latency_p95_s": 1.3, "throughput_rps": 8.0, "peak_rss_mb": 190.0}, baseline)
+    assert [r.split(":")[0] for r in regressions] == ["latency_p95_s", "throughput_rps"]
+
+
+def test_orchestrator_benchmark_smoke(tmp_path):
+    config = BenchConfig(runs=3, concurrency=3, docs=5, risks=4, llm_median_s=0.0, llm_sigma=0.0)
+    metrics = run_benchmark(config, workdir=str(tmp_path))
+
+    assert metrics["runs"] == 3 and metrics["errors"] == 0
+    assert metrics["llm_calls"] == 3 * 8
+    assert metrics["latency_p99_s"] >= metrics["latency_p50_s"] > 0
@@ -17,3 +17,98 @@ def test_list_design_changes_empty(client, test_user_data):
     response = client.get("/api/v1/design-changes/", headers=headers)
     assert response.status_code == status.HTTP_200_OK
     assert response.json() == []
+
+
+def _register(client, username, role):
+    client.post("/api/v1/auth/register", json={
+        "username": username,
+        "email": f"{username}@example.com",
+        "password": "testpassword123",
+        "full_name": username,
+        "role": role
+    })
+    login_resp = client.post(
+        "/api/v1/auth/login",
+        data={"username": username, "password": "testpassword123"}
+    )
+    return {"Authorization": f"Bearer {login_resp.json()['access_token']}"}
+
+
+def _create_changes(client, db_session, headers, test_project_data, test_change_data, count):
+    from app.db.models import DesignProject
+    project = DesignProject(**test_project_data)
+    db_session.add(project)
+    db_session.commit()
+    return [
+        client.post(
+            "/api/v1/design-changes/",
+            json={**test_change_data, "project_id": project.id},
+            headers=headers
+        ).json()["id"]
+        for _ in range(count)
+    ]
+
+
+def test_transition_is_validated_against_current_status(
+    client, db_session, test_user_data, test_project_data, test_change_data
+):
+    headers = _register(client, test_user_data["username"], "design_engineer")
+    ra_headers = _register(client, "ra_user", "regulatory_affairs")
+    ra_id = client.get("/api/v1/auth/me", headers=ra_headers).json()["id"]
+    change_id, = _create_changes(client, db_session, headers, test_project_data, test_change_data, 1)
+    url = f"/api/v1/design-changes/{change_id}/transition"
+    
+    response = client.post(url, json={"action": "approve"}, headers=headers)
+    assert response.status_code == status.HTTP_409_CONFLICT
+    response = client.post(url, json={"action": "unknown"}, headers=headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    
+    response = client.post(url, json={"action": "submit_for_ra"}, headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["workflow_status"] == "ra_review"
+    assert response.json()["current_assignee"] == ra_id
+    
+    inbox = client.get("/api/v1/design-changes/inbox", headers=ra_headers).json()
+    assert [c["id"] for c in inbox] == [change_id]
+    assert client.get("/api/v1/design-changes/inbox", headers=headers).json() == []
+    
+    response = client.put(f"/api/v1/design-changes/{change_id}", json={"workflow_status": "approved"},
+                          headers=headers)
+    assert response.status_code == status.HTTP_409_CONFLICT
+
+
+def test_bulk_transition_applies_in_one_transaction(
+    client, db_session, test_user_data, test_project_data, test_change_data
+):
+    from app.db.models import WorkflowHistory
+    headers = _register(client, test_user_data["username"], "design_engineer")
+    ra_ids = [
+        client.get("/api/v1/auth/me", headers=_register(client, f"ra_{i}", "regulatory_affairs")).json()["id"]
+        for i in range(2)
+    ]
+    change_ids = _create_changes(client, db_session, headers, test_project_data, test_change_data, 4)
+    client.post(f"/api/v1/design-changes/{change_ids[0]}/transition", json={"action": "submit_for_ra"},
+                headers=headers)
+    url = "/api/v1/design-changes/transitions/bulk"
+    
+    # 하나라도 전이할 수 없으면 아무것도 적용하지 않음
+    response = client.post(url, json={"action": "submit_for_ra", "change_ids": change_ids}, headers=headers)
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert db_session.query(WorkflowHistory).count() == 1
+    
+    response = client.post(url, json={"action": "submit_for_ra", "change_ids": change_ids, "atomic": False},
+                           headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    body = response.json()
+    assert body["applied"] == change_ids[1:]
+    assert [f["change_id"] for f in body["failed"]] == [change_ids[0]]
+    assert db_session.query(WorkflowHistory).count() == 4
+    
+    # 역할 사용자에게 고르게 배정
+    assigned = [client.get(f"/api/v1/design-changes/{i}", headers=headers).json()["current_assignee"]
+                for i in change_ids]
+    assert sorted(assigned) == sorted(ra_ids * 2)
+    
+    response = client.get("/api/v1/design-changes/inbox",
+                          params={"assignee_id": ra_ids[0], "workflow_status": "ra_review"}, headers=headers)
+    assert len(response.json()) == 2
@@ -0,0 +1,89 @@
+import pytest
+from fastapi import status
+from app.services.local_storage_service import LocalStorageService
+
+
+@pytest.fixture
+def auth_headers(client, test_user_data):
+    client.post("/api/v1/auth/register", json=test_user_data)
+    login_resp = client.post(
+        "/api/v1/auth/login",
+        data={
+            "username": test_user_data["username"],
+            "password": test_user_data["password"]
+        }
+    )
+    token = login_resp.json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    from app.api.v1 import documents
+
+    service = LocalStorageService(base_path=str(tmp_path / "qms"))
+    monkeypatch.setattr(documents, "local_storage_service", service)
+    yield service
+    service.catalog.close()
+
+
+def test_upload_streams_binary_and_download_supports_range(client, auth_headers, storage):
+    payload = bytes(range(256)) * 1024
+    response = client.post(
+        "/api/v1/documents/files/upload",
+        files={"file": ("risk.xlsx", payload, "application/octet-stream")},
+        data={"category": "risk"},
+        headers=auth_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert (storage.base_path / "risk" / "risk.xlsx").read_bytes() == payload
+
+    full = client.get("/api/v1/documents/files/download", params={"path": "risk/risk.xlsx"}, headers=auth_headers)
+    assert full.status_code == status.HTTP_200_OK
+    assert full.content == payload
+    assert full.headers["accept-ranges"] == "bytes"
+    etag = full.headers["etag"]
+    assert etag == f'"{storage.catalog.get("risk/risk.xlsx")["sha256"]}"'
+
+    partial = client.get(
+        "/api/v1/documents/files/download",
+        params={"path": "risk/risk.xlsx"},
+        headers={**auth_headers, "Range": "bytes=100-199"}
+    )
+    assert partial.status_code == status.HTTP_206_PARTIAL_CONTENT
+    assert partial.content == payload[100:200]
+    assert partial.headers["content-range"] == f"bytes 100-199/{len(payload)}"
+
+    suffix = client.get(
+        "/api/v1/documents/files/download",
+        params={"path": "risk/risk.xlsx"},
+        headers={**auth_headers, "Range": "bytes=-10"}
+    )
+    assert suffix.content == payload[-10:]
+
+    not_modified = client.get(
+        "/api/v1/documents/files/download",
+        params={"path": "risk/risk.xlsx"},
+        headers={**auth_headers, "If-None-Match": etag}
+    )
+    assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+    assert not_modified.content == b""
+
+
+def test_download_rejects_bad_ranges_and_paths(client, auth_headers, storage):
+    storage.write_file("sop/SOP-001.md", "hello")
+
+    response = client.get(
+        "/api/v1/documents/files/download",
+        params={"path": "sop/SOP-001.md"},
+        headers={**auth_headers, "Range": "bytes=10-20"}
+    )
+    assert response.status_code == status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+    assert response.headers["content-range"] == "bytes */5"
+
+    for path in ["../secret.txt", ".catalog.sqlite3", "sop/../../x"]:
+        response = client.get("/api/v1/documents/files/download", params={"path": path}, headers=auth_headers)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    response = client.get("/api/v1/documents/files/download", params={"path": "sop/none.md"}, headers=auth_headers)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,90 @@
+from collections import Counter
+from app.services.document_manager import DocumentManager, StorageType
+from app.services.drive_cache import DriveDocumentCache
+from app.services.local_storage_service import LocalStorageService
+
+
+class FakeDrive:
+    """DocumentManager 가 사용하는 GoogleDriveService 메서드만 흉내내는 대역"""
+
+    def __init__(self):
+        self.service = object()
+        self.files = {}
+        self.changes = []
+        self.calls = Counter()
+
+    def set_file(self, file_id, name, content, modified):
+        self.files[file_id] = {"id": file_id, "name": name, "modifiedTime": modified, "content": content}
+        self.changes.append({"fileId": file_id, "file": self._meta(file_id)})
+
+    def _meta(self, file_id):
+        return {k: v for k, v in self.files[file_id].items() if k != "content"}
+
+    def list_files(self, folder_id=None, query=None):
+        self.calls["list_files"] += 1
+        term = query.split("'")[1]
+        return [self._meta(i) for i, f in self.files.items() if term in f["name"]]
+
+    def get_file_metadata(self, file_id):
+        self.calls["get_file_metadata"] += 1
+        return self._meta(file_id)
+
+    def get_file_content(self, file_id):
+        self.calls["get_file_content"] += 1
+        return self.files[file_id]["content"]
+
+    def get_start_page_token(self):
+        self.calls["get_start_page_token"] += 1
+        return str(len(self.changes))
+
+    def list_changes(self, page_token):
+        self.calls["list_changes"] += 1
+        return self.changes[int(page_token):], str(len(self.changes))
+
+
+def make_manager(tmp_path, drive, **cache_kwargs):
+    cache = DriveDocumentCache(tmp_path / "cache", refresh_seconds=0, **cache_kwargs)
+    local = LocalStorageService(base_path=str(tmp_path / "qms"))
+    return DocumentManager(local_service=local, gdrive_service=drive, drive_cache=cache), cache
+
+
+def test_get_sop_is_served_locally_after_first_read(tmp_path):
+    drive = FakeDrive()
+    drive.set_file("f1", "SOP-001 Design Control", "v1", "2024-01-01T00:00:00Z")
+    manager, cache = make_manager(tmp_path, drive)
+
+    assert manager.get_sop("SOP-001", storage=StorageType.GDRIVE) == "v1"
+    network = drive.calls["list_files"] + drive.calls["get_file_content"]
+
+    for _ in range(3):
+        assert manager.get_sop("SOP-001", storage=StorageType.GDRIVE) == "v1"
+    assert drive.calls["list_files"] + drive.calls["get_file_content"] == network
+    assert drive.calls["get_file_metadata"] == 1
+
+
+def test_changes_invalidate_modified_and_removed_files(tmp_path):
+    drive = FakeDrive()
+    drive.set_file("f1", "SOP-001.docx", "v1", "2024-01-01T00:00:00Z")
+    manager, cache = make_manager(tmp_path, drive)
+
+    assert manager.read_document("f1", storage=StorageType.GDRIVE) == "v1"
+    drive.set_file("f1", "SOP-001.docx", "v2", "2024-02-01T00:00:00Z")
+    assert manager.read_document("f1", storage=StorageType.GDRIVE) == "v2"
+    assert drive.calls["get_file_content"] == 2
+
+    drive.changes.append({"fileId": "f1", "removed": True})
+    assert cache.refresh(drive, force=True) == 1
+    assert cache.get("f1") is None
+
+
+def test_lru_eviction_bounds_cache_size(tmp_path):
+    cache = DriveDocumentCache(tmp_path / "cache", max_bytes=10, refresh_seconds=0)
+    cache.put("a", {"modifiedTime": "1"}, b"aaaa")
+    cache.put("b", {"modifiedTime": "1"}, b"bbbb")
+    cache.get("a")
+    cache.put("c", {"modifiedTime": "1"}, b"cccc")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"aaaa" and cache.get("c") == b"cccc"
+    assert cache.stats()["bytes"] == 8
+    assert len(list(cache.blob_dir.iterdir())) == 2
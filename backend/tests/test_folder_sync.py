@@ -0,0 +1,100 @@
+import hashlib
+import os
+
+from app.services.folder_sync import FolderSyncEngine, SyncDirection, ConflictPolicy
+from app.services.local_storage_service import LocalStorageService
+from tests.fake_drive import FakeDriveService
+from tests.test_gdrive_service import make_service
+
+
+def make_engine(tmp_path, fake):
+    local = LocalStorageService(base_path=str(tmp_path / "qms"))
+    return local, FolderSyncEngine(local, make_service(fake), max_workers=3)
+
+
+def test_upload_only_changed_files_and_create_folders(tmp_path):
+    fake = FakeDriveService()
+    root = fake.add("QMS", folder=True)
+    local, engine = make_engine(tmp_path, fake)
+    local.write_file("sop/SOP-001.md", "v1")
+    local.write_file("sop/archive/SOP-000.md", "old")
+
+    report = engine.run("sop", root)
+    counts = report.to_dict()["counts"]
+    assert counts == {"upload": 2}
+    assert fake.calls["files.create"] == 3  # archive 폴더 + 파일 2개
+    uploaded = {f["name"]: f for f in fake.items.values()}
+    assert uploaded["SOP-000.md"]["parents"] == [uploaded["archive"]["id"]]
+    assert uploaded["SOP-001.md"]["content"] == b"v1"
+
+    # 변경 없음 → 전송 없음
+    assert engine.run("sop", root).to_dict()["counts"] == {"skip": 2}
+
+    local.write_file("sop/SOP-001.md", "v2")
+    report = engine.run("sop", root)
+    assert report.to_dict()["counts"] == {"skip": 1, "update": 1}
+    assert fake.calls["files.update"] == 1
+    assert uploaded["SOP-001.md"]["content"] == b"v2"
+    assert report.transferred_bytes == 2
+    local.catalog.close()
+
+
+def test_dry_run_transfers_nothing(tmp_path):
+    fake = FakeDriveService()
+    root = fake.add("QMS", folder=True)
+    local, engine = make_engine(tmp_path, fake)
+    local.write_file("sop/SOP-001.md", "v1")
+
+    report = engine.run("sop", root, dry_run=True)
+    assert [(a.path, a.action) for a in report.actions] == [("SOP-001.md", "upload")]
+    assert fake.calls["files.create"] == 0
+    local.catalog.close()
+
+
+def test_conflicts_follow_policy(tmp_path):
+    fake = FakeDriveService()
+    root = fake.add("QMS", folder=True)
+    local, engine = make_engine(tmp_path, fake)
+    local.write_file("sop/SOP-001.md", "base")
+    engine.run("sop", root)
+
+    # 양쪽 모두 수정
+    remote_id = next(i for i, f in fake.items.items() if f["name"] == "SOP-001.md")
+    fake.items[remote_id].update(content=b"remote", size="6", md5Checksum=hashlib.md5(b"remote").hexdigest(),
+                                 modifiedTime="2000-01-01T00:00:00Z")
+    local.write_file("sop/SOP-001.md", "local!")
+
+    skipped = engine.run("sop", root, policy=ConflictPolicy.SKIP)
+    assert [a.action for a in skipped.actions] == ["conflict"]
+    assert fake.items[remote_id]["content"] == b"remote"
+
+    # 원격이 더 오래됨 → newer_wins 에서 로컬이 이김
+    engine.run("sop", root, policy=ConflictPolicy.NEWER_WINS)
+    assert fake.items[remote_id]["content"] == b"local!"
+    local.catalog.close()
+
+
+def test_to_local_downloads_missing_and_changed(tmp_path):
+    fake = FakeDriveService()
+    root = fake.add("QMS", folder=True)
+    sub = fake.add("forms", parent=root, folder=True)
+    for name, content in [("a.txt", b"alpha"), ("b.txt", b"bravo")]:
+        fake.add(name, parent=sub, content=content, size=str(len(content)),
+                 md5Checksum=hashlib.md5(content).hexdigest())
+    fake.add("Guide", parent=root, content="exported text", mimeType="application/vnd.google-apps.document")
+    local, engine = make_engine(tmp_path, fake)
+    local.write_file("templates/forms/a.txt", "alpha")
+
+    report = engine.run("templates", root, direction=SyncDirection.TO_LOCAL)
+    assert sorted((a.path, a.action) for a in report.actions) == [
+        ("Guide", "download"), ("forms/a.txt", "skip"), ("forms/b.txt", "download")
+    ]
+    base = tmp_path / "qms" / "templates"
+    assert (base / "forms" / "b.txt").read_bytes() == b"bravo"
+    assert (base / "Guide").read_text(encoding="utf-8") == "exported text"
+
+    # 체크섬 없는 Google 문서도 마지막 동기화 버전으로 변경 없음 판단
+    again = engine.run("templates", root, direction=SyncDirection.TO_LOCAL)
+    assert again.to_dict()["counts"] == {"skip": 3}
+    assert not any(name.startswith(".") for name in os.listdir(base))
+    local.catalog.close()
@@ -0,0 +1,78 @@
+import asyncio
+import threading
+import time
+from google.oauth2.credentials import Credentials
+from app.services.gdrive_pool import DriveClientPool
+
+
+class StubClient:
+    def __init__(self, credentials, identity="default"):
+        self.credentials = credentials
+        self.identity = identity
+
+
+def make_credentials(refresh_token):
+    return Credentials(token="t", refresh_token=refresh_token, client_id="cid", client_secret="s",
+                       token_uri="https://oauth2.googleapis.com/token")
+
+
+def test_clients_are_per_user_and_reused():
+    default = StubClient(None)
+    pool = DriveClientPool(factory=StubClient, default_client=default)
+
+    alice = pool.client_for(make_credentials("alice"), key="user:1")
+    assert pool.client_for(make_credentials("alice"), key="user:1") is alice
+    bob = pool.client_for(make_credentials("bob"), key="user:2")
+    assert bob is not alice and bob.identity != alice.identity
+    assert pool.client_for(None) is default
+
+    # 다시 로그인해 refresh token 이 바뀌면 새 클라이언트
+    assert pool.client_for(make_credentials("alice-2"), key="user:1") is not alice
+
+
+def test_idle_and_capacity_eviction():
+    pool = DriveClientPool(factory=StubClient, max_clients=2, idle_seconds=0.05)
+    first = pool.client_for(make_credentials("a"), key="user:1")
+    pool.client_for(make_credentials("b"), key="user:2")
+    pool.client_for(make_credentials("c"), key="user:3")
+    assert len(pool) == 2
+    assert pool.client_for(make_credentials("a"), key="user:1") is not first
+
+    time.sleep(0.1)
+    pool.client_for(make_credentials("d"), key="user:4")
+    assert len(pool) == 1
+
+
+def test_run_caps_concurrency_without_blocking_loop():
+    pool = DriveClientPool(factory=StubClient, max_concurrency=3)
+    active, peak = 0, 0
+    lock = threading.Lock()
+
+    def blocking_call():
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+        return threading.current_thread().name
+
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        task = asyncio.create_task(ticker())
+        names = await asyncio.gather(*(pool.run(blocking_call) for _ in range(9)))
+        task.cancel()
+        return names, ticks
+
+    names, ticks = asyncio.run(main())
+    assert peak == 3
+    assert threading.main_thread().name not in names
+    assert ticks > 10
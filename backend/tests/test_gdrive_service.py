@@ -0,0 +1,107 @@
+from app.services.gdrive_service import GoogleDriveService
+from tests.fake_drive import FakeDriveService
+
+
+def make_service(fake: FakeDriveService) -> GoogleDriveService:
+    service = GoogleDriveService()
+    service.service = fake
+    return service
+
+
+def test_list_files_follows_page_tokens():
+    fake = FakeDriveService()
+    folder = fake.add("Regulatory", folder=True)
+    for i in range(2500):
+        fake.add(f"STD-{i:04d}.pdf", parent=folder)
+
+    service = make_service(fake)
+    files = service.list_files(folder_id=folder)
+
+    assert len(files) == 2500
+    assert fake.calls["files.list"] == 3
+    assert set(files[0]) == {"id", "name", "mimeType", "modifiedTime"}
+
+    names = [f["name"] for f in service.iter_files(folder_id=folder, fields="id, name")]
+    assert names[0] == "STD-0000.pdf" and len(names) == 2500
+
+
+def test_get_files_metadata_uses_batches():
+    fake = FakeDriveService()
+    ids = [fake.add(f"doc-{i}") for i in range(250)]
+
+    service = make_service(fake)
+    result = service.get_files_metadata(ids + ["missing"], fields="id, name")
+
+    assert len(result) == 250
+    assert result[ids[10]] == {"id": ids[10], "name": "doc-10"}
+    assert fake.calls["batch"] == 3
+    assert fake.calls["files.get"] == 0
+
+
+def test_walk_folder_recurses_with_relative_paths():
+    fake = FakeDriveService()
+    root = fake.add("QMS", folder=True)
+    sop = fake.add("SOP", parent=root, folder=True)
+    nested = fake.add("Archive", parent=sop, folder=True)
+    fake.add("SOP-001.docx", parent=sop)
+    fake.add("SOP-000.docx", parent=nested)
+    fake.add("Policy.pdf", parent=root)
+
+    service = make_service(fake)
+    paths = sorted(f["path"] for f in service.walk_folder(root, max_workers=2))
+    assert paths == ["Policy.pdf", "SOP", "SOP/Archive", "SOP/Archive/SOP-000.docx", "SOP/SOP-001.docx"]
+
+    shallow = sorted(f["path"] for f in service.walk_folder(root, max_depth=0))
+    assert shallow == ["Policy.pdf", "SOP"]
+
+
+def test_download_to_streams_in_chunks_and_retries(monkeypatch):
+    import io
+    import time
+
+    monkeypatch.setattr(time, "sleep", lambda seconds: None)
+    fake = FakeDriveService()
+    payload = bytes(range(256)) * 4096  # 1 MiB
+    file_id = fake.add("report.pdf", content=payload)
+    fake.fail_next = 1
+
+    service = make_service(fake)
+    sink = io.BytesIO()
+    written = service.download_to(file_id, sink, chunk_size=256 * 1024, num_retries=2)
+
+    assert written == len(payload) and sink.getvalue() == payload
+    assert [size for _, size in fake.ranges] == [256 * 1024] * 4
+    assert all(size <= 256 * 1024 for _, size in fake.ranges)
+
+
+def test_read_excel_and_sync_to_local_stream_from_disk(tmp_path):
+    import io
+    import pandas as pd
+    from app.services.document_manager import DocumentManager
+    from app.services.drive_cache import DriveDocumentCache
+    from app.services.local_storage_service import LocalStorageService
+
+    buffer = io.BytesIO()
+    pd.DataFrame({"risk_number": ["R-1", "R-2"], "severity": [3, 5]}).to_excel(buffer, index=False)
+    fake = FakeDriveService()
+    xlsx = fake.add(
+        "risk.xlsx",
+        content=buffer.getvalue(),
+        mimeType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    )
+
+    service = make_service(fake)
+    df = service.read_excel_file(xlsx)
+    assert list(df["risk_number"]) == ["R-1", "R-2"]
+
+    local = LocalStorageService(base_path=str(tmp_path / "qms"))
+    manager = DocumentManager(
+        local_service=local,
+        gdrive_service=service,
+        drive_cache=DriveDocumentCache(tmp_path / "cache")
+    )
+    saved = manager.sync_to_local(xlsx, "risk")
+    assert (tmp_path / "qms" / "risk" / "risk.xlsx").read_bytes() == buffer.getvalue()
+    assert saved.endswith("risk/risk.xlsx")
+    assert local.catalog.get("risk/risk.xlsx")["size"] == len(buffer.getvalue())
+    local.catalog.close()
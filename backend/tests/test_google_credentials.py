@@ -0,0 +1,100 @@
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import settings
+from app.services.google_credentials import GoogleCredentialManager
+
+
+class FakeTokenTransport:
+    """google.auth.transport.Request 대역 (토큰 엔드포인트 응답, 호출 횟수 기록)"""
+
+    def __init__(self, delay: float = 0.0):
+        self.calls = 0
+        self.delay = delay
+        self.lock = threading.Lock()
+
+    def __call__(self, url, method="GET", body=None, headers=None, **kwargs):
+        with self.lock:
+            self.calls += 1
+            n = self.calls
+        time.sleep(self.delay)
+        data = json.dumps({"access_token": f"access-{n}", "expires_in": 3600}).encode()
+        return SimpleNamespace(status=200, headers={}, data=data)
+
+
+@pytest.fixture(autouse=True)
+def oauth_client(monkeypatch):
+    monkeypatch.setattr(settings, "GOOGLE_CLIENT_ID", "client-id")
+    monkeypatch.setattr(settings, "GOOGLE_CLIENT_SECRET", "client-secret")
+
+
+def make_user(expiry, user_id=1, refresh_token="refresh"):
+    return SimpleNamespace(
+        id=user_id,
+        google_refresh_token=refresh_token,
+        google_access_token="stale",
+        google_token_expiry=expiry,
+    )
+
+
+def make_manager(transport, persisted, **kwargs):
+    return GoogleCredentialManager(
+        refresh_margin_seconds=300,
+        idle_seconds=kwargs.pop("idle_seconds", 3600),
+        interval_seconds=0,
+        request_factory=lambda: transport,
+        persist=lambda user_id, creds: persisted.append((user_id, creds.token, creds.expiry)),
+    )
+
+
+def test_valid_token_is_cached_without_refresh():
+    transport, persisted = FakeTokenTransport(), []
+    manager = make_manager(transport, persisted)
+    user = make_user(datetime.now(timezone.utc) + timedelta(hours=1))
+
+    first = manager.get(user)
+    assert manager.get(user) is first
+    assert first.token == "stale" and transport.calls == 0 and persisted == []
+    assert manager.get(make_user(None, refresh_token=None)) is None
+    assert len(manager) == 0
+
+
+def test_expiring_token_refreshes_once_and_persists():
+    transport, persisted = FakeTokenTransport(delay=0.05), []
+    manager = make_manager(transport, persisted)
+    user = make_user(datetime.now(timezone.utc) + timedelta(seconds=60))
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(manager.get(user))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert transport.calls == 1
+    assert {id(c) for c in results} == {id(results[0])}
+    assert results[0].token == "access-1"
+    assert len(persisted) == 1 and persisted[0][:2] == (1, "access-1")
+
+    # 재로그인으로 refresh token 이 바뀌면 새 인증 정보
+    relogged = make_user(datetime.now(timezone.utc) + timedelta(hours=1), refresh_token="refresh-2")
+    assert manager.get(relogged) is not results[0]
+
+
+def test_refresh_due_renews_recent_users_and_drops_idle():
+    transport, persisted = FakeTokenTransport(), []
+    manager = make_manager(transport, persisted, idle_seconds=0.05)
+    fresh = manager.get(make_user(datetime.now(timezone.utc) + timedelta(hours=1)))
+
+    fresh.expiry = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(seconds=30)
+    manager.refresh_due()
+    assert fresh.token == "access-1" and transport.calls == 1
+
+    time.sleep(0.1)
+    manager.refresh_due()
+    assert len(manager) == 0
@@ -0,0 +1,44 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# 첫 사용 시까지 import 를 미루는 무거운 의존성 (app.main import 에 끌려오면 안 됨)
+DEFERRED_MODULES = [
+    "chromadb",
+    "langchain",
+    "langchain_google_genai",
+    "langgraph",
+    "google.generativeai",
+    "googleapiclient",
+    "google_auth_oauthlib",
+    "pandas",
+]
+
+IMPORT_BUDGET_SECONDS = float(os.environ.get("IMPORT_TIME_BUDGET_SECONDS", "3.0"))
+
+
+def _import_times(module: str):
+    """``-X importtime`` 출력 → {모듈: 누적 시간(초)}"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, env=os.environ.copy(), capture_output=True, text=True, timeout=120,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative) / 1e6
+    return times
+
+
+def test_app_import_defers_heavy_dependencies():
+    times = _import_times("app.main")
+
+    assert [m for m in DEFERRED_MODULES if m in times] == []
+    assert times["app.main"] < IMPORT_BUDGET_SECONDS
@@ -0,0 +1,112 @@
+import chromadb
+import pytest
+from chromadb.config import Settings
+
+from app.services.knowledge_base import (
+    LEGACY_COLLECTION,
+    KnowledgeBase,
+    UnknownCategory,
+    collection_name,
+)
+from app.services.vector_db_service import VectorDBService
+
+
+VOCAB = ["battery", "alarm", "usability", "label"]
+
+
+class KeywordEmbeddings:
+    """어휘 빈도 벡터 (같은 주제 텍스트끼리만 유사)"""
+
+    def __init__(self):
+        self.queries = []
+
+    def embed_documents(self, texts):
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text):
+        self.queries.append(text)
+        return self._vector(text)
+
+    @staticmethod
+    def _vector(text):
+        return [text.lower().count(word) + 0.01 for word in VOCAB]
+
+
+@pytest.fixture
+def service(tmp_path):
+    service = VectorDBService()
+    service.client = chromadb.PersistentClient(path=str(tmp_path / "chroma"),
+                                               settings=Settings(anonymized_telemetry=False))
+    service.embeddings = KeywordEmbeddings()
+    return service
+
+
+@pytest.fixture
+def kb(service):
+    kb = KnowledgeBase(vector_db=service)
+    kb.ingest_text("sop", "Battery replacement procedure", {"source": "SOP-001"}, doc_id_prefix="sop1")
+    kb.ingest_text("sop", "Alarm handling procedure", {"source": "SOP-002"}, doc_id_prefix="sop2")
+    kb.ingest_text("regulatory", "Battery label requirements", {"source": "MFDS"}, doc_id_prefix="mfds")
+    kb.ingest_text("risk", "Battery usability hazard", {"source": "RMF"}, project_id=1, doc_id_prefix="p1")
+    kb.ingest_text("risk", "Battery thermal hazard", {"source": "RMF"}, project_id=2, doc_id_prefix="p2")
+    return kb
+
+
+def test_partitions_use_tuned_hnsw(kb, service):
+    collection = service.client.get_collection(collection_name("risk"))
+    assert collection.metadata == kb.hnsw
+    assert collection.metadata["hnsw:space"] == "cosine"
+    assert collection.get(ids=["p1_0"])["metadatas"][0] == {
+        "source": "RMF", "category": "risk", "project_id": 1, "chunk_index": 0
+    }
+
+
+def test_search_only_covers_requested_categories(kb, service):
+    results = kb.search(["sop"], "battery", n_results=5)
+
+    assert set(results["ids"][0]) == {"sop1_0", "sop2_0"}
+    assert results["ids"][0][0] == "sop1_0"
+    assert all(m["category"] == "sop" for m in results["metadatas"][0])
+
+
+def test_search_merges_partitions_by_distance_with_project_filter(kb, service):
+    results = kb.search(["sop", "regulatory", "risk"], "battery", n_results=3, project_id=1)
+
+    assert len(results["ids"][0]) == 3
+    assert "p2_0" not in results["ids"][0]
+    assert results["distances"][0] == sorted(results["distances"][0])
+    # 질의 임베딩은 분류 수와 무관하게 한 번
+    assert service.embeddings.queries == ["battery"]
+
+    global_only = kb.search(["risk"], "battery", n_results=5)
+    assert global_only["ids"] == [[]]
+
+
+def test_unknown_category_is_rejected(kb):
+    with pytest.raises(UnknownCategory):
+        kb.search(["minutes"], "battery")
+    with pytest.raises(UnknownCategory):
+        kb.ingest_text("minutes", "text", {})
+
+
+def test_repartition_legacy_reuses_embeddings(service):
+    legacy = service.get_or_create_collection(LEGACY_COLLECTION)
+    legacy.add(
+        ids=["a", "b", "c"],
+        documents=["Battery procedure", "Label regulation", "Project alarm record"],
+        metadatas=[{"source": "SOP-001"}, {"category": "regulatory"}, {"category": "risk", "project_id": 7}],
+        embeddings=[[1.0, 0, 0, 0], [0, 0, 0, 1.0], [0, 1.0, 0, 0]],
+    )
+    kb = KnowledgeBase(vector_db=service)
+
+    assert kb.repartition_legacy(batch_size=2) == {"sop": 1, "regulatory": 1, "risk": 1, "templates": 0}
+    assert kb.repartition_legacy() == {"sop": 1, "regulatory": 1, "risk": 1, "templates": 0}
+
+    risk = service.client.get_collection(collection_name("risk"))
+    stored = risk.get(include=["metadatas", "embeddings"])
+    assert stored["ids"] == ["c"]
+    assert stored["metadatas"][0]["project_id"] == 7
+    assert stored["embeddings"][0] == [0, 1.0, 0, 0]
+    assert service.client.get_collection(collection_name("sop")).get(ids=["a"])["metadatas"][0] == {
+        "source": "SOP-001", "category": "sop", "project_id": 0
+    }
@@ -0,0 +1,38 @@
+from sqlalchemy import create_engine, text
+
+from benchmarks.datagen import generate
+from benchmarks.load_test import LoadConfig, run_in_process
+
+
+def test_datagen_bulk_loads_all_tables(tmp_path):
+    url = f"sqlite:///{tmp_path}/load.db"
+    report = generate(url, projects=3, users=4, changes=500, risks=50, history=2000, links=300, batch_size=256)
+    assert report["workflow_history"]["rows"] == 2000
+
+    engine = create_engine(url)
+    with engine.connect() as conn:
+        counts = {
+            table: conn.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+            for table in ("users", "design_projects", "design_changes", "risk_items",
+                          "workflow_history", "traceability_links")
+        }
+        max_change = conn.execute(text("SELECT MAX(change_id) FROM workflow_history")).scalar()
+    engine.dispose()
+    assert counts == {"users": 4, "design_projects": 3, "design_changes": 500, "risk_items": 50,
+                      "workflow_history": 2000, "traceability_links": 300}
+    assert max_change <= 500
+
+
+def test_in_process_load_reports_per_endpoint_latency(tmp_path):
+    url = f"sqlite:///{tmp_path}/load.db"
+    generate(url, projects=2, users=2, changes=50, risks=5, history=100, links=10)
+
+    config = LoadConfig(users=2, duration_s=1.0, load_users=2, projects=2, max_change_id=50,
+                        weights={"list": 3, "get": 2, "create": 1, "transition": 1, "analyze": 1})
+    report = run_in_process(url, config, workdir=str(tmp_path))
+
+    endpoints = report["endpoints"]
+    assert endpoints["login"]["statuses"] == {"200": 2}
+    assert report["requests"] > len(endpoints)
+    assert all(stats["errors"] == 0 for stats in endpoints.values())
+    assert all(stats["latency_p95_s"] >= stats["latency_p50_s"] for stats in endpoints.values())
@@ -0,0 +1,148 @@
+import os
+import pytest
+from app.services.local_storage_service import LocalStorageService
+
+
+@pytest.fixture
+def storage(tmp_path):
+    service = LocalStorageService(base_path=str(tmp_path / "qms"))
+    yield service
+    service.catalog.close()
+
+
+def test_list_files_uses_catalog_order_and_pagination(storage):
+    for i in range(5):
+        storage.write_file(f"sop/SOP-{i:03d}.md", f"content {i}")
+        os.utime(storage.base_path / f"sop/SOP-{i:03d}.md", (1_700_000_000 + i, 1_700_000_000 + i))
+        storage.catalog.upsert(f"sop/SOP-{i:03d}.md")
+    storage.write_json("documents/meta.json", {"a": 1})
+
+    page = storage.list_files(category="sop", limit=2, offset=1)
+    assert [f["name"] for f in page] == ["SOP-003.md", "SOP-002.md"]
+    assert all(f["category"] == "sop" for f in page)
+    assert storage.count_files(category="sop") == 5
+    assert [f["name"] for f in storage.list_files(extension="json")] == ["meta.json"]
+    assert page[0]["sha256"]
+
+
+def test_delete_and_reconcile_keep_catalog_in_sync(storage):
+    storage.write_file("documents/a.txt", "a")
+    storage.delete_file("documents/a.txt")
+    assert storage.list_files(category="documents") == []
+
+    # 외부에서 직접 추가/삭제된 파일은 reconcile 로 반영
+    (storage.base_path / "risk" / "external.txt").write_text("x")
+    result = storage.catalog.reconcile()
+    assert result["updated"] == 1
+    assert [f["path"] for f in storage.list_files(category="risk")] == ["risk/external.txt"]
+
+    (storage.base_path / "risk" / "external.txt").unlink()
+    assert storage.catalog.reconcile()["removed"] == 1
+    assert storage.count_files() == 0
+
+
+def test_nested_category_prefix_query(storage):
+    storage.save_record("impact", {"x": 1}, filename="one.json")
+    storage.save_record("risk", {"x": 2}, filename="two.json")
+
+    files = storage.list_files(category="records/impact")
+    assert [f["path"] for f in files] == ["records/impact/one.json"]
+    assert storage.count_files(category="records") == 2
+
+
+def test_failed_write_keeps_previous_content(storage):
+    storage.write_file("sop/SOP-001.md", "v1")
+
+    with pytest.raises(RuntimeError):
+        with storage.writer.open(storage.base_path / "sop/SOP-001.md") as f:
+            f.write(b"partial")
+            raise RuntimeError("crash mid-write")
+
+    assert storage.read_file("sop/SOP-001.md") == "v1"
+    assert not list((storage.base_path / "sop").glob(".*.tmp"))
+
+
+def test_save_record_ids_do_not_collide(storage):
+    paths = {storage.save_record("impact", {"i": i}) for i in range(20)}
+    assert len(paths) == 20
+    assert storage.count_files(category="records/impact") == 20
+
+
+def test_group_commit_fsyncs_before_replace_and_keeps_last_writer(tmp_path, monkeypatch):
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    from app.utils import durable_io
+
+    events = []
+    events_lock = threading.Lock()
+    real_fsync_file, real_replace = durable_io.fsync_file, durable_io.os.replace
+
+    def fsync_file(path):
+        with events_lock:
+            events.append(("fsync", str(path)))
+        real_fsync_file(path)
+
+    def replace(src, dst):
+        with events_lock:
+            events.append(("replace", str(src)))
+        real_replace(src, dst)
+
+    monkeypatch.setattr(durable_io, "fsync_file", fsync_file)
+    monkeypatch.setattr(durable_io.os, "replace", replace)
+
+    service = LocalStorageService(base_path=str(tmp_path / "qms"), durability="group")
+    committed = []
+
+    def write(i):
+        service.writer.write_bytes(
+            service.base_path / "records/shared.json",
+            str(i).encode(),
+            on_commit=lambda path: committed.append(i)
+        )
+        service.write_file(f"records/own-{i % 4}.txt", str(i))
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(write, range(40)))
+
+    # 임시 파일은 교체 전에 반드시 fsync 된다
+    replaced = [path for kind, path in events if kind == "replace"]
+    assert len(replaced) == 80
+    for path in replaced:
+        assert events.index(("fsync", path)) < events.index(("replace", path))
+
+    # 같은 경로에 대해서는 마지막으로 커밋된 쓰기가 남는다
+    assert (service.base_path / "records/shared.json").read_text() == str(committed[-1])
+    assert len(committed) == 40
+    assert service.count_files(category="records") == 4
+    assert not list((service.base_path / "records").glob(".*.tmp"))
+    service.catalog.close()
+
+
+def test_lock_files_are_bounded_by_stripes(storage):
+    for i in range(200):
+        storage.save_record("impact", {"i": i})
+    assert len(list((storage.base_path / ".locks").iterdir())) <= 64
+
+
+def test_copy_file_preserves_mtime(storage):
+    storage.write_file("sop/SOP-001.md", "v1")
+    os.utime(storage.base_path / "sop/SOP-001.md", (1_600_000_000, 1_600_000_000))
+
+    storage.copy_file("sop/SOP-001.md", "documents/SOP-001.md")
+    assert os.stat(storage.base_path / "documents/SOP-001.md").st_mtime == 1_600_000_000
+    assert storage.read_file("documents/SOP-001.md") == "v1"
+
+
+def test_catalog_is_lazy_and_watcher_reconciles_on_start(tmp_path):
+    base = tmp_path / "qms"
+    (base / "sop").mkdir(parents=True)
+    (base / "sop" / "offline.md").write_text("changed while down")
+
+    service = LocalStorageService(base_path=str(base))
+    assert not (base / ".catalog.sqlite3").exists()
+
+    service.watcher.interval_seconds = 0
+    service.watcher.start()
+    service.watcher._thread.join(timeout=5)
+    assert [f["path"] for f in service.list_files(category="sop")] == ["sop/offline.md"]
+    service.catalog.close()
@@ -0,0 +1,59 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.core.metrics import observe_drive, record_llm_usage
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_metrics_endpoint_reports_route_templates(client, test_user_data):
+    client.post("/api/v1/auth/register", json=test_user_data)
+    labels = {"method": "POST", "route": "/api/v1/auth/register", "status": "200"}
+    before = sample("qms_http_request_duration_seconds_count", **labels)
+    client.post("/api/v1/auth/register", json={**test_user_data, "username": "other", "email": "o@example.com"})
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert "qms_db_pool_connections" in response.text
+    assert sample("qms_http_request_duration_seconds_count", **labels) == before + 1
+
+
+def test_drive_errors_are_counted_by_status_code():
+    class FakeHttpError(Exception):
+        resp = SimpleNamespace(status=403)
+
+    before = sample("qms_drive_api_errors_total", method="drive.files.get", code="403")
+    with pytest.raises(FakeHttpError):
+        with observe_drive("drive.files.get"):
+            raise FakeHttpError()
+    assert sample("qms_drive_api_errors_total", method="drive.files.get", code="403") == before + 1
+
+
+def test_agent_run_records_llm_latency_and_tokens():
+    from app.agents.base_agent import BaseAgent
+
+    class FakeLLM:
+        async def ainvoke(self, prompt):
+            return SimpleNamespace(content="{}", usage_metadata={"input_tokens": 12, "output_tokens": 5})
+
+    class EchoAgent(BaseAgent):
+        def _init_llm(self, model_name=None, credentials=None):
+            self.llm = FakeLLM()
+
+        async def execute(self, state):
+            await self._invoke_llm("hello")
+            return state
+
+    agent = EchoAgent("echo", model_name="test-model")
+    tokens = sample("qms_llm_tokens_total", model="test-model", kind="prompt")
+    asyncio.run(agent.run({"messages": []}))
+
+    assert sample("qms_llm_tokens_total", model="test-model", kind="prompt") == tokens + 12
+    assert sample("qms_agent_execute_duration_seconds_count", agent="echo", outcome="ok") >= 1
+    assert sample("qms_llm_request_duration_seconds_count", model="test-model", outcome="ok") >= 1
+    record_llm_usage("test-model", SimpleNamespace())  # 사용량 없는 응답은 무시
@@ -5,7 +5,7 @@ import json
 from app.agents.orchestrator import orchestrator
 from app.agents.base_agent import AgentState, BaseAgent
 from app.db.models import DesignProject, DesignChange, User, RiskItem
-from app.services.vector_db_service import vector_db_service
+from app.services.knowledge_base import knowledge_base
 from app.services.gdrive_service import gdrive_service
 from app.agents.design_engineer_agent import design_engineer_agent
 from app.agents.pm_agent import pm_agent
@@ -120,7 +120,7 @@ async def test_full_orchestrator_workflow(db_session, setup_test_data):
          patch.object(verification_agent, "llm", mock_llm), \
          patch.object(qa_agent, "llm", mock_llm), \
          patch.object(BaseAgent, "_get_db_session") as mock_get_db, \
-         patch.object(vector_db_service, "search") as mock_vdb_search, \
+         patch.object(knowledge_base, "search") as mock_vdb_search, \
          patch.object(gdrive_service, "read_excel_file") as mock_gdrive_read:
         
         # Configure DB Mock to return the test session
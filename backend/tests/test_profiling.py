@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+
+from app.core import profiling
+from app.core.config import settings
+from app.services.local_storage_service import LocalStorageService
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    service = LocalStorageService(base_path=str(tmp_path / "qms"))
+    monkeypatch.setattr(profiling, "local_storage_service", service)
+    yield service
+    service.catalog.close()
+
+
+def login(client, user_data):
+    client.post("/api/v1/auth/register", json=user_data)
+    response = client.post(
+        "/api/v1/auth/login",
+        data={"username": user_data["username"], "password": user_data["password"]},
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def profiles(storage):
+    return sorted((storage.base_path / profiling.PROFILE_DIR).glob("*.html"))
+
+
+def test_admin_can_profile_a_request(client, test_user_data, storage):
+    headers = login(client, {**test_user_data, "role": "admin"})
+
+    response = client.get("/api/v1/design-changes/?profile=1", headers=headers)
+
+    assert response.status_code == 200
+    path = response.headers["x-profile-path"]
+    assert path.startswith(profiling.PROFILE_DIR)
+    assert "pyinstrument" in storage.read_file(path).lower()
+
+
+def test_profile_flag_is_forbidden_for_other_roles(client, test_user_data, storage):
+    headers = login(client, test_user_data)
+
+    response = client.get("/api/v1/design-changes/", headers={**headers, "X-Profile": "1"})
+
+    assert response.status_code == 403
+    assert "x-profile-path" not in response.headers
+    assert profiles(storage) == []
+
+
+def test_sampling_profiles_without_flag(client, storage, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILING_SAMPLE_RATE", 1)
+
+    response = client.get("/health")
+
+    assert response.status_code == 200
+    assert "x-profile-path" not in response.headers
+    assert len(profiles(storage)) == 1
+
+
+def test_profile_block_is_noop_when_disabled(storage):
+    async def run(enabled):
+        async with profiling.profile_block("orchestrator-change-1", enabled=enabled) as path:
+            await asyncio.sleep(0.01)
+        return path
+
+    assert asyncio.run(run(False)) is None
+    path = asyncio.run(run(True))
+    assert path.startswith(f"{profiling.PROFILE_DIR}/") and path.endswith(".html")
+    assert profiles(storage)[0].name == path.rsplit("/", 1)[1]
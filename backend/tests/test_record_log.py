@@ -0,0 +1,135 @@
+from datetime import datetime, timedelta
+from app.services.record_log import RecordLog
+
+
+def test_append_get_and_query(tmp_path):
+    log = RecordLog(tmp_path / "log", max_segment_bytes=400)
+    ids = [log.append("impact" if i % 2 else "risk", {"change_id": i % 3, "n": i}) for i in range(12)]
+
+    assert log.stats()["segments"] > 1
+    assert log.get(ids[5])["data"]["n"] == 5
+
+    impact = list(log.iter_records(record_type="impact"))
+    assert [r["data"]["n"] for r in impact] == [1, 3, 5, 7, 9, 11]
+
+    by_change = list(log.iter_records(change_id=1, reverse=True, limit=2))
+    assert [r["data"]["n"] for r in by_change] == [10, 7]
+
+    future = datetime.now() + timedelta(days=1)
+    assert list(log.iter_records(start=future)) == []
+    assert len(list(log.iter_records(end=future))) == 12
+
+
+def test_reopen_rebuilds_index_and_drops_partial_tail(tmp_path):
+    log = RecordLog(tmp_path / "log", max_segment_bytes=300)
+    ids = [log.append("impact", {"n": i}) for i in range(6)]
+    active = log.directory / log._segments[-1].name
+    with open(active, "ab") as f:
+        f.write(b'{"record_id": "torn')
+
+    reopened = RecordLog(tmp_path / "log", max_segment_bytes=300)
+    assert [r["record_id"] for r in reopened.iter_records()] == ids
+    assert reopened.append("impact", {"n": 6})
+
+
+def test_delete_and_compact(tmp_path):
+    log = RecordLog(tmp_path / "log", max_segment_bytes=250)
+    ids = [log.append("impact", {"n": i}) for i in range(10)]
+    assert log.delete(ids[0]) and log.delete(ids[1])
+    assert log.get(ids[0]) is None
+
+    before = log.stats()
+    result = log.compact()
+    assert result["bytes_reclaimed"] > 0
+    assert log.stats()["records"] == before["records"] == 8
+    assert [r["data"]["n"] for r in log.iter_records()] == list(range(2, 10))
+
+    reopened = RecordLog(tmp_path / "log", max_segment_bytes=250)
+    assert reopened.get(ids[9])["data"]["n"] == 9
+    assert reopened.get(ids[1]) is None
+
+
+def test_group_commit_durability(tmp_path):
+    log = RecordLog(tmp_path / "log", max_segment_bytes=300, durability="group", group_commit_ms=5)
+    ids = [log.append("impact", {"n": i}) for i in range(10)]
+    assert log.flush(timeout=5)
+    assert log.stats()["segments"] > 1
+
+    reopened = RecordLog(tmp_path / "log", max_segment_bytes=300)
+    assert [r["record_id"] for r in reopened.iter_records()] == ids
+
+
+def test_iteration_survives_concurrent_compaction(tmp_path):
+    log = RecordLog(tmp_path / "log", max_segment_bytes=250)
+    ids = [log.append("impact", {"n": i}) for i in range(10)]
+    log.delete(ids[0])
+
+    records = log.iter_records()
+    first = next(records)
+    log.compact()
+    rest = list(records)
+    assert [r["data"]["n"] for r in [first] + rest] == list(range(1, 10))
+
+
+def test_document_manager_saves_analysis_to_log(tmp_path):
+    from app.services.document_manager import DocumentManager
+
+    manager = DocumentManager(records=RecordLog(tmp_path / "log"))
+    saved = manager.save_analysis_record("impact", {"change_id": 7, "score": 1})
+
+    assert saved["storage"] == "local"
+    assert manager.get_analysis_record(saved["id"])["data"]["score"] == 1
+    assert [r["record_id"] for r in manager.iter_analysis_records(change_id=7)] == [saved["id"]]
+
+
+def test_records_endpoints(client, test_user_data, tmp_path, monkeypatch):
+    from app.services.document_manager import document_manager
+
+    monkeypatch.setattr(document_manager, "_records", RecordLog(tmp_path / "log"))
+    first = document_manager.save_analysis_record("impact", {"change_id": 1})
+    document_manager.save_analysis_record("risk", {"change_id": 2})
+
+    client.post("/api/v1/auth/register", json=test_user_data)
+    token = client.post("/api/v1/auth/login", data={
+        "username": test_user_data["username"],
+        "password": test_user_data["password"]
+    }).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = client.get("/api/v1/documents/records", params={"record_type": "impact"}, headers=headers)
+    assert response.status_code == 200
+    assert [r["record_id"] for r in response.json()] == [first["id"]]
+
+    response = client.get(f"/api/v1/documents/records/{first['id']}", headers=headers)
+    assert response.json()["data"] == {"change_id": 1}
+    assert client.get("/api/v1/documents/records/missing", headers=headers).status_code == 404
+
+
+def test_interrupted_rotation_orphan_is_not_reused(tmp_path):
+    log = RecordLog(tmp_path / "log", max_segment_bytes=250)
+    ids = [log.append("impact", {"n": i}) for i in range(3)]
+    # 압축 도중 중단: 출력 세그먼트 번호는 예약됐지만 세그먼트 목록에는 반영되지 않음
+    orphan = log.directory / log._new_segment().name
+    orphan.write_bytes(b'{"record_id": "ghost", "ts": 0}\n{"partial')
+
+    reopened = RecordLog(tmp_path / "log", max_segment_bytes=250)
+    assert not orphan.exists()
+    ids += [reopened.append("impact", {"n": i}) for i in range(3, 12)]
+    assert [r["record_id"] for r in RecordLog(tmp_path / "log").iter_records()] == ids
+
+
+def test_import_legacy_record_files_once(tmp_path):
+    from app.services.local_storage_service import LocalStorageService
+
+    storage = LocalStorageService(base_path=str(tmp_path / "qms"))
+    storage.save_record("impact", {"change_id": 3, "score": 9}, filename="old.json")
+    storage.catalog.close()
+
+    log = RecordLog(tmp_path / "log")
+    assert log.import_legacy_records(tmp_path / "qms" / "records") == 1
+    assert log.import_legacy_records(tmp_path / "qms" / "records") == 0
+
+    [record] = log.iter_records(change_id=3)
+    assert record["data"]["score"] == 9
+    assert record["legacy_path"] == "records/impact/old.json"
+    assert (tmp_path / "qms" / "records" / "impact" / "old.json").exists()
@@ -0,0 +1,107 @@
+import sys
+from unittest.mock import patch
+
+import chromadb
+import pytest
+from chromadb.config import Settings
+
+from app.services.knowledge_base import KnowledgeBase
+from app.services.reranker import Reranker, mmr_select
+from app.services.vector_db_service import VectorDBService
+
+
+class FakeCrossEncoder:
+    """문서에 질의 단어가 몇 번 나오는지로 점수화"""
+
+    def __init__(self):
+        self.batches = []
+
+    def predict(self, pairs, batch_size):
+        self.batches.append((len(pairs), batch_size))
+        return [document.count(query) for query, document in pairs]
+
+
+def _candidates(embeddings, documents=None):
+    n = len(embeddings)
+    return {
+        "ids": [f"c{i}" for i in range(n)],
+        "documents": documents or [f"doc {i}" for i in range(n)],
+        "metadatas": [{"n": i} for i in range(n)],
+        "distances": [0.1 * i for i in range(n)],
+        "embeddings": embeddings,
+    }
+
+
+def test_mmr_prefers_diverse_results():
+    query = [1.0, 0.0, 0.0]
+    embeddings = [
+        [1.0, 0.1, 0.0],   # 가장 관련
+        [1.0, 0.11, 0.0],  # 0 과 거의 같음
+        [0.8, 0.0, 0.6],   # 관련도는 낮지만 다른 내용
+    ]
+    assert mmr_select(query, embeddings, 2, lambda_mult=1.0) == [0, 1]
+    assert mmr_select(query, embeddings, 2, lambda_mult=0.5) == [0, 2]
+    assert mmr_select(query, embeddings, 5, lambda_mult=0.5) == [0, 2, 1]
+    assert mmr_select(query, [], 3, lambda_mult=0.5) == []
+
+
+def test_mmr_rerank_attaches_query_similarity():
+    reranker = Reranker(strategy="mmr", mmr_lambda=0.3, top_k=2)
+    result = reranker.rerank("q", [1.0, 0.0], _candidates([[1.0, 0.0], [1.0, 0.01], [0.0, 1.0]]), n_results=3)
+
+    assert result["ids"] == ["c0", "c2"]
+    assert result["scores"][0] == pytest.approx(1.0)
+    assert result["scores"][1] == pytest.approx(0.0, abs=1e-6)
+    assert result["metadatas"] == [{"n": 0}, {"n": 2}]
+    assert "embeddings" not in result
+
+
+def test_cross_encoder_scores_in_batches():
+    reranker = Reranker(strategy="cross_encoder", batch_size=16)
+    model = FakeCrossEncoder()
+    with patch.object(Reranker, "model", model):
+        assert not reranker.needs_embeddings
+        result = reranker.rerank("alarm", [1.0], _candidates(
+            [None] * 3, ["battery", "alarm alarm", "alarm"]
+        ), n_results=2)
+
+    assert result["ids"] == ["c1", "c2"]
+    assert result["scores"] == [2.0, 1.0]
+    assert model.batches == [(3, 16)]
+
+
+def test_cross_encoder_falls_back_to_mmr_without_sentence_transformers():
+    reranker = Reranker(strategy="cross_encoder")
+    with patch.dict(sys.modules, {"sentence_transformers": None}):
+        assert reranker.model is None
+    assert reranker.needs_embeddings
+    result = reranker.rerank("q", [1.0, 0.0], _candidates([[0.0, 1.0], [1.0, 0.0]]), n_results=1)
+    assert result["ids"] == ["c1"]
+
+
+def test_unknown_strategy_is_rejected():
+    with pytest.raises(ValueError):
+        Reranker(strategy="bm25")
+
+
+def test_knowledge_base_over_fetches_and_reranks(tmp_path):
+    service = VectorDBService()
+    service.client = chromadb.PersistentClient(path=str(tmp_path / "chroma"),
+                                               settings=Settings(anonymized_telemetry=False))
+    kb = KnowledgeBase(vector_db=service, reranker=Reranker(strategy="mmr", candidate_multiplier=3, mmr_lambda=0.5))
+    collection = service.get_or_create_collection("qms_kb_sop")
+    collection.add(
+        ids=["a", "a2", "b", "c"],
+        embeddings=[[1.0, 0.1, 0.0], [1.0, 0.11, 0.0], [0.8, 0.0, 0.6], [0.0, 1.0, 0.0]],
+        documents=["A", "A copy", "B", "C"],
+        metadatas=[{"project_id": 0}] * 4,
+    )
+
+    with patch.object(service, "embed_query", return_value=[1.0, 0.0, 0.0]), \
+            patch.object(service, "query_by_embedding", wraps=service.query_by_embedding) as query:
+        results = kb.search(["sop"], "battery", n_results=2)
+
+    assert query.call_args.args[2] == 6
+    assert results["ids"] == [["a", "b"]]
+    assert len(results["scores"][0]) == 2
+    assert results["scores"][0][0] > results["scores"][0][1]
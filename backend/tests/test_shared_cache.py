@@ -0,0 +1,108 @@
+from unittest.mock import patch
+from app.db.models import User
+from app.services.shared_cache import SharedCache
+from app.services.vector_db_service import SharedCacheEmbeddings
+
+
+class CountingEmbeddings:
+    def __init__(self):
+        self.documents = []
+        self.queries = []
+
+    def embed_documents(self, texts):
+        self.documents.extend(texts)
+        return [[float(len(text)), 1.0] for text in texts]
+
+    def embed_query(self, text):
+        self.queries.append(text)
+        return [float(len(text)), 0.0]
+
+
+def test_get_set_and_namespaces(tmp_path):
+    cache = SharedCache(str(tmp_path / "cache.sqlite3"))
+    cache.set("llm", "k", "응답")
+    cache.set_many("user", {"k": {"id": 1}, "other": {"id": 2}})
+
+    assert cache.get("llm", "k") == "응답"
+    assert cache.get("user", "k") == {"id": 1}
+    assert cache.get_many("user", ["k", "missing", "other"]) == {"k": {"id": 1}, "other": {"id": 2}}
+
+    cache.delete("user", ["k"])
+    assert cache.get("user", "k") is None
+    assert cache.get("user", "other") == {"id": 2}
+
+
+def test_disabled_cache_is_noop(tmp_path):
+    cache = SharedCache(str(tmp_path / "cache.sqlite3"), enabled=False)
+    cache.set("llm", "k", "응답")
+    assert cache.get("llm", "k") is None
+    assert not (tmp_path / "cache.sqlite3").exists()
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = SharedCache(str(tmp_path / "cache.sqlite3"))
+    with patch("app.services.shared_cache.time.time", return_value=1000.0):
+        cache.set("user", "a", {"id": 1}, ttl=30)
+    with patch("app.services.shared_cache.time.time", return_value=1029.0):
+        assert cache.get("user", "a") == {"id": 1}
+    with patch("app.services.shared_cache.time.time", return_value=1031.0):
+        assert cache.get("user", "a") is None
+
+
+def test_prune_keeps_newest_entries(tmp_path):
+    cache = SharedCache(str(tmp_path / "cache.sqlite3"), max_entries=3, prune_every=5)
+    for i in range(5):
+        with patch("app.services.shared_cache.time.time", return_value=1000.0 + i):
+            cache.set("llm", str(i), i)
+
+    assert cache.get_many("llm", [str(i) for i in range(5)]) == {"2": 2, "3": 3, "4": 4}
+
+
+def test_visible_across_instances(tmp_path):
+    # 다른 워커 프로세스는 같은 파일을 별도 연결로 엶
+    path = str(tmp_path / "cache.sqlite3")
+    SharedCache(path).set("llm", "k", "응답")
+    assert SharedCache(path).get("llm", "k") == "응답"
+
+
+def test_embeddings_only_embed_misses(tmp_path):
+    cache = SharedCache(str(tmp_path / "cache.sqlite3"))
+    inner = CountingEmbeddings()
+    embeddings = SharedCacheEmbeddings(inner, "models/embedding-001", cache)
+
+    first = embeddings.embed_documents(["가", "나나"])
+    second = embeddings.embed_documents(["나나", "다다다", "가"])
+
+    assert inner.documents == ["가", "나나", "다다다"]
+    assert second == [first[1], [3.0, 1.0], first[0]]
+
+    assert embeddings.embed_query("가") == [1.0, 0.0]
+    assert embeddings.embed_query("가") == [1.0, 0.0]
+    # 질의 임베딩은 문서 임베딩과 따로 저장
+    assert inner.queries == ["가"]
+
+
+def test_current_user_lookup_uses_shared_cache(client, db_session, test_user_data, tmp_path):
+    cache = SharedCache(str(tmp_path / "cache.sqlite3"))
+    with patch("app.utils.auth.shared_cache", cache):
+        client.post("/api/v1/auth/register", json=test_user_data)
+        login = client.post("/api/v1/auth/login", data={
+            "username": test_user_data["username"],
+            "password": test_user_data["password"]
+        })
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+        assert client.get("/api/v1/auth/me", headers=headers).json()["role"] == "design_engineer"
+        cached = cache.get("user", test_user_data["username"])
+        assert cached["role"] == "design_engineer"
+        assert "password_hash" not in cached
+
+        user = db_session.query(User).filter(User.username == test_user_data["username"]).one()
+        user.role = "qa"
+        db_session.commit()
+        # 사용자 행을 바꾸면 캐시에서 제거되어 다음 요청은 새 값을 조회
+        assert cache.get("user", test_user_data["username"]) is None
+        assert client.get("/api/v1/auth/me", headers=headers).json()["role"] == "qa"
+        # 캐시 hit 이어도 응답은 같음
+        assert cache.get("user", test_user_data["username"])["role"] == "qa"
+        assert client.get("/api/v1/auth/me", headers=headers).json()["email"] == test_user_data["email"]
@@ -0,0 +1,121 @@
+import pytest
+
+from app.api.v1 import traceability
+from app.services import traceability_graph as graph_module
+from app.services.traceability_graph import TraceabilityGraph
+from tests.conftest import TestingSessionLocal
+
+
+LINKS = [
+    (1, "design_change", 1, "requirement", 10),
+    (2, "requirement", 10, "test_case", 100),
+    (3, "requirement", 10, "risk", 7),
+    (4, "risk", 7, "control", 70),
+    (5, "requirement", 11, "risk", 7),
+    (6, "design_change", 2, "requirement", 11),
+]
+
+
+@pytest.fixture
+def graph():
+    graph = TraceabilityGraph(session_factory=TestingSessionLocal)
+    graph.load(LINKS)
+    yield graph
+    graph.detach(TestingSessionLocal)
+
+
+def ids(items):
+    return [(item["type"], item["id"], item["depth"]) for item in items]
+
+
+def test_impact_and_trace_follow_links_transitively(graph):
+    assert ids(graph.impact("design_change", 1)) == [
+        ("requirement", 10, 1),
+        ("risk", 7, 2), ("test_case", 100, 2),
+        ("control", 70, 3),
+    ]
+    assert ids(graph.impact("design_change", 1, max_depth=1)) == [("requirement", 10, 1)]
+    assert ids(graph.trace("control", 70)) == [
+        ("risk", 7, 1),
+        ("requirement", 10, 2), ("requirement", 11, 2),
+        ("design_change", 1, 3), ("design_change", 2, 3),
+    ]
+    assert graph.impact("design_change", 999) == []
+
+
+def test_coverage_gaps(graph):
+    assert graph.coverage_gaps("requirement", "test_case") == [11]
+    assert graph.coverage_gaps("requirement", "test_case", candidate_ids=[10, 12]) == [11, 12]
+    assert graph.coverage_gaps("unknown", "test_case", candidate_ids=[1]) == [1]
+
+
+def test_incremental_updates_and_compaction(graph, monkeypatch):
+    graph.add_link(7, "requirement", 11, "test_case", 101)
+    graph.remove_link(4)
+    assert graph.coverage_gaps("requirement", "test_case") == []
+    assert ("control", 70, 3) not in ids(graph.impact("design_change", 1))
+    assert ids(graph.impact("design_change", 2)) == [
+        ("requirement", 11, 1), ("risk", 7, 2), ("test_case", 101, 2),
+    ]
+    graph.remove_link(7)
+    assert graph.coverage_gaps("requirement", "test_case") == [11]
+
+    monkeypatch.setattr(graph_module, "MIN_COMPACT_EDGES", 1)
+    graph.add_link(8, "test_case", 100, "report", 5)
+    stats = graph.stats()
+    assert stats["pending_delta"] == 0 and stats["links"] == 6
+    assert ids(graph.trace("report", 5))[-1] == ("design_change", 1, 3)
+
+
+def test_committed_links_update_the_graph(graph, db_session):
+    from app.db.models import TraceabilityLink
+
+    link = TraceabilityLink(source_type="risk", source_id=7, target_type="control", target_id=71)
+    db_session.add(link)
+    db_session.flush()
+    db_session.rollback()
+    assert ("control", 71, 1) not in ids(graph.impact("risk", 7))
+
+    db_session.add(TraceabilityLink(id=50, source_type="risk", source_id=7, target_type="control", target_id=71))
+    db_session.commit()
+    assert ("control", 71, 1) in ids(graph.impact("risk", 7))
+
+    db_session.delete(db_session.get(TraceabilityLink, 50))
+    db_session.commit()
+    assert ("control", 71, 1) not in ids(graph.impact("risk", 7))
+
+
+def test_traceability_api(client, test_user_data, monkeypatch):
+    graph = TraceabilityGraph(session_factory=TestingSessionLocal)
+    monkeypatch.setattr(traceability, "traceability_graph", graph)
+    client.post("/api/v1/auth/register", json=test_user_data)
+    token = client.post(
+        "/api/v1/auth/login",
+        data={"username": test_user_data["username"], "password": test_user_data["password"]},
+    ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    try:
+        for _, source_type, source_id, target_type, target_id in LINKS[:4]:
+            response = client.post("/api/v1/traceability/links", headers=headers, json={
+                "source_type": source_type, "source_id": source_id,
+                "target_type": target_type, "target_id": target_id,
+            })
+            assert response.status_code == 200
+        link_id = response.json()["id"]
+
+        response = client.get("/api/v1/traceability/impact?node_type=design_change&node_id=1", headers=headers)
+        assert ids(response.json()["items"])[-1] == ("control", 70, 3)
+
+        assert client.delete(f"/api/v1/traceability/links/{link_id}", headers=headers).status_code == 200
+        response = client.get("/api/v1/traceability/trace?node_type=risk&node_id=7", headers=headers)
+        assert ids(response.json()["items"]) == [("requirement", 10, 1), ("design_change", 1, 2)]
+
+        response = client.get(
+            "/api/v1/traceability/coverage-gaps?source_type=requirement&target_type=test_case"
+            "&candidate_ids=10&candidate_ids=11",
+            headers=headers,
+        )
+        assert response.json()["missing_ids"] == [11]
+        assert client.delete("/api/v1/traceability/links/999", headers=headers).status_code == 404
+    finally:
+        graph.detach(TestingSessionLocal)
@@ -0,0 +1,45 @@
+import asyncio
+from types import SimpleNamespace
+
+from opentelemetry import trace
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from sqlalchemy import text
+
+from app.core.tracing import configure_tracing, start_span
+from tests.conftest import engine
+
+
+def test_run_produces_nested_agent_llm_and_sql_spans():
+    from app.agents.base_agent import BaseAgent
+
+    exporter = InMemorySpanExporter()
+    configure_tracing(engine, exporter=exporter)
+
+    class FakeLLM:
+        async def ainvoke(self, prompt):
+            return SimpleNamespace(content="{}", usage_metadata={"input_tokens": 7, "output_tokens": 3})
+
+    class LookupAgent(BaseAgent):
+        def _init_llm(self, model_name=None, credentials=None):
+            self.llm = FakeLLM()
+
+        async def execute(self, state):
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            await self._invoke_llm("analyze")
+            return state
+
+    agent = LookupAgent("lookup", model_name="test-model")
+    with start_span("orchestrator.run", change_id=42):
+        asyncio.run(agent.run({"change_id": 42, "messages": []}))
+    trace.get_tracer_provider().force_flush()
+
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    root, node = spans["orchestrator.run"], spans["agent.lookup"]
+    assert root.attributes["change_id"] == 42
+    assert node.parent.span_id == root.context.span_id
+    assert spans["llm.ainvoke"].parent.span_id == node.context.span_id
+    assert spans["llm.ainvoke"].attributes["llm.prompt_tokens"] == 7
+    assert spans["db.query"].parent.span_id == node.context.span_id
+    assert spans["db.query"].attributes["db.statement"] == "SELECT 1"
+    assert {s.context.trace_id for s in spans.values()} == {root.context.trace_id}
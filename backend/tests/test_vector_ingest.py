@@ -0,0 +1,27 @@
+import io
+from types import SimpleNamespace
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from app.services.vector_db_service import VectorDBService
+
+
+def test_stream_ingestion_splits_across_blocks():
+    text = "\n\n".join(f"Section {i}. " + "requirement text " * 40 for i in range(30))
+    added = []
+    stub = SimpleNamespace(
+        text_splitter=RecursiveCharacterTextSplitter(
+            chunk_size=1000, chunk_overlap=200, separators=["\n\n", "\n", ". ", " "]
+        ),
+        add_documents=lambda collection, documents, metadatas, ids: added.extend(zip(documents, metadatas, ids)),
+    )
+
+    count = VectorDBService.process_and_add_stream(
+        stub, "kb", io.StringIO(text), {"source": "SOP-001"}, doc_id_prefix="sop", block_chars=4096
+    )
+
+    assert count == len(added)
+    documents = [doc for doc, _, _ in added]
+    assert all(len(doc) <= 1000 for doc in documents)
+    assert all(any(f"Section {i}." in doc for doc in documents) for i in range(30))
+    assert abs(count - len(stub.text_splitter.split_text(text))) <= 3
+    assert [m["chunk_index"] for _, m, _ in added] == list(range(count))
+    assert added[-1][2] == f"sop_{count - 1}"
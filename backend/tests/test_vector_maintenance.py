@@ -0,0 +1,159 @@
+import gzip
+from unittest.mock import patch
+
+import chromadb
+import pytest
+from chromadb.config import Settings
+
+from app.core.config import settings
+from app.services.vector_db_service import VectorDBService
+from app.services.vector_maintenance import SnapshotError, VectorMaintenance
+
+
+CHURN_METADATA = {"hnsw:space": "cosine", "hnsw:batch_size": 10, "hnsw:sync_threshold": 20}
+
+
+@pytest.fixture
+def service(tmp_path):
+    service = VectorDBService()
+    service.client = chromadb.PersistentClient(path=str(tmp_path / "chroma"),
+                                               settings=Settings(anonymized_telemetry=False))
+    with patch.object(settings, "VECTOR_ALIAS_CACHE_SECONDS", 0):
+        yield service
+
+
+@pytest.fixture
+def maintenance(service, tmp_path):
+    return VectorMaintenance(vector_db=service, batch_size=50, snapshot_directory=str(tmp_path / "snapshots"))
+
+
+def _churn(service, name="qms_kb_sop", total=200, deleted=150):
+    collection = service.get_or_create_collection(name, CHURN_METADATA)
+    collection.add(
+        ids=[f"doc_{i}" for i in range(total)],
+        embeddings=[[float(i % 7) + 1, float(i % 5), 1.0] for i in range(total)],
+        documents=[f"document {i}" for i in range(total)],
+        metadatas=[{"project_id": 0, "n": i} for i in range(total)],
+    )
+    if deleted:
+        service.delete_documents(name, [f"doc_{i}" for i in range(deleted)])
+    return collection
+
+
+def test_stats_report_tombstones_and_disk_usage(service, maintenance):
+    _churn(service)
+
+    [stats] = maintenance.all_stats()
+
+    assert stats.name == stats.physical_name == "qms_kb_sop"
+    assert stats.count == 50
+    assert stats.disk_bytes > 0
+    assert stats.total_elements_added >= 180
+    assert stats.tombstones == stats.total_elements_added - 50
+
+
+def test_rebuild_compacts_and_swaps_alias(service, maintenance):
+    _churn(service)
+    service.configure_collection("qms_kb_sop", {**CHURN_METADATA, "hnsw:M": 32})
+    before = service.query_by_embedding("qms_kb_sop", [1.0, 0.0, 1.0], n_results=3)
+
+    result = maintenance.rebuild("qms_kb_sop")
+
+    assert result["copied"] == 50
+    assert result["reconciled"] == {"added": 0, "removed": 0}
+    physical = service.resolve_collection("qms_kb_sop")
+    assert physical.startswith("qms_kb_sop__g")
+    assert [c.name for c in service.client.list_collections() if c.name.startswith("qms_kb_sop")] == [physical]
+    assert result["after"]["count"] == 50
+    assert result["after"]["metadata"]["hnsw:M"] == 32
+    assert (result["after"]["tombstones"] or 0) == 0
+    assert maintenance.collection_names() == ["qms_kb_sop"]
+
+    # 논리 이름으로 계속 검색/삭제
+    after = service.query_by_embedding("qms_kb_sop", [1.0, 0.0, 1.0], n_results=3)
+    assert after["ids"] == before["ids"]
+    service.delete_documents("qms_kb_sop", ["doc_199"])
+    assert service.get_or_create_collection("qms_kb_sop").count() == 49
+
+    # 다시 재구축해도 논리 이름은 그대로
+    maintenance.rebuild("qms_kb_sop")
+    assert service.get_or_create_collection("qms_kb_sop").count() == 49
+
+
+def test_rebuild_reconciles_concurrent_changes(service, maintenance):
+    collection = _churn(service)
+    original_copy = maintenance._copy_into
+
+    def copy_then_write(target, batches):
+        copied = original_copy(target, batches)
+        # 복사가 끝난 뒤 다른 프로세스가 추가/삭제한 상황
+        if collection.count() == 50:
+            collection.add(ids=["late"], embeddings=[[1.0, 1.0, 1.0]], documents=["late"])
+            collection.delete(ids=["doc_150"])
+        return copied
+
+    with patch.object(maintenance, "_copy_into", copy_then_write):
+        result = maintenance.rebuild("qms_kb_sop")
+
+    assert result["reconciled"] == {"added": 1, "removed": 1}
+    ids = set(service.get_or_create_collection("qms_kb_sop").get(include=[])["ids"])
+    assert "late" in ids and "doc_150" not in ids
+
+
+def test_snapshot_and_restore(service, maintenance):
+    _churn(service)
+    _churn(service, name="traceability_entities", total=30, deleted=0)
+
+    snapshot = maintenance.snapshot()
+    assert snapshot["collections"] == {"qms_kb_sop": 50, "traceability_entities": 30}
+    assert [s["name"] for s in maintenance.list_snapshots()] == [snapshot["path"].rsplit("/", 1)[-1]]
+
+    service.delete_documents("qms_kb_sop", [f"doc_{i}" for i in range(150, 190)])
+    restored = maintenance.restore(maintenance.snapshot_path(maintenance.list_snapshots()[0]["name"]))
+
+    assert restored["collections"] == {"qms_kb_sop": 50, "traceability_entities": 30}
+    sop = service.get_or_create_collection("qms_kb_sop")
+    assert sop.count() == 50
+    assert sop.metadata["hnsw:space"] == "cosine"
+    assert sop.get(ids=["doc_160"], include=["metadatas", "embeddings"])["metadatas"][0] == {"project_id": 0, "n": 160}
+
+
+def test_restore_rejects_invalid_snapshots(maintenance, tmp_path):
+    with pytest.raises(SnapshotError):
+        maintenance.snapshot_path("../chroma/chroma.sqlite3")
+    bad = tmp_path / "snapshots" / "bad.jsonl.gz"
+    bad.parent.mkdir()
+    with gzip.open(bad, "wt") as f:
+        f.write('{"format": "other"}\n')
+    with pytest.raises(SnapshotError):
+        maintenance.restore(bad)
+
+
+def test_admin_endpoints_require_admin_role(client, test_user_data, service, maintenance):
+    def login(user):
+        client.post("/api/v1/auth/register", json=user)
+        token = client.post("/api/v1/auth/login", data={
+            "username": user["username"], "password": user["password"]
+        }).json()["access_token"]
+        return {"Authorization": f"Bearer {token}"}
+
+    _churn(service)
+    with patch("app.api.v1.vector_store.vector_maintenance", maintenance):
+        user_headers = login(test_user_data)
+        assert client.get("/api/v1/vector-store/stats", headers=user_headers).status_code == 403
+
+        admin_headers = login({**test_user_data, "username": "admin", "email": "admin@example.com", "role": "admin"})
+        stats = client.get("/api/v1/vector-store/stats", headers=admin_headers).json()
+        assert [s["count"] for s in stats] == [50]
+
+        assert client.post("/api/v1/vector-store/collections/missing/rebuild",
+                           headers=admin_headers).status_code == 404
+        rebuilt = client.post("/api/v1/vector-store/collections/qms_kb_sop/rebuild", headers=admin_headers).json()
+        assert rebuilt["after"]["count"] == 50
+
+        snapshot = client.post("/api/v1/vector-store/snapshots", headers=admin_headers).json()
+        name = snapshot["path"].rsplit("/", 1)[-1]
+        assert client.post(f"/api/v1/vector-store/snapshots/{name}/restore",
+                           headers=admin_headers).json()["collections"] == {"qms_kb_sop": 50}
+        assert client.post("/api/v1/vector-store/snapshots/nope.jsonl.gz/restore",
+                           headers=admin_headers).status_code == 404